@@ -1,6 +1,9 @@
 """
 FastAPI endpoint for Social AE daily pulls.
 Deploy to Render, Railway, or EC2.
+
+POST /social/daily queues the pull as a background job and returns its id
+right away; /social/jobs/{job_id} reports progress and stage timings.
 """
 
 import os
@@ -20,12 +23,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.social_ae.social_fetcher import fetch_daily_social_posts
-from src.social_ae.social_cleaner import clean_and_normalize_posts
-from src.social_ae.social_mapper import extract_reactions_from_posts
-from src.social_ae.social_anonymizer import anonymize_posts
-from src.social_ae.social_storage import store_social_records
-import pandas as pd
+from src.social_ae.social_pull_jobs import get_pull_queue
 
 # Configure logging
 logging.basicConfig(
@@ -78,100 +76,73 @@ def root():
     }
 
 
-@app.post("/social/daily")
+def _check_authorization(authorization: Optional[str]) -> None:
+    """Optional: Verify API secret key."""
+    api_secret = os.getenv("API_SECRET_KEY")
+    if api_secret and authorization != f"Bearer {api_secret}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@app.post("/social/daily", status_code=202)
 async def run_daily_social_pull(
     request: Optional[PullRequest] = None,
     authorization: Optional[str] = Header(None)
 ):
     """
-    Run daily Social AE pull and store in Supabase.
+    Queue a daily Social AE pull (stored in Supabase by a background worker).
     
-    Called by Supabase Edge Function on schedule.
+    Called by Supabase Edge Function on schedule. Returns immediately with
+    the job id; a trigger for a watchlist whose pull is still queued or
+    running returns that job instead of starting a second one.
     """
-    # Optional: Verify API secret key
-    api_secret = os.getenv("API_SECRET_KEY")
-    if api_secret and authorization != f"Bearer {api_secret}":
-        raise HTTPException(status_code=401, detail="Unauthorized")
+    _check_authorization(authorization)
+    
+    # Get parameters
+    drug_terms_str = request.drug_terms if request and request.drug_terms else ", ".join(DEFAULT_DRUG_WATCHLIST)
+    platforms = request.platforms if request and request.platforms else ["reddit"]
     
-    try:
-        # Get parameters
-        drug_terms_str = request.drug_terms if request and request.drug_terms else ", ".join(DEFAULT_DRUG_WATCHLIST)
-        platforms = request.platforms if request and request.platforms else ["reddit"]
-        
-        logger.info(f"Starting daily pull: {len(drug_terms_str.split(','))} drugs, platforms: {platforms}")
-        
-        # Step 1: Fetch posts
-        logger.info("Fetching posts from social media...")
-        raw_posts = fetch_daily_social_posts(
-            drug_terms_str,
-            platforms=platforms,
-            limit_per_term=50,
-            days_back=1,
-        )
-        
-        if not raw_posts:
-            logger.warning("No posts fetched")
-            return {
-                "success": False,
-                "error": "No posts fetched",
-                "posts_fetched": 0,
-                "inserted": 0
-            }
-        
-        logger.info(f"Fetched {len(raw_posts)} raw posts")
-        
-        # Step 2: Clean and normalize
-        logger.info("Cleaning and normalizing posts...")
-        cleaned_df = clean_and_normalize_posts(raw_posts, use_ml=False)  # ML optional for speed
-        
-        if cleaned_df.empty:
-            logger.warning("All posts filtered out during cleaning")
-            return {
-                "success": False,
-                "error": "All posts filtered out",
-                "posts_fetched": len(raw_posts),
-                "posts_cleaned": 0,
-                "inserted": 0
-            }
-        
-        logger.info(f"Cleaned {len(cleaned_df)} posts")
-        
-        # Step 3: Extract reactions
-        logger.info("Extracting reactions...")
-        df_with_reactions = extract_reactions_from_posts(cleaned_df, include_confidence=True)
-        
-        # Step 4: Anonymize
-        logger.info("Anonymizing posts...")
-        posts_list = df_with_reactions.to_dict('records')
-        anonymized_posts = anonymize_posts(posts_list)
-        df_final = pd.DataFrame(anonymized_posts)
-        
-        logger.info(f"Final dataset: {len(df_final)} posts")
-        
-        # Step 5: Store in Supabase
-        logger.info("Storing posts in Supabase...")
-        storage_result = store_social_records(df_final)
-        
-        logger.info(f"Storage complete: {storage_result['inserted']} inserted, {storage_result['errors']} errors")
-        
-        return {
-            "success": True,
-            "posts_fetched": len(raw_posts),
-            "posts_cleaned": len(cleaned_df),
-            "posts_with_reactions": int(df_final["has_reaction"].sum()) if "has_reaction" in df_final.columns else 0,
-            "posts_stored": storage_result["inserted"],
-            "posts_errors": storage_result["errors"],
-            "inserted": storage_result["inserted"],  # Alias for compatibility
-            "duplicates": 0,  # Handled by upsert
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error during daily pull: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error during pull: {str(e)}"
-        )
+    job, created = get_pull_queue().submit(
+        drug_terms_str.split(","),
+        platforms,
+        limit_per_term=50,
+        days_back=1,
+    )
+    if created:
+        logger.info(f"Queued daily pull {job.job_id}: {len(job.drug_terms)} drugs, platforms: {platforms}")
+    else:
+        logger.info(f"Daily pull for this watchlist already {job.status}: {job.job_id}")
+    
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "deduplicated": not created,
+        "status_url": f"/social/jobs/{job.job_id}",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/social/jobs/{job_id}")
+def get_social_pull_job(job_id: str, authorization: Optional[str] = Header(None)):
+    """Status, progress counts and per-stage timings of a pull job."""
+    _check_authorization(authorization)
+    job = get_pull_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
+
+
+@app.get("/social/jobs")
+def list_social_pull_jobs(authorization: Optional[str] = Header(None)):
+    """Recent pull jobs, newest first."""
+    _check_authorization(authorization)
+    return {"jobs": [job.to_dict() for job in get_pull_queue().jobs()]}
+
+
+@app.get("/social/metrics")
+def social_pull_metrics(authorization: Optional[str] = Header(None)):
+    """Job counts by status and stage throughput of succeeded pulls."""
+    _check_authorization(authorization)
+    return get_pull_queue().metrics()
 
 
 @app.get("/health")
@@ -14,6 +14,13 @@ from dataclasses import dataclass
 # Import existing spike detection
 from src.longitudinal_spike import detect_spikes, detect_statistical_spikes, analyze_trend_changepoint
 from src.utils import safe_divide, normalize_text, parse_date
+from src.ai.trend_cube import (
+    ALERT_DATE_COLUMNS,
+    DATE_COLUMNS,
+    day_on_or_after,
+    find_date_column,
+    get_trend_cube,
+)
 
 # =========================================================
 # CHUNK 6.11.1: Unified Alert Structure (Enterprise-grade standard)
@@ -92,6 +99,17 @@ def get_last_90_days(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
     except Exception:
         return pd.DataFrame()
 
+# Calendar months (latest included) compared against earlier data by the pair detectors
+RECENT_MONTHS = 3
+
+# Trend cube term kind of each multi-value column
+_TERM_KINDS = {"drug_name": "drug", "reaction": "reaction"}
+
+
+def _days_ago(days: int) -> int:
+    """First day number inside a window of the last `days` days (relative to now)."""
+    return day_on_or_after(datetime.now() - timedelta(days=days))
+
 # =========================================================
 # CHUNK 6.11.1: Light Statistical Alerts (FAST)
 # These run after every query in Hybrid Mode.
@@ -104,28 +122,12 @@ def _alert_top_reaction_spikes(df: pd.DataFrame) -> Optional[TrendAlert]:
     Returns:
         TrendAlert or None if no spike detected
     """
-    # Find date column
-    date_col = None
-    for col in ["event_date", "report_date", "receipt_date", "receive_date", "received_date"]:
-        if col in df.columns:
-            date_col = col
-            break
-    
+    date_col = find_date_column(df, ALERT_DATE_COLUMNS)
     if not date_col or "reaction" not in df.columns:
         return None
     
-    recent = get_last_90_days(df, date_col)
-    if recent.empty:
-        return None
-    
-    # Handle multi-value reactions
-    reaction_series = recent["reaction"].astype(str).str.split("; ").explode()
-    reaction_series = reaction_series[reaction_series.notna() & (reaction_series != 'nan')]
-    
-    if reaction_series.empty:
-        return None
-    
-    top_recent = reaction_series.value_counts().head(1)
+    cube = get_trend_cube(df, date_col)
+    top_recent = cube.window_counts("reaction", start_day=_days_ago(90)).head(1)
     if top_recent.empty:
         return None
     
@@ -133,9 +135,7 @@ def _alert_top_reaction_spikes(df: pd.DataFrame) -> Optional[TrendAlert]:
     recent_count = top_recent.values[0]
     
     # Compare against full dataset distribution
-    full_reaction_series = df["reaction"].astype(str).str.split("; ").explode()
-    full_reaction_series = full_reaction_series[full_reaction_series.notna() & (full_reaction_series != 'nan')]
-    total = full_reaction_series.value_counts().get(reaction, 0)
+    total = cube.total_count("reaction", reaction)
     
     older_count = total - recent_count
     pct = safe_pct_change(older_count, total)
@@ -162,28 +162,12 @@ def _alert_top_drug_spikes(df: pd.DataFrame) -> Optional[TrendAlert]:
     Returns:
         TrendAlert or None if no spike detected
     """
-    # Find date column
-    date_col = None
-    for col in ["event_date", "report_date", "receipt_date", "receive_date", "received_date"]:
-        if col in df.columns:
-            date_col = col
-            break
-    
+    date_col = find_date_column(df, ALERT_DATE_COLUMNS)
     if not date_col or "drug_name" not in df.columns:
         return None
     
-    recent = get_last_90_days(df, date_col)
-    if recent.empty:
-        return None
-    
-    # Handle multi-value drugs
-    drug_series = recent["drug_name"].astype(str).str.split("; ").explode()
-    drug_series = drug_series[drug_series.notna() & (drug_series != 'nan')]
-    
-    if drug_series.empty:
-        return None
-    
-    top_recent = drug_series.value_counts().head(1)
+    cube = get_trend_cube(df, date_col)
+    top_recent = cube.window_counts("drug", start_day=_days_ago(90)).head(1)
     if top_recent.empty:
         return None
     
@@ -191,9 +175,7 @@ def _alert_top_drug_spikes(df: pd.DataFrame) -> Optional[TrendAlert]:
     recent_count = top_recent.values[0]
     
     # Compare against full dataset
-    full_drug_series = df["drug_name"].astype(str).str.split("; ").explode()
-    full_drug_series = full_drug_series[full_drug_series.notna() & (full_drug_series != 'nan')]
-    total = full_drug_series.value_counts().get(drug, 0)
+    total = cube.total_count("drug", drug)
     
     older_count = total - recent_count
     pct = safe_pct_change(older_count, total)
@@ -220,25 +202,15 @@ def _alert_serious_case_shift(df: pd.DataFrame) -> Optional[TrendAlert]:
     Returns:
         TrendAlert or None if no significant shift
     """
-    serious_col = None
-    for col in ["seriousness", "serious"]:
-        if col in df.columns:
-            serious_col = col
-            break
-    
-    if not serious_col:
+    cube = get_trend_cube(df, find_date_column(df, ALERT_DATE_COLUMNS))
+    if not cube.serious_col:
         return None
     
-    total_cases = len(df)
+    total_cases = cube.n_cases
     if total_cases == 0:
         return None
     
-    # Handle boolean or string values
-    serious_series = df[serious_col]
-    if serious_series.dtype == bool:
-        serious_count = serious_series.sum()
-    else:
-        serious_count = serious_series.astype(str).str.lower().isin(['true', '1', 'yes', 'y', 'serious']).sum()
+    serious_count = cube.n_serious
     
     pct = (serious_count / total_cases * 100) if total_cases > 0 else 0
     
@@ -930,33 +902,12 @@ def _rolling_baseline(df: pd.DataFrame, date_col: str, group_col: str, months: i
     Returns:
         Series with value counts or None if insufficient data
     """
-    if date_col not in df.columns or group_col not in df.columns:
+    kind = _TERM_KINDS.get(group_col)
+    if date_col not in df.columns or kind is None:
         return None
     
-    try:
-        df_copy = df.copy()
-        df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors="coerce")
-        df_copy = df_copy[df_copy[date_col].notna()]
-        
-        if df_copy.empty:
-            return None
-        
-        cutoff = datetime.now() - timedelta(days=30 * months)
-        recent = df_copy[df_copy[date_col] >= cutoff]
-        
-        if recent.empty:
-            return None
-        
-        # Handle multi-value columns (split by "; ")
-        group_series = recent[group_col].astype(str).str.split("; ").explode()
-        group_series = group_series[group_series.notna() & (group_series != 'nan')]
-        
-        if group_series.empty:
-            return None
-        
-        return group_series.value_counts()
-    except Exception:
-        return None
+    counts = get_trend_cube(df, date_col).window_counts(kind, start_day=_days_ago(30 * months))
+    return counts if not counts.empty else None
 
 
 def _alert_reaction_zscore(df: pd.DataFrame) -> Optional[TrendAlert]:
@@ -967,13 +918,7 @@ def _alert_reaction_zscore(df: pd.DataFrame) -> Optional[TrendAlert]:
     Returns:
         TrendAlert or None if no significant anomaly detected
     """
-    # Find date column
-    date_col = None
-    for col in ["event_date", "report_date", "receipt_date", "receive_date", "received_date"]:
-        if col in df.columns:
-            date_col = col
-            break
-    
+    date_col = find_date_column(df, ALERT_DATE_COLUMNS)
     if not date_col or "reaction" not in df.columns:
         return None
     
@@ -983,33 +928,13 @@ def _alert_reaction_zscore(df: pd.DataFrame) -> Optional[TrendAlert]:
         return None
     
     # Recent: 90 days
-    recent = get_last_90_days(df, date_col)
-    if recent.empty:
+    recent_counts = get_trend_cube(df, date_col).window_counts("reaction", start_day=_days_ago(90))
+    if recent_counts.empty:
         return None
     
-    # Handle multi-value reactions
-    recent_series = recent["reaction"].astype(str).str.split("; ").explode()
-    recent_series = recent_series[recent_series.notna() & (recent_series != 'nan')]
-    
-    if recent_series.empty:
-        return None
-    
-    recent_counts = recent_series.value_counts()
-    
     # Align reactions - combine baseline and recent
-    all_reactions = set(baseline.index) | set(recent_counts.index)
-    
-    combined_data = []
-    for reaction in all_reactions:
-        baseline_count = baseline.get(reaction, 0)
-        recent_count = recent_counts.get(reaction, 0)
-        combined_data.append({
-            "reaction": reaction,
-            "baseline": baseline_count,
-            "recent": recent_count
-        })
-    
-    combined = pd.DataFrame(combined_data)
+    combined = pd.DataFrame({"baseline": baseline, "recent": recent_counts}).fillna(0)
+    combined = combined.rename_axis("reaction").reset_index()
     combined = combined[combined["baseline"] > 0]  # Only reactions with baseline data
     
     if combined.empty:
@@ -1060,13 +985,7 @@ def _alert_drug_baseline_delta(df: pd.DataFrame) -> Optional[TrendAlert]:
     Returns:
         TrendAlert or None if no significant deviation
     """
-    # Find date column
-    date_col = None
-    for col in ["event_date", "report_date", "receipt_date", "receive_date", "received_date"]:
-        if col in df.columns:
-            date_col = col
-            break
-    
+    date_col = find_date_column(df, ALERT_DATE_COLUMNS)
     if not date_col or "drug_name" not in df.columns:
         return None
     
@@ -1076,33 +995,13 @@ def _alert_drug_baseline_delta(df: pd.DataFrame) -> Optional[TrendAlert]:
         return None
     
     # Recent: 90 days
-    recent = get_last_90_days(df, date_col)
-    if recent.empty:
+    recent_counts = get_trend_cube(df, date_col).window_counts("drug", start_day=_days_ago(90))
+    if recent_counts.empty:
         return None
     
-    # Handle multi-value drugs
-    recent_series = recent["drug_name"].astype(str).str.split("; ").explode()
-    recent_series = recent_series[recent_series.notna() & (recent_series != 'nan')]
-    
-    if recent_series.empty:
-        return None
-    
-    recent_counts = recent_series.value_counts()
-    
     # Align drugs - combine baseline and recent
-    all_drugs = set(baseline.index) | set(recent_counts.index)
-    
-    combined_data = []
-    for drug in all_drugs:
-        baseline_count = baseline.get(drug, 0)
-        recent_count = recent_counts.get(drug, 0)
-        combined_data.append({
-            "drug": drug,
-            "baseline": baseline_count,
-            "recent": recent_count
-        })
-    
-    combined = pd.DataFrame(combined_data)
+    combined = pd.DataFrame({"baseline": baseline, "recent": recent_counts}).fillna(0)
+    combined = combined.rename_axis("drug").reset_index()
     combined = combined[combined["baseline"] > 0]  # Only drugs with baseline data
     
     if combined.empty:
@@ -1148,60 +1047,31 @@ def _alert_seriousness_trend_stability(df: pd.DataFrame) -> Optional[TrendAlert]
     Returns:
         TrendAlert or None if trend is stable
     """
-    # Find date column and seriousness column
-    date_col = None
-    for col in ["event_date", "report_date", "receipt_date", "receive_date", "received_date"]:
-        if col in df.columns:
-            date_col = col
-            break
-    
-    serious_col = None
-    for col in ["seriousness", "serious"]:
-        if col in df.columns:
-            serious_col = col
-            break
-    
-    if not date_col or not serious_col:
+    date_col = find_date_column(df, ALERT_DATE_COLUMNS)
+    if not date_col:
         return None
     
     try:
-        # Get baseline (6-month) serious rate
-        baseline_cutoff = datetime.now() - timedelta(days=180)
-        df_copy = df.copy()
-        df_copy[date_col] = pd.to_datetime(df_copy[date_col], errors="coerce")
-        df_copy = df_copy[df_copy[date_col].notna()]
+        cube = get_trend_cube(df, date_col)
+        if not cube.serious_col:
+            return None
         
-        baseline_df = df_copy[df_copy[date_col] >= baseline_cutoff]
-        baseline_df = baseline_df[baseline_df[date_col] < (datetime.now() - timedelta(days=90))]
+        # Get baseline (6-month) serious rate
+        recent_start = _days_ago(90)
+        baseline_start = _days_ago(180)
+        baseline_cases = cube.case_count(baseline_start, recent_start)
         
-        if len(baseline_df) == 0:
+        if baseline_cases == 0:
             return None
         
-        # Calculate baseline serious rate
-        if serious_col in baseline_df.columns:
-            serious_series = baseline_df[serious_col]
-            if serious_series.dtype == bool:
-                baseline_serious = serious_series.sum()
-            else:
-                baseline_serious = serious_series.astype(str).str.lower().isin(['true', '1', 'yes', 'y', 'serious']).sum()
-            baseline_rate = baseline_serious / len(baseline_df) * 100
-        else:
-            return None
+        baseline_rate = cube.case_count(baseline_start, recent_start, serious=True) / baseline_cases * 100
         
         # Get recent (90 days) serious rate
-        recent = get_last_90_days(df, date_col)
-        if recent.empty:
+        recent_cases = cube.case_count(recent_start)
+        if recent_cases == 0:
             return None
         
-        if serious_col in recent.columns:
-            serious_series = recent[serious_col]
-            if serious_series.dtype == bool:
-                recent_serious = serious_series.sum()
-            else:
-                recent_serious = serious_series.astype(str).str.lower().isin(['true', '1', 'yes', 'y', 'serious']).sum()
-            recent_rate = recent_serious / len(recent) * 100
-        else:
-            return None
+        recent_rate = cube.case_count(recent_start, serious=True) / recent_cases * 100
         
         # Calculate change
         change = recent_rate - baseline_rate
@@ -1225,8 +1095,8 @@ def _alert_seriousness_trend_stability(df: pd.DataFrame) -> Optional[TrendAlert]
                 "recent_rate": float(recent_rate),
                 "change": float(change),
                 "change_percent": change_pct,
-                "baseline_cases": len(baseline_df),
-                "recent_cases": len(recent)
+                "baseline_cases": baseline_cases,
+                "recent_cases": recent_cases
             },
             suggested_action="Review causes of seriousness trend shift - may indicate reporting changes or true safety signal."
         )
@@ -1263,30 +1133,21 @@ def detect_trend_alerts_light(df: pd.DataFrame) -> Dict[str, Any]:
     
     date_col = _find_date_column(df)
     
-    # Light detection: Only check top 10 drugs/reactions (fast)
+    # Light detection: Only check top 5 drugs, read from the shared trend cube (fast)
     if "drug_name" in df.columns and date_col:
         try:
-            drug_series = df["drug_name"].astype(str).str.split("; ").explode()
-            drug_series = drug_series[drug_series.notna() & (drug_series != 'nan')]
-            top_drugs = drug_series.value_counts().head(10).index.tolist()
+            cube = get_trend_cube(df, date_col)
             
-            for drug in top_drugs[:5]:  # Only top 5 for speed
-                drug_mask = df["drug_name"].astype(str).str.contains(drug, case=False, na=False)
-                drug_df = df[drug_mask].copy()
-                
-                if len(drug_df) < 20:
+            for term in cube.top_terms("drug", 5):  # Only top 5 for speed
+                drug = cube.label("drug", term)
+                if cube.terms["drug"].totals[term] < 20:
                     continue
                 
                 try:
-                    drug_df[date_col] = pd.to_datetime(drug_df[date_col], errors="coerce")
-                    drug_df = drug_df[drug_df[date_col].notna()]
-                    
-                    if len(drug_df) < 6:
+                    monthly_counts = cube.monthly_counts("drug", term)
+                    if monthly_counts.sum() < 6:
                         continue
                     
-                    drug_df["month"] = drug_df[date_col].dt.to_period("M")
-                    monthly_counts = drug_df.groupby("month").size()
-                    
                     if len(monthly_counts) >= 3:
                         # Simple spike: last month vs average of previous 3
                         recent = monthly_counts.tail(1).iloc[0] if len(monthly_counts) >= 1 else 0
@@ -1524,13 +1385,7 @@ def detect_trend_alerts(df: pd.DataFrame, mode: str = "auto") -> Dict[str, Any]:
 
 def _find_date_column(df: pd.DataFrame) -> Optional[str]:
     """Find the best date column in the dataframe."""
-    date_columns = ["report_date", "receipt_date", "receive_date", "received_date", 
-                    "event_date", "onset_date", "date"]
-    
-    for col in date_columns:
-        if col in df.columns:
-            return col
-    return None
+    return find_date_column(df, DATE_COLUMNS)
 
 
 def _detect_drug_trends(df: pd.DataFrame, date_col: Optional[str]) -> Dict[str, List]:
@@ -1548,30 +1403,21 @@ def _detect_drug_trends(df: pd.DataFrame, date_col: Optional[str]) -> Dict[str,
         return {"alerts": alerts, "spikes": spikes, "notes": notes}
     
     # Get top drugs by frequency
-    drug_series = df["drug_name"].astype(str).str.split("; ").explode()
-    drug_series = drug_series[drug_series.notna() & (drug_series != 'nan')]
-    top_drugs = drug_series.value_counts().head(20).index.tolist()
+    cube = get_trend_cube(df, date_col)
     
     # Analyze each top drug
-    for drug in top_drugs:
-        # Filter cases for this drug
-        drug_mask = df["drug_name"].astype(str).str.contains(drug, case=False, na=False)
-        drug_df = df[drug_mask].copy()
-        
-        if len(drug_df) < 10:  # Need minimum cases
+    for term in cube.top_terms("drug", 20):
+        drug = cube.label("drug", term)
+        if cube.terms["drug"].totals[term] < 10:  # Need minimum cases
             continue
         
         # Get monthly trend
         try:
-            drug_df[date_col] = pd.to_datetime(drug_df[date_col], errors="coerce")
-            drug_df = drug_df[drug_df[date_col].notna()]
+            monthly_counts = cube.monthly_counts("drug", term)
             
-            if len(drug_df) < 6:  # Need enough time points
+            if monthly_counts.sum() < 6:  # Need enough time points
                 continue
             
-            drug_df["month"] = drug_df[date_col].dt.to_period("M")
-            monthly_counts = drug_df.groupby("month").size()
-            
             if len(monthly_counts) < 3:
                 continue
             
@@ -1653,28 +1499,19 @@ def _detect_reaction_trends(df: pd.DataFrame, date_col: Optional[str]) -> Dict[s
         return {"alerts": alerts, "spikes": spikes, "notes": notes}
     
     # Get top reactions
-    reaction_series = df["reaction"].astype(str).str.split("; ").explode()
-    reaction_series = reaction_series[reaction_series.notna() & (reaction_series != 'nan')]
-    top_reactions = reaction_series.value_counts().head(20).index.tolist()
+    cube = get_trend_cube(df, date_col)
     
-    for reaction in top_reactions:
-        # Filter cases for this reaction
-        reaction_mask = df["reaction"].astype(str).str.contains(reaction, case=False, na=False)
-        reaction_df = df[reaction_mask].copy()
-        
-        if len(reaction_df) < 10:
+    for term in cube.top_terms("reaction", 20):
+        reaction = cube.label("reaction", term)
+        if cube.terms["reaction"].totals[term] < 10:
             continue
         
         try:
-            reaction_df[date_col] = pd.to_datetime(reaction_df[date_col], errors="coerce")
-            reaction_df = reaction_df[reaction_df[date_col].notna()]
+            monthly_counts = cube.monthly_counts("reaction", term)
             
-            if len(reaction_df) < 6:
+            if monthly_counts.sum() < 6:
                 continue
             
-            reaction_df["month"] = reaction_df[date_col].dt.to_period("M")
-            monthly_counts = reaction_df.groupby("month").size()
-            
             if len(monthly_counts) < 3:
                 continue
             
@@ -1717,88 +1554,64 @@ def _detect_emerging_signals(df: pd.DataFrame, date_col: Optional[str]) -> List[
         return signals
     
     try:
-        df_with_date = df.copy()
-        df_with_date[date_col] = pd.to_datetime(df_with_date[date_col], errors="coerce")
-        df_with_date = df_with_date[df_with_date[date_col].notna()]
+        cube = get_trend_cube(df, date_col)
         
-        if len(df_with_date) < 50:
+        if cube.n_dated < 50:
             return signals
         
-        # Split drug_name and reaction (handle multi-value)
-        df_with_date["drug_list"] = df_with_date["drug_name"].astype(str).str.split("; ")
-        df_with_date["reaction_list"] = df_with_date["reaction"].astype(str).str.split("; ")
+        # Get recent (last 3 calendar months of data) vs older periods
+        cutoff_month = cube.last_month - (RECENT_MONTHS - 1)
+        drug_ids, reaction_ids, recent_counts = cube.pair_counts(start_month=cutoff_month)
+        older_drugs, older_reactions, older_pair_counts = cube.pair_counts(end_month=cutoff_month)
         
-        # Explode to get all drug-reaction pairs
-        drug_reaction_pairs = []
-        for idx, row in df_with_date.iterrows():
-            drugs = row["drug_list"]
-            reactions = row["reaction_list"]
-            date_val = row[date_col]
-            
-            for drug in drugs:
-                if pd.notna(drug) and str(drug).strip() and str(drug).lower() != 'nan':
-                    for reaction in reactions:
-                        if pd.notna(reaction) and str(reaction).strip() and str(reaction).lower() != 'nan':
-                            drug_reaction_pairs.append({
-                                "drug": str(drug).strip(),
-                                "reaction": str(reaction).strip(),
-                                "date": date_val
-                            })
-        
-        pairs_df = pd.DataFrame(drug_reaction_pairs)
-        
-        if len(pairs_df) == 0:
-            return signals
+        # Older count of each recent pair (both lists are sorted by drug, then reaction)
+        n_reactions = len(cube.terms["reaction"])
+        older_keys = older_drugs * n_reactions + older_reactions
+        recent_keys = drug_ids * n_reactions + reaction_ids
+        older_counts = np.zeros(len(recent_keys), dtype=np.int64)
+        if len(older_keys):
+            slots = np.minimum(np.searchsorted(older_keys, recent_keys), len(older_keys) - 1)
+            found = older_keys[slots] == recent_keys
+            older_counts[found] = older_pair_counts[slots[found]]
         
-        # Get recent vs older periods
-        pairs_df["month"] = pairs_df["date"].dt.to_period("M")
-        max_date = pairs_df["date"].max()
-        cutoff_date = max_date - timedelta(days=90)  # Last 3 months
-        
-        recent_df = pairs_df[pairs_df["date"] >= cutoff_date]
-        older_df = pairs_df[pairs_df["date"] < cutoff_date]
-        
-        # Count pairs in each period
-        recent_counts = recent_df.groupby(["drug", "reaction"]).size()
-        older_counts = older_df.groupby(["drug", "reaction"]).size()
+        # Must have minimum cases in recent period; new or rapidly increasing (3x)
+        candidates = (recent_counts >= 5) & ((older_counts == 0) | (recent_counts > 3.0 * older_counts))
         
         # Find pairs that are new or rapidly increasing
-        for (drug, reaction), recent_count in recent_counts.items():
-            older_count = older_counts.get((drug, reaction), 0)
-            
-            # Must have minimum cases in recent period
-            if recent_count < 5:
-                continue
+        for position in np.flatnonzero(candidates).tolist():
+            drug = cube.label("drug", drug_ids[position])
+            reaction = cube.label("reaction", reaction_ids[position])
+            recent_count = int(recent_counts[position])
+            older_count = int(older_counts[position])
             
             # New signal (not in older period) or rapid increase
-            if older_count == 0 and recent_count >= 5:
+            if older_count == 0:
                 # New emerging signal
                 signals.append({
                     "type": "emerging_signal",
                     "drug": drug,
                     "reaction": reaction,
-                    "recent_cases": int(recent_count),
+                    "recent_cases": recent_count,
                     "older_cases": 0,
                     "growth_ratio": float('inf'),
                     "severity": "medium",
                     "message": f"🆕 Emerging signal: {drug} + {reaction} "
-                             f"({int(recent_count)} cases in last 3 months, new combination)"
+                             f"({recent_count} cases in last 3 months, new combination)"
                 })
-            elif older_count > 0:
+            else:
                 growth_ratio = safe_divide(recent_count, older_count, 0.0)
-                if growth_ratio > 3.0:  # 3x increase
-                    signals.append({
-                        "type": "rapid_increase",
-                        "drug": drug,
-                        "reaction": reaction,
-                        "recent_cases": int(recent_count),
-                        "older_cases": int(older_count),
-                        "growth_ratio": growth_ratio,
-                        "severity": "high" if growth_ratio > 5.0 else "medium",
-                        "message": f"📈 Rapid increase: {drug} + {reaction} "
-                                 f"({int(recent_count)} cases vs {int(older_count)} in previous period, "
-                                 f"{growth_ratio:.1f}x increase)"
-                    })
+                signals.append({
+                    "type": "rapid_increase",
+                    "drug": drug,
+                    "reaction": reaction,
+                    "recent_cases": recent_count,
+                    "older_cases": older_count,
+                    "growth_ratio": growth_ratio,
+                    "severity": "high" if growth_ratio > 5.0 else "medium",
+                    "message": f"📈 Rapid increase: {drug} + {reaction} "
+                             f"({recent_count} cases vs {older_count} in previous period, "
+                             f"{growth_ratio:.1f}x increase)"
+                })
     
     except Exception as e:
         # Fail silently - return empty signals
@@ -1821,15 +1634,12 @@ def _detect_overall_trends(df: pd.DataFrame, date_col: Optional[str]) -> Dict[st
         return {"alerts": alerts, "notes": notes}
     
     try:
-        df_with_date = df.copy()
-        df_with_date[date_col] = pd.to_datetime(df_with_date[date_col], errors="coerce")
-        df_with_date = df_with_date[df_with_date[date_col].notna()]
+        cube = get_trend_cube(df, date_col)
         
-        if len(df_with_date) < 12:
+        if cube.n_dated < 12:
             return {"alerts": alerts, "notes": notes}
         
-        df_with_date["month"] = df_with_date[date_col].dt.to_period("M")
-        monthly_counts = df_with_date.groupby("month").size()
+        monthly_counts = cube.monthly_totals()
         
         if len(monthly_counts) < 6:
             return {"alerts": alerts, "notes": notes}
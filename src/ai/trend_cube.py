@@ -0,0 +1,554 @@
+"""
+Trend count cube for the trend alerts engine.
+
+One pass over a dataset builds every count the trend detectors read:
+
+- drug × day and reaction × day case counts (months are rolled up from days),
+- dated case and serious-case counts per day,
+- drug × reaction × month co-reported case counts,
+- drug / reaction case totals over all rows (dated or not).
+
+Distinct drug_name / reaction / date cells are split and parsed once and
+expanded to rows with sparse products. Terms are grouped case-insensitively
+(labelled with their first spelling) and a case counts at most once per term
+or pair. Cubes are immutable; update() folds new cases into a new cube
+without rescanning the rows already counted.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+TERM_COLUMNS = {'drug': 'drug_name', 'reaction': 'reaction'}
+TERM_SEPARATOR = ';'
+SERIOUS_COLUMNS = ['seriousness', 'serious']
+SERIOUS_VALUES = ['true', '1', 'yes', 'y', 'serious']
+
+# Date column preference of detect_trend_alerts and of the 90-day alerts
+DATE_COLUMNS = ['report_date', 'receipt_date', 'receive_date', 'received_date',
+                'event_date', 'onset_date', 'date']
+ALERT_DATE_COLUMNS = ['event_date', 'report_date', 'receipt_date', 'receive_date', 'received_date']
+
+_MISSING_TERMS = ['', 'nan', 'none']
+_NO_DAY = np.iinfo(np.int64).min
+_MAX_CACHED_CUBES = 8
+
+_cubes: "OrderedDict[Tuple[int, Optional[str]], Tuple[weakref.ref, TrendCube]]" = OrderedDict()
+_cubes_lock = threading.Lock()
+
+
+class CountTable:
+    """Sparse counts keyed by integer key columns, sorted by key (first column major)."""
+
+    def __init__(self, keys: Tuple[np.ndarray, ...], counts: np.ndarray):
+        self.keys = keys
+        self.counts = counts
+
+    @classmethod
+    def aggregate(cls, keys: Sequence[np.ndarray], counts: np.ndarray) -> "CountTable":
+        """Sort entries by key and sum the counts of equal keys (zero counts dropped)."""
+        keys = [np.asarray(key, dtype=np.int64) for key in keys]
+        counts = np.asarray(counts, dtype=np.int64)
+        nonzero = counts != 0
+        keys = [key[nonzero] for key in keys]
+        counts = counts[nonzero]
+        if not len(counts):
+            return cls(tuple(keys), counts)
+
+        order = np.lexsort(tuple(reversed(keys)))
+        keys = [key[order] for key in keys]
+        counts = counts[order]
+        boundary = np.zeros(len(counts), dtype=bool)
+        boundary[0] = True
+        for key in keys:
+            boundary[1:] |= key[1:] != key[:-1]
+        starts = np.flatnonzero(boundary)
+        return cls(tuple(key[starts] for key in keys), np.add.reduceat(counts, starts))
+
+    def merge(self, other: "CountTable", remap: Optional[Sequence[Optional[np.ndarray]]] = None) -> "CountTable":
+        """Sum with another table whose key columns are translated through remap (None = identity)."""
+        other_keys = [
+            key if remap is None or remap[level] is None else remap[level][key]
+            for level, key in enumerate(other.keys)
+        ]
+        return CountTable.aggregate(
+            [np.concatenate((mine, theirs)) for mine, theirs in zip(self.keys, other_keys)],
+            np.concatenate((self.counts, other.counts)),
+        )
+
+    def rows(self, value: int) -> slice:
+        """Entries whose first key equals value."""
+        first = self.keys[0]
+        return slice(int(np.searchsorted(first, value, side='left')), int(np.searchsorted(first, value, side='right')))
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class TermAxis:
+    """Distinct drug or reaction terms with their case totals and per-day case counts."""
+
+    def __init__(self, keys: np.ndarray, labels: np.ndarray, totals: np.ndarray, by_day: CountTable):
+        """
+        Args:
+            keys: Normalized (stripped, lowercased) terms
+            labels: First original spelling of each term
+            totals: Cases reporting each term (all rows)
+            by_day: Dated case counts keyed by (term, day)
+        """
+        self.keys = keys
+        self.labels = labels
+        self.totals = totals
+        self.by_day = by_day
+
+    def merge(self, other: "TermAxis") -> Tuple["TermAxis", np.ndarray]:
+        """
+        Add another axis' counts, appending its unseen terms.
+
+        Returns:
+            Tuple of (merged axis, other term id -> merged term id)
+        """
+        remap = pd.Index(self.keys).get_indexer(other.keys)
+        unseen = remap < 0
+        remap[unseen] = len(self.keys) + np.arange(int(unseen.sum()))
+        totals = np.zeros(len(self.keys) + int(unseen.sum()), dtype=np.int64)
+        totals[:len(self.totals)] = self.totals
+        np.add.at(totals, remap, other.totals)
+        axis = TermAxis(
+            np.concatenate((self.keys, other.keys[unseen])),
+            np.concatenate((self.labels, other.labels[unseen])),
+            totals,
+            self.by_day.merge(other.by_day, (remap, None)),
+        )
+        return axis, remap
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class TrendCube:
+    """
+    Precomputed counts for the trend detectors of one dataset and date column.
+
+    Days are numbers of days since 1970-01-01, months numbers of months since
+    1970-01; rows with a missing or unparseable date only count in the totals.
+    """
+
+    def __init__(
+        self,
+        date_col: Optional[str],
+        serious_col: Optional[str],
+        n_cases: int,
+        n_serious: int,
+        terms: Dict[str, TermAxis],
+        day_cases: CountTable,
+        day_serious: CountTable,
+        pairs: CountTable,
+    ):
+        self.date_col = date_col
+        self.serious_col = serious_col
+        self.n_cases = n_cases
+        self.n_serious = n_serious
+        self.terms = terms
+        self.day_cases = day_cases
+        self.day_serious = day_serious
+        self.pairs = pairs
+        self.signature: Tuple = ()
+
+    # ---------------------------
+    # Construction
+    # ---------------------------
+    @classmethod
+    def build(cls, df: pd.DataFrame, date_col: Optional[str]) -> "TrendCube":
+        """
+        Count a DataFrame in one pass.
+
+        Args:
+            df: Normalized DataFrame (one row per case)
+            date_col: Date column to bucket by (None for totals only)
+
+        Returns:
+            TrendCube instance
+        """
+        n_rows = len(df)
+        if date_col is not None and date_col in df.columns:
+            days = _day_numbers(df[date_col])
+        else:
+            date_col = None
+            days = np.full(n_rows, _NO_DAY, dtype=np.int64)
+        dated = days != _NO_DAY
+        day0 = int(days[dated].min()) if dated.any() else 0
+        span = int(days[dated].max()) - day0 + 1 if dated.any() else 1
+        day_offsets = days[dated] - day0
+
+        serious_col = next((col for col in SERIOUS_COLUMNS if col in df.columns), None)
+        serious = _serious_flags(df[serious_col]) if serious_col else np.zeros(n_rows, dtype=bool)
+
+        terms: Dict[str, TermAxis] = {}
+        cells: Dict[str, Tuple[np.ndarray, sparse.csr_matrix]] = {}
+        for kind, col in TERM_COLUMNS.items():
+            series = df[col] if col in df.columns else pd.Series([None] * n_rows, dtype=object)
+            row_cells, cell_terms, keys, labels = _encode_cells(series)
+            cells[kind] = (row_cells, cell_terms)
+            has_cell = row_cells >= 0
+
+            totals = cell_terms.T @ np.bincount(row_cells[has_cell], minlength=cell_terms.shape[0])
+            # day × cell row counts, expanded to day × term case counts
+            day_cells = sparse.csr_matrix(
+                (np.ones(int((dated & has_cell).sum()), dtype=np.int64),
+                 (days[dated & has_cell] - day0, row_cells[dated & has_cell])),
+                shape=(span, cell_terms.shape[0]),
+            )
+            by_day = (day_cells @ cell_terms).tocoo()
+            terms[kind] = TermAxis(
+                keys, labels, np.asarray(totals, dtype=np.int64),
+                CountTable.aggregate((by_day.col, by_day.row + day0), by_day.data),
+            )
+
+        day_cases = CountTable.aggregate((np.arange(span) + day0,), np.bincount(day_offsets, minlength=span))
+        day_serious = CountTable.aggregate(
+            (np.arange(span) + day0,), np.bincount(days[dated & serious] - day0, minlength=span)
+        )
+
+        cube = cls(
+            date_col, serious_col, n_rows, int(serious.sum()), terms, day_cases, day_serious,
+            _pair_counts(cells['drug'], cells['reaction'], days),
+        )
+        cube.signature = _frame_signature(df, date_col)
+        return cube
+
+    def update(self, new_rows: pd.DataFrame) -> "TrendCube":
+        """
+        Cube of the dataset extended by new_rows (only new_rows are scanned).
+
+        Args:
+            new_rows: Newly arrived cases (same columns as the counted dataset)
+
+        Returns:
+            New TrendCube; this cube is left unchanged
+        """
+        added = TrendCube.build(new_rows, self.date_col)
+        terms = {}
+        remaps = {}
+        for kind, axis in self.terms.items():
+            terms[kind], remaps[kind] = axis.merge(added.terms[kind])
+        return TrendCube(
+            self.date_col,
+            self.serious_col or added.serious_col,
+            self.n_cases + added.n_cases,
+            self.n_serious + added.n_serious,
+            terms,
+            self.day_cases.merge(added.day_cases),
+            self.day_serious.merge(added.day_serious),
+            self.pairs.merge(added.pairs, (remaps['drug'], remaps['reaction'], None)),
+        )
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Whether df still has the columns this cube was counted from."""
+        return self.signature == _frame_signature(df, self.date_col)
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    @property
+    def n_dated(self) -> int:
+        """Cases with a valid date."""
+        return int(self.day_cases.counts.sum())
+
+    @property
+    def last_day(self) -> Optional[int]:
+        """Latest case day, or None if no case is dated."""
+        return int(self.day_cases.keys[0][-1]) if len(self.day_cases) else None
+
+    @property
+    def last_month(self) -> Optional[int]:
+        """Month number of the latest case, or None if no case is dated."""
+        last_day = self.last_day
+        return int(_months_of(np.array([last_day]))[0]) if last_day is not None else None
+
+    def top_terms(self, kind: str, n: int) -> List[int]:
+        """Ids of the n terms reported in most cases (ties in order of first appearance)."""
+        totals = self.terms[kind].totals
+        order = np.argsort(-totals, kind='stable')
+        return [int(term) for term in order[:n] if totals[term] > 0]
+
+    def label(self, kind: str, term: int) -> str:
+        """Original spelling of a term."""
+        return self.terms[kind].labels[term]
+
+    def total_count(self, kind: str, label: str) -> int:
+        """Cases reporting a term (by label or any spelling of it), 0 if unknown."""
+        axis = self.terms[kind]
+        matches = np.flatnonzero(axis.keys == str(label).strip().lower())
+        return int(axis.totals[matches[0]]) if len(matches) else 0
+
+    def monthly_counts(self, kind: str, term: int) -> pd.Series:
+        """Dated cases reporting a term per month (months without cases omitted)."""
+        by_day = self.terms[kind].by_day
+        rows = by_day.rows(term)
+        return _monthly_series(by_day.keys[1][rows], by_day.counts[rows])
+
+    def monthly_totals(self) -> pd.Series:
+        """Dated cases per month (months without cases omitted)."""
+        return _monthly_series(self.day_cases.keys[0], self.day_cases.counts)
+
+    def window_counts(self, kind: str, start_day: Optional[int] = None, end_day: Optional[int] = None) -> pd.Series:
+        """
+        Cases reporting each term between start_day (inclusive) and end_day (exclusive).
+
+        Returns:
+            Series of non-zero counts indexed by term label, most reported first
+        """
+        axis = self.terms[kind]
+        keep = _in_range(axis.by_day.keys[1], start_day, end_day)
+        counts = np.bincount(axis.by_day.keys[0][keep], weights=axis.by_day.counts[keep], minlength=len(axis))
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order].astype(np.int64), index=pd.Index(axis.labels[order], dtype=object))
+
+    def case_count(self, start_day: Optional[int] = None, end_day: Optional[int] = None, serious: bool = False) -> int:
+        """Dated (serious) cases between start_day (inclusive) and end_day (exclusive)."""
+        table = self.day_serious if serious else self.day_cases
+        return int(table.counts[_in_range(table.keys[0], start_day, end_day)].sum())
+
+    def month_term_counts(self, kind: str, start_month: Optional[int] = None, end_month: Optional[int] = None) -> np.ndarray:
+        """Cases reporting each term (by id) between start_month (inclusive) and end_month (exclusive)."""
+        axis = self.terms[kind]
+        keep = _in_range(_months_of(axis.by_day.keys[1]), start_month, end_month)
+        return np.bincount(axis.by_day.keys[0][keep], weights=axis.by_day.counts[keep], minlength=len(axis)).astype(np.int64)
+
+    def month_case_count(self, start_month: Optional[int] = None, end_month: Optional[int] = None) -> int:
+        """Dated cases between start_month (inclusive) and end_month (exclusive)."""
+        keep = _in_range(_months_of(self.day_cases.keys[0]), start_month, end_month)
+        return int(self.day_cases.counts[keep].sum())
+
+    def pair_counts(self, start_month: Optional[int] = None, end_month: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Co-reported drug/reaction cases between start_month (inclusive) and end_month (exclusive).
+
+        Returns:
+            Tuple of (drug ids, reaction ids, case counts), sorted by drug then reaction
+        """
+        drugs, reactions, months = self.pairs.keys
+        keep = _in_range(months, start_month, end_month)
+        summed = CountTable.aggregate((drugs[keep], reactions[keep]), self.pairs.counts[keep])
+        return summed.keys[0], summed.keys[1], summed.counts
+
+
+def get_trend_cube(df: pd.DataFrame, date_col: Optional[str]) -> TrendCube:
+    """
+    Return the shared TrendCube for df and date_col, building it on first use.
+
+    Cubes are keyed by DataFrame identity, dropped when the DataFrame is
+    garbage-collected, and rebuilt if the counted columns were replaced.
+    """
+    key = (id(df), date_col)
+    with _cubes_lock:
+        entry = _cubes.get(key)
+        if entry is not None:
+            ref, cube = entry
+            if ref() is df and cube.matches(df):
+                _cubes.move_to_end(key)
+                return cube
+
+    cube = TrendCube.build(df, date_col)
+    _register(df, date_col, cube)
+    return cube
+
+
+def prepare_trend_cube(df: pd.DataFrame) -> None:
+    """Build the trend cubes for a freshly loaded dataset (call at load time)."""
+    if df is None or df.empty:
+        return
+    for date_col in {find_date_column(df, DATE_COLUMNS), find_date_column(df, ALERT_DATE_COLUMNS)}:
+        get_trend_cube(df, date_col)
+
+
+def extend_trend_cube(df: pd.DataFrame, new_rows: pd.DataFrame, combined: pd.DataFrame) -> None:
+    """
+    Register cubes for combined (df with new_rows appended) by updating df's cubes.
+
+    Only new_rows are counted; cubes of df that were never built are built
+    from combined on first use as usual.
+    """
+    with _cubes_lock:
+        cubes = [
+            cube for (frame_id, _), (ref, cube) in _cubes.items()
+            if frame_id == id(df) and ref() is df and cube.matches(df)
+        ]
+    for cube in cubes:
+        updated = cube.update(new_rows)
+        updated.signature = _frame_signature(combined, updated.date_col)
+        _register(combined, updated.date_col, updated)
+
+
+def find_date_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
+    """First candidate date column present in df."""
+    return next((col for col in candidates if col in df.columns), None)
+
+
+def day_on_or_after(moment: datetime) -> int:
+    """First day number whose midnight is not before moment."""
+    day = np.datetime64(moment, 'D')
+    if np.datetime64(moment, 'us') > day:
+        day = day + 1
+    return int(day.astype(np.int64))
+
+
+def _register(df: pd.DataFrame, date_col: Optional[str], cube: TrendCube) -> None:
+    key = (id(df), date_col)
+    with _cubes_lock:
+        try:
+            ref = weakref.ref(df, lambda _ref, key=key: _discard(key, _ref))
+        except TypeError:
+            return
+        _cubes[key] = (ref, cube)
+        _cubes.move_to_end(key)
+        while len(_cubes) > _MAX_CACHED_CUBES:
+            _cubes.popitem(last=False)
+
+
+def _discard(key: Tuple[int, Optional[str]], ref: weakref.ref) -> None:
+    with _cubes_lock:
+        entry = _cubes.get(key)
+        if entry is not None and entry[0] is ref:
+            del _cubes[key]
+
+
+def _frame_signature(df: pd.DataFrame, date_col: Optional[str]) -> Tuple:
+    """Cheap identity of the counted columns (shape, names and data buffers)."""
+    buffers = [
+        df[col].to_numpy().__array_interface__['data'][0]
+        for col in list(TERM_COLUMNS.values()) + SERIOUS_COLUMNS + [date_col]
+        if col is not None and col in df.columns
+    ]
+    return (len(df), tuple(df.columns), tuple(buffers))
+
+
+def _encode_cells(series: pd.Series) -> Tuple[np.ndarray, sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Factorize a multi-value column by distinct cell and split each cell once.
+
+    Returns:
+        Tuple of (cell id per row, -1 if missing; binary cell × term matrix;
+        normalized terms; first original spelling of each term)
+    """
+    row_cells, cells = pd.factorize(series.reset_index(drop=True), sort=False)
+    parts = pd.Series(np.asarray(cells, dtype=object)).astype(str).str.split(TERM_SEPARATOR).explode().str.strip()
+    keys = parts.str.lower()
+    valid = (keys.notna() & ~keys.isin(_MISSING_TERMS)).to_numpy(dtype=bool)
+    parts, keys = parts[valid], keys[valid]
+
+    term_ids, distinct = pd.factorize(keys, sort=False)
+    first = ~keys.duplicated().to_numpy()
+    labels = np.empty(len(distinct), dtype=object)
+    labels[term_ids[first]] = parts.to_numpy(dtype=object)[first]
+
+    cell_terms = sparse.csr_matrix(
+        (np.ones(len(term_ids), dtype=np.int64), (parts.index.to_numpy(dtype=np.int64), term_ids)),
+        shape=(len(cells), len(distinct)),
+    )
+    cell_terms.sum_duplicates()
+    cell_terms.data[:] = 1
+    return np.asarray(row_cells, dtype=np.int64), cell_terms, np.asarray(distinct, dtype=object), labels
+
+
+def _pair_counts(
+    drug_cells: Tuple[np.ndarray, sparse.csr_matrix],
+    reaction_cells: Tuple[np.ndarray, sparse.csr_matrix],
+    days: np.ndarray
+) -> CountTable:
+    """
+    Drug × reaction × month case counts.
+
+    Rows are counted per (drug cell, month) × reaction cell, expanded to
+    reaction terms with one sparse product and to drug terms with another.
+    """
+    drug_rows, drug_terms = drug_cells
+    reaction_rows, reaction_terms = reaction_cells
+    keep = (days != _NO_DAY) & (drug_rows >= 0) & (reaction_rows >= 0)
+    if not keep.any() or not drug_terms.nnz or not reaction_terms.nnz:
+        empty = np.zeros(0, dtype=np.int64)
+        return CountTable((empty, empty, empty), empty)
+
+    months = _months_of(days[keep])
+    month0 = int(months.min())
+    n_months = int(months.max()) - month0 + 1
+    cell_months = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int64),
+         (drug_rows[keep] * n_months + (months - month0), reaction_rows[keep])),
+        shape=(drug_terms.shape[0] * n_months, reaction_terms.shape[0]),
+    )
+    used = np.flatnonzero(np.diff(cell_months.indptr))
+    by_reaction = cell_months[used] @ reaction_terms
+
+    # (drug cell, month) row -> (drug term, month) row for every term of the cell
+    cells, months = used // n_months, used % n_months
+    owners, members = _gather_rows(drug_terms.indptr, drug_terms.indices, cells)
+    expand = sparse.csr_matrix(
+        (np.ones(len(owners), dtype=np.int64), (members * n_months + months[owners], owners)),
+        shape=(drug_terms.shape[1] * n_months, len(used)),
+    )
+    counts = (expand @ by_reaction).tocoo()
+    return CountTable.aggregate(
+        (counts.row // n_months, counts.col, counts.row % n_months + month0), counts.data
+    )
+
+
+def _gather_rows(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR row contents of rows, as (position in rows, column) pairs."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owners = np.repeat(np.arange(len(rows)), lengths)
+    if not len(owners):
+        return owners, np.empty(0, dtype=np.int64)
+    shifts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return owners, indices[np.arange(len(owners)) + shifts].astype(np.int64)
+
+
+def _day_numbers(series: pd.Series) -> np.ndarray:
+    """Day number of each row (_NO_DAY where the date is missing or unparseable); each distinct value is parsed once."""
+    codes, uniques = pd.factorize(series.reset_index(drop=True), sort=False)
+    parsed = pd.to_datetime(pd.Series(uniques), errors='coerce')
+    if getattr(parsed.dt, 'tz', None) is not None:
+        parsed = parsed.dt.tz_localize(None)
+    values = parsed.to_numpy(dtype='datetime64[ns]')
+    days = np.where(np.isnat(values), _NO_DAY, values.astype('datetime64[D]').astype(np.int64))
+    return np.append(days, _NO_DAY)[codes]
+
+
+def _serious_flags(series: pd.Series) -> np.ndarray:
+    """Serious flag per row (booleans as is, otherwise SERIOUS_VALUES case-insensitively)."""
+    if series.dtype == bool:
+        return series.to_numpy(dtype=bool)
+    codes, uniques = pd.factorize(series.reset_index(drop=True), sort=False)
+    flags = pd.Series(uniques, dtype=object).astype(str).str.lower().isin(SERIOUS_VALUES).to_numpy()
+    return np.append(flags, False)[codes]
+
+
+def _months_of(days: np.ndarray) -> np.ndarray:
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _in_range(values: np.ndarray, start: Optional[int], end: Optional[int]) -> np.ndarray:
+    keep = np.ones(len(values), dtype=bool)
+    if start is not None:
+        keep &= values >= start
+    if end is not None:
+        keep &= values < end
+    return keep
+
+
+def _monthly_series(days: np.ndarray, counts: np.ndarray) -> pd.Series:
+    """Sum day counts per month into a Series indexed by monthly Periods."""
+    months, inverse = np.unique(_months_of(days), return_inverse=True)
+    totals = np.bincount(inverse, weights=counts, minlength=len(months)).astype(np.int64)
+    keep = totals > 0
+    index = pd.PeriodIndex(months[keep].astype('datetime64[M]'), freq='M')
+    return pd.Series(totals[keep], index=index)
@@ -1,181 +1,492 @@
 """
 Semantic Cache - Caches responses based on semantic similarity
+
+Query embeddings are kept in one float32 matrix; a lookup is a single
+matrix-vector product (cosine similarity of L2-normalized vectors) against the
+live entries of the query's namespace, and hits require similarity_threshold
+and the same entity terms (drugs, reactions, demographics, years - everything
+that is not generic question phrasing), so a near-miss such as another drug or
+year never answers the query. Without a SentenceTransformers model only exact
+matches on the normalized query are served: hashed n-gram vectors score
+different drug names as near-duplicates.
+Entries expire after ttl_hours and the least recently used entries are evicted
+beyond max_entries.
+
+On disk the cache is one snapshot file (semantic_cache.npz: vectors plus JSON
+metadata) and an append log (semantic_cache.log, one JSON line per set/delete)
+that is folded into the snapshot when it grows larger than the cache.
 """
 
+import base64
 import hashlib
 import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_FILE = "semantic_cache.npz"
+LOG_FILE = "semantic_cache.log"
+
+# Dimension of the hashed n-gram vectors used when SentenceTransformers is unavailable
+HASHED_EMBEDDING_DIM = 512
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Question phrasing that does not change what a query asks about; every other
+# term (drug, reaction, demographic, year, ...) must match for a semantic hit
+_GENERIC_TERMS = frozenset("""
+    a about all an and any are as at be by can case cases could data did do does
+    event events find for from get give has have how i in is it list me my of on
+    or please report reported reports show tell than that the their there these
+    this to was were what when which who why with would you
+""".split())
+
+# Demographic synonyms mapped to one term, so "women" and "female" agree
+_DEMOGRAPHIC_TERMS = {
+    "woman": "female", "women": "female", "female": "female", "females": "female",
+    "girl": "female", "girls": "female",
+    "man": "male", "men": "male", "male": "male", "males": "male", "boy": "male", "boys": "male",
+    "child": "pediatric", "children": "pediatric", "kid": "pediatric", "kids": "pediatric",
+    "infant": "pediatric", "infants": "pediatric", "paediatric": "pediatric", "pediatric": "pediatric",
+    "elderly": "elderly", "geriatric": "elderly", "senior": "elderly", "seniors": "elderly",
+}
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _hashed_embedding(text: str, dim: int = HASHED_EMBEDDING_DIM) -> np.ndarray:
+    """Feature-hashed word and character-trigram vector (deterministic across processes)."""
+    vector = np.zeros(dim, dtype=np.float32)
+    words = _TOKEN_PATTERN.findall(text)
+    features = list(words)
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for feature in features:
+        code = zlib.crc32(feature.encode("utf-8"))
+        vector[code % dim] += 1.0 if (code >> 16) & 1 else -1.0
+    return vector
+
+
+def _query_entities(query_normalized: str) -> frozenset:
+    """Terms of a query that must match for a semantic hit (generic phrasing removed)."""
+    entities = set()
+    for word in _TOKEN_PATTERN.findall(query_normalized):
+        if word in _GENERIC_TERMS:
+            continue
+        if word in _DEMOGRAPHIC_TERMS:
+            entities.add(_DEMOGRAPHIC_TERMS[word])
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss") and not word.isdigit():
+            entities.add(word[:-1])  # plural
+        else:
+            entities.add(word)
+    return frozenset(entities)
+
 
 class SemanticCache:
     """Semantic cache for LLM responses using embedding-based similarity."""
-    
-    def __init__(self, cache_dir: str = "data/cache/semantic", similarity_threshold: float = 0.85):
+
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/semantic",
+        similarity_threshold: float = 0.85,
+        max_entries: int = 10000,
+        ttl_hours: float = 24
+    ):
         """
         Initialize semantic cache.
-        
+
         Args:
             cache_dir: Directory for cache storage
             similarity_threshold: Minimum similarity for cache hit (0-1)
+            max_entries: Maximum cached entries (least recently used are evicted)
+            ttl_hours: Entry lifetime in hours
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = timedelta(hours=ttl_hours)
         self._embedding_model = None
-        self._cache = {}
+        self._embedding_model_loaded = False
+        self._lock = threading.RLock()
+
+        # key -> entry metadata (slot, namespace, query, response, timestamp, entities), in LRU order
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_live = np.zeros(0, dtype=bool)
+        self._slot_namespace = np.zeros(0, dtype=np.int32)
+        self._slot_keys: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._namespaces: Dict[str, int] = {}
+        self._log_entries = 0
+
+        self._stats = {
+            "hits": 0,
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "lookup_seconds": 0.0,
+            "embedding_seconds": 0.0,
+        }
         self._load_cache()
-    
+
     def _get_embedding_model(self):
         """Lazy load embedding model."""
-        if self._embedding_model is None:
+        if not self._embedding_model_loaded:
+            self._embedding_model_loaded = True
             try:
                 from sentence_transformers import SentenceTransformer
                 self._embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
             except ImportError:
-                logger.warning("SentenceTransformers not available, using hash-based cache")
+                logger.warning("SentenceTransformers not available, using hashed n-gram embeddings")
                 self._embedding_model = None
         return self._embedding_model
-    
-    def _get_cache_key(self, query: str) -> str:
+
+    def _embed(self, query_normalized: str) -> np.ndarray:
+        """L2-normalized query embedding (model embedding, or hashed n-grams as fallback)."""
+        started = time.perf_counter()
+        vector = None
+        model = self._get_embedding_model()
+        if model:
+            try:
+                vector = np.asarray(model.encode(query_normalized), dtype=np.float32).reshape(-1)
+            except Exception:
+                vector = None
+        if vector is None:
+            vector = _hashed_embedding(query_normalized)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        self._stats["embedding_seconds"] += time.perf_counter() - started
+        return vector
+
+    def _get_cache_key(self, query: str, namespace: str = "default") -> str:
         """
-        Generate cache key from query.
-        
+        Generate exact-match cache key from query.
+
         Args:
             query: Input query
-        
+            namespace: Cache namespace
+
         Returns:
             Cache key
         """
-        # Normalize query
-        query_normalized = " ".join(query.lower().split())
-        
-        # Use embedding if available, otherwise hash
-        model = self._get_embedding_model()
-        if model:
-            try:
-                embedding = model.encode(query_normalized)
-                # Use first few dimensions for key
-                key_data = embedding[:16].tobytes()
-                return hashlib.sha256(key_data).hexdigest()
-            except Exception:
-                pass
-        
-        # Fallback to hash
-        return hashlib.sha256(query_normalized.encode()).hexdigest()
-    
-    def get(self, query: str) -> Optional[str]:
+        payload = f"{namespace}\x00{_normalize_query(query)}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, query: str, namespace: str = "default") -> Optional[str]:
         """
         Get cached response if available.
-        
+
+        An identical (normalized) query hits directly. With an embedding
+        model, the most similar cached query of the same namespace also hits
+        if its cosine similarity is at least similarity_threshold and it has
+        the same entity terms; without one, only exact matches are served.
+
         Args:
             query: Input query
-        
+            namespace: Cache namespace (entries never match across namespaces)
+
         Returns:
             Cached response or None
         """
-        cache_key = self._get_cache_key(query)
-        
-        # Check in-memory cache first
-        if cache_key in self._cache:
-            cached_item = self._cache[cache_key]
-            # Check TTL (24 hours)
-            if datetime.now() - cached_item["timestamp"] < timedelta(hours=24):
-                logger.debug(f"Semantic cache hit: {cache_key[:8]}")
-                return cached_item["response"]
-            else:
-                # Expired, remove
-                del self._cache[cache_key]
-        
-        # Check disk cache
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
+        started = time.perf_counter()
+        with self._lock:
             try:
-                with open(cache_file, "r") as f:
-                    cached_item = json.load(f)
-                
-                # Check TTL
-                cached_time = datetime.fromisoformat(cached_item["timestamp"])
-                if datetime.now() - cached_time < timedelta(hours=24):
-                    response = cached_item["response"]
-                    # Load into memory cache
-                    self._cache[cache_key] = {
-                        "response": response,
-                        "timestamp": cached_time
-                    }
-                    logger.debug(f"Semantic cache hit (disk): {cache_key[:8]}")
-                    return response
-                else:
-                    # Expired, delete
-                    cache_file.unlink()
-            except Exception as e:
-                logger.warning(f"Cache read error: {e}")
-        
-        return None
-    
-    def set(self, query: str, response: str):
+                cache_key = self._get_cache_key(query, namespace)
+                entry = self._live_entry(cache_key)
+                if entry is not None:
+                    self._stats["exact_hits"] += 1
+                    return self._hit(cache_key, entry)
+
+                ns_code = self._namespaces.get(namespace)
+                if ns_code is None or self._vectors is None or self._get_embedding_model() is None:
+                    self._stats["misses"] += 1
+                    return None
+
+                query_normalized = _normalize_query(query)
+                entities = _query_entities(query_normalized)
+                vector = self._embed(query_normalized)
+                candidates = np.flatnonzero(self._slot_live & (self._slot_namespace == ns_code))
+                if len(candidates) and self._vectors.shape[1] == len(vector):
+                    similarities = self._vectors[candidates] @ vector
+                    for position in np.argsort(-similarities):
+                        if similarities[position] < self.similarity_threshold:
+                            break
+                        key = self._slot_keys[candidates[position]]
+                        entry = self._live_entry(key)
+                        if entry is not None and entry["entities"] == entities:
+                            self._stats["semantic_hits"] += 1
+                            logger.debug(f"Semantic cache hit: {key[:8]} (similarity {similarities[position]:.3f})")
+                            return self._hit(key, entry)
+
+                self._stats["misses"] += 1
+                return None
+            finally:
+                self._stats["lookup_seconds"] += time.perf_counter() - started
+
+    def _live_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entry for key if present and not expired (expired entries are dropped)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if datetime.now() - entry["timestamp"] >= self.ttl:
+            self._remove(key)
+            self._append_log({"op": "delete", "key": key})
+            self._stats["expirations"] += 1
+            return None
+        return entry
+
+    def _hit(self, key: str, entry: Dict[str, Any]) -> str:
+        self._cache.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry["response"]
+
+    def set(self, query: str, response: str, namespace: str = "default"):
         """
         Cache a response.
-        
+
         Args:
             query: Input query
             response: Response to cache
+            namespace: Cache namespace
         """
-        cache_key = self._get_cache_key(query)
-        timestamp = datetime.now()
-        
-        # Store in memory
-        self._cache[cache_key] = {
+        with self._lock:
+            cache_key = self._get_cache_key(query, namespace)
+            vector = self._embed(_normalize_query(query))
+            timestamp = datetime.now()
+            self._insert(cache_key, namespace, query, response, timestamp, vector)
+            self._stats["sets"] += 1
+            self._append_log({
+                "op": "set",
+                "key": cache_key,
+                "namespace": namespace,
+                "query": query,
+                "response": response,
+                "timestamp": timestamp.isoformat(),
+                "vector": base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii"),
+            })
+            self._evict()
+            logger.debug(f"Cached response: {cache_key[:8]}")
+
+    def _insert(
+        self,
+        key: str,
+        namespace: str,
+        query: str,
+        response: str,
+        timestamp: datetime,
+        vector: np.ndarray
+    ) -> None:
+        """Place an entry in the vector matrix (reusing a free slot when possible)."""
+        if self._vectors is not None and self._vectors.shape[1] != len(vector):
+            # Embedding model changed - previous vectors are not comparable
+            self._reset_memory()
+        if key in self._cache:
+            self._remove(key)
+
+        if not self._free_slots:
+            old_capacity = 0 if self._vectors is None else self._vectors.shape[0]
+            capacity = max(64, old_capacity * 2)
+            vectors = np.zeros((capacity, len(vector)), dtype=np.float32)
+            if self._vectors is not None:
+                vectors[:old_capacity] = self._vectors
+            self._vectors = vectors
+            self._slot_live = np.concatenate([self._slot_live, np.zeros(capacity - old_capacity, dtype=bool)])
+            self._slot_namespace = np.concatenate(
+                [self._slot_namespace, np.zeros(capacity - old_capacity, dtype=np.int32)]
+            )
+            self._slot_keys.extend([None] * (capacity - old_capacity))
+            self._free_slots = list(range(capacity - 1, old_capacity - 1, -1))
+
+        slot = self._free_slots.pop()
+        self._vectors[slot] = vector
+        self._slot_live[slot] = True
+        self._slot_namespace[slot] = self._namespaces.setdefault(namespace, len(self._namespaces))
+        self._slot_keys[slot] = key
+        self._cache[key] = {
+            "slot": slot,
+            "namespace": namespace,
+            "query": query,
             "response": response,
-            "timestamp": timestamp
+            "timestamp": timestamp,
+            "entities": _query_entities(_normalize_query(query)),
         }
-        
-        # Store on disk
-        cache_file = self.cache_dir / f"{cache_key}.json"
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            slot = entry["slot"]
+            self._slot_live[slot] = False
+            self._slot_keys[slot] = None
+            self._free_slots.append(slot)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries."""
+        while len(self._cache) > self.max_entries:
+            key = next(iter(self._cache))
+            self._remove(key)
+            self._append_log({"op": "delete", "key": key})
+            self._stats["evictions"] += 1
+
+    def _reset_memory(self) -> None:
+        self._cache.clear()
+        self._vectors = None
+        self._slot_live = np.zeros(0, dtype=bool)
+        self._slot_namespace = np.zeros(0, dtype=np.int32)
+        self._slot_keys = []
+        self._free_slots = []
+        self._namespaces = {}
+
+    def _append_log(self, record: Dict[str, Any]) -> None:
+        """Append one operation to the log; compact into the snapshot when the log outgrows the cache."""
         try:
-            with open(cache_file, "w") as f:
-                json.dump({
-                    "query": query,
-                    "response": response,
-                    "timestamp": timestamp.isoformat()
-                }, f)
-            logger.debug(f"Cached response: {cache_key[:8]}")
+            with open(self.cache_dir / LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            self._log_entries += 1
+            if self._log_entries > max(1000, 2 * len(self._cache)):
+                self._compact()
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
-    
+
+    def _compact(self) -> None:
+        """Write live entries to the snapshot file and truncate the log."""
+        keys = list(self._cache.keys())
+        slots = [self._cache[key]["slot"] for key in keys]
+        meta = [
+            {
+                "key": key,
+                "namespace": self._cache[key]["namespace"],
+                "query": self._cache[key]["query"],
+                "response": self._cache[key]["response"],
+                "timestamp": self._cache[key]["timestamp"].isoformat(),
+            }
+            for key in keys
+        ]
+        dim = self._vectors.shape[1] if self._vectors is not None else 0
+        vectors = self._vectors[slots] if slots else np.zeros((0, dim), dtype=np.float32)
+
+        tmp_path = self.cache_dir / (SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, vectors=vectors, meta=np.array(json.dumps(meta)))
+        os.replace(tmp_path, self.cache_dir / SNAPSHOT_FILE)
+        open(self.cache_dir / LOG_FILE, "w").close()
+        self._log_entries = 0
+
     def _load_cache(self):
-        """Load cache from disk into memory."""
+        """Load the snapshot and replay the append log (expired entries are skipped)."""
+        now = datetime.now()
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    with open(cache_file, "r") as f:
-                        cached_item = json.load(f)
-                    
-                    cache_key = cache_file.stem
-                    cached_time = datetime.fromisoformat(cached_item["timestamp"])
-                    
-                    # Only load if not expired
-                    if datetime.now() - cached_time < timedelta(hours=24):
-                        self._cache[cache_key] = {
-                            "response": cached_item["response"],
-                            "timestamp": cached_time
-                        }
-                except Exception:
-                    continue
+            snapshot_path = self.cache_dir / SNAPSHOT_FILE
+            if snapshot_path.exists():
+                with np.load(snapshot_path, allow_pickle=False) as data:
+                    vectors = data["vectors"]
+                    meta = json.loads(str(data["meta"]))
+                for item, vector in zip(meta, vectors):
+                    timestamp = datetime.fromisoformat(item["timestamp"])
+                    if now - timestamp < self.ttl:
+                        self._insert(item["key"], item["namespace"], item["query"], item["response"], timestamp, vector)
         except Exception as e:
             logger.warning(f"Cache load error: {e}")
-    
+
+        log_path = self.cache_dir / LOG_FILE
+        if log_path.exists():
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._log_entries += 1
+                    try:
+                        record = json.loads(line)
+                        if record["op"] == "delete":
+                            self._remove(record["key"])
+                            continue
+                        timestamp = datetime.fromisoformat(record["timestamp"])
+                        if now - timestamp >= self.ttl:
+                            self._remove(record["key"])
+                            continue
+                        vector = np.frombuffer(base64.b64decode(record["vector"]), dtype=np.float32)
+                        self._insert(
+                            record["key"], record["namespace"], record["query"],
+                            record["response"], timestamp, vector
+                        )
+                    except Exception:
+                        # Partially written trailing line
+                        continue
+
+        self._migrate_legacy_files()
+        while len(self._cache) > self.max_entries:
+            self._remove(next(iter(self._cache)))
+
+    def _migrate_legacy_files(self) -> None:
+        """Import per-query JSON files written by earlier versions, then delete them."""
+        legacy_files = list(self.cache_dir.glob("*.json"))
+        for cache_file in legacy_files:
+            try:
+                with open(cache_file, "r") as f:
+                    cached_item = json.load(f)
+                cached_time = datetime.fromisoformat(cached_item["timestamp"])
+                if datetime.now() - cached_time < self.ttl and "query" in cached_item:
+                    query = cached_item["query"]
+                    key = self._get_cache_key(query)
+                    vector = self._embed(_normalize_query(query))
+                    self._insert(key, "default", query, cached_item["response"], cached_time, vector)
+                cache_file.unlink()
+            except Exception:
+                continue
+        if legacy_files:
+            self._compact()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts, hit_rate, average lookup and
+            embedding latency (ms), entry count and evictions
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "hits": self._stats["hits"],
+                "exact_hits": self._stats["exact_hits"],
+                "semantic_hits": self._stats["semantic_hits"],
+                "misses": self._stats["misses"],
+                "sets": self._stats["sets"],
+                "evictions": self._stats["evictions"],
+                "expirations": self._stats["expirations"],
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "avg_lookup_ms": 1000 * self._stats["lookup_seconds"] / lookups if lookups else 0.0,
+                "total_embedding_ms": 1000 * self._stats["embedding_seconds"],
+                "similarity_threshold": self.similarity_threshold,
+            }
+
     def clear(self):
         """Clear all cache."""
-        self._cache.clear()
-        try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                cache_file.unlink()
-        except Exception:
-            pass
+        with self._lock:
+            self._reset_memory()
+            self._log_entries = 0
+            try:
+                for name in (SNAPSHOT_FILE, LOG_FILE):
+                    (self.cache_dir / name).unlink(missing_ok=True)
+                for cache_file in self.cache_dir.glob("*.json"):
+                    cache_file.unlink()
+            except Exception:
+                pass
         logger.info("Semantic cache cleared")
-
@@ -195,7 +195,7 @@ class CopilotEngine:
             parsed = json.loads(response)
             # Cache intent classification
             cache_key = f"intent_{query}"
-            self.cache.set(cache_key, json.dumps(parsed))
+            self.cache.set(cache_key, json.dumps(parsed), namespace="intent")
             return parsed
             
         except json.JSONDecodeError:
@@ -310,12 +310,12 @@ class CopilotEngine:
             explanation = self.router_v2.run(explanation_prompt, mode="summary", use_local_first=True)
             # Cache response
             result_key = f"response_{tool_name}_{hash(str(tool_result))}"
-            self.cache.set(result_key, explanation)
+            self.cache.set(result_key, explanation, namespace="tool_response")
             return explanation
         except Exception:
             # Fallback to summary
             response = summary or f"Tool {tool_name} completed. Result: {json.dumps(tool_result, indent=2)}"
             result_key = f"response_{tool_name}_{hash(str(tool_result))}"
-            self.cache.set(result_key, response)
+            self.cache.set(result_key, response, namespace="tool_response")
             return response
 
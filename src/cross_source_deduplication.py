@@ -8,6 +8,12 @@ Uses multiple methods:
 3. Age/sex/event-based matching
 4. ML-based duplicate detection (RecordLinkage)
 5. Quantum-inspired duplicate detection (enhanced)
+
+Pairwise methods only score candidate pairs produced by a blocking stage:
+cases must agree on every key of at least one blocking pass (age band, sex,
+event week, country, normalized drug/reaction set), and within a block only
+neighbours in sorted order (sorted-neighbourhood window) are compared. Matched
+pairs and groups are merged with a union-find.
 """
 
 import pandas as pd
@@ -33,6 +39,20 @@ try:
 except ImportError:
     RECORDLINKAGE_AVAILABLE = False
 
+CASE_ID_COLUMNS = ['caseid', 'primaryid', 'isr', 'case_id', 'xevmpd_id']
+BLOCKING_KEYS = ['age_band', 'sex', 'event_week', 'country', 'drug_set', 'reaction_set']
+
+# Each pass is a tuple of blocking keys; cases missing any key skip that pass
+DEFAULT_BLOCKING_PASSES = [
+    ('drug_set', 'reaction_set'),
+    ('drug_set', 'age_band', 'sex'),
+    ('country', 'sex', 'age_band', 'event_week'),
+]
+DEFAULT_WINDOW = 8
+AGE_BAND_YEARS = 5
+
+_PAIR_CHUNK = 2_000_000
+
 
 def detect_cross_source_duplicates(
     df: pd.DataFrame,
@@ -40,7 +60,9 @@ def detect_cross_source_duplicates(
     method: str = 'hybrid',
     similarity_threshold: float = 0.85,
     use_ml: bool = True,
-    use_quantum: bool = True
+    use_quantum: bool = True,
+    blocking_passes: Optional[List[Tuple[str, ...]]] = None,
+    window: int = DEFAULT_WINDOW
 ) -> Dict:
     """
     Detect duplicates across multiple data sources.
@@ -52,9 +74,13 @@ def detect_cross_source_duplicates(
         similarity_threshold: Threshold for fuzzy matching (0-1)
         use_ml: Whether to use ML-based deduplication (RecordLinkage)
         use_quantum: Whether to use quantum-inspired deduplication
+        blocking_passes: Blocking passes as tuples of BLOCKING_KEYS
+            (default DEFAULT_BLOCKING_PASSES)
+        window: Sorted-neighbourhood window size within each block
         
     Returns:
-        Dictionary with duplicate detection results
+        Dictionary with duplicate detection results (including 'pairs_compared'
+        and 'pairs_pruned' from candidate generation)
     """
     if df.empty:
         return {
@@ -88,7 +114,8 @@ def detect_cross_source_duplicates(
     
     # Multi-source deduplication
     return _detect_multi_source_duplicates(
-        df, source_column, method, similarity_threshold, use_ml, use_quantum
+        df, source_column, method, similarity_threshold, use_ml, use_quantum,
+        blocking_passes, window
     )
 
 
@@ -116,27 +143,34 @@ def _detect_multi_source_duplicates(
     method: str,
     similarity_threshold: float,
     use_ml: bool,
-    use_quantum: bool
+    use_quantum: bool,
+    blocking_passes: Optional[List[Tuple[str, ...]]] = None,
+    window: int = DEFAULT_WINDOW
 ) -> Dict:
     """Detect duplicates across multiple sources."""
     
+    # Candidate pairs for the pairwise methods (fuzzy, demographic, ML)
+    candidates = None
+    if method in ['fuzzy', 'hybrid', 'ml']:
+        candidates = generate_candidate_pairs(df, blocking_passes, window)
+    
     # Step 1: Exact matching on case identifiers
     exact_duplicates = _find_exact_duplicates(df, source_column)
     
     # Step 2: Fuzzy matching on case identifiers
     fuzzy_duplicates = []
     if method in ['fuzzy', 'hybrid']:
-        fuzzy_duplicates = _find_fuzzy_duplicates(df, source_column, similarity_threshold)
+        fuzzy_duplicates = _find_fuzzy_duplicates(df, source_column, similarity_threshold, candidates)
     
     # Step 3: Age/sex/event-based matching
     demographic_duplicates = []
     if method in ['fuzzy', 'hybrid', 'ml']:
-        demographic_duplicates = _find_demographic_duplicates(df, source_column, similarity_threshold)
+        demographic_duplicates = _find_demographic_duplicates(df, source_column, similarity_threshold, candidates)
     
     # Step 4: ML-based matching (RecordLinkage)
     ml_duplicates = []
     if method in ['ml', 'hybrid'] and use_ml and RECORDLINKAGE_AVAILABLE:
-        ml_duplicates = _find_ml_duplicates(df, source_column, similarity_threshold)
+        ml_duplicates = _find_ml_duplicates(df, source_column, similarity_threshold, candidates)
     
     # Step 5: Quantum-inspired matching
     quantum_duplicates = []
@@ -156,8 +190,10 @@ def _detect_multi_source_duplicates(
     total_cases = len(df)
     unique_cases = total_cases - sum(len(group) - 1 for group in all_duplicate_groups)
     duplicate_cases = total_cases - unique_cases
-    cross_source_count = sum(1 for group in all_duplicate_groups 
-                            if len(set(df.loc[group, source_column].values)) > 1)
+    cross_source_count = _count_cross_source_groups(df, all_duplicate_groups, source_column)
+    
+    total_pairs = total_cases * (total_cases - 1) // 2
+    pairs_compared = candidates['pairs_compared'] if candidates else 0
     
     return {
         'total_cases': total_cases,
@@ -171,105 +207,417 @@ def _detect_multi_source_duplicates(
         'demographic_duplicates': len(demographic_duplicates),
         'ml_duplicates': len(ml_duplicates),
         'quantum_duplicates': len(quantum_duplicates),
+        'pairs_compared': pairs_compared,
+        'pairs_pruned': total_pairs - pairs_compared if candidates else 0,
+        'blocking_passes': candidates['passes'] if candidates else [],
         'method': method
     }
 
 
+def _case_id_column(df: pd.DataFrame, columns: List[str] = CASE_ID_COLUMNS) -> Optional[str]:
+    """Return the first case identifier column present in df."""
+    for col in columns:
+        if col in df.columns:
+            return col
+    return None
+
+
+def _normalized_strings(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_text (missing values become "")."""
+    codes, uniques = pd.factorize(series, sort=False)
+    normalized = pd.Series(uniques, dtype=object).astype(str).str.strip().str.lower()
+    values = np.append(normalized.to_numpy(dtype=object), "")
+    return pd.Series(values[codes], index=series.index, dtype=object)
+
+
+def _string_codes(values: pd.Series, sort: bool = False) -> np.ndarray:
+    """Factorize strings; empty strings get code -1."""
+    codes, _ = pd.factorize(values, sort=sort)
+    codes = codes.astype(np.int64)
+    codes[(values == "").to_numpy()] = -1
+    return codes
+
+
+def _term_set_codes(series: pd.Series, separator: str = ';') -> np.ndarray:
+    """
+    Code each row by its set of normalized terms (order and repeats ignored).
+    
+    Sets are hashed as a sum of random 64-bit term keys, so equal sets get equal
+    codes without building per-row strings. Rows without terms get -1.
+    """
+    n_rows = len(series)
+    exploded = series.reset_index(drop=True).astype(str).str.split(separator).explode()
+    exploded = exploded.str.strip().str.lower()
+    exploded = exploded[exploded.notna() & ~exploded.isin(["", "nan", "none"])]
+    if exploded.empty:
+        return np.full(n_rows, -1, dtype=np.int64)
+    
+    term_codes, terms = pd.factorize(exploded, sort=False)
+    rows = exploded.index.to_numpy(dtype=np.int64)
+    entries = np.unique(rows * len(terms) + term_codes)
+    rows, term_codes = entries // len(terms), entries % len(terms)
+    
+    keys = np.random.default_rng(0).integers(0, np.iinfo(np.int64).max, size=len(terms), dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    hashes = np.add.reduceat(keys[term_codes].astype(np.uint64), starts)
+    
+    codes = np.full(n_rows, -1, dtype=np.int64)
+    codes[rows[starts]] = pd.factorize(hashes)[0]
+    return codes
+
+
+def _first_column(df: pd.DataFrame, columns: List[str]) -> Optional[pd.Series]:
+    for col in columns:
+        if col in df.columns:
+            return df[col]
+    return None
+
+
+def _age_values(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """Numeric age per row ('age', falling back to 'age_yrs' when missing or 0)."""
+    if 'age' not in df.columns and 'age_yrs' not in df.columns:
+        return None
+    age = pd.to_numeric(df['age'], errors='coerce') if 'age' in df.columns else None
+    if 'age_yrs' in df.columns:
+        age_yrs = pd.to_numeric(df['age_yrs'], errors='coerce')
+        age = age_yrs if age is None else age.where(age.notna() & (age != 0), age_yrs)
+    return age.to_numpy(dtype=float)
+
+
+def _sex_codes(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """0 for 'M', 1 for 'F', -1 otherwise ('sex', falling back to 'gender')."""
+    if 'sex' not in df.columns and 'gender' not in df.columns:
+        return None
+    sex = df['sex'] if 'sex' in df.columns else df['gender']
+    if 'sex' in df.columns and 'gender' in df.columns:
+        sex = sex.where(sex.notna() & (sex.astype(str) != ""), df['gender'])
+    upper = _normalized_strings(sex).str.upper()
+    return np.select([upper == 'M', upper == 'F'], [0, 1], default=-1).astype(np.int64)
+
+
+def _case_features(df: pd.DataFrame) -> Dict[str, Optional[np.ndarray]]:
+    """Blocking key codes per row (-1 where the key is missing)."""
+    n_rows = len(df)
+    missing = np.full(n_rows, -1, dtype=np.int64)
+    features: Dict[str, Optional[np.ndarray]] = {}
+    
+    age = _age_values(df)
+    if age is not None:
+        with np.errstate(invalid='ignore'):
+            bands = np.floor(age / AGE_BAND_YEARS)
+        features['age_band'] = np.where(np.isfinite(bands), bands, -1).astype(np.int64)
+    else:
+        features['age_band'] = missing
+    
+    sex = _sex_codes(df)
+    features['sex'] = sex if sex is not None else missing
+    
+    event_dates = _first_column(df, ['onset_date', 'event_date', 'event_dt'])
+    if event_dates is not None:
+        dates = pd.to_datetime(event_dates, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        weeks = dates.astype('datetime64[W]').astype(np.int64)
+        features['event_week'] = np.where(np.isnat(dates), -1, weeks - weeks.min(initial=0))
+    else:
+        features['event_week'] = missing
+    
+    country = _first_column(df, ['country', 'occr_country', 'reporter_country'])
+    features['country'] = _string_codes(_normalized_strings(country)) if country is not None else missing
+    
+    features['drug_set'] = _term_set_codes(df['drug_name']) if 'drug_name' in df.columns else missing
+    features['reaction_set'] = _term_set_codes(df['reaction']) if 'reaction' in df.columns else missing
+    return features
+
+
+def _combine_codes(codes: List[np.ndarray]) -> np.ndarray:
+    """Combine several code arrays into one (-1 if any component is -1)."""
+    combined = codes[0].copy()
+    for other in codes[1:]:
+        valid = (combined >= 0) & (other >= 0)
+        merged = combined * (int(other.max(initial=0)) + 1) + other
+        combined = np.full(len(combined), -1, dtype=np.int64)
+        if valid.any():
+            combined[valid] = pd.factorize(merged[valid])[0]
+    return combined
+
+
+def _sorted_neighbourhood_pairs(
+    block_codes: np.ndarray,
+    sort_key: np.ndarray,
+    window: int
+) -> np.ndarray:
+    """
+    Candidate pairs within blocks, limited to a sorted-neighbourhood window.
+    
+    Rows are sorted by (block, sort_key); row i is paired with the next
+    window - 1 rows of the same block. Small blocks are compared exhaustively,
+    large blocks cost O(block size * window).
+    
+    Returns:
+        Pair codes (lo * n + hi) over row positions
+    """
+    n_rows = len(block_codes)
+    valid = np.flatnonzero(block_codes >= 0)
+    if len(valid) < 2:
+        return np.empty(0, dtype=np.int64)
+    
+    order = valid[np.lexsort((sort_key[valid], block_codes[valid]))]
+    codes = block_codes[order]
+    
+    pairs = []
+    for offset in range(1, max(window, 2)):
+        same = codes[offset:] == codes[:-offset]
+        if not same.any():
+            # Blocks are contiguous runs, so no larger offset can match either
+            break
+        left = order[:-offset][same]
+        right = order[offset:][same]
+        pairs.append(np.minimum(left, right) * n_rows + np.maximum(left, right))
+    return np.concatenate(pairs) if pairs else np.empty(0, dtype=np.int64)
+
+
+def generate_candidate_pairs(
+    df: pd.DataFrame,
+    blocking_passes: Optional[List[Tuple[str, ...]]] = None,
+    window: int = DEFAULT_WINDOW
+) -> Dict:
+    """
+    Generate candidate case pairs with blocking and sorted-neighbourhood windows.
+    
+    Each blocking pass groups cases that agree on all of its keys
+    (see BLOCKING_KEYS); within a block, cases sorted by case identifier are
+    compared with their window - 1 successors. Two extra passes slide the window
+    over the sorted (and reversed) case identifiers to catch near-identical IDs.
+    
+    Args:
+        df: Case DataFrame
+        blocking_passes: Tuples of blocking keys (default DEFAULT_BLOCKING_PASSES)
+        window: Sorted-neighbourhood window size
+        
+    Returns:
+        Dictionary with 'left'/'right' (row positions, left < right),
+        'pairs_compared', 'pairs_pruned' and per-pass candidate counts in 'passes'
+    """
+    n_rows = len(df)
+    blocking_passes = blocking_passes or DEFAULT_BLOCKING_PASSES
+    unknown = [key for keys in blocking_passes for key in keys if key not in BLOCKING_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown blocking keys: {unknown}. Available: {BLOCKING_KEYS}")
+    
+    features = _case_features(df)
+    
+    case_id_col = _case_id_column(df)
+    if case_id_col:
+        case_ids = _normalized_strings(df[case_id_col])
+        id_rank = _string_codes(case_ids, sort=True)
+    else:
+        case_ids = None
+        id_rank = np.zeros(n_rows, dtype=np.int64)
+    
+    pair_sets = []
+    passes = []
+    for keys in blocking_passes:
+        block_codes = _combine_codes([features[key] for key in keys])
+        pairs = _sorted_neighbourhood_pairs(block_codes, id_rank, window)
+        pair_sets.append(pairs)
+        passes.append({'keys': list(keys), 'pairs': int(len(pairs))})
+    
+    if case_ids is not None:
+        id_block = np.where((case_ids.str.len() >= 3).to_numpy(), 0, -1).astype(np.int64)
+        reversed_rank = _string_codes(case_ids.str[::-1], sort=True)
+        for name, rank in (('case_id', id_rank), ('case_id_reversed', reversed_rank)):
+            pairs = _sorted_neighbourhood_pairs(id_block, rank, window)
+            pair_sets.append(pairs)
+            passes.append({'keys': [name], 'pairs': int(len(pairs))})
+    
+    pair_codes = np.unique(np.concatenate(pair_sets)) if pair_sets else np.empty(0, dtype=np.int64)
+    total_pairs = n_rows * (n_rows - 1) // 2
+    
+    return {
+        'left': pair_codes // max(n_rows, 1),
+        'right': pair_codes % max(n_rows, 1),
+        'pairs_compared': int(len(pair_codes)),
+        'pairs_pruned': int(total_pairs - len(pair_codes)),
+        'passes': passes,
+    }
+
+
 def _find_exact_duplicates(df: pd.DataFrame, source_column: str) -> List[List[int]]:
     """Find exact duplicates based on case identifiers."""
     duplicate_groups = []
     
     # Find case ID column
-    case_id_col = None
-    for col in ['caseid', 'primaryid', 'isr', 'case_id', 'xevmpd_id']:
-        if col in df.columns:
-            case_id_col = col
-            break
-    
+    case_id_col = _case_id_column(df)
     if not case_id_col:
         return []
     
-    # Group by case ID and source
-    grouped = df.groupby([case_id_col, source_column])
+    labels = df.index.to_numpy()
+    case_ids = df[case_id_col].astype(str).where(df[case_id_col].notna(), "")
+    present = (case_ids != "").to_numpy()
+    id_codes = pd.factorize(case_ids)[0]
+    source_codes = pd.factorize(df[source_column])[0]
     
-    for (case_id, source), group in grouped:
-        if len(group) > 1:
-            # Multiple rows with same case ID and source
-            duplicate_groups.append(group.index.tolist())
-    
-    # Also check for same case ID across different sources
-    cross_source_groups = defaultdict(list)
-    for idx, row in df.iterrows():
-        case_id = str(row.get(case_id_col, ''))
-        if case_id:
-            cross_source_groups[case_id].append(idx)
-    
-    for case_id, indices in cross_source_groups.items():
-        if len(indices) > 1:
-            # Check if spans multiple sources
-            sources = set(df.loc[indices, source_column].values)
-            if len(sources) > 1:
-                duplicate_groups.append(indices)
+    # Multiple rows with same case ID and source
+    same_source = pd.Series(id_codes * (source_codes.max(initial=0) + 1) + source_codes)
+    same_source_counts = same_source.map(same_source.value_counts()).to_numpy()
+    duplicate_groups.extend(_groups_from_codes(
+        same_source.to_numpy(), labels, present & (same_source_counts > 1)
+    ))
+    
+    # Same case ID across different sources
+    sources_per_id = pd.Series(source_codes).groupby(id_codes).transform('nunique').to_numpy()
+    duplicate_groups.extend(_groups_from_codes(id_codes, labels, present & (sources_per_id > 1)))
     
     return duplicate_groups
 
 
+def _groups_from_codes(codes: np.ndarray, labels: np.ndarray, mask: np.ndarray) -> List[List]:
+    """Group labels by code for the rows selected by mask (groups of 2+ rows)."""
+    positions = np.flatnonzero(mask)
+    if len(positions) == 0:
+        return []
+    selected = codes[positions]
+    order = np.argsort(selected, kind='stable')
+    sorted_codes = selected[order]
+    boundaries = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1], True])
+    sorted_labels = labels[positions[order]]
+    groups = [
+        sorted_labels[boundaries[i]:boundaries[i + 1]].tolist()
+        for i in range(len(boundaries) - 1)
+    ]
+    return [group for group in groups if len(group) > 1]
+
+
 def _find_fuzzy_duplicates(
     df: pd.DataFrame,
     source_column: str,
-    threshold: float = 0.85
+    threshold: float = 0.85,
+    candidates: Optional[Dict] = None
 ) -> List[List[int]]:
-    """Find fuzzy duplicates based on case identifiers."""
-    duplicate_groups = []
-    
-    # Find case ID column
-    case_id_col = None
-    for col in ['caseid', 'primaryid', 'isr', 'case_id', 'xevmpd_id']:
-        if col in df.columns:
-            case_id_col = col
-            break
+    """
+    Find fuzzy duplicates based on case identifiers.
     
+    Only candidate pairs are compared. Pairs whose quantum_distance similarity
+    provably cannot reach the threshold (character-set Jaccard, word overlap
+    and length-ratio bounds, computed vectorized) are skipped before the exact
+    quantum_distance is evaluated once per distinct ID pair.
+    """
+    case_id_col = _case_id_column(df)
     if not case_id_col:
         return []
+    if candidates is None:
+        candidates = generate_candidate_pairs(df)
+    
+    raw_ids = df[case_id_col].astype(str).str.strip().where(df[case_id_col].notna(), "")
+    id_codes, id_values = pd.factorize(raw_ids, sort=False)
+    id_values = np.asarray(id_values, dtype=object)
+    valid_id = np.array([len(value) >= 3 for value in id_values], dtype=bool)
+    
+    left, right = candidates['left'], candidates['right']
+    code_l, code_r = id_codes[left], id_codes[right]
+    keep = valid_id[code_l] & valid_id[code_r] & (code_l != code_r)
+    left, right, code_l, code_r = left[keep], right[keep], code_l[keep], code_r[keep]
+    if len(left) == 0:
+        return []
     
-    # Get unique case IDs with their indices
-    case_id_map = defaultdict(list)
-    for idx, row in df.iterrows():
-        case_id = str(row.get(case_id_col, '')).strip()
-        if case_id and len(case_id) >= 3:
-            case_id_map[case_id].append(idx)
+    # Score each distinct ID pair once
+    n_ids = len(id_values)
+    id_pairs, pair_index = np.unique(
+        np.minimum(code_l, code_r).astype(np.int64) * n_ids + np.maximum(code_l, code_r),
+        return_inverse=True
+    )
+    first, second = id_pairs // n_ids, id_pairs % n_ids
     
-    # Use quantum distance for fuzzy matching
-    case_ids = list(case_id_map.keys())
+    possible = _id_similarity_upper_bound(id_values, first, second, threshold) >= threshold
+    matched = np.zeros(len(id_pairs), dtype=bool)
+    for k in np.flatnonzero(possible):
+        similarity = 1.0 - quantum_distance(id_values[first[k]], id_values[second[k]])
+        matched[k] = similarity >= threshold
     
-    for i, case_id1 in enumerate(case_ids):
-        for case_id2 in case_ids[i+1:]:
-            distance = quantum_distance(case_id1, case_id2)
-            similarity = 1.0 - distance
-            
-            if similarity >= threshold:
-                # Merge groups
-                indices1 = case_id_map[case_id1]
-                indices2 = case_id_map[case_id2]
-                
-                # Check if spans multiple sources
-                all_indices = indices1 + indices2
-                sources = set(df.loc[all_indices, source_column].values)
-                
-                if len(sources) > 1 or len(all_indices) > len(indices1):
-                    duplicate_groups.append(all_indices)
+    labels = df.index.to_numpy()
+    hits = matched[pair_index]
+    return [[a, b] for a, b in zip(labels[left[hits]].tolist(), labels[right[hits]].tolist())]
+
+
+_POPCOUNT16 = np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.uint8)
+
+
+def _char_masks(texts: List[str]) -> np.ndarray:
+    """128-bit character-set masks (two uint64 words) for ASCII strings."""
+    masks = np.zeros((len(texts), 2), dtype=np.uint64)
+    if not texts:
+        return masks
+    width = max(1, max(len(text) for text in texts))
+    chars = np.array(texts, dtype=f'S{width}').view(np.uint8).reshape(len(texts), width).astype(np.uint64)
+    present = chars > 0
+    low = np.where(present & (chars < 64), np.left_shift(np.uint64(1), chars % np.uint64(64)), np.uint64(0))
+    high = np.where(chars >= 64, np.left_shift(np.uint64(1), chars % np.uint64(64)), np.uint64(0))
+    masks[:, 0] = np.bitwise_or.reduce(low, axis=1)
+    masks[:, 1] = np.bitwise_or.reduce(high, axis=1)
+    return masks
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a uint64 array."""
+    return _POPCOUNT16[bits.view(np.uint16)].reshape(len(bits), -1).sum(axis=1, dtype=np.int64)
+
+
+def _id_similarity_upper_bound(
+    values: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    threshold: float
+) -> np.ndarray:
+    """
+    Upper bound of 1 - quantum_distance for pairs of strings, vectorized.
     
-    return duplicate_groups
+    quantum_distance weighs character-set Jaccard (0.4), word-set Jaccard (0.4)
+    and longest-common-substring ratio (0.2). Word Jaccard is 0 for distinct
+    single-word strings and the substring ratio is at most min(len) / max(len);
+    character sets are exact 128-bit masks, only computed for pairs those two
+    bounds leave open. Non-ASCII strings get a bound of 1 (always scored).
+    """
+    normalized = [normalize_text(value) for value in values]
+    text_codes = pd.factorize(pd.Series(normalized, dtype=object))[0]
+    lengths = np.array([len(text) for text in normalized], dtype=np.float64)
+    multi_word = np.array([len(text.split()) > 1 for text in normalized], dtype=bool)
+    ascii_text = np.array([text.isascii() for text in normalized], dtype=bool)
+    
+    word_bound = (multi_word[first] | multi_word[second]).astype(np.float64)
+    substring_bound = np.minimum(lengths[first], lengths[second]) / np.maximum(
+        np.maximum(lengths[first], lengths[second]), 1
+    )
+    bound = 0.4 + 0.4 * word_bound + 0.2 * substring_bound
+    
+    # Character-set Jaccard for the pairs still open
+    open_pairs = np.flatnonzero((bound >= threshold) & ascii_text[first] & ascii_text[second])
+    if len(open_pairs):
+        masks = np.zeros((len(values), 2), dtype=np.uint64)
+        ascii_ids = np.flatnonzero(ascii_text)
+        masks[ascii_ids] = _char_masks([normalized[i] for i in ascii_ids])
+        a, b = masks[first[open_pairs]], masks[second[open_pairs]]
+        union = _popcount(a | b)
+        char_similarity = np.where(union > 0, _popcount(a & b) / np.maximum(union, 1), 0.0)
+        bound[open_pairs] += 0.4 * (char_similarity - 1.0)
+    
+    bound[text_codes[first] == text_codes[second]] = 1.0
+    return bound
 
 
 def _find_demographic_duplicates(
     df: pd.DataFrame,
     source_column: str,
-    threshold: float = 0.85
+    threshold: float = 0.85,
+    candidates: Optional[Dict] = None
 ) -> List[List[int]]:
-    """Find duplicates based on age, sex, and event matching."""
-    duplicate_groups = []
+    """
+    Find duplicates based on age, sex, and event matching.
     
+    Each case has a signature of up to four parts (5-year age band, sex,
+    first 20 characters of reaction and drug). A candidate pair from different
+    sources is a duplicate when both signatures have at least two parts, their
+    Jaccard similarity (as _signature_similarity) is at least threshold, and
+    one side's signature is repeated within its own source.
+    """
     # Required columns
     required_cols = []
     if 'age' in df.columns or 'age_yrs' in df.columns:
@@ -283,68 +631,50 @@ def _find_demographic_duplicates(
     
     if len(required_cols) < 2:
         return []
+    if candidates is None:
+        candidates = generate_candidate_pairs(df)
+    
+    # Signature parts as codes (-1 when the part is absent)
+    parts = []
+    age = _age_values(df)
+    if age is not None:
+        with np.errstate(invalid='ignore'):
+            bands = np.floor(age / AGE_BAND_YEARS)
+        parts.append(np.where(np.isfinite(bands), bands, -1).astype(np.int64))
+    sex = _sex_codes(df)
+    if sex is not None:
+        parts.append(sex)
+    for col in ('reaction', 'drug_name'):
+        if col in df.columns:
+            parts.append(_string_codes(_normalized_strings(df[col]).str[:20]))
+    parts = np.vstack(parts)
+    present = (parts >= 0).sum(axis=0)
+    source_codes = pd.factorize(df[source_column])[0]
+    
+    # Signatures seen more than once within the same source
+    signature_keys = pd.DataFrame(np.vstack([parts, source_codes]).T)
+    repeated = (signature_keys.groupby(list(signature_keys.columns))[0].transform('size') > 1).to_numpy()
+    repeated &= present >= 2
     
-    # Group by demographic and event characteristics
-    for source in df[source_column].unique():
-        source_df = df[df[source_column] == source]
+    labels = df.index.to_numpy()
+    duplicate_groups = []
+    for start in range(0, len(candidates['left']), _PAIR_CHUNK):
+        left = candidates['left'][start:start + _PAIR_CHUNK]
+        right = candidates['right'][start:start + _PAIR_CHUNK]
         
-        # Create signature for each case
-        signatures = {}
-        for idx, row in source_df.iterrows():
-            sig_parts = []
-            if 'age' in required_cols or 'age_yrs' in required_cols:
-                age = row.get('age') or row.get('age_yrs')
-                if pd.notna(age):
-                    # Round age to nearest 5 years for matching
-                    sig_parts.append(f"age_{int(float(age) // 5) * 5}")
-            if 'sex' in required_cols or 'gender' in required_cols:
-                sex = str(row.get('sex') or row.get('gender', '')).upper()
-                if sex in ['M', 'F']:
-                    sig_parts.append(f"sex_{sex}")
-            if 'reaction' in required_cols:
-                reaction = normalize_text(str(row.get('reaction', '')))
-                if reaction:
-                    sig_parts.append(f"react_{reaction[:20]}")  # First 20 chars
-            if 'drug_name' in required_cols:
-                drug = normalize_text(str(row.get('drug_name', '')))
-                if drug:
-                    sig_parts.append(f"drug_{drug[:20]}")  # First 20 chars
-            
-            if len(sig_parts) >= 2:
-                signature = '|'.join(sig_parts)
-                if signature not in signatures:
-                    signatures[signature] = []
-                signatures[signature].append(idx)
+        agree = ((parts[:, left] == parts[:, right]) & (parts[:, left] >= 0)).sum(axis=0)
+        union = present[left] + present[right] - agree
+        similarity = np.where(union > 0, agree / np.maximum(union, 1), 0.0)
         
-        # Find groups with multiple cases
-        for signature, indices in signatures.items():
-            if len(indices) > 1:
-                # Check if any other source has similar cases
-                other_sources = df[df[source_column] != source]
-                for other_idx, other_row in other_sources.iterrows():
-                    other_sig_parts = []
-                    if 'age' in required_cols or 'age_yrs' in required_cols:
-                        age = other_row.get('age') or other_row.get('age_yrs')
-                        if pd.notna(age):
-                            other_sig_parts.append(f"age_{int(float(age) // 5) * 5}")
-                    if 'sex' in required_cols or 'gender' in required_cols:
-                        sex = str(other_row.get('sex') or other_row.get('gender', '')).upper()
-                        if sex in ['M', 'F']:
-                            other_sig_parts.append(f"sex_{sex}")
-                    if 'reaction' in required_cols:
-                        reaction = normalize_text(str(other_row.get('reaction', '')))
-                        if reaction:
-                            other_sig_parts.append(f"react_{reaction[:20]}")
-                    if 'drug_name' in required_cols:
-                        drug = normalize_text(str(other_row.get('drug_name', '')))
-                        if drug:
-                            other_sig_parts.append(f"drug_{drug[:20]}")
-                    
-                    if len(other_sig_parts) >= 2:
-                        other_signature = '|'.join(other_sig_parts)
-                        # Check similarity
-                        if _signature_similarity(signature, other_signature) >= threshold:
-                            duplicate_groups.append(indices + [other_idx])
+        hits = (
+            (present[left] >= 2) & (present[right] >= 2)
+            & (source_codes[left] != source_codes[right])
+            & (repeated[left] | repeated[right])
+            & (similarity >= threshold)
+        )
+        duplicate_groups.extend(
+            [a, b] for a, b in zip(labels[left[hits]].tolist(), labels[right[hits]].tolist())
+        )
     
     return duplicate_groups
 
@@ -366,22 +696,18 @@ def _signature_similarity(sig1: str, sig2: str) -> float:
 def _find_ml_duplicates(
     df: pd.DataFrame,
     source_column: str,
-    threshold: float = 0.85
+    threshold: float = 0.85,
+    candidates: Optional[Dict] = None
 ) -> List[List[int]]:
-    """Find duplicates using ML-based RecordLinkage library."""
+    """Find duplicates using ML-based RecordLinkage library (candidate pairs only)."""
     if not RECORDLINKAGE_AVAILABLE:
         return []
     
     duplicate_groups = []
     
     try:
-        # Prepare data for RecordLinkage
-        # Create indexer
-        indexer = recordlinkage.Index()
-        
-        # Block on source to compare within and across sources
-        # For cross-source, we'll compare all pairs
-        indexer.full()
+        if candidates is None:
+            candidates = generate_candidate_pairs(df)
         
         # Create comparison object
         compare = recordlinkage.Compare()
@@ -405,8 +731,11 @@ def _find_ml_duplicates(
         if 'drug_name' in df.columns:
             compare.string('drug_name', 'drug_name', method='jarowinkler', threshold=threshold, label='drug')
         
-        # Generate candidate pairs
-        candidate_pairs = indexer.index(df)
+        # Candidate pairs from blocking instead of a full index
+        labels = df.index.to_numpy()
+        candidate_pairs = pd.MultiIndex.from_arrays([
+            labels[candidates['left']], labels[candidates['right']]
+        ])
         
         # Compare
         features = compare.compute(candidate_pairs, df)
@@ -417,33 +746,8 @@ def _find_ml_duplicates(
         # Find matches above threshold
         matches = scores[scores >= threshold * len(features.columns)]
         
-        # Group matches
-        match_groups = defaultdict(set)
-        for (idx1, idx2) in matches.index:
-            match_groups[idx1].add(idx1)
-            match_groups[idx1].add(idx2)
-            match_groups[idx2].add(idx1)
-            match_groups[idx2].add(idx2)
-        
-        # Convert to list of lists
-        seen = set()
-        for group in match_groups.values():
-            group_list = sorted(list(group))
-            group_tuple = tuple(group_list)
-            if group_tuple not in seen and len(group_list) > 1:
-                seen.add(group_tuple)
-                # Check if spans multiple sources
-                try:
-                    if source_column in df.columns:
-                        sources = set(df.loc[group_list, source_column].values)
-                        if len(sources) > 1 or len(group_list) > 1:
-                            duplicate_groups.append(group_list)
-                    else:
-                        # No source column, but still duplicates
-                        duplicate_groups.append(group_list)
-                except (KeyError, IndexError):
-                    # Some indices might be invalid, skip
-                    pass
+        # Matched pairs are merged into groups by _merge_duplicate_groups
+        duplicate_groups = [[idx1, idx2] for idx1, idx2 in matches.index]
     
     except Exception as e:
         # If ML method fails, return empty list
@@ -457,179 +761,106 @@ def _find_quantum_duplicates(
     source_column: str,
     threshold: float = 0.85
 ) -> List[List[int]]:
-    """Find duplicates using quantum-inspired methods."""
-    duplicate_groups = []
+    """
+    Find duplicates using quantum-inspired methods.
     
-    # Use quantum hashing to group similar cases
-    case_signatures = {}
-    for idx, row in df.iterrows():
-        # Create signature from key fields
-        sig_parts = []
-        
-        # Case ID
-        for col in ['caseid', 'primaryid', 'isr', 'xevmpd_id']:
-            if col in df.columns:
-                val = str(row.get(col, '')).strip()
-                if val:
-                    sig_parts.append(val)
-                    break
-        
-        # Demographics
-        if 'age' in df.columns or 'age_yrs' in df.columns:
-            age = row.get('age') or row.get('age_yrs')
-            if pd.notna(age):
-                sig_parts.append(f"age_{int(float(age))}")
-        
-        if 'sex' in df.columns or 'gender' in df.columns:
-            sex = str(row.get('sex') or row.get('gender', '')).upper()
-            if sex in ['M', 'F']:
-                sig_parts.append(f"sex_{sex}")
-        
-        # Events
-        if 'reaction' in df.columns:
-            reaction = normalize_text(str(row.get('reaction', '')))
-            if reaction:
-                sig_parts.append(f"react_{reaction}")
-        
-        if 'drug_name' in df.columns:
-            drug = normalize_text(str(row.get('drug_name', '')))
-            if drug:
-                sig_parts.append(f"drug_{drug}")
-        
-        if sig_parts:
-            signature = '|'.join(sig_parts)
-            quantum_hash_val = quantum_hash(signature)
-            
-            if quantum_hash_val not in case_signatures:
-                case_signatures[quantum_hash_val] = []
-            case_signatures[quantum_hash_val].append(idx)
-    
-    # Find groups with similar quantum hashes
-    hash_groups = defaultdict(list)
-    for hash_val, indices in case_signatures.items():
-        hash_groups[hash_val].extend(indices)
-    
-    # Compare cases with same or similar hashes
-    for hash_val, indices in hash_groups.items():
-        if len(indices) > 1:
-            # Check similarity within group
-            for i, idx1 in enumerate(indices):
-                for idx2 in indices[i+1:]:
-                    row1 = df.loc[idx1]
-                    row2 = df.loc[idx2]
-                    
-                    # Create signatures for comparison
-                    sig1 = _create_case_signature(row1)
-                    sig2 = _create_case_signature(row2)
-                    
-                    distance = quantum_distance(sig1, sig2)
-                    similarity = 1.0 - distance
-                    
-                    if similarity >= threshold:
-                        # Check if spans multiple sources
-                        sources = set(df.loc[[idx1, idx2], source_column].values)
-                        if len(sources) > 1:
-                            # Find or create group
-                            found_group = False
-                            for group in duplicate_groups:
-                                if idx1 in group or idx2 in group:
-                                    if idx1 not in group:
-                                        group.append(idx1)
-                                    if idx2 not in group:
-                                        group.append(idx2)
-                                    found_group = True
-                                    break
-                            
-                            if not found_group:
-                                duplicate_groups.append([idx1, idx2])
+    Cases are grouped by their normalized signature (case ID, age, sex,
+    reaction, drug) - the key quantum_hash is computed from. Cases sharing a
+    signature have quantum distance 0, so every signature group spanning more
+    than one source is a duplicate group for any threshold.
+    """
+    n_rows = len(df)
+    missing = np.full(n_rows, -1, dtype=np.int64)
     
-    return duplicate_groups
+    # Case ID (first non-empty identifier column)
+    case_ids = pd.Series("", index=df.index, dtype=object)
+    for col in ['caseid', 'primaryid', 'isr', 'xevmpd_id']:
+        if col in df.columns:
+            values = _normalized_strings(df[col])
+            case_ids = case_ids.where(case_ids != "", values)
+    
+    age = _age_values(df)
+    sex = _sex_codes(df)
+    parts = [
+        _string_codes(case_ids),
+        np.where(np.isfinite(age), np.trunc(age), -1).astype(np.int64) if age is not None else missing,
+        sex if sex is not None else missing,
+        _string_codes(_normalized_strings(df['reaction'])) if 'reaction' in df.columns else missing,
+        _string_codes(_normalized_strings(df['drug_name'])) if 'drug_name' in df.columns else missing,
+    ]
+    has_signature = np.any(np.vstack(parts) >= 0, axis=0)
+    
+    signature_codes = pd.DataFrame(dict(enumerate(parts))).groupby(list(range(len(parts)))).ngroup().to_numpy()
+    source_codes = pd.factorize(df[source_column])[0]
+    sources_per_signature = pd.Series(source_codes).groupby(signature_codes).transform('nunique').to_numpy()
+    
+    return _groups_from_codes(
+        signature_codes, df.index.to_numpy(), has_signature & (sources_per_signature > 1)
+    )
 
 
-def _create_case_signature(row: pd.Series) -> str:
-    """Create a signature string from a case row."""
-    sig_parts = []
-    
-    # Case ID
-    for col in ['caseid', 'primaryid', 'isr', 'xevmpd_id']:
-        if col in row.index:
-            val = str(row.get(col, '')).strip()
-            if val:
-                sig_parts.append(val)
-                break
-    
-    # Demographics
-    if 'age' in row.index or 'age_yrs' in row.index:
-        age = row.get('age') or row.get('age_yrs')
-        if pd.notna(age):
-            sig_parts.append(f"age_{int(float(age))}")
-    
-    if 'sex' in row.index or 'gender' in row.index:
-        sex = str(row.get('sex') or row.get('gender', '')).upper()
-        if sex in ['M', 'F']:
-            sig_parts.append(f"sex_{sex}")
-    
-    # Events
-    if 'reaction' in row.index:
-        reaction = normalize_text(str(row.get('reaction', '')))
-        if reaction:
-            sig_parts.append(f"react_{reaction}")
-    
-    if 'drug_name' in row.index:
-        drug = normalize_text(str(row.get('drug_name', '')))
-        if drug:
-            sig_parts.append(f"drug_{drug}")
-    
-    return '|'.join(sig_parts)
+class _UnionFind:
+    """Disjoint-set forest over case labels (union by size, path halving)."""
+    
+    def __init__(self):
+        self.parent: Dict = {}
+        self.size: Dict = {}
+    
+    def find(self, item):
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+    
+    def union(self, a, b) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+    
+    def groups(self) -> List[List]:
+        """Connected groups with more than one member, in first-seen order."""
+        members = defaultdict(list)
+        for item in self.parent:
+            members[self.find(item)].append(item)
+        return [sorted(group) for group in members.values() if len(group) > 1]
 
 
 def _merge_duplicate_groups(groups_list: List[List[List[int]]]) -> List[List[int]]:
-    """Merge overlapping duplicate groups."""
+    """Merge overlapping duplicate groups (connected components via union-find)."""
     if not groups_list:
         return []
     
-    # Flatten and deduplicate
-    all_groups = []
-    seen_indices = set()
-    
+    union_find = _UnionFind()
     for groups in groups_list:
         for group in groups:
-            if group:
-                # Remove duplicates within group
-                unique_group = list(dict.fromkeys(group))  # Preserves order
-                if len(unique_group) > 1:
-                    group_tuple = tuple(sorted(unique_group))
-                    if group_tuple not in seen_indices:
-                        seen_indices.add(group_tuple)
-                        all_groups.append(unique_group)
-    
-    # Merge overlapping groups
-    merged = []
-    used = set()
-    
-    for i, group1 in enumerate(all_groups):
-        if i in used:
-            continue
-        
-        current_group = set(group1)
-        used.add(i)
-        
-        # Find all overlapping groups
-        changed = True
-        while changed:
-            changed = False
-            for j, group2 in enumerate(all_groups):
-                if j in used or j == i:
-                    continue
-                
-                if current_group & set(group2):
-                    current_group |= set(group2)
-                    used.add(j)
-                    changed = True
-        
-        merged.append(sorted(list(current_group)))
+            if group and len(group) > 1:
+                first = group[0]
+                for other in group[1:]:
+                    union_find.union(first, other)
     
-    return merged
+    return union_find.groups()
+
+
+def _count_cross_source_groups(df: pd.DataFrame, groups: List[List[int]], source_column: str) -> int:
+    """Number of duplicate groups whose cases come from more than one source."""
+    if not groups:
+        return 0
+    if not df.index.is_unique:
+        return sum(1 for group in groups if len(set(df.loc[group, source_column].values)) > 1)
+    
+    flat = [label for group in groups for label in group]
+    group_ids = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    source_codes = pd.factorize(df[source_column])[0][df.index.get_indexer(flat)]
+    return int((pd.Series(source_codes).groupby(group_ids).nunique() > 1).sum())
 
 
 def remove_duplicates(
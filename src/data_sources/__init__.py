@@ -6,6 +6,8 @@ from .safe_executor import SafeExecutor, RetryConfig, safe_fetch, safe_request
 from .data_source_manager import DataSourceManager, DataSourceConfig, FallbackMode
 from .data_source_manager_v2 import DataSourceManagerV2
 from .base import SourceClientBase
+from .http_pool import RateLimiter, FixtureAdapter, FixtureMissingError, get_rate_limiter, get_session, http_fixtures
+from .openfda_backfill import OpenFDABackfill, BackfillProgress
 from .registry import SourceRegistry
 
 __all__ = [
@@ -19,5 +21,13 @@ __all__ = [
     "FallbackMode",
     "SourceClientBase",
     "SourceRegistry",
+    "RateLimiter",
+    "get_rate_limiter",
+    "get_session",
+    "FixtureAdapter",
+    "FixtureMissingError",
+    "http_fixtures",
+    "OpenFDABackfill",
+    "BackfillProgress",
 ]
 
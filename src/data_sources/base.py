@@ -5,6 +5,10 @@ Ensures consistent behavior across all sources.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
+
+import requests
+
+from .http_pool import DeadlineExceeded, get_rate_limiter, get_session, remaining_time
 from .safe_executor import SafeExecutor, RetryConfig
 
 
@@ -14,6 +18,9 @@ class SourceClientBase(ABC):
     All sources inherit from this to ensure consistent behavior.
     """
     
+    # Requests per second (None = not throttled); "rate_limit_per_sec" in the config overrides it
+    RATE_LIMIT: Optional[float] = None
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         """
         Initialize source client.
@@ -27,6 +34,7 @@ class SourceClientBase(ABC):
         self.fallback_mode = config.get("fallback", "silent")
         self.priority = config.get("priority", 0)
         self.metadata = config.get("metadata", {})
+        self.rate_limit = config.get("rate_limit_per_sec")
         
         # Create safe executor for this source
         retry_config = RetryConfig(
@@ -38,6 +46,40 @@ class SourceClientBase(ABC):
         )
         self.executor = SafeExecutor(name, retry_config)
     
+    def requests_per_second(self) -> Optional[float]:
+        """Request rate this source is throttled to (override for key-dependent limits)."""
+        return self.rate_limit or self.RATE_LIMIT
+    
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET through the shared pooled session, throttled by the source's rate limiter.
+        
+        Under a request deadline (http_pool.request_deadline) the timeout is
+        capped at the time left, and DeadlineExceeded is raised instead of
+        starting a request once it has passed.
+        
+        Args:
+            url: Request URL
+            **kwargs: Passed to requests (params, headers, timeout, ...)
+        
+        Returns:
+            Response object
+        """
+        rate = self.requests_per_second()
+        if rate:
+            get_rate_limiter(self.name, rate).acquire()
+        kwargs.setdefault("timeout", self.executor.config.timeout_secs)
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{self.name}: deadline passed, request to {url} not started")
+            timeout = kwargs["timeout"]
+            if isinstance(timeout, tuple):
+                kwargs["timeout"] = tuple(remaining if part is None else min(part, remaining) for part in timeout)
+            else:
+                kwargs["timeout"] = remaining if timeout is None else min(timeout, remaining)
+        return get_session().get(url, **kwargs)
+    
     @abstractmethod
     def fetch(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
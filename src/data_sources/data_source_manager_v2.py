@@ -4,10 +4,13 @@ Full integration with all sources, unified payload, fault isolation, AI enhancem
 """
 
 import os
+import time
+import threading
 import yaml
 import traceback
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -15,8 +18,9 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 import requests.exceptions
 
 from .base import SourceClientBase
+from .http_pool import request_deadline
 from .registry import SourceRegistry
-from .safe_executor import SafeExecutor
+from .safe_executor import SafeExecutor, stop_at_request_deadline
 from .utils import normalize_drug_name, sanitize_text, estimate_confidence, estimate_severity
 
 logger = logging.getLogger(__name__)
@@ -24,6 +28,11 @@ logger = logging.getLogger(__name__)
 CONFIG_PATH = Path("data_source_config.yaml")
 ENV_PATH = Path(".env")
 
+# Seconds a source may run in fetch_all before its results are dropped,
+# counted from when its task starts (per source: "deadline_secs" in the config)
+DEFAULT_SOURCE_DEADLINE = 60.0
+MAX_FETCH_WORKERS = 16
+
 
 class DataSourceManagerV2:
     """
@@ -36,6 +45,8 @@ class DataSourceManagerV2:
     - Normalizes payloads to unified format
     - AI-enhanced confidence and severity scoring
     - Fault isolation (one bad source never breaks the pipeline)
+    - Concurrent fan-out: sources are fetched in parallel on a shared
+      thread pool, each with its own deadline
     """
     
     def __init__(self, config_path: Optional[Path] = None, env_path: Optional[Path] = None):
@@ -52,6 +63,8 @@ class DataSourceManagerV2:
         self.env_cache = self._load_env()
         self.registry = SourceRegistry(config_path=self.config_path)
         self.clients: Dict[str, SourceClientBase] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
         self._initialize_clients()
     
     def _load_config(self) -> Dict[str, Any]:
@@ -147,7 +160,7 @@ class DataSourceManagerV2:
             logger.error(traceback.format_exc())
     
     @retry(
-        stop=stop_after_attempt(3),
+        stop=stop_after_attempt(3) | stop_at_request_deadline,
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type(requests.exceptions.RequestException)
     )
@@ -164,47 +177,145 @@ class DataSourceManagerV2:
         """
         return client.fetch(query)
     
-    def fetch_all(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Thread pool shared by all fetch_all calls (created on first use)."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=min(MAX_FETCH_WORKERS, max(1, len(self.clients))),
+                    thread_name_prefix="source-fetch"
+                )
+            return self._pool
+    
+    def _source_deadline(self, src: str) -> float:
+        cfg = self.config.get("sources", {}).get(src, {})
+        return float(cfg.get("deadline_secs", DEFAULT_SOURCE_DEADLINE))
+    
+    def _fetch_unified(self, src_name: str, client: SourceClientBase, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch from one source (with retry) and unify its entries."""
+        raw_entries = self._safe_fetch(client, query) or []
+        results = []
+        for entry in raw_entries:
+            unified = self._unify_entry(entry, src_name)
+            if unified:
+                results.append(unified)
+        return results
+    
+    def _fetch_within_deadline(
+        self,
+        src_name: str,
+        client: SourceClientBase,
+        query: Dict[str, Any],
+        budget: float,
+        overall_deadline: Optional[float],
+        clock: Dict[str, float]
+    ) -> List[Dict[str, Any]]:
+        """Run _fetch_unified under a request deadline that starts now (recorded in clock)."""
+        deadline = time.monotonic() + budget
+        if overall_deadline is not None:
+            deadline = min(deadline, overall_deadline)
+        clock["deadline"] = deadline
+        with request_deadline(deadline):
+            return self._fetch_unified(src_name, client, query)
+    
+    def iter_fetch_all(
+        self,
+        query: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Fetch all enabled sources concurrently, yielding results as each source completes.
+        
+        A source that fails is logged and skipped; one that runs past its
+        deadline is logged and dropped, so a slow source never holds back the
+        others. A source's deadline ("deadline_secs" in its config) counts
+        from when its task starts on the pool, so time spent queued does not
+        use it up; timeout bounds the whole call. The deadline is also passed
+        down to the client's requests: each request's timeout is capped at
+        the time left, and no request or retry starts after it. A dropped
+        source's worker thread is abandoned, not stopped - it finishes its
+        in-flight request (bounded by that capped timeout) in the background.
+        
+        Args:
+            query: Query parameters (drug_name, reaction, date_range, etc.)
+            timeout: Optional overall limit in seconds
+        
+        Yields:
+            Tuples of (source name, unified AE entries), in completion order
+        """
+        clients = [(src_name, client) for src_name, client in self.clients.items() if self.is_enabled(src_name)]
+        if not clients:
+            return
+        
+        pool = self._get_pool()
+        started = time.monotonic()
+        overall_deadline = None if timeout is None else started + timeout
+        # future -> (source, deadline budget, clock filled in when the task starts)
+        pending: Dict[Future, Tuple[str, float, Dict[str, float]]] = {}
+        for src_name, client in clients:
+            budget = self._source_deadline(src_name)
+            clock: Dict[str, float] = {}
+            future = pool.submit(
+                self._fetch_within_deadline, src_name, client, query, budget, overall_deadline, clock
+            )
+            pending[future] = (src_name, budget, clock)
+        
+        while pending:
+            now = time.monotonic()
+            next_deadline = None
+            for future, (src_name, budget, clock) in list(pending.items()):
+                if future.done():
+                    continue
+                deadline = clock.get("deadline")
+                if deadline is None:
+                    # Still queued: its clock starts no earlier than now
+                    deadline = now + budget if overall_deadline is None else min(now + budget, overall_deadline)
+                if deadline <= now:
+                    future.cancel()
+                    del pending[future]
+                    logger.warning(
+                        f"Source {src_name} missed its deadline ({budget:.1f}s), skipping "
+                        f"(its worker finishes the in-flight request in the background)"
+                    )
+                else:
+                    next_deadline = deadline if next_deadline is None else min(next_deadline, deadline)
+            if not pending:
+                break
+            
+            wait_for = None if next_deadline is None else max(0.0, next_deadline - now)
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                src_name, _, _ = pending.pop(future)
+                try:
+                    yield src_name, future.result()
+                except Exception as e:
+                    # Fault isolation: log error but continue with other sources
+                    logger.warning(f"Source {src_name} failed: {str(e)}")
+                    logger.debug(traceback.format_exc())
+    
+    def fetch_all(self, query: Dict[str, Any], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Execute fetch for all enabled sources and merge results.
         
+        Sources are fetched concurrently (see iter_fetch_all); the merged list
+        keeps priority order (higher first).
+        
         Args:
             query: Query parameters (drug_name, reaction, date_range, etc.)
+            timeout: Optional overall limit in seconds
             
         Returns:
             List of unified AE entries from all sources
         """
-        results = []
+        by_source = dict(self.iter_fetch_all(query, timeout=timeout))
         
         # Sort by priority (higher first)
-        sorted_clients = sorted(
-            self.clients.items(),
-            key=lambda x: getattr(x[1], 'priority', 0),
+        sorted_sources = sorted(
+            (src_name for src_name in self.clients if src_name in by_source),
+            key=lambda src_name: getattr(self.clients[src_name], 'priority', 0),
             reverse=True
         )
-        
-        for src_name, client in sorted_clients:
-            if not self.is_enabled(src_name):
-                continue
-            
-            try:
-                # Fetch with retry
-                raw_entries = self._safe_fetch(client, query)
-                
-                if not raw_entries:
-                    continue
-                
-                # Normalize each entry
-                for entry in raw_entries:
-                    unified = self._unify_entry(entry, src_name)
-                    if unified:
-                        results.append(unified)
-            
-            except Exception as e:
-                # Fault isolation: log error but continue with other sources
-                logger.warning(f"Source {src_name} failed: {str(e)}")
-                logger.debug(traceback.format_exc())
-                continue
+        results = [entry for src_name in sorted_sources for entry in by_source[src_name]]
         
         logger.info(f"Fetched {len(results)} unified entries from {len(self.clients)} sources")
         return results
@@ -227,15 +338,7 @@ class DataSourceManagerV2:
         client = self.clients[source_name]
         
         try:
-            raw_entries = self._safe_fetch(client, query)
-            results = []
-            
-            for entry in raw_entries:
-                unified = self._unify_entry(entry, source_name)
-                if unified:
-                    results.append(unified)
-            
-            return results
+            return self._fetch_unified(source_name, client, query)
         except Exception as e:
             logger.error(f"Error fetching from {source_name}: {str(e)}")
             return []
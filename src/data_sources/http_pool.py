@@ -0,0 +1,266 @@
+"""
+Shared HTTP transport for data source clients.
+
+All clients go through one pooled requests.Session (keep-alive connections,
+so repeated calls to the same host skip the TCP/TLS handshake) and are
+throttled by a per-source token bucket instead of sleeping between calls.
+
+Because every request passes through that session, http_fixtures() can
+record live responses to a JSON file and replay them later, so a fetch run
+can be reproduced offline.
+
+A thread can also run under a request deadline (request_deadline()): source
+clients then cap each request's timeout at the time left and start no new
+request once it has passed.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Connection pool sizing: one pool per host, POOL_MAXSIZE sockets per pool
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_limiters: Dict[str, "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+_local = threading.local()
+
+# Query parameters left out of fixture keys (credentials)
+FIXTURE_IGNORED_PARAMS = ("api_key", "key")
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Holds up to `burst` tokens and refills at `rate` tokens per second;
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Requests per second
+            burst: Requests that may be made back to back
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def acquire(self) -> None:
+        """Take one token, waiting for the bucket to refill if it is empty."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session shared by all source clients."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_rate_limiter(name: str, rate: float) -> RateLimiter:
+    """
+    Rate limiter shared by every client of a source.
+
+    Args:
+        name: Source name (e.g. "pubmed")
+        rate: Requests per second; updates the shared limiter if it changed
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = RateLimiter(rate)
+        elif limiter.rate != rate:
+            limiter.set_rate(rate)
+        return limiter
+
+
+class DeadlineExceeded(TimeoutError):
+    """The thread's request deadline passed before a request could start."""
+
+
+@contextmanager
+def request_deadline(deadline: Optional[float]) -> Iterator[None]:
+    """
+    Run the block under a request deadline for the current thread.
+
+    Args:
+        deadline: time.monotonic() value (None = no deadline); nested
+            deadlines keep the earlier one
+    """
+    previous = getattr(_local, "deadline", None)
+    if deadline is not None and previous is not None:
+        deadline = min(deadline, previous)
+    _local.deadline = deadline if deadline is not None else previous
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current thread's request deadline (None = no deadline)."""
+    deadline = getattr(_local, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class FixtureMissingError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+class FixtureAdapter(BaseAdapter):
+    """
+    Transport adapter that records responses or replays recorded ones.
+
+    Requests are keyed by method, URL without query string and sorted query
+    parameters (minus ignore_params). Repeated requests with the same key are
+    replayed in recording order.
+    """
+
+    def __init__(self, path: Path, mode: str = "replay", ignore_params: Iterable[str] = FIXTURE_IGNORED_PARAMS):
+        """
+        Args:
+            path: Fixture JSON file
+            mode: "replay" (serve recorded responses) or "record" (call through and save)
+            ignore_params: Query parameters that do not distinguish requests
+        """
+        super().__init__()
+        if mode not in ("replay", "record"):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.ignore_params = frozenset(ignore_params)
+        self._lock = threading.Lock()
+        self._recorded: List[Dict] = []
+        self._replay: Dict[Tuple, Deque[Dict]] = {}
+        self._live: Optional[HTTPAdapter] = None
+        if mode == "replay":
+            with open(self.path, "r") as f:
+                for record in json.load(f):
+                    self._replay.setdefault(self._record_key(record), deque()).append(record)
+        else:
+            self._live = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+
+    def _request_fields(self, request: requests.PreparedRequest) -> Dict:
+        parts = urlsplit(request.url)
+        params = sorted(
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name not in self.ignore_params
+        )
+        return {
+            "method": request.method,
+            "url": f"{parts.scheme}://{parts.netloc}{parts.path}",
+            "params": [list(param) for param in params],
+        }
+
+    @staticmethod
+    def _record_key(record: Dict) -> Tuple:
+        return record["method"], record["url"], tuple(tuple(param) for param in record["params"])
+
+    def send(self, request, **kwargs) -> requests.Response:
+        fields = self._request_fields(request)
+        if self.mode == "record":
+            response = self._live.send(request, **kwargs)
+            record = dict(
+                fields,
+                status=response.status_code,
+                headers={"Content-Type": response.headers.get("Content-Type", "")},
+                body=response.text,
+            )
+            with self._lock:
+                self._recorded.append(record)
+            return response
+
+        with self._lock:
+            queue = self._replay.get(self._record_key(fields))
+            if not queue:
+                raise FixtureMissingError(f"No recorded response for {fields['method']} {fields['url']} {fields['params']}")
+            record = queue.popleft() if len(queue) > 1 else queue[0]
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record.get("headers", {}))
+        response._content = record["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def save(self) -> None:
+        """Write recorded exchanges to the fixture file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            records = list(self._recorded)
+        with open(self.path, "w") as f:
+            json.dump(records, f, indent=1)
+
+    def close(self) -> None:
+        if self._live is not None:
+            self._live.close()
+
+
+@contextmanager
+def http_fixtures(
+    path: Path,
+    mode: str = "replay",
+    ignore_params: Iterable[str] = FIXTURE_IGNORED_PARAMS
+) -> Iterator[FixtureAdapter]:
+    """
+    Route the shared session through a FixtureAdapter for the duration of the block.
+
+    In record mode the exchanges are written to path on exit; in replay mode
+    requests without a recorded response raise FixtureMissingError.
+    """
+    session = get_session()
+    adapter = FixtureAdapter(path, mode=mode, ignore_params=ignore_params)
+    with _session_lock:
+        previous = dict(session.adapters)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    try:
+        yield adapter
+    finally:
+        with _session_lock:
+            for prefix, original in previous.items():
+                session.mount(prefix, original)
+        if mode == "record":
+            adapter.save()
+        adapter.close()
@@ -0,0 +1,306 @@
+"""
+OpenFDA Backfill - Bulk, resumable FAERS event ingestion into unified storage
+
+A date range is cut into fixed windows (window_days). Each window is split
+further by receive date until every piece has few enough reports to page
+through within openFDA's skip limit. The pages of a window are fetched
+concurrently on a small thread pool; requests still go through the client's
+rate limiter, so the pool only overlaps network latency. Entries are
+streamed into UnifiedStorageEngine batch by batch. A window is recorded in
+the JSON checkpoint once all of its rows are stored, so an interrupted run
+resumes at the first unfinished window. Event ids are derived from the
+report id (or, for a report without one, from its content) as name-based
+UUIDs, so a re-fetched window replaces its rows instead of duplicating them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .sources.openfda import OpenFDAClient
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = Path("data/backfill")
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_WORKERS = 4
+DEFAULT_STORE_BATCH_SIZE = 2000
+
+# uuid5 namespace of backfilled ae_ids (ae_events.ae_id is a UUID on Supabase)
+AE_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://api.fda.gov/drug/event.json")
+
+DateLike = Union[date, datetime, str]
+
+
+@dataclass
+class BackfillProgress:
+    """Summary of a backfill run."""
+    drug_name: str
+    windows_total: int = 0
+    windows_skipped: int = 0
+    windows_completed: int = 0
+    reports_fetched: int = 0
+    events_stored: int = 0
+    truncated_days: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "drug_name": self.drug_name,
+            "windows_total": self.windows_total,
+            "windows_skipped": self.windows_skipped,
+            "windows_completed": self.windows_completed,
+            "reports_fetched": self.reports_fetched,
+            "events_stored": self.events_stored,
+            "truncated_days": list(self.truncated_days),
+        }
+
+
+class OpenFDABackfill:
+    """
+    Seeds unified storage with openFDA adverse event reports for one drug at a time.
+    """
+
+    def __init__(
+        self,
+        client: OpenFDAClient,
+        storage,
+        checkpoint_dir: Optional[Path] = None,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_STORE_BATCH_SIZE
+    ):
+        """
+        Args:
+            client: OpenFDA client (its rate limiter throttles all requests)
+            storage: UnifiedStorageEngine receiving the events
+            checkpoint_dir: Directory for per-drug checkpoint files
+            window_days: Days per checkpointed window
+            workers: Concurrent page requests
+            batch_size: Events per storage batch
+        """
+        self.client = client
+        self.storage = storage
+        self.checkpoint_dir = Path(checkpoint_dir or CHECKPOINT_DIR)
+        self.window_days = max(1, int(window_days))
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+
+    def run(
+        self,
+        drug_name: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        progress_callback: Optional[Callable[[BackfillProgress], None]] = None
+    ) -> BackfillProgress:
+        """
+        Backfill all reports for drug_name received between start_date and end_date (inclusive).
+
+        Args:
+            drug_name: Drug to backfill
+            start_date: First receive date
+            end_date: Last receive date
+            progress_callback: Optional callback(progress) after each window
+
+        Returns:
+            BackfillProgress for this run
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        windows = list(_windows(start, end, self.window_days))
+        checkpoint_path = self.checkpoint_path(drug_name)
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        completed = set(checkpoint.setdefault("completed_windows", []))
+        checkpoint["drug_name"] = drug_name
+
+        progress = BackfillProgress(drug_name=drug_name, windows_total=len(windows))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="openfda-backfill") as pool:
+            for window in windows:
+                key = _window_key(window)
+                if key in completed:
+                    progress.windows_skipped += 1
+                    continue
+
+                reports = self._window_reports(pool, drug_name, window, progress)
+                progress.events_stored += len(
+                    self.storage.store_ae_events_batch(
+                        self._storage_events(reports, drug_name, progress),
+                        batch_size=self.batch_size
+                    )
+                )
+
+                completed.add(key)
+                checkpoint["completed_windows"] = sorted(completed)
+                _write_checkpoint(checkpoint_path, checkpoint)
+                progress.windows_completed += 1
+                logger.info(
+                    f"openFDA backfill {drug_name}: window {key} done "
+                    f"({progress.windows_completed + progress.windows_skipped}/{progress.windows_total})"
+                )
+                if progress_callback:
+                    progress_callback(progress)
+
+        return progress
+
+    def checkpoint_path(self, drug_name: str) -> Path:
+        slug = re.sub(r"[^a-z0-9]+", "_", drug_name.lower()).strip("_") or "drug"
+        return self.checkpoint_dir / f"openfda_{slug}.json"
+
+    # ---------------------------
+    # Fetching
+    # ---------------------------
+    def _window_reports(
+        self,
+        pool: ThreadPoolExecutor,
+        drug_name: str,
+        window: Tuple[date, date],
+        progress: BackfillProgress
+    ) -> Iterator[Dict[str, Any]]:
+        """Reports of one window, yielded as their pages arrive."""
+        client = self.client
+        page_limit = client.MAX_SKIP + client.MAX_PAGE_SIZE
+        pending = set()
+        for piece, total in self._split(drug_name, window):
+            if total > page_limit:
+                progress.truncated_days.append(_window_key(piece))
+                logger.warning(
+                    f"openFDA backfill {drug_name}: {total} reports on {_window_key(piece)}, "
+                    f"only the first {page_limit} are reachable"
+                )
+            search = client.event_search(drug_name, date_range=piece)
+            fetch_page = client.executor.with_retry(client.get_page)
+            for skip in range(0, min(total, page_limit), client.MAX_PAGE_SIZE):
+                page_size = min(client.MAX_PAGE_SIZE, total - skip)
+                pending.add(pool.submit(fetch_page, client.BASE_URL_EVENT, search, page_size, skip))
+
+        # Pages are released as soon as they are consumed
+        try:
+            for future in as_completed(pending):
+                pending.discard(future)
+                results = future.result().get("results", [])
+                progress.reports_fetched += len(results)
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _split(self, drug_name: str, window: Tuple[date, date]) -> List[Tuple[Tuple[date, date], int]]:
+        """
+        Cut a window into date ranges whose report count fits the skip limit.
+
+        Returns:
+            (range, total) pairs for ranges with at least one report
+        """
+        client = self.client
+        page_limit = client.MAX_SKIP + client.MAX_PAGE_SIZE
+        pieces = []
+        stack = [window]
+        while stack:
+            piece = stack.pop()
+            total = client.count_results(client.BASE_URL_EVENT, client.event_search(drug_name, date_range=piece))
+            if total > page_limit and piece[0] < piece[1]:
+                middle = piece[0] + (piece[1] - piece[0]) // 2
+                stack.append((middle + timedelta(days=1), piece[1]))
+                stack.append((piece[0], middle))
+            elif total:
+                pieces.append((piece, total))
+        return pieces
+
+    # ---------------------------
+    # Storage mapping
+    # ---------------------------
+    def _storage_events(
+        self,
+        reports: Iterator[Dict[str, Any]],
+        drug_name: str,
+        progress: BackfillProgress
+    ) -> Iterator[Dict[str, Any]]:
+        """ae_events rows for reports: one per (report, reaction)."""
+        drug_normalized = drug_name.lower().strip()
+        for report in reports:
+            entry = self.client._normalize_openfda_entry(report, drug_name)
+            metadata = {key: value for key, value in entry["metadata"].items() if key != "raw_entry"}
+            report_id = metadata.get("report_id")
+            report_key = report_id or _content_key(report)
+            serious = str(report.get("serious")) == "1"
+            event_date = entry["timestamp"]
+            text = entry["text"] or ""
+            for reaction in dict.fromkeys(entry["reactions"]):
+                yield {
+                    "ae_id": str(uuid.uuid5(AE_ID_NAMESPACE, f"{report_key}:{drug_normalized}:{reaction.lower()}")),
+                    "source": "openfda",
+                    "source_id": report_id,
+                    "drug_raw": drug_name,
+                    "drug_normalized": drug_normalized,
+                    "reaction_raw": reaction,
+                    "reaction_normalized": reaction.lower().strip(),
+                    "reaction_severity_score": entry["severity"],
+                    "serious": serious,
+                    "event_date": event_date,
+                    "report_date": event_date,
+                    "full_text": text[:5000],
+                    "text_snippet": text[:500],
+                    "metadata": metadata,
+                }
+
+    # ---------------------------
+    # Checkpoint
+    # ---------------------------
+    @staticmethod
+    def _load_checkpoint(path: Path) -> Dict[str, Any]:
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backfill checkpoint {path}: {str(e)}")
+            return {}
+
+
+def _write_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    """Write the checkpoint atomically (temp file + replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _to_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).replace("-", ""), "%Y%m%d").date()
+
+
+def _windows(start: date, end: date, days: int) -> Iterator[Tuple[date, date]]:
+    """Consecutive inclusive (first, last) date ranges of `days` days covering start..end."""
+    current = start
+    while current <= end:
+        last = min(end, current + timedelta(days=days - 1))
+        yield current, last
+        current = last + timedelta(days=1)
+
+
+def _window_key(window: Tuple[date, date]) -> str:
+    return f"{window[0]:%Y%m%d}-{window[1]:%Y%m%d}"
+
+
+def _content_key(report: Dict[str, Any]) -> str:
+    """Stable id for a report without safetyreportid: digest of its canonical JSON."""
+    canonical = json.dumps(report, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha1-" + hashlib.sha1(canonical.encode("utf-8")).hexdigest()
@@ -25,6 +25,8 @@ from requests.exceptions import (
     ConnectionError as RequestsConnectionError
 )
 
+from .http_pool import remaining_time
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,15 @@ class RetryConfig:
         self.timeout_secs = timeout_secs
 
 
+def stop_at_request_deadline(retry_state) -> bool:
+    """
+    Tenacity stop condition: the current thread's request deadline (see
+    http_pool.request_deadline) passes before the next attempt would start.
+    """
+    remaining = remaining_time()
+    return remaining is not None and remaining <= (getattr(retry_state, "upcoming_sleep", 0) or 0)
+
+
 class SafeExecutor:
     """
     Executes a callable with retries, exponential backoff, timeouts, and soft-failure.
@@ -80,7 +91,8 @@ class SafeExecutor:
             Wrapped function with retry behavior
         """
         @retry(
-            stop=stop_after_attempt(self.config.attempts),
+            # No further attempt that would start past the thread's request deadline
+            stop=stop_after_attempt(self.config.attempts) | stop_at_request_deadline,
             wait=wait_exponential(
                 multiplier=self.config.multiplier,
                 min=self.config.min_wait,
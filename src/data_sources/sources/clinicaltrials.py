@@ -3,7 +3,6 @@ ClinicalTrials.gov API Client.
 Fetches adverse event data from ClinicalTrials.gov.
 """
 
-import requests
 from typing import Dict, Any, List
 from datetime import datetime
 
@@ -52,7 +51,7 @@ class ClinicalTrialsClient(SourceClientBase):
         }
         
         # Make request
-        response = requests.get(self.BASE_URL, params=params, timeout=20)
+        response = self.http_get(self.BASE_URL, params=params, timeout=20)
         response.raise_for_status()
         data = response.json()
         
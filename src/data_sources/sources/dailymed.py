@@ -3,7 +3,6 @@ DailyMed API Client.
 Fetches adverse event information from DailyMed drug labels.
 """
 
-import requests
 from typing import Dict, Any, List
 from datetime import datetime
 import re
@@ -46,7 +45,7 @@ class DailyMedClient(SourceClientBase):
             "drug_name": drug_name
         }
         
-        response = requests.get(search_url, params=search_params, timeout=20)
+        response = self.http_get(search_url, params=search_params, timeout=20)
         response.raise_for_status()
         data = response.json()
         
@@ -62,7 +61,7 @@ class DailyMedClient(SourceClientBase):
         
         # Fetch label
         label_url = f"{self.BASE_URL}/spls/{drug_set_id}.json"
-        label_response = requests.get(label_url, timeout=30)
+        label_response = self.http_get(label_url, timeout=30)
         label_response.raise_for_status()
         label_data = label_response.json()
         
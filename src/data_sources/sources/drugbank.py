@@ -4,7 +4,6 @@ Drug database with chemical structures and drug interactions.
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 
 from ..base import SourceClientBase
@@ -51,7 +50,7 @@ class DrugBankClient(SourceClientBase):
         search_params = {"q": drug_name}
         
         try:
-            search_response = requests.get(search_url, headers=headers, params=search_params, timeout=20)
+            search_response = self.http_get(search_url, headers=headers, params=search_params, timeout=20)
             search_response.raise_for_status()
             search_data = search_response.json()
             
@@ -64,7 +63,7 @@ class DrugBankClient(SourceClientBase):
             drug_id = drug_ids[0]
             drug_url = f"{self.BASE_URL}/{drug_id}/adverse-reactions"
             
-            drug_response = requests.get(drug_url, headers=headers, timeout=20)
+            drug_response = self.http_get(drug_url, headers=headers, timeout=20)
             drug_response.raise_for_status()
             drug_data = drug_response.json()
         except Exception:
@@ -68,7 +68,7 @@ class EpicFHIRClient(SourceClientBase):
         }
         
         try:
-            response = requests.get(search_url, headers=headers, params=params, timeout=20)
+            response = self.http_get(search_url, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
         except Exception:
@@ -4,7 +4,6 @@ Patient health data aggregation from EHRs, labs, pharmacies.
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 
 from ..base import SourceClientBase
@@ -55,7 +54,7 @@ class HumanAPIClient(SourceClientBase):
         }
         
         try:
-            response = requests.get(self.BASE_URL, headers=headers, params=params, timeout=20)
+            response = self.http_get(self.BASE_URL, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
         except Exception:
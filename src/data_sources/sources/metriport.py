@@ -4,7 +4,6 @@ EHR/claims data integration from hospitals and health systems.
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 
 from ..base import SourceClientBase
@@ -54,7 +53,7 @@ class MetriportClient(SourceClientBase):
         }
         
         try:
-            response = requests.get(self.BASE_URL, headers=headers, params=params, timeout=20)
+            response = self.http_get(self.BASE_URL, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
         except Exception:
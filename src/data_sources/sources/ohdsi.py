@@ -4,7 +4,6 @@ Observational Health Data Sciences and Informatics - Research-grade EHR data.
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 
 from ..base import SourceClientBase
@@ -60,7 +59,7 @@ class OHDSIClient(SourceClientBase):
             params["outcome"] = reaction
         
         try:
-            response = requests.get(self.BASE_URL, headers=headers, params=params, timeout=20)
+            response = self.http_get(self.BASE_URL, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
         except Exception:
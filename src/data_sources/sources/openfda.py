@@ -12,10 +12,13 @@ Rate Limits:
 - 1 request/second (without key)
 
 No API key required - works without authentication.
+
+Paging: at most 1000 results per request and skip values up to 25000, so
+one search can return at most 26000 results (larger ranges are split into
+date windows, see openfda_backfill).
 """
 import os
-import requests
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from ..base import SourceClientBase
@@ -37,6 +40,9 @@ class OpenFDAClient(SourceClientBase):
     BASE_URL_LABEL = "https://api.fda.gov/drug/label.json"
     BASE_URL_RECALL = "https://api.fda.gov/drug/recall.json"
     
+    MAX_PAGE_SIZE = 1000
+    MAX_SKIP = 25000
+    
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
         # Get API key from config file first, then environment
@@ -46,6 +52,10 @@ class OpenFDAClient(SourceClientBase):
             os.getenv("OPENFDA_API_KEY")
         )
     
+    def requests_per_second(self) -> float:
+        """240 requests/minute with an API key, 1 request/second without."""
+        return self.rate_limit or (4.0 if self.api_key else 1.0)
+    
     def fetch(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Fetch adverse events from OpenFDA.
@@ -54,7 +64,7 @@ class OpenFDAClient(SourceClientBase):
             query: Query parameters
                 - drug_name: Drug name to search
                 - reaction: Reaction term (optional)
-                - limit: Number of results (default: 100)
+                - limit: Number of results (default: 100; paged past MAX_PAGE_SIZE)
                 - date_range: Tuple of (start_date, end_date) (optional)
         
         Returns:
@@ -65,38 +75,96 @@ class OpenFDAClient(SourceClientBase):
             return []
         
         limit = query.get("limit", 100)
-        reaction = query.get("reaction")
+        search_query = self.event_search(drug_name, query.get("reaction"), query.get("date_range"))
         
-        # Build search query
+        # Normalize results
+        results = []
+        for result in self.iter_results(self.BASE_URL_EVENT, search_query, limit):
+            normalized = self._normalize_openfda_entry(result, drug_name)
+            if normalized:
+                results.append(normalized)
+        
+        return results
+    
+    @staticmethod
+    def event_search(
+        drug_name: str,
+        reaction: Optional[str] = None,
+        date_range: Optional[Tuple[Any, Any]] = None
+    ) -> str:
+        """
+        Event endpoint search expression.
+        
+        Args:
+            drug_name: Drug name (medicinalproduct)
+            reaction: Optional MedDRA preferred term
+            date_range: Optional (start, end) receive dates (dates, datetimes or YYYYMMDD strings)
+        """
         search_terms = [f'patient.drug.medicinalproduct:"{drug_name}"']
         if reaction:
             search_terms.append(f'patient.reaction.reactionmeddrapt:"{reaction}"')
+        if date_range:
+            start, end = (
+                value.strftime("%Y%m%d") if hasattr(value, "strftime") else str(value).replace("-", "")
+                for value in date_range
+            )
+            search_terms.append(f"receivedate:[{start}+TO+{end}]")
+        return "+AND+".join(search_terms)
+    
+    def get_page(
+        self,
+        url: str,
+        search: Optional[str],
+        limit: int,
+        skip: int = 0
+    ) -> Dict[str, Any]:
+        """
+        One page of results (rate limited through the shared session).
         
-        search_query = "+AND+".join(search_terms)
-        
-        # Build URL
-        params = {
-            "search": search_query,
-            "limit": min(limit, 100),  # OpenFDA max is 100
-            "skip": 0
-        }
+        openFDA answers 404 when nothing matches; that is returned as an
+        empty page rather than raised.
         
+        Returns:
+            Response JSON ({"meta": ..., "results": [...]})
+        """
+        params: Dict[str, Any] = {"limit": limit, "skip": skip}
+        if search:
+            params["search"] = search
         if self.api_key:
             params["api_key"] = self.api_key
         
-        # Make request
-        response = requests.get(self.BASE_URL_EVENT, params=params, timeout=20)
+        response = self.http_get(url, params=params, timeout=30)
+        if response.status_code == 404:
+            return {"meta": {"results": {"total": 0}}, "results": []}
         response.raise_for_status()
-        data = response.json()
+        return response.json()
+    
+    def count_results(self, url: str, search: Optional[str]) -> int:
+        """Total number of matches for a search (from a one-result page)."""
+        data = self.get_page(url, search, limit=1)
+        return int(data.get("meta", {}).get("results", {}).get("total", len(data.get("results", []))))
+    
+    def iter_results(self, url: str, search: Optional[str], limit: int) -> Iterator[Dict[str, Any]]:
+        """
+        Page through up to limit results of a search (stops at the skip limit).
         
-        # Normalize results
-        results = []
-        for result in data.get("results", []):
-            normalized = self._normalize_openfda_entry(result, drug_name)
-            if normalized:
-                results.append(normalized)
+        Args:
+            url: Endpoint URL
+            search: Search expression (None for all records)
+            limit: Maximum number of results
         
-        return results
+        Yields:
+            Raw result records
+        """
+        limit = min(limit, self.MAX_SKIP + self.MAX_PAGE_SIZE)
+        skip = 0
+        while skip < limit:
+            page_size = min(self.MAX_PAGE_SIZE, limit - skip)
+            results = self.get_page(url, search, page_size, skip).get("results", [])
+            yield from results
+            if len(results) < page_size:
+                break
+            skip += page_size
     
     def _normalize_openfda_entry(self, entry: Dict[str, Any], drug_name: str) -> Dict[str, Any]:
         """
@@ -193,22 +261,9 @@ class OpenFDAClient(SourceClientBase):
         # Build search query
         search_query = f'openfda.brand_name:"{drug_name}"'
         
-        params = {
-            "search": search_query,
-            "limit": min(limit, 100),
-            "skip": 0
-        }
-        
-        if self.api_key:
-            params["api_key"] = self.api_key
-        
         try:
-            response = requests.get(self.BASE_URL_LABEL, params=params, timeout=20)
-            response.raise_for_status()
-            data = response.json()
-            
             results = []
-            for result in data.get("results", []):
+            for result in self.iter_results(self.BASE_URL_LABEL, search_query, limit):
                 results.append({
                     "drug": drug_name,
                     "label": result,
@@ -247,24 +302,11 @@ class OpenFDAClient(SourceClientBase):
         if drug_name:
             search_terms.append(f'openfda.brand_name:"{drug_name}"')
         
-        params = {
-            "limit": min(limit, 100),
-            "skip": 0
-        }
-        
-        if search_terms:
-            params["search"] = "+AND+".join(search_terms)
-        
-        if self.api_key:
-            params["api_key"] = self.api_key
+        search_query = "+AND+".join(search_terms) if search_terms else None
         
         try:
-            response = requests.get(self.BASE_URL_RECALL, params=params, timeout=20)
-            response.raise_for_status()
-            data = response.json()
-            
             results = []
-            for result in data.get("results", []):
+            for result in self.iter_results(self.BASE_URL_RECALL, search_query, limit):
                 results.append({
                     "drug": drug_name or "unknown",
                     "recall": result,
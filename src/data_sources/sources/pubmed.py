@@ -4,10 +4,8 @@ Fetches adverse event mentions from PubMed literature.
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 from datetime import datetime
-import time
 
 from ..base import SourceClientBase
 from src.utils.config_loader import load_config
@@ -31,6 +29,10 @@ class PubMedClient(SourceClientBase):
         )
         self.email = os.getenv("PUBMED_EMAIL", "user@example.com")  # Required by NCBI
     
+    def requests_per_second(self) -> float:
+        """NCBI allows 3 requests/second, 10 with an API key."""
+        return self.rate_limit or (10.0 if self.api_key else 3.0)
+    
     def fetch(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Fetch adverse event mentions from PubMed.
@@ -71,7 +73,7 @@ class PubMedClient(SourceClientBase):
         if self.api_key:
             search_params["api_key"] = self.api_key
         
-        search_response = requests.get(search_url, params=search_params, timeout=20)
+        search_response = self.http_get(search_url, params=search_params, timeout=20)
         search_response.raise_for_status()
         search_data = search_response.json()
         
@@ -91,10 +93,7 @@ class PubMedClient(SourceClientBase):
         if self.api_key:
             fetch_params["api_key"] = self.api_key
         
-        # Rate limiting (NCBI requires delay)
-        time.sleep(0.34)  # 3 requests per second max
-        
-        fetch_response = requests.get(fetch_url, params=fetch_params, timeout=30)
+        fetch_response = self.http_get(fetch_url, params=fetch_params, timeout=30)
         fetch_response.raise_for_status()
         
         # Parse XML (simplified - would use proper XML parser in production)
@@ -4,7 +4,6 @@ WHO global adverse event database (VigiBase).
 """
 
 import os
-import requests
 from typing import Dict, Any, List
 
 from ..base import SourceClientBase
@@ -59,7 +58,7 @@ class VigiBaseClient(SourceClientBase):
             params["reaction"] = reaction
         
         try:
-            response = requests.get(self.BASE_URL, headers=headers, params=params, timeout=20)
+            response = self.http_get(self.BASE_URL, headers=headers, params=params, timeout=20)
             response.raise_for_status()
             data = response.json()
         except Exception:
@@ -0,0 +1,296 @@
+"""
+Dataset term vocabulary for AetherSignal query parsing.
+
+Indexes the distinct drug_name / reaction terms of a dataset (values split
+on "; ", stripped and lowercased, at least 3 characters) so the query
+parser can ask which dataset terms contain, or are contained in, a query
+word without scanning the vocabulary:
+
+- Terms containing X: trigram inverted index (sorted postings), the
+  rarest postings are intersected and the survivors verified.
+- Terms contained in X: every substring of X is looked up in a hash map.
+
+Vocabularies are keyed by a fingerprint of the column contents and kept in
+a small LRU; DataFrames are tracked by weak reference, so entries never
+outlive their frame or go stale when an id is reused.
+"""
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.query_dataset import column_identity
+
+VOCABULARY_COLUMNS = ['drug_name', 'reaction']
+TERM_SEPARATOR = '; '
+MIN_TERM_LENGTH = 3
+
+_GRAM = 3
+_MAX_CACHED_VOCABULARIES = 4
+_MAX_TRACKED_FRAMES = 16
+
+# Intersect at most this many postings before verifying candidates
+_MAX_INTERSECTIONS = 4
+
+_vocabularies: "OrderedDict[str, DatasetVocabulary]" = OrderedDict()
+_frames: "OrderedDict[int, Tuple[weakref.ref, Tuple, str]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+class TermVocabulary:
+    """Distinct normalized terms of one column with substring indexes."""
+
+    def __init__(self, terms: np.ndarray, originals: np.ndarray, counts: np.ndarray):
+        """
+        Index a vocabulary.
+
+        Args:
+            terms: Distinct normalized terms
+            originals: First original spelling of each term
+            counts: Number of rows mentioning each term
+        """
+        self.terms = terms
+        self.originals = originals
+        self.counts = counts
+        self.lengths = np.fromiter(map(len, terms), dtype=np.int64, count=len(terms))
+        self.max_length = int(self.lengths.max()) if len(terms) else 0
+        self._term_ids: Dict[str, int] = {term: term_id for term_id, term in enumerate(terms)}
+        self._build_gram_index()
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "TermVocabulary":
+        """
+        Build the vocabulary of a drug_name / reaction column.
+
+        Args:
+            series: Column values (multi-value cells separated by "; ")
+
+        Returns:
+            TermVocabulary instance
+        """
+        value_counts = series.dropna().astype(str).value_counts(sort=False)
+        parts = pd.Series(value_counts.index, dtype=object).str.split(TERM_SEPARATOR).explode().str.strip()
+        row_counts = value_counts.to_numpy()[parts.index.to_numpy()]
+        normalized = parts.str.lower()
+        keep = (normalized.str.len() >= MIN_TERM_LENGTH).to_numpy(dtype=bool)
+        parts, normalized, row_counts = parts[keep], normalized[keep], row_counts[keep]
+        if normalized.empty:
+            empty = np.array([], dtype=object)
+            return cls(empty, empty, np.array([], dtype=np.int64))
+
+        codes, terms = pd.factorize(normalized, sort=False)
+        first = ~normalized.duplicated().to_numpy()
+        originals = np.empty(len(terms), dtype=object)
+        originals[codes[first]] = parts.to_numpy(dtype=object)[first]
+        counts = np.bincount(codes, weights=row_counts, minlength=len(terms)).astype(np.int64)
+        return cls(np.asarray(terms, dtype=object), originals, counts)
+
+    def _build_gram_index(self) -> None:
+        """Trigram -> term ids (CSR, term ids ascending within each trigram)."""
+        codes, owner = _gram_codes(list(self.terms))
+        order = np.lexsort((owner, codes))
+        codes, owner = codes[order], owner[order]
+        distinct = np.ones(len(codes), dtype=bool)
+        distinct[1:] = (codes[1:] != codes[:-1]) | (owner[1:] != owner[:-1])
+        codes, owner = codes[distinct], owner[distinct]
+        keys, starts = np.unique(codes, return_index=True)
+        self._gram_keys = keys
+        self._gram_offsets = np.append(starts, len(codes)).astype(np.int64)
+        self._gram_terms = owner.astype(np.int32)
+
+    def containing(self, text: str) -> np.ndarray:
+        """
+        Ids of the terms that contain text.
+
+        Args:
+            text: Normalized query text (at least 3 characters)
+
+        Returns:
+            Ascending term ids
+        """
+        if len(text) < _GRAM or not len(self._gram_keys):
+            return np.empty(0, dtype=np.int32)
+        grams = np.unique(_gram_codes([text])[0])
+        slots = np.searchsorted(self._gram_keys, grams)
+        if (slots >= len(self._gram_keys)).any() or (self._gram_keys[np.minimum(slots, len(self._gram_keys) - 1)] != grams).any():
+            return np.empty(0, dtype=np.int32)
+
+        postings = sorted(
+            (self._gram_terms[self._gram_offsets[slot]:self._gram_offsets[slot + 1]] for slot in slots),
+            key=len
+        )
+        candidates = postings[0]
+        for posting in postings[1:_MAX_INTERSECTIONS]:
+            found = np.searchsorted(posting, candidates)
+            candidates = candidates[posting[np.minimum(found, len(posting) - 1)] == candidates]
+            if not len(candidates):
+                return candidates
+        if len(grams) == 1 and len(text) == _GRAM:
+            return candidates
+        terms = self.terms
+        return candidates[np.fromiter((text in terms[term_id] for term_id in candidates.tolist()), dtype=bool, count=len(candidates))]
+
+    def contained_in(self, text: str) -> List[int]:
+        """
+        Ids of the terms that are substrings of text.
+
+        Args:
+            text: Normalized query text
+
+        Returns:
+            Term ids
+        """
+        term_ids = self._term_ids
+        longest = min(len(text), self.max_length)
+        found = set()
+        for start in range(len(text) - MIN_TERM_LENGTH + 1):
+            for end in range(start + MIN_TERM_LENGTH, min(start + longest, len(text)) + 1):
+                term_id = term_ids.get(text[start:end])
+                if term_id is not None:
+                    found.add(term_id)
+        return sorted(found)
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        Best dataset term for a query word (original spelling).
+
+        Preference: exact match; else the most reported term containing the
+        word (shorter first on ties); else the longest term contained in it.
+
+        Args:
+            text: Normalized query text
+
+        Returns:
+            Original spelling of the matched term, or None
+        """
+        term_id = self._term_ids.get(text)
+        if term_id is not None:
+            return self.originals[term_id]
+
+        candidates = self.containing(text)
+        if len(candidates):
+            order = np.lexsort((candidates, self.lengths[candidates], -self.counts[candidates]))
+            return self.originals[candidates[order[0]]]
+
+        contained = self.contained_in(text)
+        if contained:
+            best = min(contained, key=lambda term_id: (-self.lengths[term_id], -self.counts[term_id], term_id))
+            return self.originals[best]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+class DatasetVocabulary:
+    """Term vocabularies of a dataset's drug_name / reaction columns."""
+
+    def __init__(self, columns: Dict[str, TermVocabulary], fingerprint: str):
+        self.columns = columns
+        self.fingerprint = fingerprint
+
+    def match(self, column: str, text: str) -> Optional[str]:
+        """
+        Best term of a column for a normalized query word (see TermVocabulary.match).
+
+        Returns:
+            Original spelling of the matched term, or None (also if the column is absent)
+        """
+        vocabulary = self.columns.get(column)
+        return vocabulary.match(text) if vocabulary is not None else None
+
+
+def get_dataset_vocabulary(df: pd.DataFrame) -> DatasetVocabulary:
+    """
+    Return the shared vocabulary for df, building it on first use.
+
+    Frames are tracked by weak reference and revalidated against a cheap
+    signature; vocabularies are shared by every frame with the same column
+    contents and evicted least-recently-used. In-place cell edits keep the
+    column buffers, so (as with get_query_dataset) they are not detected.
+    """
+    key = id(df)
+    signature = _column_signature(df)
+    with _lock:
+        entry = _frames.get(key)
+        if entry is not None:
+            ref, frame_signature, fingerprint = entry
+            if ref() is df and frame_signature == signature and fingerprint in _vocabularies:
+                _frames.move_to_end(key)
+                _vocabularies.move_to_end(fingerprint)
+                return _vocabularies[fingerprint]
+
+    value_counts = {
+        col: df[col].dropna().astype(str).value_counts(sort=False)
+        for col in VOCABULARY_COLUMNS if col in df.columns
+    }
+    fingerprint = _fingerprint(value_counts)
+    with _lock:
+        vocabulary = _vocabularies.get(fingerprint)
+    if vocabulary is None:
+        vocabulary = DatasetVocabulary(
+            {col: TermVocabulary.from_series(df[col]) for col in value_counts},
+            fingerprint
+        )
+
+    with _lock:
+        _vocabularies[fingerprint] = vocabulary
+        _vocabularies.move_to_end(fingerprint)
+        while len(_vocabularies) > _MAX_CACHED_VOCABULARIES:
+            _vocabularies.popitem(last=False)
+        try:
+            ref = weakref.ref(df, lambda _ref, key=key: _discard(key, _ref))
+        except TypeError:
+            return vocabulary
+        _frames[key] = (ref, signature, fingerprint)
+        while len(_frames) > _MAX_TRACKED_FRAMES:
+            _frames.popitem(last=False)
+    return vocabulary
+
+
+def prepare_dataset_vocabulary(df: pd.DataFrame) -> None:
+    """Build the term vocabulary for a freshly loaded dataset (call at load time)."""
+    if df is not None and not df.empty:
+        get_dataset_vocabulary(df)
+
+
+def _discard(key: int, ref: weakref.ref) -> None:
+    with _lock:
+        entry = _frames.get(key)
+        if entry is not None and entry[0] is ref:
+            del _frames[key]
+
+
+def _column_signature(df: pd.DataFrame) -> Tuple:
+    """Cheap identity of the vocabulary columns (shape, names and data buffers)."""
+    buffers = [column_identity(df[col]) for col in VOCABULARY_COLUMNS if col in df.columns]
+    return (len(df), tuple(df.columns), tuple(buffers))
+
+
+def _fingerprint(value_counts: Dict[str, pd.Series]) -> str:
+    """Content fingerprint of the vocabulary columns (values and their row counts)."""
+    digest = hashlib.sha1()
+    for col, counts in value_counts.items():
+        digest.update(col.encode())
+        digest.update(pd.util.hash_pandas_object(counts, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _gram_codes(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Character trigram codes of texts and the index of the text each belongs to."""
+    if not texts:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < _GRAM:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    owner = np.repeat(np.arange(len(texts)), lengths)[:len(codes) - _GRAM + 1]
+    grams = (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+    valid = np.arange(len(grams)) + _GRAM <= ends[owner]
+    return grams[valid], owner[valid]
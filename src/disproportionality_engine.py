@@ -0,0 +1,372 @@
+"""
+Columnar disproportionality engine for AetherSignal.
+Computes PRR/ROR (95% CI), chi-square, IC and EBGM for every drug–event pair
+in a single pass over the dataset using a sparse drug × event count matrix.
+
+get_disproportionality_table() keeps the all-pairs table of a loaded dataset
+(built once at load time by prepare_disproportionality_table), so views that
+look up a few pairs do not recount the whole dataset on every rerun.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from scipy import sparse
+from scipy.stats import chi2 as chi2_dist
+
+TABLE_COLUMNS = [
+    'drug', 'reaction', 'count', 'a', 'b', 'c', 'd',
+    'prr', 'prr_ci_lower', 'prr_ci_upper',
+    'ror', 'ror_ci_lower', 'ror_ci_upper',
+    'chi2', 'p_value',
+    'ic', 'ic_025', 'ic_975',
+    'ebgm', 'eb05', 'eb95',
+]
+
+_MAX_CACHED_TABLES = 4
+
+_tables: "OrderedDict[int, Tuple[weakref.ref, Tuple, pd.DataFrame]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def _explode_terms(series: pd.Series, separator: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split a multi-value column once and factorize the normalized terms.
+
+    Args:
+        series: Column with separator-joined values (e.g. "aspirin; ibuprofen")
+        separator: Value separator
+
+    Returns:
+        Tuple of (row positions, term codes, unique term labels)
+    """
+    values = series.reset_index(drop=True)
+    exploded = values.astype(str).str.split(separator).explode()
+    exploded = exploded.str.strip().str.lower()
+    valid = exploded.notna() & (exploded != "") & (exploded != "nan") & (exploded != "none")
+    exploded = exploded[valid]
+
+    rows = exploded.index.to_numpy(dtype=np.int64)
+    codes, labels = pd.factorize(exploded, sort=False)
+    return rows, codes.astype(np.int64), np.asarray(labels, dtype=object)
+
+
+def _incidence_matrix(rows: np.ndarray, codes: np.ndarray, n_rows: int, n_terms: int) -> sparse.csr_matrix:
+    """Build a binary case × term incidence matrix (duplicates within a case count once)."""
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, codes)),
+        shape=(n_rows, n_terms),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def build_drug_event_counts(
+    df: pd.DataFrame,
+    drug_col: str = 'drug_name',
+    reaction_col: str = 'reaction',
+    separator: str = ';',
+) -> Optional[Dict]:
+    """
+    Build the sparse drug × event co-report matrix and its marginals.
+
+    Args:
+        df: Normalized DataFrame (one row per case)
+        drug_col: Drug column name
+        reaction_col: Reaction column name
+        separator: Separator used for multi-value cells
+
+    Returns:
+        Dictionary with 'counts' (sparse drugs × events), 'drug_totals',
+        'event_totals', 'drugs', 'events' and 'n', or None if columns are missing
+    """
+    if df is None or drug_col not in df.columns or reaction_col not in df.columns:
+        return None
+
+    n_rows = len(df)
+    drug_rows, drug_codes, drugs = _explode_terms(df[drug_col], separator)
+    event_rows, event_codes, events = _explode_terms(df[reaction_col], separator)
+
+    drug_matrix = _incidence_matrix(drug_rows, drug_codes, n_rows, len(drugs))
+    event_matrix = _incidence_matrix(event_rows, event_codes, n_rows, len(events))
+
+    counts = (drug_matrix.T @ event_matrix).tocoo()
+
+    return {
+        'counts': counts,
+        'drug_totals': np.asarray(drug_matrix.sum(axis=0)).ravel(),
+        'event_totals': np.asarray(event_matrix.sum(axis=0)).ravel(),
+        'drugs': drugs,
+        'events': events,
+        'n': n_rows,
+    }
+
+
+def compute_disproportionality_metrics(
+    a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized PRR/ROR/chi-square/IC/EBGM for arrays of 2x2 tables.
+
+    Formulas mirror signal_stats.calculate_prr_ror and
+    advanced_stats.calculate_ic / calculate_ebgm, so a row of the table
+    matches what the scalar functions return for the same a, b, c, d.
+    PRR/ROR/chi-square are NaN where calculate_prr_ror would return None.
+
+    Args:
+        a, b, c, d: 2x2 contingency table cells (same length)
+
+    Returns:
+        Dictionary of metric arrays
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+    d = np.asarray(d, dtype=np.float64)
+    n = a + b + c + d
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (a > 0) & ~((b == 0) & (c == 0))
+
+        # PRR with 95% CI (log-normal approximation)
+        prr_den = c * (a + b)
+        prr = np.where(prr_den > 0, a * (c + d) / prr_den, 0.0)
+        se_log = np.sqrt(1 / a + 1 / b + 1 / c + 1 / d)
+        log_prr = np.log(np.where(prr > 0, prr, 1.0))
+        prr_ci_lower = np.where(prr > 0, np.exp(log_prr - 1.96 * se_log), 0.0)
+        prr_ci_upper = np.where(prr > 0, np.exp(log_prr + 1.96 * se_log), 0.0)
+
+        # ROR with 95% CI
+        ror_den = b * c
+        ror = np.where(ror_den > 0, a * d / ror_den, 0.0)
+        log_ror = np.log(np.where(ror > 0, ror, 1.0))
+        ror_ci_lower = np.where(ror > 0, np.exp(log_ror - 1.96 * se_log), 0.0)
+        ror_ci_upper = np.where(ror > 0, np.exp(log_ror + 1.96 * se_log), 0.0)
+
+        # Chi-square with Yates correction (as scipy.stats.chi2_contingency)
+        row1, row2 = a + b, c + d
+        col1, col2 = a + c, b + d
+        expected = np.stack([row1 * col1, row1 * col2, row2 * col1, row2 * col2]) / n
+        deviation = np.abs(a - expected[0])
+        deviation = deviation - np.minimum(0.5, deviation)
+        chi2 = (deviation ** 2 * (1 / expected).sum(axis=0))
+        chi2_valid = valid & (expected > 0).all(axis=0)
+        chi2 = np.where(chi2_valid, chi2, np.nan)
+        p_value = np.where(chi2_valid, chi2_dist.sf(np.nan_to_num(chi2), 1), np.nan)
+
+        # Information Component (lambda = 0.5)
+        lam = 0.5
+        ic_expected = (a + b + lam) * (a + c + lam) / (n + lam)
+        ic_observed = a + lam
+        ic = np.log2(ic_observed / ic_expected)
+        ic_var = 1 / ic_observed - 1 / (n + lam)
+        ic_se = np.sqrt(np.where(ic_var > 0, ic_var, 0.01))
+        ic_ok = (n > 0) & (ic_expected > 0)
+        ic = np.where(ic_ok, ic, 0.0)
+        ic_025 = np.where(ic_ok, ic - 1.96 * ic_se, 0.0)
+        ic_975 = np.where(ic_ok, ic + 1.96 * ic_se, 0.0)
+
+        # Simplified EBGM with EB05/EB95
+        eb_expected = np.where(n > 0, (a + b) * (a + c) / n, 0.0)
+        eb_obs = a + 0.5
+        eb_exp = eb_expected + 0.5
+        rr = eb_obs / eb_exp
+        eb_var = 1 / eb_obs + 1 / eb_exp
+        eb_se = np.sqrt(np.where(eb_var > 0, eb_var, 0.01))
+        log_rr = np.log(np.where(rr > 0, rr, 1.0))
+        eb_ok = (n > 0) & (rr > 0)
+        ebgm = np.where(eb_ok, np.exp(log_rr), 0.0)
+        eb05 = np.where(eb_ok, np.exp(log_rr - 1.645 * eb_se), 0.0)
+        eb95 = np.where(eb_ok, np.exp(log_rr + 1.645 * eb_se), 0.0)
+
+    def only_valid(values: np.ndarray) -> np.ndarray:
+        return np.where(valid, values, np.nan)
+
+    return {
+        'prr': only_valid(prr),
+        'prr_ci_lower': only_valid(prr_ci_lower),
+        'prr_ci_upper': only_valid(prr_ci_upper),
+        'ror': only_valid(ror),
+        'ror_ci_lower': only_valid(ror_ci_lower),
+        'ror_ci_upper': only_valid(ror_ci_upper),
+        'chi2': chi2,
+        'p_value': p_value,
+        'ic': np.round(ic, 3),
+        'ic_025': np.round(ic_025, 3),
+        'ic_975': np.round(ic_975, 3),
+        'ebgm': np.round(ebgm, 3),
+        'eb05': np.round(eb05, 3),
+        'eb95': np.round(eb95, 3),
+    }
+
+
+def compute_disproportionality_table(
+    df: pd.DataFrame,
+    min_cases: int = 1,
+    drug_col: str = 'drug_name',
+    reaction_col: str = 'reaction',
+    separator: str = ';',
+) -> pd.DataFrame:
+    """
+    Compute disproportionality statistics for every drug–event pair in one pass.
+
+    Multi-value drug/reaction cells are split once, drug and event names are
+    lower-cased and stripped, and each case counts at most once per pair.
+
+    Args:
+        df: Normalized DataFrame (one row per case)
+        min_cases: Minimum co-reported cases (a) for a pair to be included
+        drug_col: Drug column name
+        reaction_col: Reaction column name
+        separator: Separator used for multi-value cells
+
+    Returns:
+        DataFrame with columns TABLE_COLUMNS, sorted by count descending
+    """
+    counts = build_drug_event_counts(df, drug_col, reaction_col, separator)
+    if counts is None or counts['counts'].nnz == 0:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+
+    matrix = counts['counts']
+    return table_from_counts(
+        counts['drugs'][matrix.row],
+        counts['events'][matrix.col],
+        matrix.data,
+        counts['drug_totals'][matrix.row],
+        counts['event_totals'][matrix.col],
+        counts['n'],
+        min_cases,
+    )
+
+
+def get_disproportionality_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the shared all-pairs table for df, indexed by (drug, reaction).
+
+    Tables are keyed by DataFrame identity like the query index, dropped when
+    the DataFrame is garbage-collected, and rebuilt if drug_name or reaction
+    was replaced. Callers must not modify the returned table.
+    """
+    key = id(df)
+    signature = _frame_signature(df)
+    with _tables_lock:
+        entry = _tables.get(key)
+        if entry is not None:
+            ref, cached_signature, table = entry
+            if ref() is df and cached_signature == signature:
+                _tables.move_to_end(key)
+                return table
+
+    table = compute_disproportionality_table(df).set_index(['drug', 'reaction'])
+    with _tables_lock:
+        try:
+            ref = weakref.ref(df, lambda _ref, key=key: _discard(key, _ref))
+        except TypeError:
+            return table
+        _tables[key] = (ref, signature, table)
+        while len(_tables) > _MAX_CACHED_TABLES:
+            _tables.popitem(last=False)
+    return table
+
+
+def prepare_disproportionality_table(df: pd.DataFrame) -> None:
+    """Build the all-pairs table for a freshly loaded dataset (call at load time)."""
+    if df is not None and not df.empty and 'drug_name' in df.columns and 'reaction' in df.columns:
+        get_disproportionality_table(df)
+
+
+def _discard(key: int, ref: weakref.ref) -> None:
+    with _tables_lock:
+        entry = _tables.get(key)
+        if entry is not None and entry[0] is ref:
+            del _tables[key]
+
+
+def _frame_signature(df: pd.DataFrame) -> Tuple:
+    """Cheap identity of the counted columns (length and data buffers)."""
+    from src.query_dataset import column_identity
+
+    return (len(df), tuple(
+        column_identity(df[col]) if col in df.columns else None for col in ('drug_name', 'reaction')
+    ))
+
+
+def table_from_counts(
+    drugs: np.ndarray,
+    reactions: np.ndarray,
+    pair_counts: np.ndarray,
+    drug_totals: np.ndarray,
+    event_totals: np.ndarray,
+    n: int,
+    min_cases: int = 1,
+) -> pd.DataFrame:
+    """
+    Disproportionality table from precomputed pair and marginal case counts.
+
+    Args:
+        drugs, reactions: Drug and reaction name of each pair
+        pair_counts: Cases reporting both (a)
+        drug_totals: Cases reporting the pair's drug
+        event_totals: Cases reporting the pair's reaction
+        n: Total cases
+        min_cases: Minimum co-reported cases (a) for a pair to be included
+
+    Returns:
+        DataFrame with columns TABLE_COLUMNS, sorted by count descending
+    """
+    keep = np.asarray(pair_counts) >= max(1, min_cases)
+    if not keep.any():
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    a = np.asarray(pair_counts)[keep].astype(np.int64)
+
+    b = np.asarray(drug_totals)[keep] - a
+    c = np.asarray(event_totals)[keep] - a
+    d = n - a - b - c
+
+    table = pd.DataFrame({
+        'drug': np.asarray(drugs, dtype=object)[keep],
+        'reaction': np.asarray(reactions, dtype=object)[keep],
+        'count': a,
+        'a': a,
+        'b': b,
+        'c': c,
+        'd': d,
+    })
+    for name, values in compute_disproportionality_metrics(a, b, c, d).items():
+        table[name] = values
+
+    table = table.sort_values(['count', 'drug', 'reaction'], ascending=[False, True, True])
+    return table.reset_index(drop=True)[TABLE_COLUMNS]
+
+
+def table_to_candidates(table: pd.DataFrame, min_cases: int = 1) -> List[Dict]:
+    """
+    Convert a disproportionality table into signal candidate dictionaries.
+
+    The output has the drug/reaction/count keys expected by
+    quantum_ranking.quantum_rerank_signals plus all metric columns
+    (missing metrics become None).
+
+    Args:
+        table: Output of compute_disproportionality_table
+        min_cases: Minimum case count
+
+    Returns:
+        List of candidate dictionaries
+    """
+    if table is None or table.empty:
+        return []
+
+    subset = table[table['count'] >= min_cases]
+    subset = subset.astype(object).where(subset.notna(), None)
+    records = subset.to_dict('records')
+    for record in records:
+        for key in ('count', 'a', 'b', 'c', 'd'):
+            if record.get(key) is not None:
+                record[key] = int(record[key])
+    return records
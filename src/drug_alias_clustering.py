@@ -0,0 +1,632 @@
+"""
+Scalable drug alias clustering for AetherSignal.
+
+Groups verbatim drug names (e.g. "METFORMIN HCL", "metformn", "Glucophage")
+into alias clusters without comparing every name against every other:
+
+1. Verbatim names are normalized (aggressive mode, through the persistent
+   normalization cache) and deduplicated into comparison keys.
+2. Candidate pairs come from MinHash LSH over character 3-grams of the
+   token-sorted keys (numpy, no per-pair Python work).
+3. Candidates are scored with rapidfuzz.process.cdist in batches using the
+   same measure as fuzzy_match_drugs (token sort ratio).
+4. Matches are merged with union-find; each cluster's canonical name is its
+   most reported member.
+
+The index persists under data/cache/drug_aliases/ and update() only hashes
+and scores the names a new quarter adds. Report counts are added once per
+dataset fingerprint, so indexing the same dataset again changes nothing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.drug_name_normalization import (
+    fuzzy_match_drugs,
+    get_normalization_cache,
+    _normalization_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+# rapidfuzz scores candidates in C (optionally multi-threaded)
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+DEFAULT_ALIAS_CACHE_DIR = "data/cache/drug_aliases"
+ALIAS_INDEX_VERSION = "2"
+_INDEX_FILE = "alias_index.json"
+_BANDS_FILE = "lsh_bands.npy"
+
+# Fingerprints of datasets whose report counts are in the index (oldest forgotten first)
+MAX_RECORDED_DATASETS = 4096
+
+# LSH parameters: 3-gram Jaccard of short names differing by one edit is
+# only ~0.4-0.6, so bands are narrow (2 rows) and numerous
+DEFAULT_NUM_PERM = 48
+DEFAULT_BANDS = 24
+SHINGLE_SIZE = 3
+
+# Candidate pairs are scored in batches of this many pairs
+SCORE_BATCH_PAIRS = 65536
+
+# Buckets larger than this are scored with cdist (query batches of
+# SCORE_BATCH_ROWS rows against length-compatible members) instead of
+# being expanded into pairs
+LARGE_GROUP_ROWS = 512
+SCORE_BATCH_ROWS = 1024
+
+
+class UnionFind:
+    """Array-based union-find (path halving, union by size)."""
+
+    def __init__(self, size: int = 0):
+        """
+        Initialize with singleton sets.
+
+        Args:
+            size: Number of elements
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self, count: int = 1) -> None:
+        """Append count new singleton elements."""
+        start = len(self.parent)
+        self.parent.extend(range(start, start + count))
+        self.size.extend([1] * count)
+
+    def find(self, item: int) -> int:
+        """Root of an element's set."""
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> Tuple[int, int]:
+        """
+        Merge the sets of two elements.
+
+        Returns:
+            Tuple of (new root, absorbed root); equal if already merged
+        """
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a, root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a, root_b
+
+    def roots(self) -> np.ndarray:
+        """Root of every element (compresses all paths)."""
+        return np.fromiter((self.find(item) for item in range(len(self.parent))), dtype=np.int64, count=len(self.parent))
+
+
+def _sorted_tokens(key: str) -> str:
+    """Comparison form of a key: lowercase, whitespace tokens sorted (token sort)."""
+    return " ".join(sorted(key.lower().split()))
+
+
+def minhash_bands(
+    texts: List[str],
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    LSH band hashes of the character 3-gram MinHash signatures of texts.
+
+    Shingling and hashing are vectorized over the concatenated code points
+    of all texts; texts are padded with spaces so every text has shingles.
+
+    Args:
+        texts: Comparison strings
+        num_perm: MinHash signature length (multiple of bands)
+        bands: Number of LSH bands
+        seed: Hash seed (fixed so persisted bands stay comparable)
+
+    Returns:
+        uint64 array of shape (len(texts), bands)
+    """
+    count = len(texts)
+    if count == 0:
+        return np.zeros((0, bands), dtype=np.uint64)
+    rows = num_perm // bands
+
+    padded = [f" {text} " for text in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=count)
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    ends = np.cumsum(lengths)
+
+    # 3-gram ids: windows that stay inside their own text
+    owner = np.repeat(np.arange(count), lengths)[:len(codes) - SHINGLE_SIZE + 1]
+    shingles = (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+    valid = np.arange(len(shingles)) + SHINGLE_SIZE <= ends[owner]
+    shingles, owner = shingles[valid], owner[valid]
+    segment_starts = np.searchsorted(owner, np.arange(count))
+
+    # Multiply-shift hash family; minimum per text for each permutation
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    signature = np.empty((count, num_perm), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for perm in range(num_perm):
+            hashed = (shingles * multipliers[perm] + offsets[perm]) >> np.uint64(32)
+            signature[:, perm] = np.minimum.reduceat(hashed, segment_starts)
+
+        # Fold each band's rows into one hash
+        mixers = rng.integers(1, 2 ** 63, size=rows, dtype=np.uint64) | np.uint64(1)
+        band_hashes = np.zeros((count, bands), dtype=np.uint64)
+        for row in range(rows):
+            band_hashes += signature[:, row::rows][:, :bands] * mixers[row]
+    return band_hashes
+
+
+def candidate_pairs(
+    band_hashes: np.ndarray,
+    is_new: np.ndarray,
+    lengths: Optional[np.ndarray] = None,
+    min_length_ratio: float = 0.0,
+    max_group: int = LARGE_GROUP_ROWS
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Candidate key pairs sharing an LSH bucket, at least one of them new.
+
+    Pairs are expanded with numpy per band, filtered by length and
+    deduplicated across bands (compacted as they accumulate).
+
+    Args:
+        band_hashes: Band hash matrix (see minhash_bands)
+        is_new: Boolean mask of keys added in this update
+        lengths: Optional text lengths for the length filter
+        min_length_ratio: Drop pairs whose shorter/longer length ratio is below this
+        max_group: Buckets larger than this are returned whole instead
+
+    Returns:
+        Tuple of (sorted unique pair codes a * len(band_hashes) + b with a < b,
+                  list of oversized buckets)
+    """
+    count = len(band_hashes)
+    unique_codes = np.zeros(0, dtype=np.int64)
+    pending: List[np.ndarray] = []
+    pending_size = 0
+    large_groups = []
+    seen_large = set()
+    positions = np.arange(count)
+    for band in range(band_hashes.shape[1]):
+        column = band_hashes[:, band]
+        order = np.argsort(column, kind="stable")
+        boundaries = np.flatnonzero(np.diff(column[order])) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [count]))
+        has_new = np.add.reduceat(is_new[order].astype(np.int64), starts) > 0
+        sizes = ends - starts
+
+        large = has_new & (sizes > max_group)
+        for start, end in zip(starts[large], ends[large]):
+            members = np.sort(order[start:end])
+            if members.tobytes() not in seen_large:
+                seen_large.add(members.tobytes())
+                large_groups.append(members)
+
+        # Every position pairs with the later positions of its bucket
+        keep = has_new & (sizes >= 2) & (sizes <= max_group)
+        group_end = np.repeat(np.where(keep, ends, 0), sizes)
+        partners = np.maximum(group_end - positions - 1, 0)
+        total = int(partners.sum())
+        if total == 0:
+            continue
+        left = np.repeat(positions, partners)
+        right = left + 1 + np.arange(total) - np.repeat(np.cumsum(partners) - partners, partners)
+        a, b = order[left], order[right]
+        del left, right
+        wanted = is_new[a] | is_new[b]
+        if lengths is not None and min_length_ratio > 0:
+            length_a, length_b = lengths[a], lengths[b]
+            wanted &= np.minimum(length_a, length_b) >= min_length_ratio * np.maximum(length_a, length_b)
+        a, b = a[wanted], b[wanted]
+        pending.append(np.minimum(a, b).astype(np.int64) * count + np.maximum(a, b))
+        pending_size += len(pending[-1])
+
+        # Compact once the pending codes outgrow the deduplicated ones
+        if pending_size > max(len(unique_codes), 1 << 20):
+            unique_codes = np.unique(np.concatenate([unique_codes] + pending))
+            pending, pending_size = [], 0
+
+    if pending:
+        unique_codes = np.unique(np.concatenate([unique_codes] + pending))
+    return unique_codes, large_groups
+
+
+class DrugAliasIndex:
+    """
+    Persistent, incrementally updated drug alias clusters.
+
+    Keys are distinct aggressive-normalized names; verbatim names map to
+    keys, keys are merged into clusters when their token sort ratio reaches
+    the threshold (transitively, via union-find).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        threshold: float = 0.9,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        workers: int = -1
+    ):
+        """
+        Initialize the index (loads the persisted state if compatible).
+
+        Args:
+            cache_dir: Persistence directory (default: DRUG_ALIAS_CACHE_DIR
+                       env var or data/cache/drug_aliases)
+            threshold: Similarity threshold (0-1) for merging keys
+            num_perm: MinHash signature length
+            bands: Number of LSH bands
+            workers: rapidfuzz cdist worker threads (-1 = all cores)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("DRUG_ALIAS_CACHE_DIR", DEFAULT_ALIAS_CACHE_DIR))
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.workers = workers
+        self.fingerprint = self._fingerprint()
+
+        self.keys: List[str] = []
+        self.key_ids: Dict[str, int] = {}
+        self.counts: List[int] = []
+        self.aliases: Dict[str, int] = {}  # Verbatim name -> key id
+        self.clusters = UnionFind()
+        self._best: Dict[int, int] = {}  # Cluster root -> canonical key id
+        self._band_hashes = np.zeros((0, bands), dtype=np.uint64)
+        self.datasets: Dict[str, None] = {}  # Counted dataset fingerprints, oldest first
+        self._dirty = False
+        self.last_update: Dict[str, Any] = {}
+        self._load()
+
+    def _fingerprint(self) -> str:
+        """Fingerprint of everything that shapes the clusters."""
+        digest = hashlib.sha256(ALIAS_INDEX_VERSION.encode())
+        digest.update(json.dumps(
+            [_normalization_fingerprint(), self.threshold, self.num_perm, self.bands, SHINGLE_SIZE]
+        ).encode())
+        return digest.hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def _rank(self, key_id: int) -> Tuple[int, int, str]:
+        """Canonical preference: most reported, then shortest, then alphabetical."""
+        return (-self.counts[key_id], len(self.keys[key_id]), self.keys[key_id])
+
+    def _better(self, a: int, b: int) -> int:
+        return a if self._rank(a) <= self._rank(b) else b
+
+    def update(self, names: Union[Dict[str, int], Iterable[str]], dataset: Optional[str] = None) -> int:
+        """
+        Add verbatim drug names (e.g. a new quarter) and merge their aliases.
+
+        Only keys not seen before are hashed and scored, against the whole
+        index. Report counts of a dataset are added once: with a dataset
+        fingerprint, a repeated fingerprint adds none; without one, only
+        names not indexed before are counted.
+
+        Args:
+            names: Verbatim names, or a mapping of name -> report count
+            dataset: Fingerprint of the dataset the counts come from
+
+        Returns:
+            Number of new keys added
+        """
+        name_counts = names if isinstance(names, dict) else {name: 1 for name in names}
+        new_names = [name for name in name_counts if name not in self.aliases]
+        if dataset is None:
+            counted = {name: name_counts[name] for name in new_names}
+        elif dataset in self.datasets:
+            counted = {}
+        else:
+            counted = name_counts
+            self.datasets[dataset] = None
+            while len(self.datasets) > MAX_RECORDED_DATASETS:
+                del self.datasets[next(iter(self.datasets))]
+        normalized = get_normalization_cache().normalize_many(new_names, aggressive=True)
+
+        first_new = len(self.keys)
+        for name, key in zip(new_names, normalized):
+            if not key:
+                continue
+            key_id = self.key_ids.get(key)
+            if key_id is None:
+                key_id = self.key_ids[key] = len(self.keys)
+                self.keys.append(key)
+                self.counts.append(0)
+            self.aliases[name] = key_id
+
+        new_keys = len(self.keys) - first_new
+        if new_keys:
+            self.clusters.add(new_keys)
+            for key_id in range(first_new, len(self.keys)):
+                self._best[key_id] = key_id
+
+        # Counts only grow, so a member can only overtake its cluster's canonical
+        for name, count in counted.items():
+            key_id = self.aliases.get(name)
+            if key_id is not None and count:
+                self.counts[key_id] += int(count)
+                root = self.clusters.find(key_id)
+                self._best[root] = self._better(self._best[root], key_id)
+
+        merged = 0
+        self.last_update = {}
+        if new_keys:
+            new_bands = minhash_bands(
+                [_sorted_tokens(key) for key in self.keys[first_new:]], self.num_perm, self.bands
+            )
+            self._band_hashes = np.vstack([self._band_hashes, new_bands])
+            is_new = np.zeros(len(self.keys), dtype=bool)
+            is_new[first_new:] = True
+            for a, b in self._score_candidates(is_new):
+                root, absorbed = self.clusters.union(a, b)
+                if root != absorbed:
+                    self._best[root] = self._better(self._best[root], self._best.pop(absorbed))
+                    merged += 1
+
+        self._dirty = self._dirty or bool(new_names) or bool(merged) or any(counted.values())
+        self.last_update.update({"new_names": len(new_names), "new_keys": new_keys, "merges": merged})
+        logger.debug(f"Drug alias index update: {self.last_update}")
+        return new_keys
+
+    def _score_candidates(self, is_new: np.ndarray) -> Iterator[Tuple[int, int]]:
+        """
+        Yield matching key pairs from the LSH candidates.
+
+        A ratio of at least t needs 2 * min(len) / (len(a) + len(b)) >= t,
+        i.e. a shorter/longer length ratio of at least t / (2 - t); pairs
+        outside that bound are dropped before scoring.
+        """
+        texts = [_sorted_tokens(key) for key in self.keys]
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        codes, large_groups = candidate_pairs(
+            self._band_hashes, is_new, lengths, self.threshold / (2 - self.threshold)
+        )
+        self.last_update["candidate_pairs"] = len(codes)
+
+        count = len(self.keys)
+        for batch_start in range(0, len(codes), SCORE_BATCH_PAIRS):
+            batch = codes[batch_start:batch_start + SCORE_BATCH_PAIRS]
+            batch_a, batch_b = (batch // count).tolist(), (batch % count).tolist()
+            matched = self._match_pairs([texts[a] for a in batch_a], [texts[b] for b in batch_b])
+            for position in np.flatnonzero(matched).tolist():
+                yield batch_a[position], batch_b[position]
+
+        for members in large_groups:
+            yield from self._score_large_group(texts, members[is_new[members]], members)
+
+    def _match_pairs(self, texts_a: List[str], texts_b: List[str]) -> np.ndarray:
+        """Boolean mask of the (texts_a[i], texts_b[i]) pairs reaching the threshold."""
+        cutoff = self.threshold * 100
+        if RAPIDFUZZ_AVAILABLE and hasattr(process, "cpdist"):
+            scores = process.cpdist(texts_a, texts_b, scorer=fuzz.ratio, score_cutoff=cutoff, workers=self.workers)
+            return scores >= cutoff
+        if RAPIDFUZZ_AVAILABLE:
+            # rapidfuzz < 3.6 has no pairwise cdist; a direct call per pair is cheaper than a 1x1 cdist
+            ratio = fuzz.ratio
+            matches = (ratio(a, b, score_cutoff=cutoff) >= cutoff for a, b in zip(texts_a, texts_b))
+        else:
+            matches = (
+                fuzzy_match_drugs(a, b, threshold=self.threshold, use_normalization=False)[0]
+                for a, b in zip(texts_a, texts_b)
+            )
+        return np.fromiter(matches, dtype=bool, count=len(texts_a))
+
+    def _score_large_group(self, texts: List[str], queries: np.ndarray, members: np.ndarray) -> Iterator[Tuple[int, int]]:
+        """
+        Score an oversized bucket with cdist, in length-sorted query batches.
+
+        Each batch is only compared with members in its length window.
+        """
+        lengths = np.array([len(texts[member]) for member in members])
+        order = np.argsort(lengths, kind="stable")
+        members, lengths = members[order], lengths[order]
+        queries = queries[np.argsort([len(texts[query]) for query in queries], kind="stable")]
+        ratio = self.threshold / (2 - self.threshold)
+        cutoff = self.threshold * 100
+        for batch_start in range(0, len(queries), SCORE_BATCH_ROWS):
+            batch = queries[batch_start:batch_start + SCORE_BATCH_ROWS]
+            low = np.searchsorted(lengths, len(texts[batch[0]]) * ratio - 1e-9, side="left")
+            high = np.searchsorted(lengths, len(texts[batch[-1]]) / ratio + 1e-9, side="right")
+            window = members[low:high]
+            for row, column in self._match_matrix([texts[query] for query in batch], [texts[member] for member in window], cutoff):
+                if batch[row] != window[column]:
+                    yield int(batch[row]), int(window[column])
+
+    def _match_matrix(self, queries: List[str], choices: List[str], cutoff: float) -> Iterator[Tuple[int, int]]:
+        """(row, column) of query/choice pairs whose similarity reaches the cutoff."""
+        if RAPIDFUZZ_AVAILABLE:
+            scores = process.cdist(
+                queries, choices, scorer=fuzz.ratio, score_cutoff=cutoff, workers=self.workers
+            )
+            rows, columns = np.nonzero(scores >= cutoff)
+            return zip(rows.tolist(), columns.tolist())
+        return (
+            (row, column)
+            for row, query in enumerate(queries)
+            for column, choice in enumerate(choices)
+            if fuzzy_match_drugs(query, choice, threshold=self.threshold, use_normalization=False)[0]
+        )
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        """
+        Canonical name of a verbatim drug name.
+
+        Args:
+            name: Verbatim drug name
+
+        Returns:
+            Canonical (normalized) name, or None if the name is not indexed
+        """
+        key_id = self.aliases.get(name)
+        if key_id is None:
+            return None
+        return self.keys[self._best[self.clusters.find(key_id)]]
+
+    def alias_map(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Map verbatim names to canonical names.
+
+        Args:
+            names: Names to map (default: every indexed name)
+
+        Returns:
+            Dictionary mapping indexed names to canonical names
+        """
+        roots = self.clusters.roots()
+        canonical = [self.keys[self._best[root]] for root in roots.tolist()]
+        names = self.aliases.keys() if names is None else names
+        return {
+            name: canonical[self.aliases[name]]
+            for name in names
+            if name in self.aliases
+        }
+
+    def clusters_by_canonical(self, min_size: int = 2) -> Dict[str, List[str]]:
+        """
+        Group keys by cluster.
+
+        Args:
+            min_size: Minimum number of keys per returned cluster
+
+        Returns:
+            Dictionary mapping canonical name to member keys
+        """
+        groups: Dict[int, List[str]] = {}
+        for key_id, root in enumerate(self.clusters.roots().tolist()):
+            groups.setdefault(root, []).append(self.keys[key_id])
+        return {
+            self.keys[self._best[root]]: members
+            for root, members in groups.items()
+            if len(members) >= min_size
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with name, key and cluster counts and the last update
+        """
+        return {
+            "names": len(self.aliases),
+            "keys": len(self.keys),
+            "clusters": len(self._best),
+            "threshold": self.threshold,
+            "last_update": self.last_update,
+            "path": str(self.cache_dir / _INDEX_FILE),
+        }
+
+    def _load(self) -> None:
+        """Load the persisted index if it exists and matches the fingerprint."""
+        index_path = self.cache_dir / _INDEX_FILE
+        bands_path = self.cache_dir / _BANDS_FILE
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") != self.fingerprint:
+                logger.info("Drug alias index fingerprint changed - rebuilding from scratch")
+                return
+            band_hashes = np.load(bands_path)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable drug alias index {index_path}: {e}")
+            return
+
+        if len(band_hashes) != len(data["keys"]):
+            logger.warning("Drug alias index files are inconsistent - rebuilding from scratch")
+            return
+        self.keys = data["keys"]
+        self.key_ids = {key: key_id for key_id, key in enumerate(self.keys)}
+        self.counts = data["counts"]
+        self.aliases = data["aliases"]
+        self.clusters = UnionFind(len(self.keys))
+        self.clusters.parent = data["parent"]
+        self.clusters.size = data["size"]
+        self._best = {int(root): key_id for root, key_id in data["best"].items()}
+        self.datasets = dict.fromkeys(data.get("datasets", []))
+        self._band_hashes = band_hashes
+
+    def save(self) -> bool:
+        """
+        Persist the index if it changed (atomic replace, best effort).
+
+        Returns:
+            True if the files were written
+        """
+        if not self._dirty:
+            return False
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_bands = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, self._band_hashes)
+
+            self.clusters.roots()  # Compress paths before writing parents
+            data = {
+                "fingerprint": self.fingerprint,
+                "keys": self.keys,
+                "counts": self.counts,
+                "aliases": self.aliases,
+                "parent": self.clusters.parent,
+                "size": self.clusters.size,
+                "best": {str(root): key_id for root, key_id in self._best.items()},
+                "datasets": list(self.datasets),
+            }
+            fd, tmp_index = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+            os.replace(tmp_bands, self.cache_dir / _BANDS_FILE)
+            os.replace(tmp_index, self.cache_dir / _INDEX_FILE)
+            self._dirty = False
+            return True
+        except OSError as e:
+            logger.warning(f"Could not persist drug alias index: {e}")
+            return False
+
+
+_ALIAS_INDEXES: Dict[Tuple[str, float], DrugAliasIndex] = {}
+
+
+def get_alias_index(threshold: float = 0.9, cache_dir: Optional[str] = None) -> DrugAliasIndex:
+    """
+    Get the shared alias index for a threshold (loaded from disk on first use).
+
+    Args:
+        threshold: Similarity threshold
+        cache_dir: Optional persistence directory
+
+    Returns:
+        DrugAliasIndex instance
+    """
+    cache_key = (cache_dir or "", threshold)
+    if cache_key not in _ALIAS_INDEXES:
+        _ALIAS_INDEXES[cache_key] = DrugAliasIndex(cache_dir=cache_dir, threshold=threshold)
+    return _ALIAS_INDEXES[cache_key]
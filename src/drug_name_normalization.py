@@ -1,15 +1,29 @@
 """
 Enhanced Drug Name Normalization and Fuzzy Matching for AetherSignal.
 Handles brand names, generic names, misspellings, abbreviations, and multi-drug combinations.
+
+Column normalization runs over unique values only and goes through a
+persistent cache (data/cache/drug_normalization/) keyed by a fingerprint of
+the mapping tables, so repeated quarters only normalize new drug strings.
 """
 
+import atexit
+import hashlib
+import json
+import logging
+import os
 import re
-from typing import Dict, List, Optional, Tuple, Set
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Set
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 
 from src.utils import normalize_text, clean_drug_name
 
+logger = logging.getLogger(__name__)
+
 # Try to use rapidfuzz for better performance, fallback to simple matching
 try:
     from rapidfuzz import fuzz, process
@@ -330,6 +344,64 @@ SUFFIX_PATTERNS = [
     (r'\s+\[.*?\]', ''),  # Remove bracketed info
 ]
 
+# All suffix patterns folded into one regex (every replacement is ''). A
+# single pass gives the same result as applying them in order, except when
+# parenthetical and bracketed spans cross, which falls back to _SUFFIX_REGEXES.
+_SUFFIX_REGEXES = [(re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in SUFFIX_PATTERNS]
+_SUFFIX_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern, _ in SUFFIX_PATTERNS), re.IGNORECASE
+) if all(replacement == '' for _, replacement in SUFFIX_PATTERNS) else None
+
+# Brand lookup for aggressive mode: trie of substantial brand names
+# (len >= 4) whose terminal nodes hold the brand's BRAND_TO_GENERIC position
+_TRIE_END = ""
+
+
+def _build_brand_trie(brand_map: Dict[str, str]) -> Dict[str, Any]:
+    """Build a character trie over the brand names used for partial matches."""
+    root: Dict[str, Any] = {}
+    for position, brand in enumerate(brand_map):
+        if len(brand) < 4:
+            continue
+        node = root
+        for char in brand:
+            node = node.setdefault(char, {})
+        node.setdefault(_TRIE_END, position)
+    return root
+
+
+_BRAND_TRIE = _build_brand_trie(BRAND_TO_GENERIC)
+_BRAND_GENERICS = list(BRAND_TO_GENERIC.values())
+
+
+def _find_contained_brand(text: str) -> Optional[str]:
+    """
+    Generic name of the first BRAND_TO_GENERIC brand (len >= 4) contained in text.
+    
+    Walks the trie from every start position, so the cost depends on the
+    length of the text rather than the number of brands.
+    """
+    best = None
+    for start in range(len(text)):
+        node = _BRAND_TRIE
+        for char in text[start:]:
+            node = node.get(char)
+            if node is None:
+                break
+            position = node.get(_TRIE_END)
+            if position is not None and (best is None or position < best):
+                best = position
+    return _BRAND_GENERICS[best] if best is not None else None
+
+
+def _strip_suffixes(drug_lower: str) -> str:
+    """Remove SUFFIX_PATTERNS matches (e.g. "metformin hcl" -> "metformin")."""
+    if _SUFFIX_RE is not None and not ("(" in drug_lower and "[" in drug_lower):
+        return _SUFFIX_RE.sub('', drug_lower)
+    for pattern, replacement in _SUFFIX_REGEXES:
+        drug_lower = pattern.sub(replacement, drug_lower)
+    return drug_lower
+
 
 def normalize_drug_name(drug: str, aggressive: bool = False) -> str:
     """
@@ -362,10 +434,7 @@ def normalize_drug_name(drug: str, aggressive: bool = False) -> str:
     drug_lower = normalize_text(drug_str)
     
     # Remove common suffixes (e.g., "metformin HCL" -> "metformin")
-    for pattern, replacement in SUFFIX_PATTERNS:
-        drug_lower = re.sub(pattern, replacement, drug_lower, flags=re.IGNORECASE)
-    
-    drug_lower = drug_lower.strip()
+    drug_lower = _strip_suffixes(drug_lower).strip()
     
     # Check abbreviations first
     if drug_lower in DRUG_ABBREVIATIONS:
@@ -381,10 +450,10 @@ def normalize_drug_name(drug: str, aggressive: bool = False) -> str:
     
     # Aggressive normalization: try partial matches
     if aggressive:
-        # Check if any brand/generic is contained in the drug name
-        for brand, generic in BRAND_TO_GENERIC.items():
-            if brand in drug_lower and len(brand) >= 4:  # Only for substantial matches
-                return generic.title()
+        # Check if any brand/generic is contained in the drug name (only substantial matches)
+        generic = _find_contained_brand(drug_lower)
+        if generic:
+            return generic.title()
     
     # Return cleaned, title-cased version
     return drug_str.title()
@@ -553,13 +622,201 @@ def find_similar_drugs(
     return matches[:max_results]
 
 
-def normalize_drug_column(df: pd.DataFrame, drug_column: str = 'drug_name') -> pd.DataFrame:
+# Persistent normalization cache (raw drug string -> normalized name)
+DEFAULT_NORMALIZATION_CACHE_DIR = "data/cache/drug_normalization"
+NORMALIZATION_CACHE_VERSION = "1"  # Bump when normalize_drug_name logic changes
+NORMALIZATION_CACHE_MAX_ENTRIES = 2_000_000
+# save() rewrites the file only once new entries reach this count or a tenth of the cache
+NORMALIZATION_CACHE_SAVE_MIN_NEW = 10_000
+_NORMALIZATION_CACHE_FILE = "normalization_cache.json"
+
+
+def _normalization_fingerprint() -> str:
+    """Fingerprint of the mapping tables; a change discards persisted entries."""
+    digest = hashlib.sha256(NORMALIZATION_CACHE_VERSION.encode())
+    digest.update(json.dumps(
+        [DRUG_ABBREVIATIONS, BRAND_TO_GENERIC, COMMON_MISSPELLINGS, SUFFIX_PATTERNS],
+        sort_keys=True,
+    ).encode())
+    return digest.hexdigest()[:16]
+
+
+class DrugNormalizationCache:
+    """
+    Memo of normalize_drug_name results, persisted across sessions.
+    
+    Entries are kept per mode (standard / aggressive) in memory and written
+    as one JSON file under the cache directory. The file carries a
+    fingerprint of the mapping tables, so editing them invalidates it.
+    Because every write rewrites the whole file, save() waits until enough
+    new entries have accumulated; flush() writes unconditionally and runs at
+    exit for the shared cache.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = NORMALIZATION_CACHE_MAX_ENTRIES):
+        """
+        Initialize the cache (loaded lazily on first use).
+        
+        Args:
+            cache_dir: Cache directory (default: DRUG_NORMALIZATION_CACHE_DIR
+                       env var or data/cache/drug_normalization)
+            max_entries: Maximum entries per mode; oldest are dropped first
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("DRUG_NORMALIZATION_CACHE_DIR", DEFAULT_NORMALIZATION_CACHE_DIR))
+        self.max_entries = max_entries
+        self.fingerprint = _normalization_fingerprint()
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+        self._new_entries = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def path(self) -> Path:
+        """Path of the persisted cache file."""
+        return self.cache_dir / _NORMALIZATION_CACHE_FILE
+    
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Load persisted entries (empty if missing, unreadable or stale)."""
+        if self._entries is not None:
+            return self._entries
+        
+        self._entries = {"standard": {}, "aggressive": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == self.fingerprint:
+                for mode in self._entries:
+                    self._entries[mode].update(data.get("entries", {}).get(mode, {}))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable drug normalization cache {self.path}: {e}")
+        return self._entries
+    
+    def normalize_many(self, drugs: Iterable[Any], aggressive: bool = False) -> List[str]:
+        """
+        Normalize drug names through the cache.
+        
+        Args:
+            drugs: Drug names (non-strings are converted with str())
+            aggressive: Use aggressive normalization
+            
+        Returns:
+            List of normalized names, aligned with drugs
+        """
+        entries = self._load()["aggressive" if aggressive else "standard"]
+        results = []
+        for drug in drugs:
+            key = str(drug)
+            normalized = entries.get(key)
+            if normalized is None:
+                self.misses += 1
+                normalized = normalize_drug_name(key, aggressive=aggressive)
+                entries[key] = normalized
+                self._new_entries += 1
+            else:
+                self.hits += 1
+            results.append(normalized)
+        
+        # Drop the oldest entries beyond the cap
+        if len(entries) > self.max_entries:
+            for key in list(entries)[:len(entries) - self.max_entries]:
+                del entries[key]
+        return results
+    
+    def save(self, force: bool = False) -> bool:
+        """
+        Persist the cache once enough new entries accumulated (atomic replace, best effort).
+        
+        The file is rewritten when the entries added since the last write reach
+        NORMALIZATION_CACHE_SAVE_MIN_NEW or a tenth of the cache, so the cost
+        of rewriting stays proportional to the entries added.
+        
+        Args:
+            force: Write any new entries regardless of the threshold
+            
+        Returns:
+            True if the file was written
+        """
+        if not self._new_entries or self._entries is None:
+            return False
+        total = sum(len(mode_entries) for mode_entries in self._entries.values())
+        if not force and self._new_entries < max(NORMALIZATION_CACHE_SAVE_MIN_NEW, total // 10):
+            return False
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            self._new_entries = 0
+            return True
+        except OSError as e:
+            logger.warning(f"Could not persist drug normalization cache: {e}")
+            return False
+    
+    def flush(self) -> bool:
+        """Persist any new entries now."""
+        return self.save(force=True)
+    
+    def clear(self) -> None:
+        """Drop all entries, in memory and on disk, and reset the statistics."""
+        self._entries = {"standard": {}, "aggressive": {}}
+        self._new_entries = 0
+        self.hits = 0
+        self.misses = 0
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entries, hits, misses and hit_ratio
+        """
+        entries = self._load()
+        lookups = self.hits + self.misses
+        return {
+            "entries": sum(len(mode_entries) for mode_entries in entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "path": str(self.path),
+        }
+
+
+_NORMALIZATION_CACHE: Optional[DrugNormalizationCache] = None
+
+
+def get_normalization_cache() -> DrugNormalizationCache:
+    """Get the shared drug normalization cache (flushed at interpreter exit)."""
+    global _NORMALIZATION_CACHE
+    if _NORMALIZATION_CACHE is None:
+        _NORMALIZATION_CACHE = DrugNormalizationCache()
+        atexit.register(_NORMALIZATION_CACHE.flush)
+    return _NORMALIZATION_CACHE
+
+
+def normalize_drug_column(
+    df: pd.DataFrame,
+    drug_column: str = 'drug_name',
+    cache: Optional[DrugNormalizationCache] = None,
+    persist: bool = True
+) -> pd.DataFrame:
     """
     Normalize drug names in a DataFrame column.
     
+    Each distinct value is normalized once (factorize -> normalize -> take),
+    looked up in the persistent normalization cache first.
+    
     Args:
         df: DataFrame with drug column
         drug_column: Name of drug column
+        cache: Normalization cache (default: shared cache)
+        persist: Save new cache entries to disk
         
     Returns:
         DataFrame with normalized drug names
@@ -568,24 +825,49 @@ def normalize_drug_column(df: pd.DataFrame, drug_column: str = 'drug_name') -> p
         return df
     
     df_normalized = df.copy()
-    
-    # Normalize each drug name
-    df_normalized[drug_column] = df_normalized[drug_column].apply(
-        lambda x: normalize_drug_name(str(x)) if pd.notna(x) else ""
-    )
+    cache = cache or get_normalization_cache()
+    hits, misses = cache.hits, cache.misses
+    
+    # Normalize unique values only; missing values (code -1) become ""
+    codes, uniques = pd.factorize(df_normalized[drug_column])
+    normalized = np.empty(len(uniques) + 1, dtype=object)
+    normalized[:-1] = cache.normalize_many(uniques)
+    normalized[-1] = ""
+    df_normalized[drug_column] = normalized[codes]
+    
+    new_hits, new_misses = cache.hits - hits, cache.misses - misses
+    if new_hits + new_misses:
+        logger.debug(
+            f"Normalized {len(df_normalized):,} drug names ({len(uniques):,} unique, "
+            f"cache hit ratio {new_hits / (new_hits + new_misses):.1%})"
+        )
+    if persist and new_misses:
+        cache.save()
     
     return df_normalized
 
 
-def create_drug_alias_map(df: pd.DataFrame, drug_column: str = 'drug_name') -> Dict[str, str]:
+def create_drug_alias_map(
+    df: pd.DataFrame,
+    drug_column: str = 'drug_name',
+    threshold: float = 0.9,
+    persist: bool = True
+) -> Dict[str, str]:
     """
     Create a mapping of drug name variations to canonical names.
     
-    Useful for grouping similar drug names together.
+    Useful for grouping similar drug names together. Names are added to the
+    persistent alias index (see drug_alias_clustering), which clusters them
+    with LSH candidates, rapidfuzz scoring and union-find instead of
+    comparing every name with every canonical name, and only processes names
+    it has not seen before. A dataset's report counts are recorded once (by
+    content fingerprint), so repeated calls return the same mapping.
     
     Args:
         df: DataFrame with drug names
         drug_column: Name of drug column
+        threshold: Similarity threshold (0-1) for merging names
+        persist: Save the updated alias index to disk
         
     Returns:
         Dictionary mapping variations to canonical names
@@ -593,39 +875,24 @@ def create_drug_alias_map(df: pd.DataFrame, drug_column: str = 'drug_name') -> D
     if drug_column not in df.columns:
         return {}
     
-    # Get unique drug names
-    unique_drugs = df[drug_column].dropna().unique()
+    from src.drug_alias_clustering import get_alias_index
     
-    # Group similar drugs
-    alias_map = {}
-    canonical_names = set()
+    # Unique, non-empty verbatim names with their report counts
+    names = df[drug_column].dropna().astype(str).str.strip()
+    name_counts = names[names != ""].value_counts()
+    if name_counts.empty:
+        return {}
     
-    for drug in unique_drugs:
-        if pd.isna(drug):
-            continue
-        
-        drug_str = str(drug).strip()
-        if not drug_str:
-            continue
-        
-        normalized = normalize_drug_name(drug_str, aggressive=True)
-        
-        # Check if we've seen a similar canonical name
-        found_canonical = None
-        for canonical in canonical_names:
-            is_match, _ = fuzzy_match_drugs(normalized, canonical, threshold=0.9)
-            if is_match:
-                found_canonical = canonical
-                break
-        
-        if found_canonical:
-            alias_map[drug_str] = found_canonical
-        else:
-            # This is a new canonical name
-            canonical_names.add(normalized)
-            alias_map[drug_str] = normalized
+    # Counts of a dataset are recorded once, however often it is re-rendered
+    dataset = hashlib.sha256(
+        pd.util.hash_pandas_object(name_counts, index=True).to_numpy().tobytes()
+    ).hexdigest()[:16]
+    index = get_alias_index(threshold=threshold)
+    index.update(name_counts.to_dict(), dataset=dataset)
+    if persist:
+        index.save()
     
-    return alias_map
+    return index.alias_map(name_counts.index)
 
 
 def group_similar_drugs(
@@ -652,10 +919,15 @@ def group_similar_drugs(
     # Create alias map
     alias_map = create_drug_alias_map(df, drug_column)
     
-    # Apply normalization
-    df_grouped['drug_name_normalized'] = df_grouped[drug_column].apply(
-        lambda x: alias_map.get(str(x), normalize_drug_name(str(x))) if pd.notna(x) else ""
-    )
+    # Apply normalization (once per distinct value; unmapped names fall back to normalize_drug_name)
+    codes, uniques = pd.factorize(df_grouped[drug_column])
+    names = [str(value) for value in uniques]
+    unmapped = [name for name in names if name not in alias_map]
+    fallback = dict(zip(unmapped, get_normalization_cache().normalize_many(unmapped)))
+    grouped = np.empty(len(uniques) + 1, dtype=object)
+    grouped[:-1] = [alias_map[name] if name in alias_map else fallback[name] for name in names]
+    grouped[-1] = ""
+    df_grouped['drug_name_normalized'] = grouped[codes]
     
     return df_grouped
 
@@ -102,6 +102,71 @@ class EvidenceGovernanceEngine:
         
         return record
     
+    def process_records(
+        self,
+        records: List[Dict[str, Any]],
+        source: Optional[str] = None,
+        stage: str = "ingestion"
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a batch of records through the governance framework.
+        
+        Same result as process_record for each record, but lineage and
+        provenance are persisted with one append per batch.
+        
+        Args:
+            records: AE record dictionaries
+            source: Source name (defaults to each record's own source)
+            stage: Current transformation stage
+        
+        Returns:
+            The records, enhanced with governance metadata
+        """
+        if not EVIDENCE_GOVERNANCE_ENABLED or not records:
+            return records
+        
+        import uuid
+        
+        record_ids = [
+            record.get("ae_id") or record.get("id") or str(uuid.uuid4())
+            for record in records
+        ]
+        sources = [source or record.get("source", "unknown") for record in records]
+        fingerprints = [generate_fingerprint(record) for record in records]
+        
+        lineage_events = self.lineage_tracker.record_many(
+            record_ids,
+            stage,
+            [{"source": src, "fingerprint": fp} for src, fp in zip(sources, fingerprints)]
+        )
+        provenances = self.provenance_tracker.record_provenance_many([
+            {
+                "record_id": record_id,
+                "source": src,
+                "platform": record.get("platform"),
+                "source_url": record.get("source_url"),
+                "source_id": record.get("source_id"),
+                "metadata": record.get("metadata")
+            }
+            for record, record_id, src in zip(records, record_ids, sources)
+        ])
+        
+        for record, record_id, src, fingerprint, lineage_event, provenance in zip(
+            records, record_ids, sources, fingerprints, lineage_events, provenances
+        ):
+            quality_result = self.quality_scorer.score_record(record, src)
+            record["governance"] = {
+                "record_id": record_id,
+                "fingerprint": fingerprint,
+                "lineage_event_id": lineage_event.get("lineage_event_id"),
+                "provenance_id": provenance.get("provenance_id"),
+                "quality_score": quality_result["quality_score"],
+                "quality_threshold": quality_result["threshold"],
+                "quality_components": quality_result["components"]
+            }
+        
+        return records
+    
     def process_dataframe(
         self,
         df: pd.DataFrame,
@@ -4,7 +4,7 @@ Integration hooks for lineage tracking across all pipelines.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import pandas as pd
 
 from .governance_engine import EvidenceGovernanceEngine
@@ -92,6 +92,15 @@ def track_storage(record: Dict[str, Any], source: str) -> Dict[str, Any]:
     return engine.process_record(record, source=source, stage="storage")
 
 
+def track_storage_batch(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Track storage of a batch of records (each under its own source)."""
+    engine = get_governance_engine()
+    if not engine:
+        return records
+    
+    return engine.process_records(records, stage="storage")
+
+
 def track_aggregation(df: pd.DataFrame, source_col: str = "source") -> pd.DataFrame:
     """Track aggregation for dashboard."""
     engine = get_governance_engine()
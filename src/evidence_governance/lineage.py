@@ -24,8 +24,12 @@ def get_lineage_tracker() -> LineageTracker:
         class NoOpTracker:
             def record(self, *args, **kwargs):
                 return {}
+            def record_many(self, record_ids, *args, **kwargs):
+                return [{} for _ in record_ids]
             def get_lineage(self, *args, **kwargs):
                 return []
+            def get_lineages(self, *args, **kwargs):
+                return {}
             def get_lineage_chain(self, *args, **kwargs):
                 return {}
         
@@ -86,6 +86,53 @@ class LineageTracker:
         
         return event
     
+    def record_many(
+        self,
+        record_ids: List[str],
+        stage: str,
+        metadata: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Record one lineage event per record, persisted with a single append.
+        
+        Args:
+            record_ids: Record identifiers
+            stage: Transformation stage (shared by all records)
+            metadata: Optional per-record metadata (same length as record_ids)
+        
+        Returns:
+            List of lineage event dictionaries
+        """
+        if not LINEAGE_ENABLED:
+            return [{} for _ in record_ids]
+        
+        if stage not in self.STAGES:
+            logger.warning(f"Unknown stage: {stage}")
+        
+        timestamp = datetime.utcnow().isoformat()
+        events = [
+            {
+                "lineage_event_id": str(uuid.uuid4()),
+                "record_id": record_id,
+                "stage": stage,
+                "timestamp": timestamp,
+                "metadata": (metadata[i] if metadata else None) or {},
+                "parent_ids": []
+            }
+            for i, record_id in enumerate(record_ids)
+        ]
+        
+        self.events.extend(events)
+        
+        # Persist to file
+        try:
+            with open(self.storage_file, "a") as f:
+                f.write("".join(json.dumps(event) + "\n" for event in events))
+        except Exception as e:
+            logger.error(f"Error persisting lineage events: {e}")
+        
+        return events
+    
     def get_lineage(self, record_id: str) -> List[Dict[str, Any]]:
         """
         Get complete lineage for a record.
@@ -104,6 +151,29 @@ class LineageTracker:
         
         return lineage
     
+    def get_lineages(self, record_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get lineage for several records in one pass over the events.
+        
+        Args:
+            record_ids: Record identifiers
+        
+        Returns:
+            Dictionary mapping record ID to its lineage events (chronologically ordered)
+        """
+        if not LINEAGE_ENABLED:
+            return {}
+        
+        wanted = set(record_ids)
+        lineages: Dict[str, List[Dict[str, Any]]] = {}
+        for event in self.events:
+            if event["record_id"] in wanted:
+                lineages.setdefault(event["record_id"], []).append(event)
+        for lineage in lineages.values():
+            lineage.sort(key=lambda x: x["timestamp"])
+        
+        return lineages
+    
     def get_lineage_chain(self, record_id: str) -> Dict[str, Any]:
         """
         Get lineage chain with parent relationships.
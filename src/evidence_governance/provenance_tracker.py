@@ -60,9 +60,61 @@ class ProvenanceTracker:
         if not PROVENANCE_ENABLED:
             return {}
         
+        provenance = self._make_provenance(
+            record_id, source, platform, ingest_date, version, source_url, source_id, metadata
+        )
+        self.provenance_records[record_id] = provenance
+        
+        # Persist to file
+        try:
+            with open(self.storage_file, "a") as f:
+                f.write(json.dumps(provenance) + "\n")
+        except Exception as e:
+            logger.error(f"Error persisting provenance: {e}")
+        
+        return provenance
+    
+    def record_provenance_many(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record provenance for several records, persisted with a single append.
+        
+        Args:
+            entries: Keyword arguments of record_provenance, one dict per record
+        
+        Returns:
+            List of provenance record dictionaries
+        """
+        if not PROVENANCE_ENABLED:
+            return [{} for _ in entries]
+        
+        provenances = [self._make_provenance(**entry) for entry in entries]
+        for provenance in provenances:
+            self.provenance_records[provenance["record_id"]] = provenance
+        
+        # Persist to file
+        try:
+            with open(self.storage_file, "a") as f:
+                f.write("".join(json.dumps(provenance) + "\n" for provenance in provenances))
+        except Exception as e:
+            logger.error(f"Error persisting provenance: {e}")
+        
+        return provenances
+    
+    def _make_provenance(
+        self,
+        record_id: str,
+        source: str,
+        platform: Optional[str] = None,
+        ingest_date: Optional[datetime] = None,
+        version: Optional[str] = None,
+        source_url: Optional[str] = None,
+        source_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build a provenance record dictionary."""
         evidence_class_weight = get_evidence_class_weight(source)
         
-        provenance = {
+        return {
             "provenance_id": str(uuid.uuid4()),
             "record_id": record_id,
             "source": source,
@@ -76,17 +128,6 @@ class ProvenanceTracker:
             "metadata": metadata or {},
             "recorded_at": datetime.utcnow().isoformat()
         }
-        
-        self.provenance_records[record_id] = provenance
-        
-        # Persist to file
-        try:
-            with open(self.storage_file, "a") as f:
-                f.write(json.dumps(provenance) + "\n")
-        except Exception as e:
-            logger.error(f"Error persisting provenance: {e}")
-        
-        return provenance
     
     def get_provenance(self, record_id: str) -> Optional[Dict[str, Any]]:
         """
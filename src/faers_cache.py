@@ -0,0 +1,278 @@
+"""
+Persistent columnar cache for parsed FAERS quarters.
+
+Joined, normalized case tables produced by faers_loader are stored as
+partitioned Arrow IPC files under data/cache/faers/<key>/ and memory-mapped on
+a cache hit. Keys are content addressed: they combine each source file's size
+and CRC32 (read from the ZIP directory for archives, computed in one streaming
+pass for extracted files) with a loader fingerprint, so a change to the column
+standardization or drug normalization rules yields a new key and stale entries
+are pruned on the next store.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Arrow IPC storage is optional - without pyarrow the cache is disabled
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = "data/cache/faers"
+PARTITION_ROWS = 1_000_000
+_CRC_CHUNK_BYTES = 8 << 20
+_MANIFEST = "manifest.json"
+_DIGEST_INDEX = "file_digests.json"
+
+
+def get_cache_dir(cache_dir: Optional[str] = None) -> Path:
+    """Resolve the cache directory (argument, FAERS_CACHE_DIR env var, or default)."""
+    return Path(cache_dir or os.getenv("FAERS_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def is_cache_available() -> bool:
+    """Return True if the columnar cache can be used (pyarrow installed)."""
+    return PYARROW_AVAILABLE
+
+
+def file_digest(file_path: Path, cache_dir: Optional[str] = None) -> str:
+    """
+    Content digest of a file as "<size>:<crc32>".
+
+    Digests of unchanged files (same path, size and mtime) are remembered in a
+    small index so repeat loads of a folder do not re-read the data. Entries
+    for files that were deleted or have changed since are dropped whenever the
+    index is rewritten.
+    """
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    index_path = get_cache_dir(cache_dir) / _DIGEST_INDEX
+    memo_key = f"{file_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    index = _read_json(index_path) or {}
+    if memo_key in index:
+        return index[memo_key]
+
+    crc = 0
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(_CRC_CHUNK_BYTES)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    digest = f"{stat.st_size}:{crc & 0xFFFFFFFF:08x}"
+
+    index = _prune_digest_index(index)
+    index[memo_key] = digest
+    try:
+        _write_json(index_path, index)
+    except OSError:
+        pass
+    return digest
+
+
+def zip_member_digest(info) -> str:
+    """Content digest of a ZIP member from its directory entry (no extraction)."""
+    return f"{info.file_size}:{info.CRC & 0xFFFFFFFF:08x}"
+
+
+def sources_digest(sources: Dict[str, str]) -> str:
+    """Digest of the FAERS source set ({file_type: file digest})."""
+    payload = json.dumps(sorted(sources.items()))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def cache_key(sources: Dict[str, str], loader_fingerprint: str) -> str:
+    """Cache key for a source set under a given loader fingerprint."""
+    payload = f"{sources_digest(sources)}|{loader_fingerprint}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def load_cached(key: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a cached case table by key.
+
+    Returns:
+        Dict with 'data' (DataFrame), 'manifest' and 'seconds', or None on a miss
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+
+    entry_dir = get_cache_dir(cache_dir) / key
+    manifest = _read_json(entry_dir / _MANIFEST)
+    if not manifest:
+        return None
+
+    started = time.perf_counter()
+    try:
+        tables = []
+        for partition in manifest.get("partitions", []):
+            # Memory-map each partition; pyarrow keeps the mapping alive while buffers are referenced
+            source = pa.memory_map(str(entry_dir / partition), "r")
+            tables.append(pa_ipc.open_file(source).read_all())
+        if not tables:
+            return None
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        df = table.to_pandas(split_blocks=True)
+        # Arrow nulls come back as None in object columns; a fresh load has NaN there
+        for col in df.columns:
+            if df[col].dtype == object and df[col].hasnans:
+                df[col] = df[col].fillna(np.nan)
+    except Exception:
+        # Corrupt or partial entry - drop it so the next load rebuilds it
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    return {
+        "data": df,
+        "manifest": manifest,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def store_cached(
+    key: str,
+    df: pd.DataFrame,
+    sources: Dict[str, str],
+    loader_fingerprint: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+) -> bool:
+    """
+    Store a case table under key as partitioned Arrow IPC files.
+
+    The entry is written to a temporary directory and renamed into place, so
+    readers never see a partial entry. Entries for the same sources built with
+    a different loader fingerprint are removed.
+
+    Returns:
+        True if the entry was written
+    """
+    if not PYARROW_AVAILABLE or df is None:
+        return False
+
+    root = get_cache_dir(cache_dir)
+    entry_dir = root / key
+    if (entry_dir / _MANIFEST).exists():
+        return True
+
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=root))
+
+        partitions = []
+        for number, offset in enumerate(range(0, max(table.num_rows, 1), PARTITION_ROWS)):
+            name = f"part-{number:05d}.arrow"
+            with pa.OSFile(str(tmp_dir / name), "wb") as sink:
+                with pa_ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table.slice(offset, PARTITION_ROWS))
+            partitions.append(name)
+
+        manifest = {
+            "key": key,
+            "sources": sources,
+            "sources_digest": sources_digest(sources),
+            "loader_fingerprint": loader_fingerprint,
+            "rows": int(table.num_rows),
+            "columns": list(df.columns),
+            "partitions": partitions,
+            "created_at": datetime.now().isoformat(),
+            **(metadata or {}),
+        }
+        _write_json(tmp_dir / _MANIFEST, manifest)
+
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        return False
+
+    _prune_stale_entries(root, manifest["sources_digest"], loader_fingerprint)
+    return True
+
+
+def clear_cache(cache_dir: Optional[str] = None) -> int:
+    """
+    Remove all cached entries.
+
+    Returns:
+        Number of entries removed
+    """
+    root = get_cache_dir(cache_dir)
+    if not root.exists():
+        return 0
+    removed = 0
+    for entry in root.iterdir():
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    (root / _DIGEST_INDEX).unlink(missing_ok=True)
+    return removed
+
+
+def list_cache_entries(cache_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """List manifests of cached entries."""
+    root = get_cache_dir(cache_dir)
+    if not root.exists():
+        return []
+    entries = []
+    for entry in sorted(root.iterdir()):
+        manifest = _read_json(entry / _MANIFEST) if entry.is_dir() else None
+        if manifest:
+            entries.append(manifest)
+    return entries
+
+
+def _prune_stale_entries(root: Path, digest: str, loader_fingerprint: str) -> None:
+    """Remove entries for the same sources built by an older loader fingerprint."""
+    for manifest in list_cache_entries(str(root)):
+        if manifest.get("sources_digest") == digest and manifest.get("loader_fingerprint") != loader_fingerprint:
+            shutil.rmtree(root / manifest["key"], ignore_errors=True)
+
+
+def _prune_digest_index(index: Dict[str, str]) -> Dict[str, str]:
+    """Keep digest memos whose file still exists with the recorded size and mtime."""
+    kept = {}
+    for memo_key, digest in index.items():
+        path, _, version = memo_key.rpartition("|")
+        path, _, size = path.rpartition("|")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if f"{stat.st_size}|{stat.st_mtime_ns}" == f"{size}|{version}":
+            kept[memo_key] = digest
+    return kept
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, default=str)
+    os.replace(tmp_path, path)
@@ -4,10 +4,15 @@ Handles the 7 standard FAERS ASCII files and joins them on CASE id.
 Also supports PDF files via pdfplumber with regex fallback.
 """
 
+import numpy as np
 import pandas as pd
 import zipfile
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import io
+import csv
+import codecs
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import re
 from pathlib import Path
 
@@ -18,6 +23,14 @@ try:
 except ImportError:
     PDFPLUMBER_AVAILABLE = False
 
+# Try to import pyarrow for multi-threaded ASCII parsing (C engine fallback)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 # Standard FAERS file types and their expected columns
 # Pattern matches: DEMO25Q3.txt, DEMO24Q4.txt, DEMO25Q.txt, etc.
@@ -99,6 +112,61 @@ ESSENTIAL_COLUMNS = {
     'rpsr_cod',
 }
 
+# Key columns across FAERS formats (2024+: primaryid/caseid, legacy: ISR/CASE)
+FAERS_KEY_COLUMNS = ['caseid', 'primaryid', 'isr', 'case']
+
+# Source columns copied into the standard names used by downstream aggregation
+# (target -> candidates, first match wins). Used by _standardize_faers_columns.
+FAERS_COLUMN_ALIASES: Dict[str, Dict[str, List[str]]] = {
+    'DRUG': {
+        # DRUG files have: primaryid, caseid, drug_seq, drugname, prod_ai, etc.
+        'drug': ['drugname', 'medicinalproduct', 'prod_ai', 'drug_name'],
+        # Additional DRUG file fields for case processing
+        'dechal': ['dechal', 'dechallenge', 'dechallenge_code'],
+        'rechal': ['rechal', 'rechallenge', 'rechallenge_code'],
+        'dose_amt': ['dose_amt', 'dose_amount', 'dose'],
+        'dose_unit': ['dose_unit', 'dose_units', 'unit'],
+        'dose_form': ['dose_form', 'doseform', 'form'],
+        'route': ['route', 'route_cod', 'route_code'],
+        'role_cod': ['role_cod', 'role_code', 'drug_role'],
+    },
+    'REAC': {
+        # REAC files have: primaryid, caseid, pt, drug_rec_act (NO drug_seq column!)
+        'pt': ['preferred_term', 'reaction', 'reaction_pt', 'pt_name'],
+    },
+    'INDI': {
+        'indi_pt': ['indication', 'indi_pt', 'indication_pt'],
+    },
+    'OUTC': {
+        'outc_cod': ['outcome', 'outcome_code', 'outc_cod', 'outcome_cod'],
+    },
+    'THER': {
+        'start_dt': ['start_dt', 'start_date', 'therapy_start', 'dsg_dt'],
+        'end_dt': ['end_dt', 'end_date', 'therapy_end'],
+        'dur': ['dur', 'duration', 'therapy_duration'],
+        'dur_cod': ['dur_cod', 'duration_code', 'dur_code'],
+    },
+    'RPSR': {
+        'rpsr_cod': ['source', 'report_source', 'rpsr_cod', 'rpsr_code'],
+    },
+}
+
+# Sequence columns renamed in place (they are NOT join keys - we join on primaryid/caseid)
+FAERS_COLUMN_RENAMES: Dict[str, Dict[str, List[str]]] = {
+    # INDI: indi_drug_seq is DIFFERENT from drug_seq (used in DRUG file)
+    'INDI': {'indi_drug_seq': ['indi_drug_seq', 'indication_drug_seq', 'drug_seq']},
+    # THER: dsg_drug_seq is DIFFERENT from drug_seq (used in DRUG file)
+    'THER': {'dsg_drug_seq': ['dsg_drug_seq', 'therapy_drug_seq', 'drug_seq']},
+}
+
+# Bump when join/aggregation semantics change (invalidates the columnar cache)
+FAERS_LOADER_VERSION = "3"
+
+# ASCII reader tuning
+_SNIFF_BYTES = 1 << 20          # Byte sample used to detect the delimiter
+_SCAN_CHUNK_BYTES = 8 << 20     # Chunk size for the structure scan
+_STREAM_BUFFER_BYTES = 1 << 20  # Read buffer for the repaired-line stream
+
 LOAD_WARNINGS: List[str] = []
 FAERS_FILE_SUMMARY: Dict[str, Dict[str, Any]] = {}
 
@@ -125,6 +193,17 @@ def clear_faers_file_summary() -> None:
     FAERS_FILE_SUMMARY.clear()
 
 
+def _describe_parse_throughput(file_path) -> str:
+    """Human-readable parse throughput for a file loaded in this session."""
+    meta = FAERS_FILE_SUMMARY.get(Path(file_path).name)
+    if not meta or meta.get("rows_per_sec") is None:
+        return ""
+    return (
+        f"{meta['rows']:,} rows in {meta['parse_seconds']:.1f}s "
+        f"({meta['rows_per_sec']:,.0f} rows/s, {meta['mb_per_sec']:.1f} MB/s)"
+    )
+
+
 def _record_warning(message: str) -> None:
     LOAD_WARNINGS.append(message)
     try:
@@ -133,34 +212,113 @@ def _record_warning(message: str) -> None:
     except Exception:
         pass
 
-def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.DataFrame]:
+def _find_faers_files(folder: Path) -> Dict[str, Path]:
+    """Find FAERS files by type (recursively - handles nested folders like ASCII/)."""
+    files_found = {}
+    for file_type, config in FAERS_FILES.items():
+        pattern = re.compile(config['filename_pattern'], re.IGNORECASE)
+        for file_path in folder.rglob('*.txt'):
+            if pattern.match(file_path.name):
+                files_found[file_type] = file_path
+                break
+    return files_found
+
+
+def _loader_fingerprint() -> str:
+    """
+    Fingerprint of everything that shapes the joined case table.
+    
+    Covers FAERS_LOADER_VERSION, the column rules and the source of the
+    standardization/aggregation functions and of drug_name_normalization, so
+    editing any of them invalidates cached quarters automatically.
+    """
+    import hashlib
+    import inspect
+    import json
+    
+    digest = hashlib.sha256(FAERS_LOADER_VERSION.encode())
+    digest.update(json.dumps(
+        [FAERS_COLUMN_ALIASES, FAERS_COLUMN_RENAMES, sorted(ESSENTIAL_COLUMNS), _JOIN_FILE_TYPES],
+        sort_keys=True,
+    ).encode())
+    try:
+        from src import drug_name_normalization
+        for obj in (_standardize_faers_columns, _aggregate_faers_table, _join_unique_values,
+                    _trim_to_essential_columns, drug_name_normalization):
+            digest.update(inspect.getsource(obj).encode())
+    except (OSError, TypeError, ImportError):
+        pass  # Source unavailable (e.g. frozen build) - version and rules still apply
+    return digest.hexdigest()[:16]
+
+
+def _restore_cached_faers(key: str, progress_callback=None) -> Optional[pd.DataFrame]:
+    """Return a cached case table for key (and restore its per-file summary), or None."""
+    from src import faers_cache
+    
+    cached = faers_cache.load_cached(key)
+    if cached is None:
+        return None
+    
+    manifest = cached['manifest']
+    for name, meta in (manifest.get('file_summary') or {}).items():
+        FAERS_FILE_SUMMARY[name] = {**meta, 'cache_hit': True}
+    if progress_callback:
+        total = len(manifest.get('sources', {}))
+        progress_callback(
+            f"Loaded {manifest.get('rows', len(cached['data'])):,} cases from cache in {cached['seconds']:.1f}s",
+            100, total, total,
+        )
+    return cached['data']
+
+
+def _store_cached_faers(key: str, df: pd.DataFrame, sources: Dict[str, str], files_found: Dict[str, Path]) -> None:
+    """Store a freshly loaded case table in the columnar cache (best effort)."""
+    from src import faers_cache
+    
+    file_summary = {
+        Path(path).name: FAERS_FILE_SUMMARY[Path(path).name]
+        for path in files_found.values()
+        if Path(path).name in FAERS_FILE_SUMMARY
+    }
+    faers_cache.store_cached(
+        key, df, sources, _loader_fingerprint(),
+        metadata={'file_summary': file_summary, 'loader_version': FAERS_LOADER_VERSION},
+    )
+
+
+def load_faers_folder(
+    folder_path: str,
+    progress_callback=None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> Optional[pd.DataFrame]:
     """
     Load FAERS data from a folder containing ASCII files.
     Supports nested folder structures (e.g., ASCII/ subfolder).
     
+    The seven tables are read and aggregated per case concurrently in a
+    process pool (thread pool if processes are unavailable), then joined onto
+    DEMO in a single multi-way join on the key column.
+    
     Args:
         folder_path: Path to folder containing FAERS ASCII files
         progress_callback: Optional callback function(step_name, progress_percent, file_num, total_files)
+        max_workers: Worker count for table loading (default: one per table, capped
+            at the CPU count; 1 loads sequentially in-process)
+        use_cache: Reuse/store the joined table in the columnar cache (faers_cache)
         
     Returns:
         Combined DataFrame with all FAERS data joined on CASE/ISR
     """
-    files_found = {}
     folder = Path(folder_path)
     
     # Find all FAERS files (recursively search subfolders)
-    for file_type, config in FAERS_FILES.items():
-        pattern = re.compile(config['filename_pattern'], re.IGNORECASE)
-        # Use rglob for recursive search (handles nested folders like ASCII/)
-        for file_path in folder.rglob('*.txt'):
-            if pattern.match(file_path.name):
-                files_found[file_type] = file_path
-                break
+    files_found = _find_faers_files(folder)
     
     if not files_found:
         return None
     
-    # Load DEMO first (base table)
+    # DEMO is the base table
     if 'DEMO' not in files_found:
         _record_warning(
             "⚠️ **DEMO file not found** in FAERS data.\n\n"
@@ -176,16 +334,48 @@ def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.D
     if progress_callback:
         progress_callback("Scanning for FAERS files...", 5, 0, total_files)
     
-    demo_df = None
-    demo_error = None
-    try:
-        # Report progress: Loading DEMO
+    # Content-addressed cache lookup (file size + CRC32, plus loader fingerprint)
+    sources = None
+    key = None
+    if use_cache:
+        try:
+            from src import faers_cache
+            if faers_cache.is_cache_available():
+                sources = {ft: faers_cache.file_digest(path) for ft, path in files_found.items()}
+                key = faers_cache.cache_key(sources, _loader_fingerprint())
+                cached = _restore_cached_faers(key, progress_callback)
+                if cached is not None:
+                    return cached
+        except Exception:
+            key = None  # Cache problems never block a load
+    
+    if progress_callback:
+        progress_callback(
+            f"Reading {total_files} FAERS files in parallel ({', '.join(files_found)})...",
+            10, files_processed, total_files,
+        )
+    
+    # Read + aggregate every table concurrently; progress is reported as each completes
+    tables: Dict[str, Dict[str, Any]] = {}
+    for result in _load_faers_tables(files_found, max_workers):
+        file_type = result['file_type']
+        tables[file_type] = result
+        LOAD_WARNINGS.extend(result['warnings'])
+        if result['summary']:
+            FAERS_FILE_SUMMARY[Path(files_found[file_type]).name] = result['summary']
+        if result['frame'] is not None:
+            files_processed += 1
         if progress_callback:
-            progress_callback(f"Reading DEMO file ({Path(files_found['DEMO']).name})...", 10, files_processed, total_files)
-        demo_df = load_faers_file(files_found['DEMO'], 'DEMO')
-        files_processed += 1
-    except Exception as e:
-        demo_error = str(e)
+            progress_pct = 10 + int(len(tables) / total_files * 70)
+            throughput = _describe_parse_throughput(files_found[file_type])
+            progress_callback(
+                f"Parsed {file_type}: {throughput}" if throughput else f"Read {file_type}",
+                progress_pct, files_processed, total_files,
+            )
+    
+    demo = tables['DEMO']
+    demo_df = demo['frame']
+    demo_error = demo['error']
     
     if demo_df is None or len(demo_df) == 0:
         import streamlit as st
@@ -194,10 +384,9 @@ def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.D
             f"❌ **Could not parse DEMO file**: `{Path(demo_file).name if demo_file else 'Not found'}`\n\n"
             f"**This could mean:**\n"
             f"- The file format is incorrect (expected pipe-delimited `|` or dollar-delimited `$`)\n"
-            f"- The file encoding is not compatible (tried: latin-1, cp1252, iso-8859-1, utf-8)\n"
+            f"- The file encoding is not compatible (tried: utf-8, cp1252, latin-1)\n"
             f"- The file is corrupted or empty\n\n"
         )
-        
         if demo_error:
             error_msg += f"**Error details:**\n"
             error_msg += f"```\n{demo_error[:500]}\n```\n\n"
@@ -209,138 +398,41 @@ def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.D
     
     # Determine the key column (primaryid, caseid, ISR, or CASE)
     # FAERS 2024+ uses primaryid/caseid, older files use ISR/CASE
-    # Prefer caseid over primaryid for joins (caseid is more commonly used)
-    key_column = None
-    for col_name in ['caseid', 'primaryid', 'isr', 'case', 'CASE']:
-        if col_name in demo_df.columns:
-            key_column = col_name
-            break
-    
-    if key_column is None:
-        # Try case-insensitive match (columns are already lowercased)
-        for col in demo_df.columns:
-            col_lower = col.lower()
-            if col_lower in ['caseid', 'primaryid', 'isr', 'case']:
-                key_column = col
-                break
-    
+    key_column = demo['key_column']
     if key_column is None:
         return None
     
-    # Start with DEMO
-    combined_df = demo_df.copy()
-    
-    # Join other files
-    file_types = ['DRUG', 'REAC', 'OUTC', 'THER', 'INDI', 'RPSR']
-    for idx, file_type in enumerate(file_types):
-        if file_type in files_found:
-            # Calculate progress: 10% for DEMO, 70% for other files (10% each), 20% for merging
-            progress_pct = 10 + int((idx + 1) / len(file_types) * 70)
-            
-            # Report progress: Loading this file type
-            file_name = Path(files_found[file_type]).name
-            if progress_callback:
-                progress_callback(f"Reading {file_type} file ({file_name})...", progress_pct, files_processed, total_files)
-            
-            df = load_faers_file(files_found[file_type], file_type)
-            if df is not None and len(df) > 0 and key_column in df.columns:
-                # For files that can have multiple rows per case, we'll aggregate
-                if file_type == 'DRUG':
-                    # Aggregate drug names
-                    # Check if required columns exist
-                    if 'drug' not in df.columns:
-                        # Skip if drug column doesn't exist after standardization
-                        continue
-                    
-                    # Aggregate drug names and additional fields
-                    # Don't try to use drug_seq in aggregation - just count rows directly
-                    def agg_unique(x):
-                        """Aggregate unique values, joining with semicolon."""
-                        unique_vals = x.dropna().unique()
-                        if len(unique_vals) == 0:
-                            return None
-                        return '; '.join(str(v) for v in unique_vals)
-                    
-                    agg_dict = {'drug': agg_unique}
-                    
-                    # Aggregate additional DRUG fields (preserve unique values)
-                    for field in ['dechal', 'rechal', 'dose_amt', 'dose_unit', 'dose_form', 'route', 'role_cod']:
-                        if field in df.columns:
-                            agg_dict[field] = agg_unique
-                    
-                    drug_agg = df.groupby(key_column).agg(agg_dict).reset_index()
-                    
-                    # Add count column (size of each group) - this always works
-                    drug_agg['drug_count'] = df.groupby(key_column).size().values
-                    
-                    # Rename drug to drug_name
-                    drug_agg.rename(columns={'drug': 'drug_name'}, inplace=True)
-                    
-                    # Normalize drug names (enhanced fuzzy matching)
-                    try:
-                        from src.drug_name_normalization import normalize_drug_column
-                        drug_agg = normalize_drug_column(drug_agg, drug_column='drug_name')
-                    except Exception:
-                        pass  # Continue without normalization if it fails
-                    
-                    combined_df = combined_df.merge(drug_agg, on=key_column, how='left')
-                    files_processed += 1
-                elif file_type == 'REAC':
-                    # Aggregate reactions
-                    # REAC file has NO drug_seq column - just count rows directly
-                    if 'pt' not in df.columns:
-                        continue
-                    
-                    # Count rows per case and aggregate reactions
-                    reac_agg = df.groupby(key_column).agg({
-                        'pt': lambda x: '; '.join(str(v) for v in x.dropna().unique())
-                    }).reset_index()
-                    
-                    # Add count column (size of each group)
-                    reac_agg['reaction_count'] = df.groupby(key_column).size().values
-                    reac_agg.columns = [key_column, 'reaction', 'reaction_count']
-                    combined_df = combined_df.merge(reac_agg, on=key_column, how='left')
-                    files_processed += 1
-                elif file_type == 'OUTC':
-                    # Take first outcome per case
-                    outcome_df = df.groupby(key_column).first().reset_index()
-                    combined_df = combined_df.merge(outcome_df, on=key_column, how='left', suffixes=('', '_outc'))
-                    files_processed += 1
-                elif file_type == 'THER':
-                    # Aggregate therapy fields (preserve first non-null values)
-                    ther_agg = df.groupby(key_column).agg({
-                        'start_dt': 'first',
-                        'end_dt': 'first',
-                        'dur': 'first',
-                        'dur_cod': 'first'
-                    }).reset_index()
-                    combined_df = combined_df.merge(ther_agg, on=key_column, how='left', suffixes=('', '_ther'))
-                    files_processed += 1
-                elif file_type == 'INDI':
-                    # Aggregate indications
-                    if 'indi_pt' in df.columns:
-                        indi_agg = df.groupby(key_column).agg({
-                            'indi_pt': lambda x: '; '.join(str(v) for v in x.dropna().unique())
-                        }).reset_index()
-                        indi_agg.rename(columns={'indi_pt': 'indication'}, inplace=True)
-                        combined_df = combined_df.merge(indi_agg, on=key_column, how='left', suffixes=('', '_indi'))
-                    files_processed += 1
-                elif file_type == 'RPSR':
-                    # Take first reporter source per case
-                    rpsr_df = df.groupby(key_column).first().reset_index()
-                    if 'rpsr_cod' in rpsr_df.columns:
-                        combined_df = combined_df.merge(rpsr_df[[key_column, 'rpsr_cod']], on=key_column, how='left', suffixes=('', '_rpsr'))
-                    files_processed += 1
-                else:
-                    # For other files, merge on first occurrence
-                    other_df = df.groupby(key_column).first().reset_index()
-                    combined_df = combined_df.merge(other_df, on=key_column, how='left', suffixes=('', f'_{file_type.lower()}'))
-                    files_processed += 1
-    
     # Report progress: Merging files
     if progress_callback:
         progress_callback("Merging all FAERS files...", 85, files_processed, total_files)
     
+    # Collect per-case aggregates (indexed by key) in a fixed column order
+    aggregates = []
+    seen_columns = set(demo_df.columns)
+    demo_keys = pd.Index(demo_df[key_column].unique())
+    for file_type in _JOIN_FILE_TYPES:
+        result = tables.get(file_type)
+        if result is None or result['frame'] is None:
+            continue
+        agg = result['frame']
+        if result['key_column'] != key_column or agg.empty:
+            continue
+        # Mirror merge suffixes for columns that already exist (e.g. primaryid_outc)
+        agg = agg.rename(columns={
+            col: f"{col}_{file_type.lower()}" for col in agg.columns if col in seen_columns
+        })
+        seen_columns.update(agg.columns)
+        # Only DEMO cases: a case missing from DEMO would add NaN rows to the
+        # outer concat and turn other tables' counts into float
+        aggregates.append(agg[agg.index.isin(demo_keys)])
+    
+    # Single multi-way join: align all aggregates on the key, then join once onto DEMO
+    combined_df = demo_df
+    if aggregates:
+        wide = pd.concat(aggregates, axis=1, join='outer', sort=False)
+        combined_df = demo_df.merge(wide, left_on=key_column, right_index=True, how='left')
+        combined_df.reset_index(drop=True, inplace=True)
+    
     # Report progress: Finalizing
     if progress_callback:
         progress_callback("Finalizing dataset...", 95, files_processed, total_files)
@@ -351,6 +443,9 @@ def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.D
     if 'source' not in result.columns:
         result['source'] = 'FAERS'
     
+    if key is not None:
+        _store_cached_faers(key, result, sources, files_found)
+    
     # Report progress: Complete
     if progress_callback:
         progress_callback("Processing complete!", 100, files_processed, total_files)
@@ -358,6 +453,174 @@ def load_faers_folder(folder_path: str, progress_callback=None) -> Optional[pd.D
     return result
 
 
+# Tables joined onto DEMO, in output column order
+_JOIN_FILE_TYPES = ['DRUG', 'REAC', 'OUTC', 'THER', 'INDI', 'RPSR']
+
+# Extra DRUG fields preserved per case (unique values joined with '; ')
+_DRUG_DETAIL_FIELDS = ['dechal', 'rechal', 'dose_amt', 'dose_unit', 'dose_form', 'route', 'role_cod']
+
+
+def _find_key_column(columns) -> Optional[str]:
+    """Pick the join key (prefer caseid over primaryid, then legacy ISR/CASE)."""
+    for col_name in ['caseid', 'primaryid', 'isr', 'case', 'CASE']:
+        if col_name in columns:
+            return col_name
+    # Case-insensitive match (e.g. legacy ISR renamed to uppercase)
+    for col in columns:
+        if str(col).lower() in FAERS_KEY_COLUMNS:
+            return col
+    return None
+
+
+def _join_unique_values(df: pd.DataFrame, key_column: str, column: str) -> pd.Series:
+    """
+    Per-case unique non-null values joined with '; ' (first-seen order).
+    
+    Deduplication is one vectorized drop_duplicates and a stable sort makes each
+    case's values contiguous, so joining is a slice per case rather than a
+    per-group pandas call. Cases with no values are absent from the result.
+    """
+    values = df[[key_column, column]].dropna().drop_duplicates()
+    values = values.sort_values(key_column, kind='stable')
+    keys = values[key_column].to_numpy()
+    if len(keys) == 0:
+        return pd.Series([], index=pd.Index([], name=key_column), dtype=object)
+    
+    strings = values[column].astype(str).tolist()
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(keys)]))
+    joined = ['; '.join(strings[start:end]) for start, end in zip(starts, ends)]
+    return pd.Series(joined, index=pd.Index(keys[starts], name=key_column), dtype=object)
+
+
+def _aggregate_faers_table(df: pd.DataFrame, file_type: str, key_column: str) -> Optional[pd.DataFrame]:
+    """
+    Aggregate a multi-row-per-case FAERS table to one row per case, indexed by key.
+    """
+    grouped = df.groupby(key_column, sort=True)
+    
+    if file_type == 'DRUG':
+        # Skip if drug column doesn't exist after standardization
+        if 'drug' not in df.columns:
+            return None
+        agg = pd.DataFrame({'drug_name': _join_unique_values(df, key_column, 'drug')})
+        agg = agg.reindex(grouped.size().index)
+        for field in _DRUG_DETAIL_FIELDS:
+            if field in df.columns:
+                agg[field] = _join_unique_values(df, key_column, field)
+        # Count rows per case directly (no drug_seq needed)
+        agg['drug_count'] = grouped.size()
+        
+        # Normalize drug names (enhanced fuzzy matching)
+        try:
+            from src.drug_name_normalization import normalize_drug_column
+            agg = normalize_drug_column(agg, drug_column='drug_name')
+        except Exception:
+            pass  # Continue without normalization if it fails
+        return agg
+    
+    if file_type == 'REAC':
+        # REAC file has NO drug_seq column - just count rows directly
+        if 'pt' not in df.columns:
+            return None
+        sizes = grouped.size()
+        reaction = _join_unique_values(df, key_column, 'pt').reindex(sizes.index, fill_value='')
+        return pd.DataFrame({'reaction': reaction, 'reaction_count': sizes})
+    
+    if file_type == 'OUTC':
+        # Take first outcome per case
+        return grouped.first()
+    
+    if file_type == 'THER':
+        # Preserve first non-null therapy fields
+        fields = [col for col in ['start_dt', 'end_dt', 'dur', 'dur_cod'] if col in df.columns]
+        return grouped[fields].first() if fields else None
+    
+    if file_type == 'INDI':
+        if 'indi_pt' not in df.columns:
+            return None
+        indication = _join_unique_values(df, key_column, 'indi_pt').reindex(grouped.size().index, fill_value='')
+        return pd.DataFrame({'indication': indication})
+    
+    if file_type == 'RPSR':
+        # Take first reporter source per case
+        if 'rpsr_cod' not in df.columns:
+            return None
+        return grouped[['rpsr_cod']].first()
+    
+    # For other files, keep first occurrence
+    return grouped.first()
+
+
+def _load_faers_table(file_path: Path, file_type: str) -> Dict[str, Any]:
+    """
+    Worker: read one FAERS file and (except DEMO) aggregate it per case.
+    Runs in a separate process, so summary and warnings are returned to the caller.
+    """
+    warnings_before = len(LOAD_WARNINGS)
+    frame = None
+    key_column = None
+    error = None
+    try:
+        df = load_faers_file(file_path, file_type)
+        if df is not None and len(df) > 0:
+            key_column = _find_key_column(df.columns)
+            if file_type == 'DEMO':
+                frame = df
+            elif key_column is not None:
+                frame = _aggregate_faers_table(df, file_type, key_column)
+    except Exception as e:
+        error = str(e)
+    
+    warnings = LOAD_WARNINGS[warnings_before:]
+    del LOAD_WARNINGS[warnings_before:]
+    return {
+        'file_type': file_type,
+        'frame': frame,
+        'key_column': key_column,
+        'error': error,
+        'warnings': warnings,
+        'summary': FAERS_FILE_SUMMARY.get(Path(file_path).name),
+    }
+
+
+def _load_faers_tables(files_found: Dict[str, Path], max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield _load_faers_table results as each table completes.
+    
+    Uses a process pool (parsing and aggregation are CPU-bound); falls back to
+    threads where processes cannot be started, and to sequential loading for
+    max_workers=1.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    
+    workers = max_workers or min(len(files_found), os.cpu_count() or 1)
+    if workers <= 1 or len(files_found) == 1:
+        for file_type, file_path in files_found.items():
+            yield _load_faers_table(file_path, file_type)
+        return
+    
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_load_faers_table, path, ft) for ft, path in files_found.items()]
+    except (OSError, NotImplementedError, ImportError):
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_load_faers_table, path, ft) for ft, path in files_found.items()]
+    
+    pending = dict(zip(futures, files_found.items()))
+    try:
+        for future in as_completed(futures):
+            file_type, file_path = pending[future]
+            try:
+                yield future.result()
+            except Exception:
+                # Worker process died (e.g. out of memory) - retry this table in-process
+                yield _load_faers_table(file_path, file_type)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def load_faers_file(file_path, file_type: str) -> Optional[pd.DataFrame]:
     """
     Load a single FAERS ASCII file.
@@ -379,9 +642,8 @@ def load_faers_file(file_path, file_type: str) -> Optional[pd.DataFrame]:
         file_path = Path(str(file_path))
     
     try:
-        # FAERS files use $ delimiter (not |)
-        # Try $ first since that's the standard FAERS format
-        df = _read_with_delimiters(file_path, ['$', '|'])
+        # FAERS files use $ delimiter (not |) - sniffed once, $ wins ties
+        df, parse_stats = _read_faers_ascii(file_path, file_type, ['$', '|'])
         
         if df is None or len(df) == 0:
             return None
@@ -407,18 +669,9 @@ def load_faers_file(file_path, file_type: str) -> Optional[pd.DataFrame]:
             # Older format - rename to ISR for consistency
             df.rename(columns={'case': 'ISR'}, inplace=True)
 
-        # Update per-file summary for import diagnostics
-        try:
-            total_lines = 0
-            with open(file_path, 'rb') as fh:
-                for _ in fh:
-                    total_lines += 1
-            approx_skipped = 0
-            if total_lines > 1:
-                approx_skipped = max(0, total_lines - 1 - len(df))
-        except Exception:
-            total_lines = None
-            approx_skipped = None
+        # Update per-file summary for import diagnostics (line count comes from the parse scan)
+        total_lines = parse_stats["total_lines"]
+        approx_skipped = max(0, total_lines - 1 - len(df)) if total_lines > 1 else 0
 
         try:
             name = file_path.name if hasattr(file_path, "name") else str(file_path)
@@ -431,6 +684,7 @@ def load_faers_file(file_path, file_type: str) -> Optional[pd.DataFrame]:
             "approx_skipped_lines": int(approx_skipped) if approx_skipped is not None else None,
             "total_lines": int(total_lines) if total_lines is not None else None,
             "columns": list(df.columns),
+            **{k: v for k, v in parse_stats.items() if k != "total_lines"},
         }
         
         return df
@@ -444,14 +698,243 @@ def load_faers_file(file_path, file_type: str) -> Optional[pd.DataFrame]:
         raise
 
 
-def _read_with_delimiters(file_path: Path, delimiters: List[str]) -> pd.DataFrame:
+class _LineStream(io.RawIOBase):
+    """Read-only byte stream over an iterator of lines (feeds the parser without a temp file)."""
+
+    def __init__(self, lines: Iterator[bytes]):
+        self._lines = lines
+        self._buffer = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while len(self._buffer) < len(target):
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
+def _sniff_faers_format(file_path: Path, delimiters: List[str]) -> Tuple[str, bytes]:
     """
-    Attempt to read a FAERS file with a prioritized list of delimiters.
-    Handles variable field counts by using on_bad_lines='warn' (pandas >= 1.3)
-    or error_bad_lines=False (pandas < 1.3).
-    Also tries different encodings if latin-1 fails.
+    Detect the delimiter once from a byte sample.
+    
+    Returns:
+        Tuple of (delimiter, raw header line)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(_SNIFF_BYTES)
+    
+    if sample.startswith(b'\xef\xbb\xbf'):
+        sample = sample[3:]
+    header = sample.split(b'\n', 1)[0].rstrip(b'\r')
+    
+    # Prefer delimiter that appears most often in the header (ties keep priority order)
+    counts = {delim: header.count(delim.encode()) for delim in delimiters}
+    sep = max(delimiters, key=lambda delim: counts[delim])
+    if counts[sep] == 0:
+        found = [f"{d}: {header.count(d.encode())}" for d in ['|', '$', '\t', ','] if d.encode() in header]
+        raise ValueError(
+            f"Could not detect delimiter for {file_path.name} (tried {', '.join(delimiters)}). "
+            f"First line preview: {header[:100].decode('latin-1')}..."
+            + (f" Delimiters in first line: {', '.join(found)}" if found else "")
+        )
+    return sep, header
+
+
+# Bytes with no character in cp1252 (a file containing any of them is read as latin-1)
+_CP1252_UNDEFINED = (b'\x81', b'\x8d', b'\x8f', b'\x90', b'\x9d')
+
+
+def _scan_line_structure(file_path: Path, sep: str) -> Tuple[int, int, str]:
+    """
+    Count lines and delimiters in large binary chunks (no per-line Python work)
+    and pick the encoding for the whole file in the same pass.
+    
+    The file is UTF-8 only if every byte decodes as UTF-8 (checked with an
+    incremental decoder, so a character split across chunks is fine);
+    otherwise cp1252, or latin-1 if it contains bytes cp1252 does not define.
+    
+    Returns:
+        Tuple of (line count, delimiter count, encoding)
+    """
+    sep_bytes = sep.encode()
+    lines = 0
+    seps = 0
+    last = b''
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    is_utf8 = True
+    is_cp1252 = True
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(_SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            lines += chunk.count(b'\n')
+            seps += chunk.count(sep_bytes)
+            last = chunk[-1:]
+            if is_utf8:
+                try:
+                    utf8.decode(chunk)
+                except UnicodeDecodeError:
+                    is_utf8 = False
+            if is_cp1252 and any(byte in chunk for byte in _CP1252_UNDEFINED):
+                is_cp1252 = False
+    if is_utf8:
+        try:
+            utf8.decode(b'', final=True)
+        except UnicodeDecodeError:
+            is_utf8 = False
+    if last and last != b'\n':
+        lines += 1
+    encoding = 'utf-8' if is_utf8 else ('cp1252' if is_cp1252 else 'latin-1')
+    return lines, seps, encoding
+
+
+def _repair_faers_lines(handle, sep: str, expected_seps: int, stats: Dict[str, int]) -> Iterator[bytes]:
+    """
+    Streaming repair of malformed FAERS lines.
+    
+    - Lines split by embedded newlines are re-joined until the field count matches
+    - Short lines that cannot be re-joined are padded with empty fields
+    - Trailing empty extra fields are trimmed; lines with real extra fields are dropped
+    - Blank lines are dropped
+    """
+    sep_bytes = sep.encode()
+    pending = None
+    
+    def pad(line: bytes) -> bytes:
+        return line + sep_bytes * (expected_seps - line.count(sep_bytes)) + b'\n'
+    
+    for raw in handle:
+        line = raw.rstrip(b'\r\n')
+        
+        if pending is not None:
+            joined = pending + b' ' + line
+            joined_seps = joined.count(sep_bytes)
+            if joined_seps <= expected_seps:
+                stats['joined_lines'] += 1
+                if joined_seps == expected_seps:
+                    yield joined + b'\n'
+                    pending = None
+                else:
+                    pending = joined
+                continue
+            # Next line starts a new record - emit what we have
+            stats['padded_lines'] += 1
+            yield pad(pending)
+            pending = None
+        
+        if not line.strip():
+            stats['dropped_lines'] += 1
+            continue
+        
+        n_seps = line.count(sep_bytes)
+        if n_seps == expected_seps:
+            yield line + b'\n'
+        elif n_seps < expected_seps:
+            pending = line
+        else:
+            fields = line.split(sep_bytes)
+            if not any(field.strip() for field in fields[expected_seps + 1:]):
+                stats['trimmed_lines'] += 1
+                yield sep_bytes.join(fields[:expected_seps + 1]) + b'\n'
+            else:
+                stats['dropped_lines'] += 1
+    
+    if pending is not None:
+        stats['padded_lines'] += 1
+        yield pad(pending)
+
+
+def _faers_columns_to_read(file_type: Optional[str]) -> set:
+    """
+    Lowercase column names worth parsing for a file type: everything
+    _trim_to_essential_columns keeps plus the sources _standardize_faers_columns reads.
+    """
+    ft = (file_type or "").upper()
+    alias_maps = [FAERS_COLUMN_ALIASES.get(ft, {}), FAERS_COLUMN_RENAMES.get(ft, {})]
+    if ft not in FAERS_COLUMN_ALIASES and ft not in FAERS_FILES:
+        alias_maps = list(FAERS_COLUMN_ALIASES.values()) + list(FAERS_COLUMN_RENAMES.values())
+    
+    wanted = {col.lower() for col in ESSENTIAL_COLUMNS} | set(FAERS_KEY_COLUMNS)
+    for alias_map in alias_maps:
+        for target, candidates in alias_map.items():
+            wanted.add(target)
+            wanted.update(candidates)
+    return wanted
+
+
+def _parse_with_pyarrow(source, sep: str, encoding: str, usecols: List[str]) -> pd.DataFrame:
+    """Parse with pyarrow's multi-threaded CSV reader (all columns as strings)."""
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(encoding=encoding, use_threads=True),
+        parse_options=pa_csv.ParseOptions(delimiter=sep, quote_char=False),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=usecols,
+            column_types={col: pa.string() for col in usecols},
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+    # Arrow nulls arrive as None; missing text is NaN everywhere else (C engine, downstream checks)
+    for col in df.columns:
+        if df[col].dtype == object and df[col].hasnans:
+            df[col] = df[col].fillna(np.nan)
+    return df
+
+
+def _parse_with_c_engine(source, sep: str, encoding: str, wanted: set) -> pd.DataFrame:
+    """Parse with the pandas C engine (all columns as strings)."""
+    return pd.read_csv(
+        source,
+        sep=sep,
+        encoding=encoding,
+        dtype=str,
+        usecols=lambda col: str(col).strip().lower() in wanted,
+        quoting=csv.QUOTE_NONE,
+        on_bad_lines='warn',
+        memory_map=isinstance(source, Path),
+    )
+
+
+def _coerce_numeric_columns(df: pd.DataFrame) -> None:
+    """
+    Convert string columns that are entirely numeric (IDs, ages, FAERS dates
+    such as 20240115) to numbers, matching what type inference used to produce.
+    """
+    for col in df.columns:
+        series = df[col]
+        non_null = series.notna()
+        if not non_null.any():
+            continue
+        converted = pd.to_numeric(series, errors='coerce')
+        if converted[non_null].notna().all():
+            df[col] = converted
+
+
+def _read_faers_ascii(
+    file_path: Path,
+    file_type: Optional[str] = None,
+    delimiters: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Read a FAERS ASCII file in a single parse.
+    
+    The delimiter is sniffed once from a byte sample and the encoding is chosen
+    from the whole file during the structure scan, only the columns needed downstream are parsed (as strings), and malformed lines are repaired in
+    a streaming pre-pass instead of re-parsing with the python engine. Parsing uses
+    pyarrow (multi-threaded) when installed, otherwise the pandas C engine.
+    
+    Returns:
+        Tuple of (DataFrame, parse statistics)
     """
-    # Convert to Path if it's a string
     if isinstance(file_path, str):
         file_path = Path(file_path)
     
@@ -459,144 +942,80 @@ def _read_with_delimiters(file_path: Path, delimiters: List[str]) -> pd.DataFram
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    if file_path.stat().st_size == 0:
+    file_size = file_path.stat().st_size
+    if file_size == 0:
         raise ValueError(f"File is empty: {file_path}")
     
-    # Try to peek at first few lines to detect delimiter
-    try:
-        with open(file_path, 'rb') as f:
-            first_bytes = f.read(1024)
-            first_lines = first_bytes.decode('latin-1', errors='ignore').split('\n')[:3]
-            
-        # Count delimiters in first line
-        delimiter_counts = {}
-        if first_lines:
-            first_line = first_lines[0]
-            for delim in delimiters:
-                delimiter_counts[delim] = first_line.count(delim)
-        
-        # Sort delimiters by count (highest first)
-        sorted_delimiters = sorted(delimiter_counts.items(), key=lambda x: x[1], reverse=True)
-        if sorted_delimiters and sorted_delimiters[0][1] > 0:
-            # Prefer delimiter that appears most often
-            preferred_delimiter = sorted_delimiters[0][0]
-            if preferred_delimiter in delimiters:
-                delimiters = [preferred_delimiter] + [d for d in delimiters if d != preferred_delimiter]
-    except Exception:
-        pass  # If peeking fails, use original order
+    started = time.perf_counter()
+    sep, header_bytes = _sniff_faers_format(file_path, delimiters or ['$', '|'])
+    total_lines, total_seps, encoding = _scan_line_structure(file_path, sep)
+    header = header_bytes.decode(encoding).split(sep)
+    expected_seps = len(header) - 1
+    well_formed = total_seps == expected_seps * total_lines
     
-    last_error = None
-    last_error_msg = None
-    encodings = ['latin-1', 'cp1252', 'iso-8859-1', 'utf-8']
+    wanted = _faers_columns_to_read(file_type)
+    usecols = [col for col in header if col.strip() and col.strip().lower() in wanted]
+    if not usecols:
+        raise ValueError(
+            f"Could not read file {file_path.name}: no recognised FAERS columns in header "
+            f"({', '.join(c for c in header[:10] if c)})"
+        )
     
-    for sep in delimiters:
-        for encoding in encodings:
-            try:
-                read_kwargs = {
-                    "sep": sep,
-                    "encoding": encoding,
-                    "engine": "python",  # python engine tolerates variable columns
-                    "quotechar": '"',
-                    "escapechar": "\\",
-                }
-                try:
-                    # pandas >= 1.3
-                    df = pd.read_csv(file_path, on_bad_lines="warn", **read_kwargs)
-                except TypeError:
-                    # pandas < 1.3 (fallback params)
-                    df = pd.read_csv(
-                        file_path,
-                        error_bad_lines=False,
-                        warn_bad_lines=True,
-                        **read_kwargs,
-                    )
-                
-                if df is not None and len(df) > 0:
-                    # Verify delimiter actually split columns
-                    if df.shape[1] == 1 and sep != '$':
-                        first_col = str(df.columns[0])
-                        sample_val = str(df.iloc[0, 0]) if len(df) > 0 else ""
-                        # If only one column and it contains the other delimiter, try next
-                        if '$' in first_col or (sep == '|' and '$' in sample_val):
-                            continue
-                    # Success - return the dataframe
-                    if df.shape[1] > 1:  # Must have multiple columns
-                        return df
-            except Exception as exc:
-                last_error = exc
-                last_error_msg = f"Delimiter '{sep}' with encoding '{encoding}': {str(exc)}"
-                continue
+    repair_stats = {'joined_lines': 0, 'padded_lines': 0, 'trimmed_lines': 0, 'dropped_lines': 0}
+    
+    def parse(parser, *args):
+        if well_formed:
+            return parser(file_path, *args)
+        for key in repair_stats:
+            repair_stats[key] = 0
+        with open(file_path, 'rb') as handle:
+            stream = io.BufferedReader(
+                _LineStream(_repair_faers_lines(handle, sep, expected_seps, repair_stats)),
+                buffer_size=_STREAM_BUFFER_BYTES,
+            )
+            return parser(stream, *args)
     
-    # Fall back to pandas delimiter inference if explicit delimiters fail
-    for encoding in encodings:
+    df = None
+    engine = None
+    last_error = None
+    if PYARROW_AVAILABLE:
         try:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    engine="python",
-                    on_bad_lines="warn",
-                    quotechar='"',
-                    escapechar="\\",
-                )
-            except TypeError:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    engine="python",
-                    error_bad_lines=False,
-                    warn_bad_lines=True,
-                    quotechar='"',
-                    escapechar="\\",
-                )
-            
-            if df is not None and len(df) > 0:
-                if df.shape[1] > 1:  # Must have multiple columns
-                    return df
+            df = parse(_parse_with_pyarrow, sep, encoding, usecols)
+            engine = 'pyarrow'
         except Exception as exc:
             last_error = exc
-            last_error_msg = f"Auto-detect with encoding '{encoding}': {str(exc)}"
-            continue
-    
-    # If all else fails, provide detailed error
-    error_details = []
-    if last_error_msg:
-        error_details.append(f"Last attempt: {last_error_msg}")
-    
-    # Try to get file info for debugging
-    try:
-        file_size = file_path.stat().st_size
-        error_details.append(f"File size: {file_size:,} bytes")
-        
-        # Try to read first line
-        with open(file_path, 'rb') as f:
-            first_bytes = f.read(200)
-            first_line = first_bytes.decode('latin-1', errors='ignore').split('\n')[0]
-            error_details.append(f"First line preview: {first_line[:100]}...")
-            
-            # Check what delimiters are present
-            found_delimiters = []
-            for delim in ['|', '$', '\t', ',']:
-                if delim in first_line:
-                    count = first_line.count(delim)
-                    found_delimiters.append(f"{delim}: {count} occurrences")
-            if found_delimiters:
-                error_details.append(f"Delimiters in first line: {', '.join(found_delimiters)}")
-    except Exception:
-        pass
+            df = None
+    if df is None:
+        try:
+            df = parse(_parse_with_c_engine, sep, encoding, wanted)
+            engine = 'c'
+        except Exception as exc:
+            raise ValueError(
+                f"Could not read file {file_path.name} (delimiter '{sep}', encoding '{encoding}'): {exc}"
+            ) from (last_error or exc)
     
-    error_msg = f"Could not read file {file_path.name} with any delimiter or encoding"
-    if error_details:
-        error_msg += f"\nDetails: {'; '.join(error_details)}"
+    _coerce_numeric_columns(df)
     
-    if last_error:
-        raise ValueError(error_msg) from last_error
-    raise ValueError(error_msg)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    stats = {
+        "delimiter": sep,
+        "encoding": encoding,
+        "engine": engine,
+        "bytes": int(file_size),
+        "total_lines": int(total_lines),
+        "repaired": not well_formed,
+        **repair_stats,
+        "parse_seconds": round(elapsed, 3),
+        "rows_per_sec": round(len(df) / elapsed, 1),
+        "mb_per_sec": round(file_size / (1024 * 1024) / elapsed, 2),
+    }
+    return df, stats
 
 
 def _standardize_faers_columns(df: pd.DataFrame, file_type: str) -> None:
     """
     Normalize FAERS columns to names expected by downstream aggregation.
+    Alias and rename rules live in FAERS_COLUMN_ALIASES / FAERS_COLUMN_RENAMES.
     """
     def ensure_column(target: str, candidates: List[str]):
         if target in df.columns:
@@ -607,58 +1026,15 @@ def _standardize_faers_columns(df: pd.DataFrame, file_type: str) -> None:
                 return
     
     ft = (file_type or "").upper()
-    if ft == 'DRUG':
-        # DRUG files have: primaryid, caseid, drug_seq, drugname, prod_ai, etc.
-        ensure_column('drug', ['drugname', 'medicinalproduct', 'prod_ai', 'drug_name'])
-        # Preserve additional DRUG file fields for case processing
-        # dechal, rechal, dose_amt, dose_unit, dose_form, route, role_cod
-        ensure_column('dechal', ['dechal', 'dechallenge', 'dechallenge_code'])
-        ensure_column('rechal', ['rechal', 'rechallenge', 'rechallenge_code'])
-        ensure_column('dose_amt', ['dose_amt', 'dose_amount', 'dose'])
-        ensure_column('dose_unit', ['dose_unit', 'dose_units', 'unit'])
-        ensure_column('dose_form', ['dose_form', 'doseform', 'form'])
-        ensure_column('route', ['route', 'route_cod', 'route_code'])
-        ensure_column('role_cod', ['role_cod', 'role_code', 'drug_role'])
-        # drug_seq should already exist in DRUG files - no need to create it
-        # If it doesn't exist, we'll use key_column for counting
-    elif ft == 'REAC':
-        # REAC files have: primaryid, caseid, pt, drug_rec_act (NO drug_seq column!)
-        ensure_column('pt', ['preferred_term', 'reaction', 'reaction_pt', 'pt_name'])
-        # REAC files do NOT have drug_seq - we'll count rows directly
-    elif ft == 'INDI':
-        # INDI files have: primaryid, caseid, indi_drug_seq, indi_pt
-        # NOTE: indi_drug_seq is DIFFERENT from drug_seq (used in DRUG file)
-        # We join on primaryid/caseid, NOT on drug_seq
-        ensure_column('indi_pt', ['indication', 'indi_pt', 'indication_pt'])
-        # Preserve indi_drug_seq if it exists (for reference, not for joining)
-        if 'indi_drug_seq' not in df.columns:
-            # Try alternative names
-            for alt in ['indi_drug_seq', 'indication_drug_seq', 'drug_seq']:
-                if alt in df.columns:
-                    df.rename(columns={alt: 'indi_drug_seq'}, inplace=True)
-                    break
-    elif ft == 'OUTC':
-        # OUTC files have: primaryid, caseid, outc_cod
-        ensure_column('outc_cod', ['outcome', 'outcome_code', 'outc_cod', 'outcome_cod'])
-    elif ft == 'THER':
-        # THER files have: primaryid, caseid, dsg_drug_seq, start_dt, end_dt, dur, dur_cod
-        # NOTE: dsg_drug_seq is DIFFERENT from drug_seq (used in DRUG file)
-        # We join on primaryid/caseid, NOT on drug_seq
-        # Preserve dsg_drug_seq if it exists (for reference, not for joining)
-        if 'dsg_drug_seq' not in df.columns:
-            # Try alternative names
-            for alt in ['dsg_drug_seq', 'therapy_drug_seq', 'drug_seq']:
+    for target, candidates in FAERS_COLUMN_RENAMES.get(ft, {}).items():
+        # Preserve sequence column under its file-specific name (for reference, not for joining)
+        if target not in df.columns:
+            for alt in candidates:
                 if alt in df.columns:
-                    df.rename(columns={alt: 'dsg_drug_seq'}, inplace=True)
+                    df.rename(columns={alt: target}, inplace=True)
                     break
-        # Preserve therapy date and duration fields
-        ensure_column('start_dt', ['start_dt', 'start_date', 'therapy_start', 'dsg_dt'])
-        ensure_column('end_dt', ['end_dt', 'end_date', 'therapy_end'])
-        ensure_column('dur', ['dur', 'duration', 'therapy_duration'])
-        ensure_column('dur_cod', ['dur_cod', 'duration_code', 'dur_code'])
-    elif ft == 'RPSR':
-        # RPSR files have: primaryid, caseid, rpsr_cod
-        ensure_column('rpsr_cod', ['source', 'report_source', 'rpsr_cod', 'rpsr_code'])
+    for target, candidates in FAERS_COLUMN_ALIASES.get(ft, {}).items():
+        ensure_column(target, candidates)
 
 
 def _trim_to_essential_columns(df: pd.DataFrame, key_column: str) -> pd.DataFrame:
@@ -678,7 +1054,22 @@ def _trim_to_essential_columns(df: pd.DataFrame, key_column: str) -> pd.DataFram
     return df
 
 
-def load_faers_zip(zip_path: str, progress_callback=None) -> Optional[pd.DataFrame]:
+def _zip_faers_sources(z: zipfile.ZipFile) -> Dict[str, str]:
+    """Cache digests of the FAERS members of a ZIP, matched like _find_faers_files."""
+    from src import faers_cache
+    
+    sources = {}
+    members = [info for info in z.infolist() if info.filename.lower().endswith('.txt')]
+    for file_type, config in FAERS_FILES.items():
+        pattern = re.compile(config['filename_pattern'], re.IGNORECASE)
+        for info in members:
+            if pattern.match(Path(info.filename).name):
+                sources[file_type] = faers_cache.zip_member_digest(info)
+                break
+    return sources
+
+
+def load_faers_zip(zip_path: str, progress_callback=None, use_cache: bool = True) -> Optional[pd.DataFrame]:
     """
     Load FAERS data from a ZIP file containing ASCII files.
     Supports nested folder structures (e.g., ASCII/ subfolder).
@@ -686,6 +1077,7 @@ def load_faers_zip(zip_path: str, progress_callback=None) -> Optional[pd.DataFra
     Args:
         zip_path: Path to ZIP file
         progress_callback: Optional callback function(step_name, progress_percent, file_num, total_files)
+        use_cache: Reuse/store the joined table in the columnar cache (faers_cache)
         
     Returns:
         Combined DataFrame with all FAERS data joined on CASE/ISR
@@ -714,6 +1106,22 @@ def load_faers_zip(zip_path: str, progress_callback=None) -> Optional[pd.DataFra
             if not txt_files:
                 # No .txt files found - might be wrong format
                 return None
+            
+            # Cache hit straight from the ZIP directory (member size + CRC32) - no extraction
+            if use_cache:
+                try:
+                    from src import faers_cache
+                    if faers_cache.is_cache_available():
+                        sources = _zip_faers_sources(z)
+                        if 'DEMO' in sources:
+                            cached = _restore_cached_faers(
+                                faers_cache.cache_key(sources, _loader_fingerprint()),
+                                progress_callback,
+                            )
+                            if cached is not None:
+                                return cached
+                except Exception:
+                    pass
         
         # Report progress: Extracting ZIP
         if progress_callback:
@@ -738,7 +1146,7 @@ def load_faers_zip(zip_path: str, progress_callback=None) -> Optional[pd.DataFra
             faers_progress_callback = None
         
         # load_faers_folder now uses rglob to search recursively
-        result = load_faers_folder(temp_dir, progress_callback=faers_progress_callback)
+        result = load_faers_folder(temp_dir, progress_callback=faers_progress_callback, use_cache=use_cache)
         
         if result is None or len(result) == 0:
             txt_files_in_zip = [f for f in zip_contents if f.lower().endswith('.txt')]
@@ -2,9 +2,13 @@
 Knowledge Graph Core - Entity and relation management
 """
 
+import threading
+from pathlib import Path
 import networkx as nx
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
+from .kg_snapshot import KGSnapshot
+from .kg_store import save_graph, load_graph
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,40 @@ class KnowledgeGraph:
     
     def __init__(self):
         self.g = nx.DiGraph()
+        self.metadata: Dict[str, Any] = {}
+        self._version = 0
+        self._snapshot: Optional[KGSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+    
+    # ---------------------------
+    # Versioning / Snapshot
+    # ---------------------------
+    @property
+    def version(self) -> int:
+        """Graph version (incremented on every change made through this class)."""
+        return self._version
+    
+    def mark_changed(self):
+        """Invalidate the compiled snapshot (call after editing self.g directly)."""
+        self._version += 1
+    
+    def snapshot(self) -> KGSnapshot:
+        """
+        Return the compiled read-only snapshot, recompiling it if the graph changed.
+        
+        Direct edits of self.g that change the node or edge count are also
+        detected; other direct edits need mark_changed().
+        """
+        snapshot = self._snapshot
+        signature = (self.g.number_of_nodes(), self.g.number_of_edges())
+        if snapshot is not None and snapshot.version == self._version and snapshot.signature == signature:
+            return snapshot
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self._version or snapshot.signature != signature:
+                snapshot = KGSnapshot(self.g, self._version)
+                self._snapshot = snapshot
+            return snapshot
     
     # ---------------------------
     # Node Adders
@@ -30,26 +68,37 @@ class KnowledgeGraph:
     def add_drug(self, name: str, **attrs):
         """Add a drug node to the graph."""
         self.g.add_node(name, type="drug", **attrs)
+        self._version += 1
     
     def add_reaction(self, name: str, **attrs):
         """Add a reaction node to the graph."""
         self.g.add_node(name, type="reaction", **attrs)
+        self._version += 1
     
     def add_pathway(self, name: str, **attrs):
         """Add a pathway node to the graph."""
         self.g.add_node(name, type="pathway", **attrs)
+        self._version += 1
     
     def add_mechanism(self, name: str, **attrs):
         """Add a mechanism node to the graph."""
         self.g.add_node(name, type="mechanism", **attrs)
+        self._version += 1
     
     def add_gene(self, name: str, **attrs):
         """Add a gene node to the graph."""
         self.g.add_node(name, type="gene", **attrs)
+        self._version += 1
     
     def add_target(self, name: str, **attrs):
         """Add a drug target node to the graph."""
         self.g.add_node(name, type="target", **attrs)
+        self._version += 1
+    
+    def add_nodes(self, names: Iterable[str], node_type: str, **attrs):
+        """Add many nodes of one type in a single batch."""
+        self.g.add_nodes_from(names, type=node_type, **attrs)
+        self._version += 1
     
     # ---------------------------
     # Relation Adders
@@ -57,26 +106,79 @@ class KnowledgeGraph:
     def link_drug_reaction(self, drug: str, reaction: str, weight: float = 1.0, **attrs):
         """Link a drug to a reaction with optional weight."""
         self.g.add_edge(drug, reaction, relation="causes", weight=weight, **attrs)
+        self._version += 1
     
     def link_drug_pathway(self, drug: str, pathway: str, **attrs):
         """Link a drug to a pathway."""
         self.g.add_edge(drug, pathway, relation="modulates", **attrs)
+        self._version += 1
     
     def link_pathway_reaction(self, pathway: str, reaction: str, **attrs):
         """Link a pathway to a reaction."""
         self.g.add_edge(pathway, reaction, relation="leads_to", **attrs)
+        self._version += 1
     
     def link_mechanism_pathway(self, mechanism: str, pathway: str, **attrs):
         """Link a mechanism to a pathway."""
         self.g.add_edge(mechanism, pathway, relation="activates", **attrs)
+        self._version += 1
     
     def link_drug_target(self, drug: str, target: str, **attrs):
         """Link a drug to its target."""
         self.g.add_edge(drug, target, relation="binds_to", **attrs)
+        self._version += 1
     
     def link_target_pathway(self, target: str, pathway: str, **attrs):
         """Link a target to a pathway."""
         self.g.add_edge(target, pathway, relation="regulates", **attrs)
+        self._version += 1
+    
+    def accumulate_edges(
+        self,
+        edges: pd.DataFrame,
+        relation: str,
+        max_columns: Iterable[str] = (),
+        **attrs
+    ) -> int:
+        """
+        Fold pre-aggregated edges into the graph in a single batch.
+        
+        New edges are added with their count and weight; existing edges get
+        count and weight incremented by the deltas, max_columns folded with
+        max(), and relation/attrs overwritten.
+        
+        Args:
+            edges: DataFrame with columns source, target, count, weight (+ max_columns)
+            relation: Relation label (e.g. "causes")
+            max_columns: Extra per-edge columns kept as the maximum seen
+            **attrs: Attributes set on every edge (e.g. source="faers")
+        
+        Returns:
+            Number of edges added or updated
+        """
+        max_columns = [col for col in max_columns if col in edges.columns]
+        columns = [edges[col].tolist() for col in ["source", "target", "count", "weight"] + max_columns]
+        succ = dict(self.g.adjacency())
+        new_edges = []
+        for source, target, count, weight, *extra in zip(*columns):
+            values = {col: value for col, value in zip(max_columns, extra) if value is not None and value == value}
+            neighbours = succ.get(source)
+            data = neighbours.get(target) if neighbours is not None else None
+            if data is None:
+                new_edges.append((source, target, {
+                    "relation": relation, "weight": float(weight), "count": int(count), **values, **attrs
+                }))
+                continue
+            data["relation"] = relation
+            data["weight"] = float(data.get("weight", 0.0)) + float(weight)
+            data["count"] = int(data.get("count", 0)) + int(count)
+            for col, value in values.items():
+                current = data.get(col)
+                data[col] = max(current, value) if current is not None and current == current else value
+            data.update(attrs)
+        self.g.add_edges_from(new_edges)
+        self._version += 1
+        return len(edges)
     
     # ---------------------------
     # Query
@@ -95,17 +197,11 @@ class KnowledgeGraph:
     
     def shortest_path(self, start: str, end: str) -> Optional[List[str]]:
         """Find shortest path between two nodes."""
-        try:
-            return nx.shortest_path(self.g, start, end)
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            return None
+        return self.snapshot().shortest_path(self.g, start, end)
     
     def all_paths(self, start: str, end: str, max_length: int = 5) -> List[List[str]]:
         """Find all paths between two nodes up to max_length."""
-        try:
-            return list(nx.all_simple_paths(self.g, start, end, cutoff=max_length))
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            return []
+        return self.snapshot().all_paths(start, end, max_length)
     
     def get_node_attributes(self, node: str) -> Dict[str, Any]:
         """Get all attributes of a node."""
@@ -122,15 +218,35 @@ class KnowledgeGraph:
     def import_graph(self, data: Dict):
         """Import graph from dictionary format."""
         self.g = nx.node_link_graph(data)
+        self._version += 1
+    
+    def save(self, path: str):
+        """Persist the graph and its metadata as a compact binary snapshot (.npz)."""
+        save_graph(self.g, Path(path), self.metadata)
+    
+    @classmethod
+    def load(cls, path: str) -> "KnowledgeGraph":
+        """
+        Load a graph saved with save().
+        
+        Returns:
+            KnowledgeGraph (empty if the file does not exist)
+        """
+        kg = cls()
+        if Path(path).exists():
+            kg.g, kg.metadata = load_graph(Path(path))
+        return kg
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics."""
+        snapshot = self.snapshot()
+        type_counts = snapshot.type_counts()
         return {
-            "nodes": self.g.number_of_nodes(),
-            "edges": self.g.number_of_edges(),
-            "drugs": len([n for n, d in self.g.nodes(data=True) if d.get("type") == "drug"]),
-            "reactions": len([n for n, d in self.g.nodes(data=True) if d.get("type") == "reaction"]),
-            "pathways": len([n for n, d in self.g.nodes(data=True) if d.get("type") == "pathway"]),
-            "mechanisms": len([n for n, d in self.g.nodes(data=True) if d.get("type") == "mechanism"]),
+            "nodes": snapshot.signature[0],
+            "edges": snapshot.signature[1],
+            "drugs": type_counts["drug"],
+            "reactions": type_counts["reaction"],
+            "pathways": type_counts["pathway"],
+            "mechanisms": type_counts["mechanism"],
         }
 
@@ -0,0 +1,189 @@
+"""
+KG Snapshot - Read-optimized compiled view of the knowledge graph
+
+A snapshot freezes the graph into integer node ids, a node type array and
+CSR adjacency (successors and predecessors, in graph insertion order) so
+path queries do not walk the networkx dict-of-dicts. Path results are kept
+in a per-snapshot LRU; a new snapshot (and cache) is compiled whenever the
+graph version changes.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+
+import networkx as nx
+import numpy as np
+
+PATH_CACHE_SIZE = 2048
+NODE_TYPES = ["drug", "reaction", "pathway", "mechanism", "gene", "target"]
+
+
+class KGSnapshot:
+    """
+    Immutable compiled copy of a KnowledgeGraph.
+
+    Safe to share between threads: the arrays are never mutated and the
+    path cache is guarded by a lock.
+    """
+
+    def __init__(self, g: nx.DiGraph, version: int):
+        """
+        Compile a graph.
+
+        Args:
+            g: Graph to compile
+            version: KnowledgeGraph version the snapshot was taken at
+        """
+        self.version = version
+        self.signature = (g.number_of_nodes(), g.number_of_edges())
+        self.nodes: List[Any] = list(g.nodes)
+        self.node_ids: Dict[Any, int] = {node: node_id for node_id, node in enumerate(self.nodes)}
+
+        self.type_labels: List[str] = list(NODE_TYPES)
+        type_ids = {label: code for code, label in enumerate(self.type_labels)}
+        types = []
+        for _, node_type in g.nodes(data="type"):
+            label = node_type if node_type is not None else "unknown"
+            code = type_ids.get(label)
+            if code is None:
+                code = type_ids[label] = len(self.type_labels)
+                self.type_labels.append(label)
+            types.append(code)
+        self.types = np.asarray(types, dtype=np.int32)
+
+        node_ids = self.node_ids
+        n_nodes = len(self.nodes)
+        sources = np.fromiter((node_ids[u] for u, _ in g.edges), dtype=np.int64, count=self.signature[1])
+        targets = np.fromiter((node_ids[v] for _, v in g.edges), dtype=np.int64, count=self.signature[1])
+        self.indptr, self.indices = _csr(sources, targets, n_nodes)
+        self.reverse_indptr, self.reverse_indices = _csr(targets, sources, n_nodes)
+        self._successors = [
+            self.indices[self.indptr[node]:self.indptr[node + 1]].tolist() for node in range(n_nodes)
+        ]
+
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def type_counts(self) -> Dict[str, int]:
+        """Number of nodes of each type."""
+        counts = np.bincount(self.types, minlength=len(self.type_labels))
+        return {label: int(count) for label, count in zip(self.type_labels, counts)}
+
+    def all_paths(self, start: Any, end: Any, max_length: int = 5) -> List[List[Any]]:
+        """
+        All simple paths from start to end with at most max_length edges.
+
+        Same paths, in the same order, as nx.all_simple_paths(g, start, end,
+        cutoff=max_length). Results are cached per snapshot.
+        """
+        key = ("all_paths", start, end, max_length)
+        paths = self._cached(key)
+        if paths is None:
+            paths = self._store(key, self._enumerate_paths(start, end, max_length))
+        return [list(path) for path in paths]
+
+    def shortest_path(self, g: nx.DiGraph, start: Any, end: Any) -> Optional[List[Any]]:
+        """Shortest path from start to end (nx.shortest_path on g), cached per snapshot."""
+        key = ("shortest_path", start, end)
+        path = self._cached(key)
+        if path is None:
+            try:
+                path = tuple(nx.shortest_path(g, start, end))
+            except (nx.NetworkXNoPath, nx.NodeNotFound):
+                path = ()
+            self._store(key, path)
+        return list(path) if path else None
+
+    def distances_to(self, end: int, max_length: int) -> np.ndarray:
+        """
+        Hop distance from every node to end (reverse BFS up to max_length).
+
+        Returns:
+            Array of distances, -1 for nodes that cannot reach end in max_length hops
+        """
+        distances = np.full(len(self.nodes), -1, dtype=np.int64)
+        distances[end] = 0
+        frontier = np.array([end], dtype=np.int64)
+        for depth in range(1, max_length + 1):
+            starts = self.reverse_indptr[frontier]
+            lengths = self.reverse_indptr[frontier + 1] - starts
+            if not lengths.sum():
+                break
+            offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+            neighbours = self.reverse_indices[np.arange(lengths.sum()) + offsets]
+            neighbours = np.unique(neighbours[distances[neighbours] < 0])
+            if not len(neighbours):
+                break
+            distances[neighbours] = depth
+            frontier = neighbours
+        return distances
+
+    def _enumerate_paths(self, start: Any, end: Any, max_length: int) -> Tuple[Tuple[Any, ...], ...]:
+        """
+        Bounded-depth bidirectional enumeration.
+
+        A reverse BFS from end gives each node's remaining hop distance; the
+        forward DFS from start (successors in insertion order, like networkx)
+        only descends into nodes that can still reach end within the budget.
+        """
+        source = self.node_ids.get(start)
+        target = self.node_ids.get(end)
+        if source is None or target is None:
+            return ()
+        if source == target:
+            return ((start,),)
+        if max_length < 1:
+            return ()
+
+        distances = self.distances_to(target, max_length).tolist()
+        if distances[source] < 0:
+            return ()
+
+        successors = self._successors
+        found = []
+        path = [source]
+        on_path = {source}
+        stack = [iter(successors[source])]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                on_path.discard(path.pop())
+            elif child == target:
+                found.append(path + [target])
+            elif child not in on_path and 0 < distances[child] <= max_length - len(path):
+                path.append(child)
+                on_path.add(child)
+                stack.append(iter(successors[child]))
+
+        nodes = self.nodes
+        return tuple(tuple(nodes[node] for node in ids) for ids in found)
+
+    # ---------------------------
+    # Cache
+    # ---------------------------
+    def _cached(self, key: Tuple) -> Optional[Any]:
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _store(self, key: Tuple, value: Any) -> Any:
+        with self._cache_lock:
+            self._cache[key] = value
+            while len(self._cache) > PATH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return value
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, n_nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR adjacency (edge order preserved within each row)."""
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n_nodes), out=indptr[1:])
+    return indptr, targets[order]
@@ -0,0 +1,156 @@
+"""
+KG Store - Compact binary persistence for the knowledge graph
+
+The graph is written as one compressed .npz archive: node names, integer
+edge endpoints and one column per node/edge attribute (numbers as int64 or
+float64 arrays, strings as codes into a label table, anything else as JSON
+text), plus a JSON header with the attribute schema and graph metadata. No
+pickle is involved, so archives load with allow_pickle=False.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+FORMAT_VERSION = 1
+_MISSING = object()
+
+
+def save_graph(g: nx.DiGraph, path: Path, metadata: Dict[str, Any]) -> None:
+    """
+    Write a graph snapshot (atomic replace).
+
+    Args:
+        g: Graph to save
+        path: Target .npz file
+        metadata: JSON-serializable graph metadata (e.g. ingestion watermarks)
+    """
+    path = Path(path)
+    nodes = list(g.nodes)
+    node_ids = {node: node_id for node_id, node in enumerate(nodes)}
+    edges = list(g.edges(data=True))
+
+    arrays: Dict[str, np.ndarray] = {
+        "nodes": np.asarray([str(node) for node in nodes], dtype=str),
+        "edge_source": np.fromiter((node_ids[u] for u, _, _ in edges), dtype=np.int32, count=len(edges)),
+        "edge_target": np.fromiter((node_ids[v] for _, v, _ in edges), dtype=np.int32, count=len(edges)),
+    }
+    header = {
+        "format": FORMAT_VERSION,
+        "metadata": metadata,
+        "node_columns": _encode_columns("node", [data for _, data in g.nodes(data=True)], arrays),
+        "edge_columns": _encode_columns("edge", [data for _, _, data in edges], arrays),
+    }
+    arrays["header"] = np.asarray(json.dumps(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_graph(path: Path) -> Tuple[nx.DiGraph, Dict[str, Any]]:
+    """
+    Read a graph snapshot written by save_graph.
+
+    Returns:
+        Tuple of (graph, metadata)
+
+    Raises:
+        ValueError: If the file is not a graph snapshot of a known format
+    """
+    with np.load(Path(path), allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    header = json.loads(str(arrays["header"]))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported knowledge graph snapshot format: {header.get('format')}")
+
+    nodes = arrays["nodes"].tolist()
+    node_attrs = _decode_columns("node", header["node_columns"], arrays, len(nodes))
+    sources = arrays["edge_source"].tolist()
+    targets = arrays["edge_target"].tolist()
+    edge_attrs = _decode_columns("edge", header["edge_columns"], arrays, len(sources))
+
+    g = nx.DiGraph()
+    g.add_nodes_from(zip(nodes, node_attrs))
+    g.add_edges_from((nodes[u], nodes[v], attrs) for u, v, attrs in zip(sources, targets, edge_attrs))
+    return g, header.get("metadata", {})
+
+
+def _column_kind(values: List[Any]) -> str:
+    present = [value for value in values if value is not _MISSING]
+    if all(isinstance(value, (bool, np.bool_)) for value in present):
+        return "bool"
+    if all(isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)) for value in present):
+        return "int"
+    if all(isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)) for value in present):
+        return "float"
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    return "json"
+
+
+def _encode_columns(prefix: str, records: List[Dict[str, Any]], arrays: Dict[str, np.ndarray]) -> List[List[str]]:
+    """Store one array per attribute key; returns the [key, kind] schema."""
+    keys: Dict[str, None] = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+
+    schema = []
+    for position, key in enumerate(keys):
+        values = [record.get(key, _MISSING) for record in records]
+        kind = _column_kind(values)
+        name = f"{prefix}_{position}"
+        present = np.fromiter((value is not _MISSING for value in values), dtype=bool, count=len(values))
+        arrays[f"{name}_present"] = present
+        if kind in ("bool", "int", "float"):
+            dtype = np.float64 if kind == "float" else np.int64
+            arrays[name] = np.asarray([value if value is not _MISSING else 0 for value in values], dtype=dtype)
+        else:
+            texts = [
+                (value if kind == "str" else json.dumps(value, default=str)) if value is not _MISSING else None
+                for value in values
+            ]
+            labels = list(dict.fromkeys(text for text in texts if text is not None))
+            label_ids = {label: code for code, label in enumerate(labels)}
+            arrays[name] = np.fromiter(
+                (label_ids[text] if text is not None else -1 for text in texts), dtype=np.int32, count=len(texts)
+            )
+            arrays[f"{name}_labels"] = np.asarray(labels, dtype=str)
+        schema.append([key, kind])
+    return schema
+
+
+def _decode_columns(
+    prefix: str,
+    schema: List[List[str]],
+    arrays: Dict[str, np.ndarray],
+    size: int
+) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = [{} for _ in range(size)]
+    for position, (key, kind) in enumerate(schema):
+        name = f"{prefix}_{position}"
+        present = arrays[f"{name}_present"].tolist()
+        if kind in ("bool", "int", "float"):
+            cast = {"bool": bool, "int": int, "float": float}[kind]
+            values = [cast(value) for value in arrays[name].tolist()]
+        else:
+            labels = arrays[f"{name}_labels"].tolist()
+            if kind == "json":
+                labels = [json.loads(label) for label in labels]
+            values = [labels[code] if code >= 0 else None for code in arrays[name].tolist()]
+        for record, is_present, value in zip(records, present, values):
+            if is_present:
+                record[key] = value
+    return records
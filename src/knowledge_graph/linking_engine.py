@@ -1,14 +1,30 @@
 """
 Linking Engine - Automatic KG population from data sources
+
+Ingestion is columnar: rows are reduced to one weighted edge per
+(drug, reaction) / (drug, mechanism) pair with a groupby and folded into the
+graph in one batch (KnowledgeGraph.accumulate_edges), so edge weights are the
+sum of the per-row weights and counts the number of supporting rows. Each
+source keeps a watermark (stored in kg.metadata and persisted with
+KnowledgeGraph.save), so re-ingesting a growing dataset only folds in rows
+newer than the last ingest.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from .kg_core import KnowledgeGraph
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Candidate watermark columns per source (first present column is used)
+WATERMARK_COLUMNS = {
+    "social": ["created_utc", "timestamp", "created_date"],
+    "faers": ["primaryid", "receive_date", "receipt_date", "case_id"],
+    "literature": ["pmid", "publication_date", "pub_date"],
+}
+
 
 class LinkingEngine:
     """
@@ -21,125 +37,139 @@ class LinkingEngine:
     def __init__(self, kg: KnowledgeGraph):
         self.kg = kg
     
-    def ingest_social(self, df: pd.DataFrame):
+    @property
+    def watermarks(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source watermarks ({source: {"column", "kind", "value"}})."""
+        return self.kg.metadata.setdefault("watermarks", {})
+    
+    def reset_watermark(self, source: Optional[str] = None):
+        """Forget the watermark of one source (or all), so the next ingest folds in every row."""
+        if source is None:
+            self.watermarks.clear()
+        else:
+            self.watermarks.pop(source, None)
+    
+    def ingest_social(self, df: pd.DataFrame) -> int:
         """
         Ingest social media AE data into KG.
         
         Args:
             df: DataFrame with columns: drug_match, reaction, confidence, severity
+        
+        Returns:
+            Number of rows folded in
         """
         if df.empty:
-            return
+            return 0
         
-        count = 0
-        for _, row in df.iterrows():
-            drug = row.get("drug_match") or row.get("drug")
-            reaction = row.get("reaction")
-            
-            if not drug or not reaction:
-                continue
-            
-            # Add nodes
-            self.kg.add_drug(drug)
-            self.kg.add_reaction(reaction)
-            
-            # Calculate weight from confidence and severity
-            confidence = row.get("confidence", 0.5)
-            severity = row.get("severity", 0.5)
-            weight = (confidence + severity) / 2.0
-            
-            # Link
-            self.kg.link_drug_reaction(
-                drug,
-                reaction,
-                weight=weight,
-                source="social",
-                confidence=confidence,
-                severity=severity
-            )
-            count += 1
+        df, commit = self._new_rows(df, "social")
+        drug = _text_column(df, "drug_match")
+        drug = drug.where(drug.notna(), _text_column(df, "drug"))
+        reaction = _text_column(df, "reaction")
+        
+        # Calculate weight from confidence and severity
+        confidence = _numeric_column(df, "confidence", 0.5)
+        severity = _numeric_column(df, "severity", 0.5)
+        rows = pd.DataFrame({
+            "source": drug,
+            "target": reaction,
+            "weight": (confidence + severity) / 2.0,
+            "confidence": confidence,
+            "severity": severity,
+        })
+        rows = rows[drug.notna() & reaction.notna()]
         
-        logger.info(f"Ingested {count} social AE links into KG")
+        self.kg.add_nodes(rows["source"].unique(), "drug")
+        self.kg.add_nodes(rows["target"].unique(), "reaction")
+        self.kg.accumulate_edges(
+            _aggregate_edges(rows, confidence="max", severity="max"),
+            "causes",
+            max_columns=("confidence", "severity"),
+            source="social"
+        )
+        commit()
+        
+        logger.info(f"Ingested {len(rows)} social AE links into KG")
+        return len(rows)
     
-    def ingest_faers(self, df: pd.DataFrame):
+    def ingest_faers(self, df: pd.DataFrame) -> int:
         """
         Ingest FAERS data into KG.
         
         Args:
             df: DataFrame with columns: drug, reaction, seriousness
+        
+        Returns:
+            Number of rows folded in
         """
         if df.empty:
-            return
+            return 0
         
-        count = 0
-        for _, row in df.iterrows():
-            drug = row.get("drug")
-            reaction = row.get("reaction")
-            
-            if not drug or not reaction:
-                continue
-            
-            # Add nodes
-            self.kg.add_drug(drug)
-            self.kg.add_reaction(reaction)
-            
-            # Calculate weight from seriousness
-            seriousness = row.get("seriousness", 0)
-            weight = 1.0 if seriousness > 0 else 0.7
-            
-            # Link
-            self.kg.link_drug_reaction(
-                drug,
-                reaction,
-                weight=weight,
-                source="faers",
-                seriousness=seriousness
-            )
-            count += 1
+        df, commit = self._new_rows(df, "faers")
+        drug = _text_column(df, "drug")
+        reaction = _text_column(df, "reaction")
         
-        logger.info(f"Ingested {count} FAERS links into KG")
+        # Calculate weight from seriousness
+        seriousness = _numeric_column(df, "seriousness", 0)
+        rows = pd.DataFrame({
+            "source": drug,
+            "target": reaction,
+            "weight": np.where(seriousness > 0, 1.0, 0.7),
+            "seriousness": seriousness,
+        })
+        rows = rows[drug.notna() & reaction.notna()]
+        
+        self.kg.add_nodes(rows["source"].unique(), "drug")
+        self.kg.add_nodes(rows["target"].unique(), "reaction")
+        self.kg.accumulate_edges(
+            _aggregate_edges(rows, seriousness="max"),
+            "causes",
+            max_columns=("seriousness",),
+            source="faers"
+        )
+        commit()
+        
+        logger.info(f"Ingested {len(rows)} FAERS links into KG")
+        return len(rows)
     
-    def ingest_literature(self, df: pd.DataFrame):
+    def ingest_literature(self, df: pd.DataFrame) -> int:
         """
         Ingest literature data into KG.
         
         Args:
             df: DataFrame with columns: drug, mechanism, reaction, pathway
+        
+        Returns:
+            Number of rows folded in
         """
         if df.empty:
-            return
+            return 0
         
-        count = 0
-        for _, row in df.iterrows():
-            drug = row.get("drug")
-            mechanism = row.get("mechanism") or row.get("pathway")
-            reaction = row.get("reaction")
-            
-            if not drug:
-                continue
-            
-            # Add drug
-            self.kg.add_drug(drug)
-            
-            # Add mechanism/pathway if present
-            if mechanism:
-                self.kg.add_mechanism(mechanism)
-                self.kg.link_drug_pathway(drug, mechanism, source="literature")
-            
-            # Add reaction if present
-            if reaction:
-                self.kg.add_reaction(reaction)
-                
-                # Link drug to reaction
-                self.kg.link_drug_reaction(drug, reaction, source="literature", weight=0.9)
-                
-                # Link mechanism to reaction if both present
-                if mechanism:
-                    self.kg.link_pathway_reaction(mechanism, reaction, source="literature")
-            
-            count += 1
+        df, commit = self._new_rows(df, "literature")
+        drug = _text_column(df, "drug")
+        mechanism = _text_column(df, "mechanism")
+        mechanism = mechanism.where(mechanism.notna(), _text_column(df, "pathway"))
+        reaction = _text_column(df, "reaction")
         
+        has_drug = drug.notna()
+        drug_mechanism = pd.DataFrame({"source": drug, "target": mechanism, "weight": 1.0})
+        drug_mechanism = drug_mechanism[has_drug & mechanism.notna()]
+        drug_reaction = pd.DataFrame({"source": drug, "target": reaction, "weight": 0.9})
+        drug_reaction = drug_reaction[has_drug & reaction.notna()]
+        mechanism_reaction = pd.DataFrame({"source": mechanism, "target": reaction, "weight": 1.0})
+        mechanism_reaction = mechanism_reaction[has_drug & mechanism.notna() & reaction.notna()]
+        
+        self.kg.add_nodes(drug[has_drug].unique(), "drug")
+        self.kg.add_nodes(drug_mechanism["target"].unique(), "mechanism")
+        self.kg.add_nodes(drug_reaction["target"].unique(), "reaction")
+        self.kg.accumulate_edges(_aggregate_edges(drug_mechanism), "modulates", source="literature")
+        self.kg.accumulate_edges(_aggregate_edges(drug_reaction), "causes", source="literature")
+        self.kg.accumulate_edges(_aggregate_edges(mechanism_reaction), "leads_to", source="literature")
+        commit()
+        
+        count = int(has_drug.sum())
         logger.info(f"Ingested {count} literature links into KG")
+        return count
     
     def ingest_mechanisms(self, mechanisms: List[Dict[str, Any]]):
         """
@@ -181,4 +211,87 @@ class LinkingEngine:
             count += 1
         
         logger.info(f"Ingested {count} mechanism links into KG")
+    
+    def _new_rows(self, df: pd.DataFrame, source: str) -> Tuple[pd.DataFrame, Callable[[], None]]:
+        """
+        Rows of df past the source watermark.
+        
+        Rows without a watermark value are only ingested while the source has
+        no watermark yet.
+        
+        Returns:
+            Tuple of (rows to ingest, callback advancing the watermark once they are in the graph)
+        """
+        column = next((col for col in WATERMARK_COLUMNS[source] if col in df.columns), None)
+        if column is None:
+            return df, lambda: None
+        
+        keys, kind = _watermark_keys(df[column])
+        previous = self.watermarks.get(source)
+        if previous is not None and (previous.get("column"), previous.get("kind")) != (column, kind):
+            logger.warning(f"{source} watermark column changed ({previous.get('column')} -> {column}); ingesting all rows")
+            previous = None
+        if previous is not None:
+            fresh = keys.notna() & (keys.fillna(previous["value"]) > previous["value"])
+            df, keys = df[fresh.to_numpy(dtype=bool)], keys[fresh]
+        if not keys.notna().any():
+            return df, lambda: None
+        
+        latest = keys.max()
+        latest = latest.item() if hasattr(latest, "item") else latest
+        
+        def commit():
+            self.watermarks[source] = {"column": column, "kind": kind, "value": latest}
+        return df, commit
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column as stripped strings, None where missing or empty."""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = df[column]
+    text = values.astype(str).str.strip()
+    return text.where(values.notna() & (text != ""), None)
+
+
+def _numeric_column(df: pd.DataFrame, column: str, default: float) -> pd.Series:
+    """Numeric column with missing values replaced by default."""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index, dtype=float)
+    return pd.to_numeric(df[column], errors="coerce").fillna(default)
+
+
+def _aggregate_edges(rows: pd.DataFrame, **max_columns: str) -> pd.DataFrame:
+    """One row per (source, target): count, summed weight and aggregated extra columns."""
+    aggregations = {"count": ("weight", "size"), "weight": ("weight", "sum")}
+    aggregations.update({col: (col, how) for col, how in max_columns.items()})
+    return rows.groupby(["source", "target"], sort=False).agg(**aggregations).reset_index()
+
+
+def _watermark_keys(values: pd.Series) -> Tuple[pd.Series, str]:
+    """
+    Comparable watermark keys: numbers, datetimes (as epoch microseconds) or strings.
+    
+    Returns:
+        Tuple of (keys, kind)
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float), "number"
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return _epoch_us(values), "datetime"
+    
+    present = values.notna()
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers[present].notna().all():
+        return numbers.astype(float), "number"
+    dates = pd.to_datetime(values, errors="coerce", utc=True, format="mixed")
+    if dates[present].notna().all():
+        return _epoch_us(dates), "datetime"
+    return values.astype(str).where(present, None), "text"
+
 
+def _epoch_us(dates: pd.Series) -> pd.Series:
+    """Datetimes as float microseconds since the epoch (exact in float64), NaN for NaT."""
+    if getattr(dates.dt, "tz", None) is None:
+        dates = dates.dt.tz_localize("UTC")
+    return (dates - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(1, "us")
@@ -209,28 +209,33 @@ class MechanismSupervisor:
         social_df: Optional[pd.DataFrame] = None,
         faers_df: Optional[pd.DataFrame] = None,
         lit_papers_map: Optional[Dict[tuple, List[str]]] = None,
-        mech_texts_map: Optional[Dict[tuple, List[str]]] = None
+        mech_texts_map: Optional[Dict[tuple, List[str]]] = None,
+        max_workers: int = 1
     ) -> List[Dict[str, Any]]:
         """
         Analyze multiple drug-reaction pairs.
         
+        With max_workers > 1 the pairs are analyzed on a thread pool; the KG
+        snapshot is compiled once up front and shared (read-only) by all
+        workers, so repeated drug→reaction path searches hit its cache.
+        
         Args:
             drug_reaction_pairs: List of (drug, reaction) tuples
             social_df: Optional social media DataFrame
             faers_df: Optional FAERS DataFrame
             lit_papers_map: Optional mapping of (drug, reaction) to papers
             mech_texts_map: Optional mapping of (drug, reaction) to mechanism texts
+            max_workers: Number of worker threads (1 = sequential)
         
         Returns:
-            List of analysis dictionaries
+            List of analysis dictionaries (in input order)
         """
-        results = []
-        
-        for drug, reaction in drug_reaction_pairs:
+        def analyze_pair(pair: tuple) -> Dict[str, Any]:
+            drug, reaction = pair
             lit_papers = lit_papers_map.get((drug, reaction), []) if lit_papers_map else []
             mech_texts = mech_texts_map.get((drug, reaction), []) if mech_texts_map else []
             
-            analysis = self.analyze(
+            return self.analyze(
                 drug=drug,
                 reaction=reaction,
                 social_df=social_df,
@@ -238,8 +243,15 @@ class MechanismSupervisor:
                 lit_papers=lit_papers,
                 mech_texts=mech_texts
             )
-            
-            results.append(analysis)
         
-        return results
-
+        if max_workers <= 1 or len(drug_reaction_pairs) <= 1:
+            return [analyze_pair(pair) for pair in drug_reaction_pairs]
+        
+        kg = self.kg if self.kg is not None else getattr(self.router, "kg", None)
+        if kg is not None:
+            kg.snapshot()
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(drug_reaction_pairs))) as executor:
+            return list(executor.map(analyze_pair, drug_reaction_pairs))
@@ -3,7 +3,7 @@ Local FAERS Processing Engine (CHUNK 7.8)
 Browser-based FAERS file loading and joining for offline processing.
 """
 from .faers_local_engine import FaersLocalEngine, create_faers_engine
-from .faers_models import FaersTable, FaersJoinedTable
+from .faers_models import FaersTable, FaersJoinedTable, FaersKeyIndex
 from .faers_validators import validate_faers_csv, detect_faers_table_type
 from .faers_schema_definitions import FAERS_REQUIRED_SCHEMAS
 
@@ -32,6 +32,7 @@ __all__ = [
     "create_faers_engine",
     "FaersTable",
     "FaersJoinedTable",
+    "FaersKeyIndex",
     "validate_faers_csv",
     "detect_faers_table_type",
     "FAERS_REQUIRED_SCHEMAS",
@@ -109,7 +109,7 @@ class FAERSCaseBuilder:
             List of all case objects
         """
         cases = []
-        for primaryid in self.index.demo_index.keys():
+        for primaryid in self.index.case_ids():
             case = self.build_case(primaryid)
             if case:
                 cases.append(case)
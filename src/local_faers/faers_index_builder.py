@@ -4,7 +4,17 @@ Builds optimized indexes for fast multi-file joins and key reconstruction.
 """
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
-from .faers_models import FaersTable
+from .faers_models import FaersTable, FaersKeyIndex, canonical_key
+
+# Table name -> attribute holding its PRIMARYID index
+_TABLE_MAPS = {
+    "DEMO": "demo_index",
+    "DRUG": "drug_map",
+    "REAC": "reac_map",
+    "THER": "ther_map",
+    "OUTC": "outc_map",
+    "INDI": "indi_map",
+}
 
 
 class LocalFAERSIndex:
@@ -16,16 +26,20 @@ class LocalFAERSIndex:
     - Key canonicalization
     - Duplicate detection
     - Missing key reconstruction
+    
+    The PRIMARYID indexes are the tables' own key indexes (FaersTable.key_index),
+    so the join engines and this index share one structure per table.
     """
     
     def __init__(self):
         """Initialize FAERS index structure."""
-        self.demo_index: Dict[str, Dict[str, Any]] = {}  # PRIMARYID -> DEMO row
-        self.drug_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # PRIMARYID -> DRUG rows
-        self.reac_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # PRIMARYID -> REAC rows
-        self.ther_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # PRIMARYID -> THER rows
-        self.outc_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # PRIMARYID -> OUTC rows
-        self.indi_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # PRIMARYID -> INDI rows
+        self.tables: Dict[str, FaersTable] = {}
+        self.demo_index: Optional[FaersKeyIndex] = None  # PRIMARYID -> DEMO rows
+        self.drug_map: Optional[FaersKeyIndex] = None  # PRIMARYID -> DRUG rows
+        self.reac_map: Optional[FaersKeyIndex] = None  # PRIMARYID -> REAC rows
+        self.ther_map: Optional[FaersKeyIndex] = None  # PRIMARYID -> THER rows
+        self.outc_map: Optional[FaersKeyIndex] = None  # PRIMARYID -> OUTC rows
+        self.indi_map: Optional[FaersKeyIndex] = None  # PRIMARYID -> INDI rows
         
         # Key reconstruction helpers
         self.canonical_ids: Dict[str, str] = {}  # Variant -> Canonical PRIMARYID
@@ -39,75 +53,22 @@ class LocalFAERSIndex:
         Args:
             tables: Dictionary of loaded FAERS tables
         """
-        # Index DEMO
-        demo_table = tables.get("DEMO")
-        if demo_table:
-            for row in demo_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.demo_index[canonical_id] = row
-                    self.canonical_ids[primaryid] = canonical_id
+        self.tables = {name.upper(): table for name, table in tables.items() if table is not None}
         
-        # Index DRUG
-        drug_table = tables.get("DRUG")
-        if drug_table:
-            for row in drug_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.drug_map[canonical_id].append(row)
+        # Reconstruct missing keys first so the rebuilt indexes include those rows
+        self._reconstruct_missing_keys(self.tables)
         
-        # Index REAC
-        reac_table = tables.get("REAC")
-        if reac_table:
-            for row in reac_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.reac_map[canonical_id].append(row)
+        for table_name, attribute in _TABLE_MAPS.items():
+            table = self.tables.get(table_name)
+            setattr(self, attribute, table.key_index("primaryid") if table is not None else None)
         
-        # Index THER
-        ther_table = tables.get("THER")
-        if ther_table:
-            for row in ther_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.ther_map[canonical_id].append(row)
-        
-        # Index OUTC
-        outc_table = tables.get("OUTC")
-        if outc_table:
-            for row in outc_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.outc_map[canonical_id].append(row)
-        
-        # Index INDI
-        indi_table = tables.get("INDI")
-        if indi_table:
-            for row in indi_table.rows:
-                primaryid = self._extract_primaryid(row)
-                if primaryid:
-                    canonical_id = self._canonicalize_id(primaryid)
-                    self.indi_map[canonical_id].append(row)
+        if self.demo_index is not None:
+            self.canonical_ids = {
+                str(variant).strip(): canonical for variant, canonical in self.demo_index.variants.items()
+            }
         
         # Build duplicate groups
         self._build_duplicate_groups()
-        
-        # Attempt key reconstruction
-        self._reconstruct_missing_keys(tables)
-    
-    def _extract_primaryid(self, row: Dict[str, Any]) -> Optional[str]:
-        """Extract PRIMARYID from row, trying multiple column variations."""
-        possible_cols = ["primaryid", "PRIMARYID", "PrimaryID", "primary_id", "PRIMARY_ID"]
-        for col in possible_cols:
-            val = row.get(col)
-            if val:
-                return str(val).strip()
-        return None
     
     def _canonicalize_id(self, primaryid: str) -> str:
         """
@@ -118,17 +79,7 @@ class LocalFAERSIndex:
         - Leading/trailing spaces
         - Zero-padding issues
         """
-        # Normalize
-        canonical = str(primaryid).strip().upper()
-        
-        # Remove leading zeros (if numeric)
-        try:
-            numeric_id = int(canonical)
-            canonical = str(numeric_id)
-        except (ValueError, OverflowError):
-            pass  # Keep as-is if not numeric
-        
-        return canonical
+        return canonical_key(primaryid) or ""
     
     def _build_duplicate_groups(self) -> None:
         """Build groups of duplicate PRIMARYIDs."""
@@ -153,61 +104,77 @@ class LocalFAERSIndex:
         - Match by date + drug + reaction combination
         - Match by patient demographics + date
         """
+        # CASEID -> PRIMARYID from DEMO (first row wins)
+        caseid_to_primaryid: Dict[str, str] = {}
+        demo_table = tables.get("DEMO")
+        if demo_table is not None:
+            demo_ids = demo_table.column("primaryid") or []
+            demo_caseids = demo_table.column("caseid") or []
+            for primaryid, caseid in zip(demo_ids, demo_caseids):
+                canonical = canonical_key(primaryid)
+                caseid_key = str(caseid).strip().upper()
+                if canonical and caseid_key and caseid_key not in caseid_to_primaryid:
+                    caseid_to_primaryid[caseid_key] = canonical
+        
         # Find rows with missing PRIMARYID
         for table_name, table in tables.items():
-            for row in table.rows:
-                primaryid = self._extract_primaryid(row)
-                if not primaryid:
-                    # Try to match by CASEID
-                    caseid = row.get("caseid") or row.get("CASEID") or row.get("CASE_ID")
-                    if caseid:
-                        # Try to find matching PRIMARYID in DEMO
-                        for demo_id, demo_row in self.demo_index.items():
-                            demo_caseid = demo_row.get("caseid") or demo_row.get("CASEID")
-                            if str(demo_caseid).strip().upper() == str(caseid).strip().upper():
-                                row["primaryid"] = demo_id
-                                row["PRIMARYID"] = demo_id
-                                break
+            missing_positions = list(table.key_index("primaryid").missing)
+            if not missing_positions:
+                continue
+            caseids = table.column("caseid")
+            for position in missing_positions:
+                caseid = caseids[position] if caseids is not None else ""
+                demo_id = caseid_to_primaryid.get(str(caseid).strip().upper()) if caseid else None
+                if demo_id:
+                    table.set_value(position, "primaryid", demo_id)
+                else:
+                    self.missing_keys.append({"table": table_name, "row": position, "caseid": caseid or None})
+    
+    def _rows(self, table_name: str, index: Optional[FaersKeyIndex], primaryid: str) -> List[Dict[str, Any]]:
+        if index is None:
+            return []
+        return self.tables[table_name].rows_at(index.positions(primaryid))
     
     def get_demo(self, primaryid: str) -> Optional[Dict[str, Any]]:
-        """Get DEMO row by PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.demo_index.get(canonical)
+        """Get DEMO row by PRIMARYID (the last row if the ID repeats)."""
+        if self.demo_index is None:
+            return None
+        positions = self.demo_index.positions(primaryid)
+        return self.tables["DEMO"].row(positions[-1]) if positions else None
     
     def get_drugs(self, primaryid: str) -> List[Dict[str, Any]]:
         """Get all DRUG rows for a PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.drug_map.get(canonical, [])
+        return self._rows("DRUG", self.drug_map, primaryid)
     
     def get_reactions(self, primaryid: str) -> List[Dict[str, Any]]:
         """Get all REAC rows for a PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.reac_map.get(canonical, [])
+        return self._rows("REAC", self.reac_map, primaryid)
     
     def get_outcomes(self, primaryid: str) -> List[Dict[str, Any]]:
         """Get all OUTC rows for a PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.outc_map.get(canonical, [])
+        return self._rows("OUTC", self.outc_map, primaryid)
     
     def get_therapies(self, primaryid: str) -> List[Dict[str, Any]]:
         """Get all THER rows for a PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.ther_map.get(canonical, [])
+        return self._rows("THER", self.ther_map, primaryid)
     
     def get_indications(self, primaryid: str) -> List[Dict[str, Any]]:
         """Get all INDI rows for a PRIMARYID."""
-        canonical = self._canonicalize_id(primaryid)
-        return self.indi_map.get(canonical, [])
+        return self._rows("INDI", self.indi_map, primaryid)
+    
+    def case_ids(self) -> List[str]:
+        """Canonical PRIMARYIDs of all DEMO cases, in file order."""
+        return list(self.demo_index.keys()) if self.demo_index is not None else []
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get index statistics."""
         return {
-            "demo_count": len(self.demo_index),
-            "drug_entries": sum(len(v) for v in self.drug_map.values()),
-            "reac_entries": sum(len(v) for v in self.reac_map.values()),
-            "ther_entries": sum(len(v) for v in self.ther_map.values()),
-            "outc_entries": sum(len(v) for v in self.outc_map.values()),
-            "indi_entries": sum(len(v) for v in self.indi_map.values()),
+            "demo_count": len(self.demo_index) if self.demo_index is not None else 0,
+            "drug_entries": self.drug_map.entry_count() if self.drug_map is not None else 0,
+            "reac_entries": self.reac_map.entry_count() if self.reac_map is not None else 0,
+            "ther_entries": self.ther_map.entry_count() if self.ther_map is not None else 0,
+            "outc_entries": self.outc_map.entry_count() if self.outc_map is not None else 0,
+            "indi_entries": self.indi_map.entry_count() if self.indi_map is not None else 0,
             "duplicate_groups": len(self.duplicate_groups),
             "missing_keys": len(self.missing_keys),
         }
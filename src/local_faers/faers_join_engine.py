@@ -2,8 +2,9 @@
 FAERS Join Engine (CHUNK 7.8 - Part 4)
 Performs joins between FAERS tables to create flattened case records.
 
-This engine works with lightweight FaersTable models (list-of-dicts)
-instead of pandas DataFrames for Pyodide/browser compatibility.
+This engine works with lightweight FaersTable models (column lists with
+shared PRIMARYID indexes) instead of pandas DataFrames for Pyodide/browser
+compatibility.
 """
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
@@ -52,7 +53,7 @@ class FaersJoinEngine:
         flattened_cases = []
         
         # Process each case in DEMO
-        for demo_row in demo_table.rows:
+        for demo_row in demo_table.iter_rows():
             primaryid = demo_row.get("primaryid") or demo_row.get("PRIMARYID")
             caseid = demo_row.get("caseid") or demo_row.get("CASEID")
             
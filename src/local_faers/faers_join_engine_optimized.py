@@ -5,9 +5,8 @@ Performance-optimized join engine with indexing for faster joins.
 This is an optimized version that pre-builds indexes before joining,
 resulting in 2-6× faster performance for large datasets.
 """
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
-from .faers_models import FaersTable, FaersJoinedTable
+from typing import Dict, List, Any, Optional, Tuple
+from .faers_models import FaersTable, FaersJoinedTable, canonical_key
 
 
 class FaersJoinEngineOptimized:
@@ -15,7 +14,7 @@ class FaersJoinEngineOptimized:
     Optimized join engine with pre-built indexes for faster performance.
     
     Performance improvements:
-    - Pre-builds indexes on PRIMARYID for all tables
+    - Uses the tables' shared PRIMARYID indexes (built once per table)
     - Uses dictionary lookups instead of linear searches
     - 2-6× faster for datasets with 20k+ rows
     """
@@ -29,29 +28,19 @@ class FaersJoinEngineOptimized:
         """
         self.tables = tables
         self._indexes = {}  # Pre-built indexes for fast lookups
+        self._indexed_tables = {}  # Upper-case table name -> table
+        self._column_cache = {}  # (table, columns...) -> column lists
         self._build_indexes()
     
     def _build_indexes(self) -> None:
-        """Build indexes on PRIMARYID for all tables for fast lookups."""
+        """Build (or reuse) the tables' shared PRIMARYID indexes."""
         for table_name, table in self.tables.items():
             if table is None or len(table) == 0:
                 continue
             
-            # Build index: PRIMARYID -> List of rows
-            index = defaultdict(list)
-            
-            for row in table.rows:
-                # Try multiple column name variations
-                primaryid = (
-                    row.get("primaryid") or 
-                    row.get("PRIMARYID") or
-                    row.get("PrimaryID")
-                )
-                
-                if primaryid:
-                    index[str(primaryid)].append(row)
-            
-            self._indexes[table_name.upper()] = dict(index)
+            # Index: canonical PRIMARYID -> contiguous row range (kept on the table)
+            self._indexes[table_name.upper()] = table.key_index("primaryid")
+            self._indexed_tables[table_name.upper()] = table
     
     def _get_indexed_rows(self, table_name: str, primaryid: str) -> List[Dict[str, Any]]:
         """
@@ -64,8 +53,43 @@ class FaersJoinEngineOptimized:
         Returns:
             List of matching row dictionaries
         """
-        index = self._indexes.get(table_name.upper(), {})
-        return index.get(str(primaryid), [])
+        index = self._indexes.get(table_name.upper())
+        if index is None:
+            return []
+        return self._indexed_tables[table_name.upper()].rows_at(index.positions(primaryid))
+    
+    def _get_indexed_values(self, table_name: str, primaryid: str, *columns: str) -> List[Tuple[Any, ...]]:
+        """
+        Get selected column values from indexed table by canonical PRIMARYID.
+        
+        Reads the columns directly instead of building full row dictionaries.
+        
+        Args:
+            table_name: Table name (e.g., "DRUG", "REAC")
+            primaryid: Canonical primary ID (see canonical_key)
+            columns: Column names to read
+            
+        Returns:
+            List of value tuples, one per matching row
+        """
+        index = self._indexes.get(table_name)
+        if index is None:
+            return []
+        bounds = index.ranges.get(primaryid)
+        if bounds is None:
+            return []
+        
+        cache_key = (table_name,) + columns
+        selected = self._column_cache.get(cache_key)
+        if selected is None:
+            table = self._indexed_tables[table_name]
+            selected = self._column_cache[cache_key] = [
+                table.column(name) or [""] * len(table) for name in columns
+            ]
+        return [
+            tuple([values[position] for values in selected])
+            for position in index.order[bounds[0]:bounds[1]]
+        ]
     
     def join(self) -> FaersJoinedTable:
         """
@@ -86,7 +110,7 @@ class FaersJoinEngineOptimized:
         flattened_cases = []
         
         # Process each case in DEMO (using index for faster lookups)
-        for demo_row in demo_table.rows:
+        for demo_row in demo_table.iter_rows():
             primaryid = demo_row.get("primaryid") or demo_row.get("PRIMARYID")
             caseid = demo_row.get("caseid") or demo_row.get("CASEID")
             
@@ -99,19 +123,16 @@ class FaersJoinEngineOptimized:
             # Normalize primaryid/caseid keys
             case_record["primaryid"] = str(primaryid)
             case_record["caseid"] = str(caseid) if caseid else ""
+            primaryid = canonical_key(primaryid)
             
             # Join DRUG table using index (FAST)
-            drugs = self._get_indexed_rows("DRUG", primaryid)
+            drugs = self._get_indexed_values("DRUG", primaryid, "drugname", "drug_seq", "role_cod")
             if drugs:
                 drug_names = []
                 drug_seqs = []
                 drug_roles = []
                 
-                for drug_row in drugs:
-                    drug_name = drug_row.get("drugname") or drug_row.get("DRUGNAME", "")
-                    drug_seq = drug_row.get("drug_seq") or drug_row.get("DRUG_SEQ", "")
-                    drug_role = drug_row.get("role_cod") or drug_row.get("ROLE_COD", "")
-                    
+                for drug_name, drug_seq, drug_role in drugs:
                     if drug_name:
                         drug_names.append(str(drug_name))
                         drug_seqs.append(str(drug_seq))
@@ -123,11 +144,10 @@ class FaersJoinEngineOptimized:
                 case_record["drug_role"] = drug_roles[0] if drug_roles else ""
             
             # Join REAC table using index (FAST)
-            reactions = self._get_indexed_rows("REAC", primaryid)
+            reactions = self._get_indexed_values("REAC", primaryid, "pt")
             if reactions:
                 reaction_pts = []
-                for reac_row in reactions:
-                    pt = reac_row.get("pt") or reac_row.get("PT", "")
+                for (pt,) in reactions:
                     if pt:
                         reaction_pts.append(str(pt))
                 
@@ -136,11 +156,10 @@ class FaersJoinEngineOptimized:
                 case_record["reaction_count"] = len(reaction_pts)
             
             # Join OUTC table using index (FAST)
-            outcomes = self._get_indexed_rows("OUTC", primaryid)
+            outcomes = self._get_indexed_values("OUTC", primaryid, "outc_cod")
             if outcomes:
                 outcome_codes = []
-                for outc_row in outcomes:
-                    outc_cod = outc_row.get("outc_cod") or outc_row.get("OUTC_COD", "")
+                for (outc_cod,) in outcomes:
                     if outc_cod:
                         outcome_codes.append(str(outc_cod))
                 
@@ -152,18 +171,17 @@ class FaersJoinEngineOptimized:
                 )
             
             # Join THER table using index (FAST)
-            therapies = self._get_indexed_rows("THER", primaryid)
+            therapies = self._get_indexed_values("THER", primaryid, "start_dt", "end_dt")
             if therapies:
-                first_ther = therapies[0]
-                case_record["therapy_start_dt"] = first_ther.get("start_dt") or first_ther.get("START_DT", "")
-                case_record["therapy_end_dt"] = first_ther.get("end_dt") or first_ther.get("END_DT", "")
+                start_dt, end_dt = therapies[0]
+                case_record["therapy_start_dt"] = start_dt or ""
+                case_record["therapy_end_dt"] = end_dt or ""
             
             # Join INDI table using index (FAST)
-            indications = self._get_indexed_rows("INDI", primaryid)
+            indications = self._get_indexed_values("INDI", primaryid, "indi_pt")
             if indications:
                 indi_pts = []
-                for indi_row in indications:
-                    indi_pt = indi_row.get("indi_pt") or indi_row.get("INDI_PT", "")
+                for (indi_pt,) in indications:
                     if indi_pt:
                         indi_pts.append(str(indi_pt))
                 
@@ -188,6 +206,7 @@ class FaersJoinEngineOptimized:
         stats = {
             "indexed_tables": list(self._indexes.keys()),
             "total_indexed_keys": sum(len(idx) for idx in self._indexes.values()),
+            "total_indexed_rows": sum(idx.entry_count() for idx in self._indexes.values()),
             "index_sizes": {
                 table: len(idx) 
                 for table, idx in self._indexes.items()
@@ -4,14 +4,161 @@ Base class for loading FAERS CSV files into lightweight table models.
 
 This is the foundation that all specific loaders (DEMO, DRUG, etc.) depend on.
 Compatible with Pyodide for browser-based processing.
+
+Sources are streamed: bytes, memory maps and binary files are decoded
+incrementally, parsed LOAD_CHUNK_ROWS records at a time and appended to the
+table column by column, so peak memory beyond the table itself is bounded by
+the chunk size rather than the file size.
 """
+import codecs
 import csv
-from io import StringIO
-from typing import Dict, Any, Optional
+import io
+import mmap
+import os
+from itertools import chain, islice
+from typing import Dict, Any, Optional, Iterator, Iterable, List, Tuple, Union
 
 from .faers_models import FaersTable
 from .faers_validators import validate_faers_csv, validate_faers_file_structure
 
+# Records parsed per columnar append
+LOAD_CHUNK_ROWS = 50_000
+
+# Bytes decoded per read from binary sources
+DECODE_CHUNK_BYTES = 1 << 20
+
+# FAERS ASCII files use "$"; exports and hand-made files use the others
+DELIMITER_CANDIDATES = ("$", "|", "\t", ",")
+
+CsvSource = Union[bytes, bytearray, memoryview, mmap.mmap, str, os.PathLike, io.IOBase, Any]
+
+
+def iter_text_lines(source: CsvSource, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Iterate the lines of a CSV source without materializing the whole text.
+
+    Args:
+        source: bytes/bytearray/memoryview/mmap, CSV text (str), a path,
+                or a binary/text file-like object (e.g. a Streamlit upload)
+        encoding: Text encoding (undecodable bytes are ignored)
+
+    Yields:
+        Lines including their line endings
+    """
+    if isinstance(source, str) and ("\n" in source or "\r" in source or not os.path.exists(source)):
+        yield from _iter_string_lines(source)
+        return
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_binary_lines(f, encoding)
+        return
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield from _iter_buffer_lines(memoryview(source), encoding)
+        return
+    if isinstance(source, io.TextIOBase):
+        yield from source
+        return
+    yield from _iter_binary_lines(source, encoding)
+
+
+def _iter_string_lines(text: str) -> Iterator[str]:
+    """Lines of an in-memory string (no list of lines is built)."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end < 0:
+            end = length
+        else:
+            end += 1
+        yield text[start:end]
+        start = end
+
+
+def _iter_buffer_lines(buffer: memoryview, encoding: str) -> Iterator[str]:
+    """Decode a byte buffer DECODE_CHUNK_BYTES at a time (slices are zero-copy views)."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+    chunks = (
+        decoder.decode(buffer[offset:offset + DECODE_CHUNK_BYTES])
+        for offset in range(0, len(buffer), DECODE_CHUNK_BYTES)
+    )
+    yield from _split_lines(chain(chunks, [decoder.decode(b"", final=True)]))
+
+
+def _iter_binary_lines(stream, encoding: str) -> Iterator[str]:
+    """Decode a file-like object DECODE_CHUNK_BYTES at a time."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+
+    def chunks() -> Iterator[str]:
+        while True:
+            chunk = stream.read(DECODE_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    yield from _split_lines(chunks())
+
+
+def _split_lines(text_chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split decoded text chunks into "\n"-terminated lines."""
+    pending = ""
+    for text in text_chunks:
+        if not text:
+            continue
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def detect_delimiter(header_line: str) -> str:
+    """Pick the delimiter that splits the header line into the most fields."""
+    counts = {candidate: header_line.count(candidate) for candidate in DELIMITER_CANDIDATES}
+    best = max(DELIMITER_CANDIDATES, key=lambda candidate: counts[candidate])
+    return best if counts[best] > 0 else ","
+
+
+def iter_csv_chunks(
+    source: CsvSource,
+    chunk_rows: int = LOAD_CHUNK_ROWS,
+    delimiter: Optional[str] = None,
+    encoding: str = "utf-8"
+) -> Tuple[List[str], Iterator[List[List[str]]]]:
+    """
+    Stream a CSV source as a header plus chunks of records.
+
+    Args:
+        source: CSV source (see iter_text_lines)
+        chunk_rows: Records per chunk
+        delimiter: Field delimiter (detected from the header line if None)
+        encoding: Text encoding
+
+    Returns:
+        Tuple of (header, iterator over lists of records)
+    """
+    lines = iter_text_lines(source, encoding)
+    first_line = next(lines, "")
+    if first_line.startswith("\ufeff"):
+        first_line = first_line[1:]
+    delimiter = delimiter or detect_delimiter(first_line)
+
+    reader = csv.reader(chain([first_line], lines), delimiter=delimiter)
+    header = [name.strip() for name in next(reader, [])]
+
+    def chunks() -> Iterator[List[List[str]]]:
+        # Blank lines parse as [] and are skipped (as csv.DictReader did)
+        records_iter = filter(None, reader)
+        while True:
+            records = list(islice(records_iter, max(1, chunk_rows)))
+            if not records:
+                return
+            yield records
+
+    return header, chunks()
+
 
 class FaersLoaderBase:
     """
@@ -33,12 +180,12 @@ class FaersLoaderBase:
         """
         self.table_name = table_name.upper()
     
-    def load_csv(self, file_bytes: bytes, validate: bool = True) -> FaersTable:
+    def load_csv(self, file_bytes: CsvSource, validate: bool = True) -> FaersTable:
         """
         Load a FAERS CSV into a lightweight FaersTable model.
         
         Args:
-            file_bytes: CSV file content as bytes
+            file_bytes: CSV file content as bytes (or any source accepted by load_stream)
             validate: Whether to validate schema (default: True)
             
         Returns:
@@ -47,50 +194,89 @@ class FaersLoaderBase:
         Raises:
             ValueError: If validation fails
         """
-        # Decode bytes to text
-        try:
-            text = file_bytes.decode("utf-8", errors="ignore")
-        except Exception as e:
-            raise ValueError(f"Failed to decode CSV file: {str(e)}")
+        return self.load_stream(file_bytes, validate=validate)
+    
+    def load_stream(
+        self,
+        source: CsvSource,
+        validate: bool = True,
+        chunk_rows: int = LOAD_CHUNK_ROWS,
+        delimiter: Optional[str] = None,
+        encoding: str = "utf-8"
+    ) -> FaersTable:
+        """
+        Stream a FAERS CSV into a FaersTable.
         
-        # Parse CSV
+        Args:
+            source: bytes, memory map, path, CSV text, or binary/text file-like object
+            validate: Whether to validate schema (default: True)
+            chunk_rows: Records parsed and appended per chunk
+            delimiter: Field delimiter (detected from the header if None)
+            encoding: Text encoding
+            
+        Returns:
+            FaersTable instance with loaded data
+            
+        Raises:
+            ValueError: If validation fails
+        """
+        table = FaersTable(self.table_name)
+        for chunk in self.iter_chunks(source, validate, chunk_rows, delimiter, encoding):
+            table.add_records(chunk[0], chunk[1])
+        return table
+    
+    def iter_chunks(
+        self,
+        source: CsvSource,
+        validate: bool = True,
+        chunk_rows: int = LOAD_CHUNK_ROWS,
+        delimiter: Optional[str] = None,
+        encoding: str = "utf-8"
+    ) -> Iterator[Tuple[List[str], List[List[str]]]]:
+        """
+        Stream a FAERS CSV as validated (header, records) chunks.
+        
+        The header is validated before any records are read and the first
+        rows are validated before the first chunk is returned.
+        
+        Args:
+            source: bytes, memory map, path, CSV text, or binary/text file-like object
+            validate: Whether to validate schema (default: True)
+            chunk_rows: Records per chunk
+            delimiter: Field delimiter (detected from the header if None)
+            encoding: Text encoding
+            
+        Yields:
+            Tuples of (header, records)
+            
+        Raises:
+            ValueError: If decoding, parsing or validation fails
+        """
         try:
-            reader = csv.DictReader(StringIO(text))
-            headers = reader.fieldnames or []
-        except Exception as e:
+            header, chunks = iter_csv_chunks(source, chunk_rows, delimiter, encoding)
+        except (csv.Error, OSError) as e:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
         
         # Validate headers
         if validate:
-            is_valid, error = validate_faers_csv(self.table_name, headers)
+            is_valid, error = validate_faers_csv(self.table_name, header)
             if not is_valid:
                 raise ValueError(f"Invalid FAERS file: {error}")
         
-        # Create table and load rows
-        table = FaersTable(self.table_name)
-        sample_rows = []
-        
-        for i, row in enumerate(reader):
-            # Clean row (remove None values, normalize keys)
-            cleaned_row = {}
-            for key, value in row.items():
-                if key:
-                    cleaned_key = key.strip()
-                    cleaned_row[cleaned_key] = value.strip() if value else ""
-            
-            table.add_row(cleaned_row)
-            
-            # Store first few rows for structure validation
-            if i < 10:
-                sample_rows.append(cleaned_row)
-        
-        # Validate structure
-        if validate and sample_rows:
-            is_valid, error = validate_faers_file_structure(self.table_name, sample_rows)
-            if not is_valid:
-                raise ValueError(f"Invalid file structure: {error}")
-        
-        return table
+        first = True
+        try:
+            for records in chunks:
+                if first and validate:
+                    # Validate structure on the first few rows (canonical column names)
+                    sample = FaersTable(self.table_name)
+                    sample.add_records(header, records[:10])
+                    is_valid, error = validate_faers_file_structure(self.table_name, sample.rows)
+                    if not is_valid:
+                        raise ValueError(f"Invalid file structure: {error}")
+                first = False
+                yield header, records
+        except csv.Error as e:
+            raise ValueError(f"Failed to parse CSV: {str(e)}")
     
     def load_from_dict(self, data: Dict[str, Any]) -> FaersTable:
         """
@@ -104,13 +290,10 @@ class FaersLoaderBase:
         """
         table = FaersTable(data.get("name", self.table_name))
         
-        rows = data.get("rows", [])
-        for row in rows:
-            table.add_row(row)
+        table.add_rows(data.get("rows", []))
         
         return table
     
     def get_table_name(self) -> str:
         """Get table name."""
         return self.table_name
-
@@ -7,8 +7,11 @@ This file becomes the "brain" of local FAERS processing.
 - Parts 2-3: Individual table loaders integration
 - Part 4: Join logic (pending)
 """
+import os
 from typing import Dict, Any, Optional, List
 from .faers_models import FaersTable, FaersJoinedTable
+from .faers_loader_base import detect_delimiter
+from .faers_validators import detect_faers_table_type
 
 # Import all loaders (Parts 2 & 3)
 try:
@@ -41,15 +44,17 @@ class FaersLocalEngine:
         self.load_status: Dict[str, bool] = {}  # Track which tables are loaded
         self.errors: List[str] = []  # Error messages
     
-    def load_table(self, table_name: str, file_bytes: bytes, validate: bool = True) -> bool:
+    def load_table(self, table_name: str, file_bytes, validate: bool = True) -> bool:
         """
         Load a FAERS table from CSV bytes.
         
         Uses specific loader classes (Parts 2 & 3) for each table type.
+        The file is streamed in chunks (see FaersLoaderBase.load_stream).
         
         Args:
             table_name: Table type (e.g., "DEMO", "DRUG", "REAC")
-            file_bytes: CSV file content as bytes
+            file_bytes: CSV file content as bytes, memory map, path,
+                        or file-like object (e.g. a Streamlit upload)
             validate: Whether to validate schema
             
         Returns:
@@ -92,6 +97,46 @@ class FaersLocalEngine:
             self.load_status[table_name_upper] = False
             return False
     
+    def load_file(self, source, table_name: Optional[str] = None, validate: bool = True) -> bool:
+        """
+        Load a FAERS file, detecting its table type if not given.
+        
+        The type is taken from the file name (e.g. "DRUG24Q1.txt") or,
+        failing that, from the header of a seekable source.
+        
+        Args:
+            source: Path or file-like object (e.g. a Streamlit upload)
+            table_name: Optional table type
+            validate: Whether to validate schema
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        table_name = table_name or self._detect_table_name(source)
+        if not table_name:
+            name = getattr(source, "name", source)
+            self.errors.append(f"Could not detect FAERS table type of {name}")
+            return False
+        return self.load_table(table_name, source, validate=validate)
+    
+    def _detect_table_name(self, source) -> Optional[str]:
+        """Detect the FAERS table type from a file name or header line."""
+        name = os.path.basename(str(getattr(source, "name", source) if not isinstance(source, bytes) else ""))
+        for table_name in ("DEMO", "DRUG", "REAC", "OUTC", "THER", "INDI"):
+            if name.upper().startswith(table_name):
+                return table_name
+        
+        if hasattr(source, "seek") and hasattr(source, "read"):
+            position = source.tell()
+            header_line = source.readline()
+            source.seek(position)
+            if isinstance(header_line, bytes):
+                header_line = header_line.decode("utf-8", errors="ignore")
+            header_line = header_line.lstrip("\ufeff")
+            headers = header_line.strip().split(detect_delimiter(header_line))
+            return detect_faers_table_type(headers)
+        return None
+    
     def validate_all_tables_present(self, required_tables: Optional[List[str]] = None) -> bool:
         """
         Validate that all required tables are loaded.
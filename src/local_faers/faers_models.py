@@ -2,20 +2,135 @@
 FAERS Data Models (CHUNK 7.8 - Part 1)
 Lightweight in-browser data models for FAERS tables.
 
-Uses Python lists + dicts instead of pandas DataFrames for:
+Uses Python column lists instead of pandas DataFrames for:
 - Faster processing
 - Lower memory usage
 - Browser compatibility
 - Pyodide-friendly operations
 """
-from typing import List, Dict, Any, Optional
+import sys
+from array import array
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+# Column name variants mapped to the canonical (lower-case) FAERS names
+COLUMN_ALIASES = {
+    "primary_id": "primaryid",
+    "case_id": "caseid",
+}
+
+
+def canonical_column(name: str) -> str:
+    """Canonical column name (stripped, lower-case, aliases resolved)."""
+    column = str(name).strip().lower()
+    return COLUMN_ALIASES.get(column, column)
+
+
+def canonical_key(value: Any) -> Optional[str]:
+    """
+    Canonical join key (e.g. PRIMARYID).
+
+    Strips whitespace, upper-cases and drops leading zeros of numeric IDs.
+    Returns None for empty values.
+    """
+    if value is None:
+        return None
+    if type(value) is str and value.isdigit() and value[0] != "0" and value.isascii():
+        return value  # Already canonical (the common case for FAERS IDs)
+    canonical = str(value).strip().upper()
+    if not canonical:
+        return None
+    try:
+        canonical = str(int(canonical))
+    except (ValueError, OverflowError):
+        pass  # Keep as-is if not numeric
+    return canonical
+
+
+class FaersKeyIndex:
+    """
+    Permanent key -> rows index of a FaersTable.
+
+    Row positions are stored sorted by key (stable, so file order is kept
+    within a key), making each key's rows one contiguous range of `order`.
+    """
+
+    def __init__(self, values: List[Any]):
+        """
+        Build the index over a column.
+
+        Args:
+            values: Column values (one per row)
+        """
+        # Raw value -> key code (-1 for empty keys); codes follow first occurrence
+        code_of: Dict[Any, int] = {}
+        key_codes: Dict[str, int] = {}
+        codes: List[int] = []
+        for value in values:
+            code = code_of.get(value)
+            if code is None:
+                key = canonical_key(value)
+                if key is None:
+                    code = -1
+                else:
+                    code = key_codes.get(key)
+                    if code is None:
+                        code = key_codes[key] = len(key_codes)
+                code_of[value] = code
+            codes.append(code)
+
+        # Stable sort of row positions by key code, so each key's rows are contiguous
+        order = sorted(range(len(codes)), key=codes.__getitem__)
+        counts = Counter(codes)
+        n_missing = counts.pop(-1, 0)
+        self.missing = order[:n_missing]
+        self.order = array("l", order[n_missing:])
+
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for key, code in key_codes.items():
+            end = start + counts[code]
+            self.ranges[key] = (start, end)
+            start = end
+        keys = list(key_codes)
+        self.variants = {raw: keys[code] for raw, code in code_of.items() if code >= 0}
+
+    def __len__(self) -> int:
+        """Number of distinct keys."""
+        return len(self.ranges)
+
+    def __contains__(self, key: Any) -> bool:
+        return canonical_key(key) in self.ranges
+
+    def keys(self) -> Iterable[str]:
+        """Canonical keys in first-occurrence order."""
+        return self.ranges.keys()
+
+    def positions(self, key: Any) -> array:
+        """Row positions for a key (empty if absent)."""
+        bounds = self.ranges.get(canonical_key(key))
+        if bounds is None:
+            return array("l")
+        return self.order[bounds[0]:bounds[1]]
+
+    def count(self, key: Any) -> int:
+        """Number of rows for a key."""
+        bounds = self.ranges.get(canonical_key(key))
+        return bounds[1] - bounds[0] if bounds else 0
+
+    def entry_count(self) -> int:
+        """Number of indexed rows (rows with a non-empty key)."""
+        return len(self.order)
 
 
 class FaersTable:
     """
-    Generic FAERS table structure (list of dict rows).
-    
+    Generic FAERS table structure (column lists of interned strings).
+
     Lightweight alternative to pandas DataFrame for browser-based processing.
+    Column names are canonicalized once when rows are added, repeated values
+    share one string object, and key indexes (see key_index) are built once
+    and kept until the table changes.
     """
     
     def __init__(self, name: str, rows: Optional[List[Dict[str, Any]]] = None):
@@ -27,24 +142,182 @@ class FaersTable:
             rows: Optional list of row dictionaries
         """
         self.name = name.upper()
-        self.rows = rows or []
-        self._index_cache = {}  # For fast lookups
+        self.columns: Dict[str, List[Any]] = {}
+        self._length = 0
+        self._key_indexes: Dict[str, FaersKeyIndex] = {}
+        if rows:
+            self.add_rows(rows)
     
     def add_row(self, row: Dict[str, Any]) -> None:
         """Add a row to the table."""
-        self.rows.append(row)
-        # Clear index cache when adding rows
-        self._index_cache = {}
+        self.add_rows([row])
+    
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append rows (column names are canonicalized, missing columns become "").
+        
+        Args:
+            rows: Row dictionaries
+            
+        Returns:
+            Number of rows added
+        """
+        columns = self.columns
+        intern = sys.intern
+        added = 0
+        row_keys = None
+        targets: List[Optional[List[Any]]] = []
+        padded: List[List[Any]] = []
+        for row in rows:
+            keys = tuple(row)
+            if keys != row_keys:
+                # Resolve this key layout to column lists once; rows usually share it
+                row_keys = keys
+                targets = []
+                for key in keys:
+                    column_name = canonical_column(key) if key else None
+                    if column_name is None or any(target is columns.get(column_name) for target in targets if target is not None):
+                        targets.append(None)  # Empty or duplicate column name - first value wins
+                        continue
+                    if column_name not in columns:
+                        columns[column_name] = [""] * (self._length + added)
+                    targets.append(columns[column_name])
+                provided = {id(target) for target in targets if target is not None}
+                padded = [column for column in columns.values() if id(column) not in provided]
+            for column, value in zip(targets, row.values()):
+                if column is not None:
+                    column.append(intern(value) if type(value) is str else value)
+            for column in padded:
+                column.append("")
+            added += 1
+        self._length += added
+        if added:
+            # Indexes are rebuilt on next use
+            self._key_indexes = {}
+        return added
+    
+    def add_records(self, header: List[str], records: List[List[Any]]) -> int:
+        """
+        Append positional records (e.g. csv.reader rows) column by column.
+        
+        String values are stripped; short records are padded with "".
+        
+        Args:
+            header: Column names for the record positions
+            records: Records (lists of values)
+            
+        Returns:
+            Number of records added
+        """
+        if not records:
+            return 0
+        width = len(header)
+        if any(len(record) != width for record in records):
+            records = [(list(record) + [""] * width)[:width] for record in records]
+        
+        intern = sys.intern
+        provided = set()
+        for key, values in zip(header, zip(*records)):
+            column_name = canonical_column(key) if key else None
+            if column_name is None or column_name in provided:
+                continue  # Empty or duplicate column name - first value wins
+            provided.add(column_name)
+            column = self.columns.get(column_name)
+            if column is None:
+                column = self.columns[column_name] = [""] * self._length
+            column.extend([
+                intern(value.strip()) if type(value) is str else ("" if value is None else value)
+                for value in values
+            ])
+        for column_name, column in self.columns.items():
+            if column_name not in provided:
+                column.extend([""] * len(records))
+        self._length += len(records)
+        self._key_indexes = {}
+        return len(records)
     
     def __len__(self) -> int:
         """Get number of rows."""
-        return len(self.rows)
+        return self._length
+    
+    @property
+    def column_names(self) -> List[str]:
+        """Canonical column names."""
+        return list(self.columns.keys())
+    
+    def column(self, name: str) -> Optional[List[Any]]:
+        """Values of a column (None if the table has no such column)."""
+        return self.columns.get(canonical_column(name))
+    
+    def get_value(self, position: int, column: str, default: Any = "") -> Any:
+        """Value of column at row position."""
+        values = self.columns.get(canonical_column(column))
+        return values[position] if values is not None else default
+    
+    def set_value(self, position: int, column: str, value: Any) -> None:
+        """Set a single cell (invalidates key indexes)."""
+        column_name = canonical_column(column)
+        values = self.columns.get(column_name)
+        if values is None:
+            values = self.columns[column_name] = [""] * self._length
+        values[position] = sys.intern(value) if type(value) is str else value
+        self._key_indexes = {}
+    
+    def row(self, position: int) -> Dict[str, Any]:
+        """Row at position as a dictionary."""
+        return {name: values[position] for name, values in self.columns.items()}
+    
+    def rows_at(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Rows at positions as dictionaries."""
+        names = list(self.columns.keys())
+        columns = list(self.columns.values())
+        return [dict(zip(names, [values[position] for values in columns])) for position in positions]
+    
+    def values_at(self, positions: Iterable[int], *columns: str) -> List[Tuple[Any, ...]]:
+        """Selected column values at positions as tuples (missing columns read as "")."""
+        selected = [self.columns.get(name) or self.column(name) for name in columns]
+        if all(values is not None for values in selected):
+            return [tuple([values[position] for values in selected]) for position in positions]
+        return [
+            tuple([values[position] if values is not None else "" for values in selected])
+            for position in positions
+        ]
+    
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate rows as dictionaries (built on the fly)."""
+        names = list(self.columns.keys())
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+    
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """All rows as dictionaries (a materialized copy - edits do not change the table)."""
+        return list(self.iter_rows())
+    
+    def key_index(self, key_column: str = "primaryid") -> FaersKeyIndex:
+        """
+        Key index on a column (built once, shared by all joins and lookups).
+        
+        Args:
+            key_column: Column name (any casing)
+            
+        Returns:
+            FaersKeyIndex over canonical key values
+        """
+        column_name = canonical_column(key_column)
+        index = self._key_indexes.get(column_name)
+        if index is None:
+            values = self.columns.get(column_name)
+            index = FaersKeyIndex(values if values is not None else [""] * self._length)
+            self._key_indexes[column_name] = index
+        return index
     
     def get_rows_by_key(self, key_column: str, key_value: Any) -> List[Dict[str, Any]]:
         """
         Get all rows matching a key-value pair (for joins).
         
-        Handles case-insensitive column name matching (e.g., "primaryid", "PRIMARYID").
+        Column names are matched case-insensitively and key values are
+        compared in canonical form (see canonical_key).
         
         Args:
             key_column: Column name to match (e.g., "primaryid")
@@ -53,42 +326,12 @@ class FaersTable:
         Returns:
             List of matching row dictionaries
         """
-        # Use cache for repeated lookups
-        cache_key = f"{key_column}:{key_value}"
-        if cache_key in self._index_cache:
-            return self._index_cache[cache_key]
-        
-        # Try multiple column name variations (case-insensitive)
-        key_column_lower = key_column.lower()
-        key_column_upper = key_column.upper()
-        
-        matches = []
-        for row in self.rows:
-            # Check all possible column name variations
-            row_value = (
-                row.get(key_column) or 
-                row.get(key_column_lower) or 
-                row.get(key_column_upper) or
-                row.get(key_column.capitalize())
-            )
-            
-            if row_value == key_value:
-                matches.append(row)
-        
-        # Cache result (limit cache size)
-        if len(self._index_cache) < 1000:
-            self._index_cache[cache_key] = matches
-        
-        return matches
+        return self.rows_at(self.key_index(key_column).positions(key_value))
     
     def get_unique_values(self, column: str) -> List[Any]:
         """Get unique values in a column."""
-        values = set()
-        for row in self.rows:
-            val = row.get(column)
-            if val:
-                values.add(val)
-        return list(values)
+        values = self.column(column) or []
+        return [value for value in dict.fromkeys(values) if value]
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -99,14 +342,15 @@ class FaersTable:
         """
         return {
             "name": self.name,
-            "row_count": len(self.rows),
-            "rows": self.rows[:1000]  # Limit to first 1000 for serialization
+            "row_count": len(self),
+            "rows": self.rows_at(range(min(len(self), 1000)))  # Limit to first 1000 for serialization
         }
     
     def clear(self) -> None:
         """Clear all rows and cache."""
-        self.rows = []
-        self._index_cache = {}
+        self.columns = {}
+        self._length = 0
+        self._key_indexes = {}
 
 
 class FaersJoinedTable:
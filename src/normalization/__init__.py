@@ -4,11 +4,14 @@ Normalization Module - Reaction normalization and dictionary management.
 
 from .reaction_normalizer import ReactionNormalizer
 from .reaction_dictionary import REACTION_DICTIONARY, get_reaction_category, get_reaction_pt
+from .term_index import TermIndex, get_term_index
 
 __all__ = [
     "ReactionNormalizer",
     "REACTION_DICTIONARY",
     "get_reaction_category",
     "get_reaction_pt",
+    "TermIndex",
+    "get_term_index",
 ]
 
@@ -9,7 +9,7 @@ import logging
 
 from .reaction_dictionary import (
     REACTION_DICTIONARY, add_reaction_entry, get_reaction_pt,
-    get_reaction_category, get_all_pts
+    get_reaction_category, get_all_pts, mark_dictionary_changed
 )
 
 logger = logging.getLogger(__name__)
@@ -147,6 +147,7 @@ class DictionaryManager:
             
             # Remove source PT
             del REACTION_DICTIONARY[source_pt]
+            mark_dictionary_changed()
             
             # Update database
             if self.supabase and SUPABASE_AVAILABLE:
@@ -154,6 +154,21 @@ for pt, additions in PATTERN_ADDITIONS.items():
         REACTION_DICTIONARY[pt]["patterns"].extend(additions.get("patterns", []))
 
 
+# Bumped on every dictionary change so indexes built over it can rebuild
+_dictionary_version = 0
+
+
+def mark_dictionary_changed():
+    """Record a change to REACTION_DICTIONARY (call after editing it in place)."""
+    global _dictionary_version
+    _dictionary_version += 1
+
+
+def get_dictionary_version() -> int:
+    """Get the REACTION_DICTIONARY change counter."""
+    return _dictionary_version
+
+
 def get_reaction_pt(reaction: str) -> Optional[str]:
     """
     Get Preferred Term for a reaction.
@@ -249,4 +264,5 @@ def add_reaction_entry(pt: str, synonyms: List[str] = None, category: str = "Oth
             REACTION_DICTIONARY[pt]["emoji"] = list(set(REACTION_DICTIONARY[pt]["emoji"]))
         if category != "Other":
             REACTION_DICTIONARY[pt]["category"] = category
-
+    
+    mark_dictionary_changed()
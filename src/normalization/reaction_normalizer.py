@@ -3,22 +3,18 @@ Reaction Normalizer - Unified normalization engine.
 REUSES existing map_to_meddra_pt and extends with fuzzy matching, semantic similarity, and LLM.
 """
 
-import re
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Optional, List, Dict, Tuple
 import logging
 
-from .reaction_dictionary import (
-    REACTION_DICTIONARY, get_reaction_pt, get_reaction_category,
-    get_all_pts, get_synonyms
-)
-from src.utils import map_to_meddra_pt
+from .reaction_dictionary import get_reaction_pt, get_reaction_category
+from .term_index import FUZZY_SCORE_CUTOFF, get_term_index
 from src.social_ae.social_mapper import EMOJI_AE_MAP
 
 logger = logging.getLogger(__name__)
 
-# Try to import fuzzy matching
+# Fuzzy matching runs in TermIndex.fuzzy_lookup; only check that rapidfuzz is installed
 try:
-    from rapidfuzz import fuzz, process
+    import rapidfuzz  # noqa: F401
     FUZZY_AVAILABLE = True
 except ImportError:
     FUZZY_AVAILABLE = False
@@ -46,6 +42,7 @@ class ReactionNormalizer:
         """
         self.embedding_engine = embedding_engine
         self.use_llm = use_llm
+        self.term_index = get_term_index()
     
     def normalize(self, text: str, drug: Optional[str] = None) -> Dict[str, any]:
         """
@@ -105,8 +102,8 @@ class ReactionNormalizer:
                 "confidence": 0.75
             }
         
-        # Step 4: REUSE existing map_to_meddra_pt
-        pt = map_to_meddra_pt(text)
+        # Step 4: REUSE existing map_to_meddra_pt (indexed)
+        pt = self.term_index.map_to_pt(text)
         if pt and pt.lower() != text_lower:
             category = get_reaction_category(pt)
             return {
@@ -119,7 +116,7 @@ class ReactionNormalizer:
         # Step 5: Fuzzy matching
         if FUZZY_AVAILABLE:
             pt, score = self._fuzzy_match(text_lower)
-            if pt and score >= 80:
+            if pt and score >= FUZZY_SCORE_CUTOFF:
                 category = get_reaction_category(pt)
                 return {
                     "pt": pt,
@@ -160,6 +157,28 @@ class ReactionNormalizer:
             "confidence": 0.0
         }
     
+    def normalize_many(self, texts: List[Any], drug: Optional[str] = None) -> List[Dict[str, any]]:
+        """
+        Normalize a batch of reaction texts (each distinct text once).
+        
+        Args:
+            texts: Reaction texts to normalize
+            drug: Optional drug name for context
+        
+        Returns:
+            List of result dictionaries aligned with texts (see normalize)
+        """
+        results: Dict[str, Dict[str, any]] = {}
+        normalized = []
+        for text in texts:
+            if not isinstance(text, str):
+                normalized.append(self.normalize(text, drug))
+                continue
+            if text not in results:
+                results[text] = self.normalize(text, drug)
+            normalized.append(dict(results[text]))
+        return normalized
+    
     def _emoji_lookup(self, text: str) -> Tuple[Optional[str], str]:
         """Lookup reaction via emoji."""
         for char in text:
@@ -172,41 +191,23 @@ class ReactionNormalizer:
     
     def _synonym_lookup(self, text_lower: str) -> Tuple[Optional[str], str]:
         """Lookup reaction via synonym dictionary."""
-        # Direct PT match
-        for pt in get_all_pts():
-            if pt.lower() == text_lower:
-                return pt, "synonym"
-        
-        # Synonym match
-        for pt, info in REACTION_DICTIONARY.items():
-            for synonym in info["synonyms"]:
-                if synonym.lower() == text_lower or synonym.lower() in text_lower:
-                    return pt, "synonym"
-        
+        pt = self.term_index.synonym_lookup(text_lower)
+        if pt:
+            return pt, "synonym"
         return None, ""
     
     def _pattern_match(self, text_lower: str) -> Tuple[Optional[str], str]:
         """Match reaction via regex patterns."""
-        for pt, info in REACTION_DICTIONARY.items():
-            for pattern in info["patterns"]:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return pt, "pattern"
+        pt = self.term_index.pattern_lookup(text_lower)
+        if pt:
+            return pt, "pattern"
         return None, ""
     
     def _fuzzy_match(self, text_lower: str) -> Tuple[Optional[str], float]:
-        """Fuzzy match against all PTs."""
+        """Fuzzy match against all PTs (candidates from the PT bigram index)."""
         if not FUZZY_AVAILABLE:
             return None, 0.0
-        
-        pt_list = get_all_pts()
-        if not pt_list:
-            return None, 0.0
-        
-        result = process.extractOne(text_lower, pt_list, scorer=fuzz.ratio)
-        if result:
-            pt, score, _ = result
-            return pt, score
-        return None, 0.0
+        return self.term_index.fuzzy_lookup(text_lower, score_cutoff=FUZZY_SCORE_CUTOFF)
     
     def _semantic_match(self, text: str, drug: Optional[str] = None) -> Tuple[Optional[str], float]:
         """Semantic match using embeddings."""
@@ -0,0 +1,467 @@
+"""
+Term Index - Indexed MedDRA-like term lookup.
+
+Shared, precompiled lookup structures for map_to_meddra_pt and
+ReactionNormalizer, so neither scans the dictionaries per term:
+
+- Contained synonyms: an Aho-Corasick automaton over FREE_MEDDRA_LIKE
+  synonyms (longest contained synonym) and REACTION_DICTIONARY synonyms
+  (first synonym in dictionary order), one pass over the term.
+- Fuzzy PT candidates: a character bigram index over the PT list; only PTs
+  that can reach the score cutoff (length and bigram count filters) are
+  scored with rapidfuzz.
+- Results are kept in a bounded LRU cache.
+
+Results are identical to the linear scans they replace. Use get_term_index()
+to share one warm index across the FAERS loader, social mapper and query
+engine.
+"""
+
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Try to import fuzzy matching
+try:
+    from rapidfuzz import fuzz, process
+    FUZZY_AVAILABLE = True
+except ImportError:
+    FUZZY_AVAILABLE = False
+
+# Partial FREE_MEDDRA_LIKE matches must be at least this long (shorter
+# synonyms can never win, see map_to_pt)
+MIN_PARTIAL_MATCH_LENGTH = 8
+
+# Default fuzzy score cutoff (0-100) used by ReactionNormalizer
+FUZZY_SCORE_CUTOFF = 80
+
+DEFAULT_CACHE_SIZE = 50000
+
+_QGRAM = 2
+
+
+class ContainmentAutomaton:
+    """
+    Aho-Corasick automaton reporting which terms occur in a text.
+
+    Shared by the MedDRA-like lookups here and the social slang matcher
+    (social_mapper.ReactionMatcher), which also needs match positions.
+    """
+
+    def __init__(self, terms: List[str]):
+        """
+        Build the trie, failure links and a dense transition table.
+
+        Args:
+            terms: Terms to find (ids are list positions; empty terms are ignored)
+        """
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for term_id, term in enumerate(terms):
+            if not term:
+                continue
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(term_id)
+
+        # Breadth-first: failure targets are always shallower, so their
+        # transitions and outputs are complete when a state is reached
+        fail = [0] * len(goto)
+        transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+                queue.append(next_state)
+
+        self._transitions = transitions
+        self._outputs = [tuple(output) for output in outputs]
+        self.term_lengths = [len(term) for term in terms]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """
+        Scan text once, reporting every position where terms end.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            (end position, ids of the terms ending there); a term starts at
+            end - term_lengths[id]
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                yield position + 1, outputs[state]
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Ids of the terms contained in text (same as `term in text`).
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of term ids
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class QGramIndex:
+    """
+    Character bigram inverted index for fuzz.ratio candidate generation.
+
+    A ratio of at least c needs an Indel distance d <= (len(a) + len(b)) * (1 - c),
+    and strings within edit distance d share at least
+    max(len) - q + 1 - d * q q-grams (counted with multiplicity), so any
+    choice failing either bound can be skipped without scoring it.
+    """
+
+    def __init__(self, choices: List[str]):
+        """
+        Index the choices.
+
+        Args:
+            choices: Strings to search (e.g. the PT list)
+        """
+        self.choices = choices
+        self.lengths = np.fromiter(map(len, choices), dtype=np.int64, count=len(choices))
+        postings: Dict[str, Dict[int, int]] = {}
+        for choice_id, choice in enumerate(choices):
+            for gram, count in _qgram_counts(choice).items():
+                postings.setdefault(gram, {})[choice_id] = count
+        self._postings = {
+            gram: (np.fromiter(ids.keys(), dtype=np.int64), np.fromiter(ids.values(), dtype=np.int64))
+            for gram, ids in postings.items()
+        }
+
+    def candidates(self, query: str, score_cutoff: float) -> np.ndarray:
+        """
+        Ids (ascending) of the choices that may score at least score_cutoff.
+
+        Args:
+            query: Query string
+            score_cutoff: fuzz.ratio cutoff (0-100)
+
+        Returns:
+            Candidate choice ids
+        """
+        cutoff = score_cutoff / 100.0
+        query_length = len(query)
+        total = self.lengths + query_length
+        max_distance = np.floor(total * (1 - cutoff) + 1e-9)
+        possible = (total - np.abs(self.lengths - query_length)) >= cutoff * total - 1e-9
+        required = np.maximum(self.lengths, query_length) - _QGRAM + 1 - _QGRAM * max_distance
+
+        shared = np.zeros(len(self.choices), dtype=np.int64)
+        for gram, count in _qgram_counts(query).items():
+            posting = self._postings.get(gram)
+            if posting is not None:
+                ids, counts = posting
+                shared[ids] += np.minimum(counts, count)
+        return np.flatnonzero(possible & (shared >= required))
+
+
+def _qgram_counts(text: str) -> Dict[str, int]:
+    """Multiset of the character q-grams of text."""
+    counts: Dict[str, int] = {}
+    for start in range(len(text) - _QGRAM + 1):
+        gram = text[start:start + _QGRAM]
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def _free_meddra_like() -> Dict[str, str]:
+    """FREE_MEDDRA_LIKE from src/utils.py (the src/utils/ package does not re-export it)."""
+    import src.utils as utils_package
+    module = getattr(utils_package, "_utils_file_module", utils_package)
+    return getattr(module, "FREE_MEDDRA_LIKE", {})
+
+
+class TermIndex:
+    """
+    Indexed lookups over FREE_MEDDRA_LIKE and REACTION_DICTIONARY.
+
+    The FREE_MEDDRA_LIKE structures are static; the REACTION_DICTIONARY
+    structures are rebuilt when the dictionary version changes (see
+    reaction_dictionary.mark_dictionary_changed).
+    """
+
+    def __init__(self, meddra_like: Optional[Dict[str, str]] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the index (structures are built on first use).
+
+        Args:
+            meddra_like: Synonym -> PT mapping (default: FREE_MEDDRA_LIKE)
+            cache_size: Maximum number of cached results
+        """
+        self.meddra_like = _free_meddra_like() if meddra_like is None else meddra_like
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._meddra_terms: Optional[List[str]] = None
+        self._meddra_automaton: Optional[ContainmentAutomaton] = None
+        self._dictionary_version: Optional[Tuple[int, int]] = None
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _ensure_meddra_like(self) -> None:
+        """Build the FREE_MEDDRA_LIKE automaton."""
+        if self._meddra_automaton is not None:
+            return
+        terms = list(self.meddra_like.keys())
+        # Only synonyms long enough to be returned as partial matches matter
+        self._meddra_automaton = ContainmentAutomaton(
+            [term if len(term) >= MIN_PARTIAL_MATCH_LENGTH else "" for term in terms]
+        )
+        self._meddra_terms = terms
+
+    def _ensure_dictionary(self) -> None:
+        """(Re)build the REACTION_DICTIONARY structures if the dictionary changed."""
+        from .reaction_dictionary import REACTION_DICTIONARY, get_dictionary_version
+
+        version = (get_dictionary_version(), len(REACTION_DICTIONARY))
+        if version == self._dictionary_version:
+            return
+
+        pts = list(REACTION_DICTIONARY.keys())
+        pt_by_lower: Dict[str, str] = {}
+        for pt in pts:
+            pt_by_lower.setdefault(pt.lower(), pt)
+
+        # Synonyms flattened in lookup priority order (PT order, then synonym order)
+        synonym_pts: List[str] = []
+        synonyms: List[str] = []
+        patterns: List[Tuple["re.Pattern", str]] = []
+        for pt, info in REACTION_DICTIONARY.items():
+            for synonym in info["synonyms"]:
+                synonyms.append(synonym.lower())
+                synonym_pts.append(pt)
+            for pattern in info["patterns"]:
+                patterns.append((re.compile(pattern, re.IGNORECASE), pt))
+
+        with self._lock:
+            self._pts = pts
+            self._pt_by_lower = pt_by_lower
+            self._synonym_pts = synonym_pts
+            self._synonym_automaton = ContainmentAutomaton(synonyms)
+            # An empty synonym is contained in every text
+            self._empty_synonym_rank = next((rank for rank, synonym in enumerate(synonyms) if not synonym), None)
+            self._patterns = patterns
+            self._pt_qgrams = QGramIndex(pts)
+            self._dictionary_version = version
+            self._cache = OrderedDict((key, value) for key, value in self._cache.items() if key[0] == "meddra")
+
+    def _cached(self, kind: str, term: Any, compute: Callable[[Any], Any]) -> Any:
+        """LRU-cached compute(term)."""
+        key = (kind, term)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return self._cache[key]
+        result = compute(term)
+        with self._lock:
+            self._misses += 1
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def map_to_pt(self, term: Any) -> str:
+        """
+        Map a reaction term to a MedDRA-like PT (same result as map_to_meddra_pt).
+
+        Args:
+            term: Reaction term
+
+        Returns:
+            PT, or the title-cased term if not found ("" for empty input)
+        """
+        if term is None or pd.isna(term):
+            return ""
+        term_str = str(term).strip()
+        if not term_str:
+            return ""
+        pt = self._cached("meddra", term_str.lower(), self._lookup_pt)
+        return pt if pt is not None else term_str.title()
+
+    def lookup_pt(self, term: str) -> Optional[str]:
+        """
+        PT for an exact or contained FREE_MEDDRA_LIKE synonym.
+
+        Args:
+            term: Reaction term
+
+        Returns:
+            PT, or None if no synonym matches
+        """
+        term_lower = str(term).strip().lower()
+        if not term_lower:
+            return None
+        return self._cached("meddra", term_lower, self._lookup_pt)
+
+    def _lookup_pt(self, term_lower: str) -> Optional[str]:
+        if term_lower in self.meddra_like:
+            return self.meddra_like[term_lower]
+
+        # Longest contained synonym, earliest in dictionary order on ties
+        self._ensure_meddra_like()
+        found = self._meddra_automaton.find(term_lower)
+        if not found:
+            return None
+        terms = self._meddra_terms
+        best = min(found, key=lambda term_id: (-len(terms[term_id]), term_id))
+        return self.meddra_like[terms[best]]
+
+    def synonym_lookup(self, text_lower: str) -> Optional[str]:
+        """
+        PT whose name equals, or whose first synonym (in dictionary order) is
+        contained in, a lowercased text.
+
+        Args:
+            text_lower: Lowercased, stripped text
+
+        Returns:
+            PT or None
+        """
+        self._ensure_dictionary()
+        return self._cached("synonym", text_lower, self._synonym_lookup)
+
+    def _synonym_lookup(self, text_lower: str) -> Optional[str]:
+        pt = self._pt_by_lower.get(text_lower)
+        if pt is not None:
+            return pt
+        ranks = self._synonym_automaton.find(text_lower)
+        if self._empty_synonym_rank is not None:
+            ranks.add(self._empty_synonym_rank)
+        return self._synonym_pts[min(ranks)] if ranks else None
+
+    def pattern_lookup(self, text_lower: str) -> Optional[str]:
+        """
+        PT of the first REACTION_DICTIONARY pattern matching a text.
+
+        Args:
+            text_lower: Lowercased text
+
+        Returns:
+            PT or None
+        """
+        self._ensure_dictionary()
+        return self._cached("pattern", text_lower, self._pattern_lookup)
+
+    def _pattern_lookup(self, text_lower: str) -> Optional[str]:
+        for pattern, pt in self._patterns:
+            if pattern.search(text_lower):
+                return pt
+        return None
+
+    def fuzzy_lookup(self, text: str, score_cutoff: float = FUZZY_SCORE_CUTOFF) -> Tuple[Optional[str], float]:
+        """
+        Best fuzz.ratio PT match reaching the cutoff (first PT on ties).
+
+        Args:
+            text: Query text
+            score_cutoff: Minimum score (0-100)
+
+        Returns:
+            Tuple of (PT, score), or (None, 0.0) if no PT reaches the cutoff
+        """
+        if not FUZZY_AVAILABLE:
+            return None, 0.0
+        self._ensure_dictionary()
+        return self._cached(f"fuzzy:{score_cutoff}", text, lambda query: self._fuzzy_lookup(query, score_cutoff))
+
+    def _fuzzy_lookup(self, text: str, score_cutoff: float) -> Tuple[Optional[str], float]:
+        candidates = self._pt_qgrams.candidates(text, score_cutoff)
+        if len(candidates) == 0:
+            return None, 0.0
+        result = process.extractOne(
+            text, [self._pts[pt_id] for pt_id in candidates], scorer=fuzz.ratio, score_cutoff=score_cutoff
+        )
+        if result:
+            pt, score, _ = result
+            return pt, score
+        return None, 0.0
+
+    def normalize_many(self, terms: Iterable[Any]) -> List[str]:
+        """
+        Map a batch of reaction terms to PTs (each distinct term once).
+
+        Args:
+            terms: Reaction terms (e.g. a DataFrame column)
+
+        Returns:
+            List of PTs aligned with terms (see map_to_pt)
+        """
+        values = terms if isinstance(terms, pd.Series) else pd.Series(list(terms), dtype=object)
+        if values.empty:
+            return []
+        codes, uniques = pd.factorize(values)
+        mapped = np.empty(len(uniques) + 1, dtype=object)
+        mapped[:-1] = [self.map_to_pt(value) for value in uniques]
+        mapped[-1] = ""
+        return mapped[codes].tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache size, hits, misses and hit ratio
+        """
+        lookups = self._hits + self._misses
+        return {
+            "cached": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+        }
+
+
+_TERM_INDEX: Optional[TermIndex] = None
+
+
+def get_term_index() -> TermIndex:
+    """Get the shared term index (built on first use)."""
+    global _TERM_INDEX
+    if _TERM_INDEX is None:
+        _TERM_INDEX = TermIndex()
+    return _TERM_INDEX
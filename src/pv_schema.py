@@ -138,13 +138,27 @@ def normalize_dataframe(df: pd.DataFrame, schema_mapping: Dict[str, str]) -> pd.
     
     # Add MedDRA Preferred Term mapping for reactions
     if 'reaction' in normalized.columns:
-        normalized['reaction_meddra'] = normalized['reaction'].apply(map_to_meddra_pt)
+        normalized['reaction_meddra'] = _map_reactions_to_meddra(normalized['reaction'])
     else:
         normalized['reaction_meddra'] = None
     
     return normalized
 
 
+def _map_reactions_to_meddra(reactions: pd.Series) -> pd.Series:
+    """
+    Apply map_to_meddra_pt to a reaction column, once per distinct value.
+    
+    Uses the shared term index (see src.normalization.term_index), so repeated
+    loads reuse its warm result cache.
+    """
+    try:
+        from src.normalization.term_index import get_term_index
+    except ImportError:
+        return reactions.apply(map_to_meddra_pt)
+    return pd.Series(get_term_index().normalize_many(reactions), index=reactions.index, dtype=object)
+
+
 def get_schema_summary(schema_mapping: Dict[str, str]) -> pd.DataFrame:
     """
     Create a summary DataFrame of schema mapping for display.
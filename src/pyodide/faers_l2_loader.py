@@ -8,6 +8,9 @@ import numpy as np
 from typing import Dict, List, Any, Optional, Generator
 from io import StringIO
 
+from src.local_faers.faers_loader_base import FaersLoaderBase
+from src.local_faers.faers_models import FaersTable, canonical_column, canonical_key
+
 try:
     # In Pyodide, pandas is available via pyodide.loadPackage
     PYODIDE_MODE = True
@@ -221,6 +224,9 @@ def chunked_load_faers_l2(
     
     This is a generator that yields merged chunks, allowing processing
     of large FAERS datasets without loading everything into memory at once.
+    Child files are streamed once into PRIMARYID-indexed FaersTables and each
+    DEMO chunk is merged with just its cases' rows. Contents may be text,
+    bytes or file-like objects; values are returned as strings.
     
     Args:
         demo_content: DEMO file content
@@ -235,8 +241,30 @@ def chunked_load_faers_l2(
     Yields:
         Merged DataFrame chunks
     """
-    # Load base DEMO in chunks
-    for demo_chunk in chunked_read_csv(demo_content, chunk_size):
+    if not demo_content:
+        return
+    
+    # Parse each child file once into an indexed FaersTable (streamed, not per DEMO chunk)
+    child_tables = []
+    for table_name, content, how in (
+        ("DRUG", drug_content, "inner"),
+        ("REAC", reac_content, "inner"),
+        ("OUTC", outc_content, "left"),
+    ):
+        if content:
+            try:
+                table = FaersLoaderBase(table_name).load_stream(content, validate=False, chunk_rows=chunk_size)
+            except ValueError:
+                continue
+            if table.column("primaryid") is not None:
+                child_tables.append((table, how, f"_{table_name.lower()}"))
+    
+    # Stream DEMO in chunks and merge each chunk with its cases' child rows
+    demo_chunks = FaersLoaderBase("DEMO").iter_chunks(demo_content, validate=False, chunk_rows=chunk_size)
+    for header, records in demo_chunks:
+        demo_chunk = pd.DataFrame(records, columns=[canonical_column(name) for name in header])
+        demo_chunk = demo_chunk.loc[:, ~demo_chunk.columns.duplicated()]
+        
         # Find key column
         key_col = _find_key_column(demo_chunk)
         if not key_col:
@@ -245,48 +273,40 @@ def chunked_load_faers_l2(
         if key_col != "primaryid":
             demo_chunk = demo_chunk.rename(columns={key_col: "primaryid"})
         
-        # Load and merge other files (full load for joins, then merge with chunk)
-        # Note: For true chunked processing, we'd need to index other files
-        # This is a simplified version that loads full files for merging
-        
         try:
-            # Load DRUG (required)
-            if drug_content:
-                drug_df = pd.read_csv(StringIO(drug_content), delimiter="$", low_memory=False)
-                drug_key = _find_key_column(drug_df)
-                if drug_key and drug_key in drug_df.columns:
-                    if drug_key != "primaryid":
-                        drug_df = drug_df.rename(columns={drug_key: "primaryid"})
-                    demo_chunk = demo_chunk.merge(drug_df, on="primaryid", how="inner", suffixes=("", "_drug"))
-            
-            # Load REAC (required)
-            if reac_content:
-                reac_df = pd.read_csv(StringIO(reac_content), delimiter="$", low_memory=False)
-                reac_key = _find_key_column(reac_df)
-                if reac_key and reac_key in reac_df.columns:
-                    if reac_key != "primaryid":
-                        reac_df = reac_df.rename(columns={reac_key: "primaryid"})
-                    demo_chunk = demo_chunk.merge(reac_df, on="primaryid", how="inner", suffixes=("", "_reac"))
-            
-            # Merge optional files if available
-            if outc_content:
-                outc_df = pd.read_csv(StringIO(outc_content), delimiter="$", low_memory=False)
-                outc_key = _find_key_column(outc_df)
-                if outc_key and outc_key in outc_df.columns:
-                    if outc_key != "primaryid":
-                        outc_df = outc_df.rename(columns={outc_key: "primaryid"})
-                    demo_chunk = demo_chunk.merge(outc_df, on="primaryid", how="left", suffixes=("", "_outc"))
+            demo_chunk["_key"] = demo_chunk["primaryid"].map(canonical_key)
+            for table, how, suffix in child_tables:
+                demo_chunk = demo_chunk.merge(
+                    _child_rows(table, demo_chunk["_key"].dropna().unique()),
+                    on="_key", how=how, suffixes=("", suffix)
+                )
             
             # Similar for RPSR, THER, INDI...
             # (Simplified for brevity - full implementation would include all)
             
-            yield demo_chunk
+            yield demo_chunk.drop(columns="_key")
             
         except Exception:
             # Skip chunks that fail to merge
             continue
 
 
+def _child_rows(table: FaersTable, keys) -> pd.DataFrame:
+    """Rows of an indexed child table for the given canonical PRIMARYIDs, keyed by '_key'."""
+    index = table.key_index("primaryid")
+    positions = []
+    row_keys = []
+    for key in keys:
+        bounds = index.ranges.get(key)
+        if bounds is not None:
+            positions.extend(index.order[bounds[0]:bounds[1]])
+            row_keys.extend([key] * (bounds[1] - bounds[0]))
+    columns = [name for name in table.column_names if name != "primaryid"]
+    child = pd.DataFrame(table.values_at(positions, *columns), columns=columns)
+    child["_key"] = row_keys
+    return child
+
+
 def normalize_faers_l2(df: pd.DataFrame) -> pd.DataFrame:
     """
     Normalize FAERS L2 data for consistency (drug names, reaction PTs, etc.).
@@ -0,0 +1,363 @@
+"""
+Query-ready dataset index for AetherSignal.
+
+Normalizes the filterable columns of a dataset once (drug_name, reaction,
+country, sex, seriousness), keeps token → row inverted indexes for the
+multi-value drug/reaction columns, parses age and onset_date once, and
+evaluates nl_query_parser filter dictionaries as boolean bitmap
+intersections. Matching semantics are those of signal_stats.apply_filters
+(case-insensitive substring matching).
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import normalize_text, parse_date, extract_age
+
+TEXT_COLUMNS = ['drug_name', 'reaction', 'country', 'sex', 'seriousness']
+TOKENIZED_COLUMNS = ['drug_name', 'reaction']
+TOKEN_SEPARATOR = ';'
+SERIOUS_VALUES = {'1', 'yes', 'y', 'true', 'serious'}
+
+# Rows matched through postings when a term selects fewer than n / this factor
+_SELECTIVE_FACTOR = 64
+# Byte budget of each dataset's term cache (matches kept as row positions or packed bits)
+_TERM_CACHE_BYTES = 32 << 20
+_MAX_CACHED_DATASETS = 8
+
+_datasets: "OrderedDict[int, Tuple[weakref.ref, QueryDataset]]" = OrderedDict()
+_datasets_lock = threading.Lock()
+
+
+class _TextColumn:
+    """Normalized column as category codes, plus optional token postings."""
+
+    def __init__(self, series: pd.Series, tokenize: bool):
+        raw_codes, raw_uniques = pd.factorize(series, sort=False)
+        raw_uniques = np.asarray(raw_uniques, dtype=object)
+        missing = raw_codes < 0
+        if missing.any():
+            # factorize folds None/NaN/NaT/pd.NA into one sentinel; keep the
+            # distinct strings apply_filters' astype(str) gave them ('none', '', ...)
+            na_codes, na_uniques = pd.factorize(series.iloc[np.flatnonzero(missing)].astype(str), sort=False)
+            raw_codes = raw_codes.copy()
+            raw_codes[missing] = len(raw_uniques) + na_codes
+            raw_uniques = np.concatenate([raw_uniques, np.asarray(na_uniques, dtype=object)])
+        normalized = (
+            pd.Series(raw_uniques, dtype=object)
+            .astype(str)
+            .str.strip()
+            .str.lower()
+            .replace("nan", "")
+        )
+        norm_codes, categories = pd.factorize(normalized, sort=False)
+        categories = np.asarray(categories, dtype=object)
+        codes = norm_codes[raw_codes] if len(raw_codes) else np.zeros(0, dtype=np.int64)
+
+        self.codes = codes.astype(np.int32)
+        self.categories = pd.Series(categories, dtype=object)
+        self.category_counts = np.bincount(self.codes, minlength=len(categories))
+
+        # Category -> rows (CSR): rows sorted by category
+        self.row_order = np.argsort(self.codes, kind='stable').astype(np.int64)
+        self.row_offsets = np.concatenate(([0], np.cumsum(self.category_counts)))
+
+        self.vocabulary = None
+        self.token_categories = None
+        self.token_offsets = None
+        if tokenize:
+            self._build_token_index()
+
+    def _build_token_index(self) -> None:
+        """Token -> categories (CSR) over the split, stripped category values."""
+        exploded = self.categories.str.split(TOKEN_SEPARATOR).explode().str.strip()
+        exploded = exploded[exploded.notna() & (exploded != "")]
+        token_codes, vocabulary = pd.factorize(exploded, sort=False)
+        category_ids = exploded.index.to_numpy(dtype=np.int64)
+
+        order = np.argsort(token_codes, kind='stable')
+        self.vocabulary = pd.Series(np.asarray(vocabulary, dtype=object), dtype=object)
+        self.token_categories = category_ids[order]
+        counts = np.bincount(token_codes, minlength=len(vocabulary))
+        self.token_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def categories_containing(self, term: str) -> np.ndarray:
+        """Boolean mask over categories whose value contains term."""
+        if self.vocabulary is not None and TOKEN_SEPARATOR not in term:
+            # Substring search runs over the token vocabulary, not over rows
+            tokens = np.flatnonzero(self.vocabulary.str.contains(term, regex=False).to_numpy())
+            matched = np.zeros(len(self.categories), dtype=bool)
+            matched[_gather_ranges(self.token_categories, self.token_offsets, tokens)] = True
+            return matched
+        return self.categories.str.contains(term, regex=False).to_numpy(dtype=bool)
+
+    def categories_equal(self, value: str) -> np.ndarray:
+        return (self.categories == value).to_numpy(dtype=bool)
+
+    def categories_in(self, values) -> np.ndarray:
+        return self.categories.isin(values).to_numpy(dtype=bool)
+
+    def rows_for(self, matched_categories: np.ndarray, n_rows: int) -> np.ndarray:
+        """Row bitmap for a category mask (postings when selective, code lookup otherwise)."""
+        selected = np.flatnonzero(matched_categories)
+        if self.category_counts[selected].sum() * _SELECTIVE_FACTOR < n_rows:
+            mask = np.zeros(n_rows, dtype=bool)
+            mask[_gather_ranges(self.row_order, self.row_offsets, selected)] = True
+            return mask
+        return matched_categories[self.codes]
+
+
+class QueryDataset:
+    """
+    Pre-normalized, indexed view of a dataset for fast repeated filtering.
+
+    The dataset does not keep the DataFrame alive; it indexes it and returns
+    row positions. Use get_query_dataset() to share one index per DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_rows = len(df)
+        self.signature = _frame_signature(df)
+        self.columns: Dict[str, _TextColumn] = {}
+        for col in TEXT_COLUMNS:
+            if col in df.columns:
+                self.columns[col] = _TextColumn(df[col], tokenize=col in TOKENIZED_COLUMNS)
+
+        self.age: Optional[np.ndarray] = None
+        if 'age' in df.columns:
+            codes, uniques = pd.factorize(df['age'], sort=False)
+            parsed = np.array([_as_float(extract_age(v)) for v in uniques], dtype=float)
+            self.age = np.where(codes >= 0, parsed[np.maximum(codes, 0)] if len(parsed) else np.nan, np.nan)
+
+        self.onset_date: Optional[np.ndarray] = None
+        if 'onset_date' in df.columns:
+            self.onset_date = pd.to_datetime(df['onset_date'], errors='coerce').to_numpy()
+
+        self._term_cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._term_cache_bytes = 0
+        self._lock = threading.Lock()
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """True if this index was built for df in its current state."""
+        return len(df) == self.n_rows and _frame_signature(df) == self.signature
+
+    def _contains_mask(self, col: str, values) -> Optional[np.ndarray]:
+        """Rows whose normalized col contains any of values (None if no usable terms)."""
+        column = self.columns.get(col)
+        if column is None:
+            return None
+        terms = values if isinstance(values, list) else [values]
+        tokens = [normalize_text(term) for term in terms if term]
+        tokens = [t for t in tokens if t]
+        if not tokens:
+            return None
+
+        mask = None
+        for token in tokens:
+            key = (col, token)
+            with self._lock:
+                stored = self._term_cache.get(key)
+                if stored is not None:
+                    self._term_cache.move_to_end(key)
+            if stored is None:
+                rows = column.rows_for(column.categories_containing(token), self.n_rows)
+                self._cache_term(key, _pack_rows(rows))
+            else:
+                rows = _unpack_rows(stored, self.n_rows)
+            mask = rows if mask is None else (mask | rows)
+        return mask
+
+    def _cache_term(self, key: Tuple[str, str], stored: np.ndarray) -> None:
+        """Add a term's rows to the cache, evicting least recently used terms over the byte budget."""
+        if stored.nbytes > _TERM_CACHE_BYTES:
+            return
+        with self._lock:
+            previous = self._term_cache.pop(key, None)
+            if previous is not None:
+                self._term_cache_bytes -= previous.nbytes
+            self._term_cache[key] = stored
+            self._term_cache_bytes += stored.nbytes
+            while self._term_cache_bytes > _TERM_CACHE_BYTES:
+                _, evicted = self._term_cache.popitem(last=False)
+                self._term_cache_bytes -= evicted.nbytes
+
+    def select(self, filters: Dict) -> Optional[np.ndarray]:
+        """
+        Evaluate a filter dictionary as a row bitmap.
+
+        Args:
+            filters: Filter dictionary from nl_query_parser
+
+        Returns:
+            Boolean array over rows, or None if no filter applies
+        """
+        mask = None
+
+        def combine(part: Optional[np.ndarray]):
+            nonlocal mask
+            if part is not None:
+                mask = part if mask is None else (mask & part)
+
+        # Drug filter
+        if 'drug' in filters:
+            combine(self._contains_mask('drug_name', filters['drug']))
+
+        # Reaction filter (OR by default, AND requires every reaction)
+        if 'reaction' in filters:
+            reaction_value = filters['reaction']
+            if (isinstance(reaction_value, list) and len(reaction_value) > 1
+                    and filters.get('reaction_logic', 'OR') == 'AND'):
+                for reaction in reaction_value:
+                    combine(self._contains_mask('reaction', reaction))
+            else:
+                combine(self._contains_mask('reaction', reaction_value))
+
+        # Exclude negated reactions
+        if 'exclude_reaction' in filters:
+            excluded = self._contains_mask('reaction', filters['exclude_reaction'])
+            if excluded is not None:
+                combine(~excluded)
+
+        # Age filter
+        if self.age is not None:
+            with np.errstate(invalid='ignore'):
+                if 'age_min' in filters:
+                    combine(self.age >= filters['age_min'])
+                if 'age_max' in filters:
+                    combine(self.age <= filters['age_max'])
+
+        # Sex filter
+        if 'sex' in filters and 'sex' in self.columns:
+            column = self.columns['sex']
+            combine(column.categories_equal(normalize_text(filters['sex']))[column.codes])
+
+        # Country filter
+        if 'country' in filters and 'country' in self.columns:
+            column = self.columns['country']
+            target = normalize_text(filters['country'])
+            combine(column.categories_containing(target)[column.codes])
+
+        # Seriousness filter
+        if filters.get('seriousness') and 'seriousness' in self.columns:
+            column = self.columns['seriousness']
+            combine(column.categories_in(SERIOUS_VALUES)[column.codes])
+
+        # Date filters
+        if self.onset_date is not None:
+            if 'date_from' in filters:
+                date_from = parse_date(filters['date_from'])
+                if date_from:
+                    combine(self.onset_date >= np.datetime64(pd.Timestamp(date_from)))
+            if 'date_to' in filters:
+                date_to = parse_date(filters['date_to'])
+                if date_to:
+                    combine(self.onset_date <= np.datetime64(pd.Timestamp(date_to)))
+
+        return mask
+
+    def positions(self, filters: Dict) -> np.ndarray:
+        """Row positions (into the indexed DataFrame) matching filters."""
+        mask = self.select(filters)
+        if mask is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(mask)
+
+
+def get_query_dataset(df: pd.DataFrame) -> QueryDataset:
+    """
+    Return the shared QueryDataset for df, building it on first use.
+
+    Indexes are keyed by DataFrame identity, dropped when the DataFrame is
+    garbage-collected, and rebuilt if the indexed columns were replaced.
+    """
+    key = id(df)
+    with _datasets_lock:
+        entry = _datasets.get(key)
+        if entry is not None:
+            ref, dataset = entry
+            if ref() is df and dataset.matches(df):
+                _datasets.move_to_end(key)
+                return dataset
+
+    dataset = QueryDataset(df)
+    with _datasets_lock:
+        try:
+            ref = weakref.ref(df, lambda _ref, key=key: _discard(key, _ref))
+        except TypeError:
+            return dataset
+        _datasets[key] = (ref, dataset)
+        while len(_datasets) > _MAX_CACHED_DATASETS:
+            _datasets.popitem(last=False)
+    return dataset
+
+
+def prepare_query_dataset(df: pd.DataFrame) -> None:
+    """Build the query index for a freshly loaded dataset (call at load time)."""
+    if df is not None and not df.empty:
+        get_query_dataset(df)
+
+
+def _discard(key: int, ref: weakref.ref) -> None:
+    with _datasets_lock:
+        entry = _datasets.get(key)
+        if entry is not None and entry[0] is ref:
+            del _datasets[key]
+
+
+def _gather_ranges(data: np.ndarray, offsets: np.ndarray, selected: np.ndarray) -> np.ndarray:
+    """Concatenate CSR slices data[offsets[i]:offsets[i + 1]] for i in selected, without a Python loop."""
+    starts = offsets[selected]
+    lengths = offsets[selected + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    shifts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return data[np.arange(total) + shifts]
+
+
+def column_identity(series: pd.Series) -> Tuple:
+    """
+    Cheap identity of a column's data, without copying it.
+
+    NumPy-backed columns are identified by their data buffer. For extension
+    dtypes (arrow, categorical, nullable) to_numpy() would build a new array,
+    so those are identified by the extension array object and length instead.
+    """
+    if isinstance(series.dtype, np.dtype):
+        return ('buffer', series.to_numpy().__array_interface__['data'][0])
+    return ('array', id(series.array), len(series))
+
+
+def _frame_signature(df: pd.DataFrame) -> Tuple:
+    """Cheap identity of the indexed columns (shape, names and data buffers)."""
+    buffers: List[Tuple] = []
+    for col in TEXT_COLUMNS + ['age', 'onset_date']:
+        if col in df.columns:
+            buffers.append(column_identity(df[col]))
+    return (len(df), tuple(df.columns), tuple(buffers))
+
+
+def _pack_rows(mask: np.ndarray) -> np.ndarray:
+    """Compact form of a row mask: int32 positions when sparse, packed bits otherwise."""
+    count = int(np.count_nonzero(mask))
+    if count * 4 < (len(mask) + 7) // 8 and len(mask) <= np.iinfo(np.int32).max:
+        return np.flatnonzero(mask).astype(np.int32)
+    return np.packbits(mask)
+
+
+def _unpack_rows(stored: np.ndarray, n_rows: int) -> np.ndarray:
+    """Row mask from _pack_rows output."""
+    if stored.dtype == np.int32:
+        mask = np.zeros(n_rows, dtype=bool)
+        mask[stored] = True
+        return mask
+    return np.unpackbits(stored, count=n_rows).view(bool)
+
+
+def _as_float(value) -> float:
+    return float(value) if value is not None else np.nan
@@ -15,6 +15,10 @@ def apply_filters(df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
     """
     Apply filters to DataFrame.
     
+    Filtering runs against the shared query index for df (see
+    src.query_dataset): columns are normalized and indexed once per dataset,
+    each filter is a bitmap, and the result is materialized with a single take.
+    
     Args:
         df: Normalized DataFrame with standard column names
         filters: Filter dictionary from nl_query_parser (may include 'exclude_reaction')
@@ -22,128 +26,14 @@ def apply_filters(df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
     Returns:
         Filtered DataFrame
     """
-    filtered_df = df.copy()
-    if filtered_df.empty:
-        return filtered_df
-    
-    normalized_cache: Dict[str, pd.Series] = {}
-    
-    def get_normalized(col: str) -> Optional[pd.Series]:
-        if col not in filtered_df.columns:
-            return None
-        if col not in normalized_cache:
-            normalized_cache[col] = (
-                filtered_df[col]
-                .astype(str)
-                .str.strip()
-                .str.lower()
-                .replace("nan", "")
-            )
-        return normalized_cache[col]
-    
-    def apply_mask(mask):
-        nonlocal filtered_df
-        if mask is None:
-            return
-        if not isinstance(mask, pd.Series):
-            mask = pd.Series(mask, index=filtered_df.index)
-        mask = mask.fillna(False)
-        filtered_df = filtered_df[mask]
-        for key in normalized_cache:
-            normalized_cache[key] = normalized_cache[key][mask]
-    
-    def build_mask(series: pd.Series, values, invert=False):
-        if series is None:
-            return None
-        terms = values if isinstance(values, list) else [values]
-        tokens = [re.escape(normalize_text(term)) for term in terms if term]
-        tokens = [t for t in tokens if t]
-        if not tokens:
-            return None
-        pattern = "|".join(tokens)
-        mask = series.str.contains(pattern, na=False)
-        return ~mask if invert else mask
-    
-    # Drug filter
-    if 'drug' in filters:
-        drug_series = get_normalized('drug_name')
-        mask = build_mask(drug_series, filters['drug'])
-        if mask is not None:
-            apply_mask(mask)
-    
-    # Reaction filter
-    if 'reaction' in filters:
-        reaction_series = get_normalized('reaction')
-        reaction_value = filters['reaction']
-        reaction_logic = filters.get('reaction_logic', 'OR')  # Default to OR
-        
-        # If multiple reactions and AND logic, need to match ALL
-        if isinstance(reaction_value, list) and len(reaction_value) > 1 and reaction_logic == 'AND':
-            # AND logic: case must contain ALL reactions
-            mask = None
-            for reaction in reaction_value:
-                single_mask = build_mask(reaction_series, reaction)
-                if single_mask is not None:
-                    mask = single_mask if mask is None else (mask & single_mask)
-        else:
-            # OR logic (default): case matches ANY reaction
-            mask = build_mask(reaction_series, reaction_value)
-        
-        if mask is not None:
-            apply_mask(mask)
-    
-    # Exclude negated reactions
-    if 'exclude_reaction' in filters:
-        reaction_series = get_normalized('reaction')
-        mask = build_mask(reaction_series, filters['exclude_reaction'], invert=True)
-        if mask is not None:
-            apply_mask(mask)
-    
-    # Age filter
-    if ('age_min' in filters or 'age_max' in filters) and 'age' in filtered_df.columns:
-        age_values = filtered_df['age'].apply(extract_age)
-        if 'age_min' in filters:
-            apply_mask(age_values >= filters['age_min'])
-        if 'age_max' in filters:
-            apply_mask(age_values <= filters['age_max'])
-    
-    # Sex filter
-    if 'sex' in filters:
-        sex_series = get_normalized('sex')
-        if sex_series is not None:
-            target = normalize_text(filters['sex'])
-            mask = sex_series == target
-            apply_mask(mask)
-    
-    # Country filter
-    if 'country' in filters:
-        country_series = get_normalized('country')
-        if country_series is not None:
-            target = normalize_text(filters['country'])
-            mask = country_series.str.contains(re.escape(target), na=False)
-            apply_mask(mask)
-    
-    # Seriousness filter
-    if filters.get('seriousness') and 'seriousness' in filtered_df.columns:
-        serious_series = get_normalized('seriousness')
-        if serious_series is not None:
-            allowed = {'1', 'yes', 'y', 'true', 'serious'}
-            mask = serious_series.isin(allowed)
-            apply_mask(mask)
-    
-    # Date filters
-    if 'onset_date' in filtered_df.columns and ('date_from' in filters or 'date_to' in filters):
-        date_values = pd.to_datetime(filtered_df['onset_date'], errors='coerce')
-        if 'date_from' in filters:
-            date_from = parse_date(filters['date_from'])
-            if date_from:
-                apply_mask(date_values >= date_from)
-        if 'date_to' in filters:
-            date_to = parse_date(filters['date_to'])
-            if date_to:
-                apply_mask(date_values <= date_to)
-    
-    return filtered_df
+    if df.empty:
+        return df.copy()
+    
+    from src.query_dataset import get_query_dataset
+    mask = get_query_dataset(df).select(filters)
+    if mask is None:
+        return df.copy()
+    return df.iloc[np.flatnonzero(mask)]
 
 
 def calculate_prr_ror(drug: str, reaction: str, df: pd.DataFrame) -> Optional[Dict]:
@@ -343,17 +233,29 @@ def get_top_co_reactions(filtered_df: pd.DataFrame, reaction: Optional[str] = No
     ]
 
 
-def get_drug_event_combinations(df: pd.DataFrame, min_cases: int = 3) -> List[Dict]:
+def get_drug_event_combinations(
+    df: pd.DataFrame,
+    min_cases: int = 3,
+    disproportionality_table: Optional[pd.DataFrame] = None,
+) -> List[Dict]:
     """
     Get all drug-event combinations with minimum case count.
     
     Args:
         df: Normalized DataFrame
         min_cases: Minimum number of cases for a combination
+        disproportionality_table: Optional precomputed table from
+            disproportionality_engine.compute_disproportionality_table. When
+            given, combinations (with PRR/ROR/IC/EBGM attached) are read from
+            it instead of regrouping df.
         
     Returns:
         List of dictionaries with drug, reaction, and count
     """
+    if disproportionality_table is not None:
+        from src.disproportionality_engine import table_to_candidates
+        return table_to_candidates(disproportionality_table, min_cases=min_cases)
+    
     if 'drug_name' not in df.columns or 'reaction' not in df.columns:
         return []
     
@@ -1,38 +1,52 @@
 """
 Reaction Co-Occurrence Engine
 Analyzes which reactions occur together (Drug × Reaction × Reaction networks).
+
+Cases (social posts or FAERS cases) are encoded once as a sparse binary
+case × reaction incidence matrix C. Pair counts are the off-diagonal
+entries of CᵀC; triplets are mined with FP-growth under a support threshold
+instead of enumerating every combination per case.
 """
 
-import itertools
+import math
 from collections import Counter, defaultdict
 from typing import List, Dict, Tuple, Optional
+import numpy as np
 import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default triplet support: this fraction of the cases (at least 1 case)
+TRIPLET_MIN_SUPPORT_FRACTION = 0.001
+
 
 class ReactionCoOccurrenceEngine:
     """
     Analyzes co-occurrence patterns between reactions.
     """
-    
+
     def __init__(self):
         """Initialize co-occurrence engine."""
         pass
-    
+
     def analyze_cooccurrence(
         self,
         reactions_list: List[List[str]],
-        drug: Optional[str] = None
+        drug: Optional[str] = None,
+        min_support: Optional[int] = None
     ) -> Dict[str, any]:
         """
         Analyze co-occurrence patterns.
-        
+
         Args:
             reactions_list: List of reaction lists (one per post/case)
             drug: Optional drug name for filtering
-        
+            min_support: Minimum number of cases for a triplet (default:
+                         TRIPLET_MIN_SUPPORT_FRACTION of the cases, at least 1)
+
         Returns:
             Dictionary with:
             - pairs: Counter of reaction pairs
@@ -40,56 +54,126 @@ class ReactionCoOccurrenceEngine:
             - network_data: Network graph data
         """
         if not reactions_list:
-            return {
-                "pairs": Counter(),
-                "triplets": Counter(),
-                "network_data": []
-            }
-        
-        pairs = []
-        triplets = []
-        
-        for reactions in reactions_list:
-            # Filter out empty and normalize
-            reactions = [r.strip().lower() for r in reactions if r and r.strip()]
-            reactions = list(set(reactions))  # Deduplicate
-            
-            if len(reactions) < 2:
-                continue
-            
-            # Extract pairs
-            for pair in itertools.combinations(sorted(reactions), 2):
-                pairs.append(pair)
-            
-            # Extract triplets
-            if len(reactions) >= 3:
-                for triplet in itertools.combinations(sorted(reactions), 3):
-                    triplets.append(triplet)
-        
-        pair_counter = Counter(pairs)
-        triplet_counter = Counter(triplets)
-        
-        # Build network data
-        network_data = self._build_network_data(pair_counter)
-        
+            return self._empty_result()
+
+        cases = []
+        terms = []
+        for case, reactions in enumerate(reactions_list):
+            for reaction in reactions:
+                if reaction and reaction.strip():
+                    cases.append(case)
+                    terms.append(reaction.strip().lower())
+
+        return self._analyze_terms(
+            np.asarray(cases, dtype=np.int64),
+            pd.Series(terms, dtype=object),
+            len(reactions_list),
+            min_support
+        )
+
+    def analyze_dataframe(
+        self,
+        df: pd.DataFrame,
+        reaction_column: str = "reaction",
+        case_column: Optional[str] = None,
+        separator: Optional[str] = ";",
+        drug: Optional[str] = None,
+        min_support: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Analyze co-occurrence directly from a DataFrame.
+
+        Works for FAERS-style data (one row per case with "; "-joined
+        reactions, or REAC rows with a case id and one pt per row) and for
+        social posts (one row per extracted reaction, grouped by post_id).
+
+        Args:
+            df: DataFrame with a reaction column
+            reaction_column: Reaction column (e.g. "reaction" or REAC "pt")
+            case_column: Column identifying the case/post; rows are cases if None
+            separator: Separator of multi-value reaction cells (None to disable)
+            drug: Optional drug name for filtering
+            min_support: Minimum number of cases for a triplet (see analyze_cooccurrence)
+
+        Returns:
+            Same structure as analyze_cooccurrence
+        """
+        if df.empty or reaction_column not in df.columns:
+            return self._empty_result()
+
+        values = df[reaction_column].reset_index(drop=True)
+        if case_column is not None and case_column in df.columns:
+            case_codes, case_labels = pd.factorize(df[case_column], sort=True)
+            n_cases = len(case_labels)
+        else:
+            case_codes = np.arange(len(values), dtype=np.int64)
+            n_cases = len(values)
+
+        # Exploded values keep their row position, which indexes case_codes
+        values = values[values.notna().to_numpy() & (case_codes >= 0)].astype(str)
+        if separator:
+            values = values.str.split(separator).explode()
+        terms = values.str.strip().str.lower()
+        valid = (terms != "").to_numpy(dtype=bool)
+
+        return self._analyze_terms(
+            np.asarray(case_codes, dtype=np.int64)[terms.index.to_numpy()[valid]],
+            terms[valid].reset_index(drop=True),
+            n_cases,
+            min_support
+        )
+
+    def _analyze_terms(
+        self,
+        cases: np.ndarray,
+        terms: pd.Series,
+        n_cases: int,
+        min_support: Optional[int]
+    ) -> Dict[str, any]:
+        """Build the incidence matrix for (case, normalized term) entries and count pairs/triplets."""
+        if not len(terms):
+            return self._empty_result()
+
+        # Sorted labels: term id order == alphabetical order, so id-sorted tuples are sorted tuples
+        codes, labels = pd.factorize(terms, sort=True)
+        labels = np.asarray(labels, dtype=object)
+        matrix = _incidence_matrix(cases, codes, n_cases, len(labels))
+
+        if min_support is None:
+            min_support = max(1, math.ceil(n_cases * TRIPLET_MIN_SUPPORT_FRACTION))
+
+        cooccurrence = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+        pair_counter = _pair_counts(cooccurrence, labels)
+        triplet_counter = Counter({
+            (labels[a], labels[b], labels[c]): count
+            for (a, b, c), count in _frequent_triplets(matrix, cooccurrence, min_support).items()
+        })
+
         return {
             "pairs": pair_counter,
             "triplets": triplet_counter,
-            "network_data": network_data
+            "network_data": self._build_network_data(pair_counter)
+        }
+
+    def _empty_result(self) -> Dict[str, any]:
+        return {
+            "pairs": Counter(),
+            "triplets": Counter(),
+            "network_data": []
         }
-    
+
     def _build_network_data(self, pair_counter: Counter) -> List[Dict]:
         """
         Build network graph data from pair counter.
-        
+
         Args:
             pair_counter: Counter of reaction pairs
-        
+
         Returns:
             List of network edges
         """
         network_data = []
-        
+
         for (reaction1, reaction2), count in pair_counter.most_common(100):  # Top 100
             network_data.append({
                 "source": reaction1,
@@ -97,17 +181,17 @@ class ReactionCoOccurrenceEngine:
                 "weight": count,
                 "strength": min(count / 10.0, 1.0)  # Normalize to 0-1
             })
-        
+
         return network_data
-    
+
     def get_top_pairs(self, pair_counter: Counter, top_n: int = 20) -> pd.DataFrame:
         """
         Get top co-occurring reaction pairs.
-        
+
         Args:
             pair_counter: Counter of reaction pairs
             top_n: Number of top pairs to return
-        
+
         Returns:
             DataFrame with top pairs
         """
@@ -118,51 +202,164 @@ class ReactionCoOccurrenceEngine:
                 "reaction2": reaction2,
                 "cooccurrence_count": count
             })
-        
+
         return pd.DataFrame(rows)
-    
+
     def get_reaction_clusters(self, pair_counter: Counter, min_weight: int = 3) -> Dict[str, List[str]]:
         """
         Identify reaction clusters based on co-occurrence.
-        
+
         Args:
             pair_counter: Counter of reaction pairs
             min_weight: Minimum co-occurrence count to form cluster
-        
+
         Returns:
             Dictionary mapping cluster names to reaction lists
         """
-        # Build graph
-        graph = defaultdict(set)
+        # Build graph (node ids in order of first appearance)
+        node_ids: Dict[str, int] = {}
+        sources = []
+        targets = []
         for (r1, r2), count in pair_counter.items():
             if count >= min_weight:
-                graph[r1].add(r2)
-                graph[r2].add(r1)
-        
+                sources.append(node_ids.setdefault(r1, len(node_ids)))
+                targets.append(node_ids.setdefault(r2, len(node_ids)))
+
+        if not node_ids:
+            return {}
+
         # Find connected components (clusters)
-        visited = set()
-        clusters = []
-        
-        for reaction in graph:
-            if reaction not in visited:
-                cluster = []
-                stack = [reaction]
-                
-                while stack:
-                    node = stack.pop()
-                    if node not in visited:
-                        visited.add(node)
-                        cluster.append(node)
-                        stack.extend(graph[node] - visited)
-                
-                if len(cluster) > 1:
-                    clusters.append(cluster)
-        
+        n_nodes = len(node_ids)
+        graph = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=np.int8), (sources, targets)),
+            shape=(n_nodes, n_nodes)
+        )
+        _, component = connected_components(graph, directed=False)
+
+        members = defaultdict(list)
+        for reaction, node in node_ids.items():
+            members[component[node]].append(reaction)
+        clusters = [cluster for cluster in members.values() if len(cluster) > 1]
+
         # Name clusters by most common reaction
         cluster_dict = {}
         for i, cluster in enumerate(clusters):
             cluster_name = f"Cluster_{i+1}"
             cluster_dict[cluster_name] = cluster
-        
+
         return cluster_dict
 
+
+def _incidence_matrix(cases: np.ndarray, codes: np.ndarray, n_cases: int, n_terms: int) -> sparse.csr_matrix:
+    """Build a binary case × reaction incidence matrix (duplicates within a case count once)."""
+    matrix = sparse.csr_matrix(
+        (np.ones(len(cases), dtype=np.int64), (cases, codes)),
+        shape=(n_cases, n_terms),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def _pair_counts(cooccurrence: sparse.coo_matrix, labels: np.ndarray) -> Counter:
+    """Pair counts from the strict upper triangle of CᵀC."""
+    order = np.lexsort((cooccurrence.col, cooccurrence.row))
+    first = labels[cooccurrence.row[order]].tolist()
+    second = labels[cooccurrence.col[order]].tolist()
+    return Counter(dict(zip(zip(first, second), cooccurrence.data[order].tolist())))
+
+
+def _frequent_triplets(
+    matrix: sparse.csr_matrix,
+    cooccurrence: sparse.coo_matrix,
+    min_support: int
+) -> Dict[Tuple[int, int, int], int]:
+    """
+    Mine reaction triplets present in at least min_support cases (FP-growth).
+
+    Items are ranked by descending support. An item can only be part of a
+    frequent triplet if it has two frequent pairs (from CᵀC), so only such
+    items of cases with three or more of them enter the FP-tree. The pair
+    counts of each item's conditional pattern base (one sparse product) are
+    the supports of the triplets ending in that item.
+
+    Returns:
+        Mapping of ascending item-id triplets to case counts
+    """
+    support = np.asarray(matrix.sum(axis=0)).ravel()
+    n_items = len(support)
+    rank = np.empty(n_items, dtype=np.int64)
+    rank[np.lexsort((np.arange(n_items), -support))] = np.arange(n_items)
+    strong = cooccurrence.data >= min_support
+    partners = np.bincount(cooccurrence.row[strong], minlength=n_items) + \
+        np.bincount(cooccurrence.col[strong], minlength=n_items)
+    frequent = partners >= 2
+
+    transactions: Counter = Counter()
+    indptr, indices = matrix.indptr, matrix.indices
+    for row in range(matrix.shape[0]):
+        items = indices[indptr[row]:indptr[row + 1]]
+        items = items[frequent[items]]
+        if len(items) >= 3:
+            transactions[tuple(items[np.argsort(rank[items])].tolist())] += 1
+
+    triplets: Dict[Tuple[int, int, int], int] = {}
+    if not transactions:
+        return triplets
+
+    header = _build_fp_tree(transactions.items())
+    for first, nodes in header.items():
+        base = [(path, count) for path, count in _pattern_base(nodes) if len(path) >= 2]
+        if sum(count for _, count in base) < min_support:
+            continue
+        # Pair counts within the conditional pattern base are the triplet supports
+        lengths = np.fromiter((len(path) for path, _ in base), dtype=np.int64, count=len(base))
+        items = np.fromiter((item for path, _ in base for item in path), dtype=np.int64, count=int(lengths.sum()))
+        weights = np.fromiter((count for _, count in base), dtype=np.int64, count=len(base))
+        paths = sparse.csr_matrix(
+            (np.repeat(weights, lengths), items, np.concatenate(([0], np.cumsum(lengths)))),
+            shape=(len(base), n_items)
+        )
+        pairs = sparse.triu(paths.T @ (paths > 0).astype(np.int64), k=1).tocoo()
+        frequent_pairs = pairs.data >= min_support
+        for second, third, count in zip(
+            pairs.row[frequent_pairs].tolist(), pairs.col[frequent_pairs].tolist(), pairs.data[frequent_pairs].tolist()
+        ):
+            triplets[tuple(sorted((first, second, third)))] = count
+    return triplets
+
+
+def _build_fp_tree(paths) -> Dict[int, List[list]]:
+    """
+    Insert (ordered item path, count) pairs into an FP-tree.
+
+    Nodes are [item, count, parent, children]; returns the header table
+    (item -> nodes holding it).
+    """
+    root = [None, 0, None, {}]
+    header: Dict[int, List[list]] = defaultdict(list)
+    for path, count in paths:
+        node = root
+        for item in path:
+            child = node[3].get(item)
+            if child is None:
+                child = [item, 0, node, {}]
+                node[3][item] = child
+                header[item].append(child)
+            child[1] += count
+            node = child
+    return header
+
+
+def _pattern_base(nodes: List[list]) -> List[Tuple[Tuple[int, ...], int]]:
+    """Conditional pattern base: the prefix path (root first) and count of each node."""
+    base = []
+    for node in nodes:
+        path = []
+        parent = node[2]
+        while parent[0] is not None:
+            path.append(parent[0])
+            parent = parent[2]
+        if path:
+            base.append((tuple(reversed(path)), node[1]))
+    return base
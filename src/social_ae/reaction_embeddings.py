@@ -1,94 +1,170 @@
 """
 Reaction Embedding Engine
-Generates embeddings for reaction terms using OpenAI or fallback vectors.
+Generates embeddings for reaction terms using OpenAI, a local
+sentence-transformers model, or fallback vectors.
 REUSES existing components where possible.
 """
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
 import numpy as np
 from typing import Optional, List
 import logging
-from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Texts per OpenAI embeddings request (the API accepts up to 2048 inputs)
+OPENAI_BATCH_SIZE = 256
+LOCAL_BATCH_SIZE = 64
+CACHE_SIZE = 50000
+
 
 class ReactionEmbeddingEngine:
     """
     Generates embeddings for reaction terms.
     Uses OpenAI text-embedding-3-small by default, with fallback for offline use.
+    A local sentence-transformers model can be used instead of OpenAI.
     """
-    
-    def __init__(self, model: str = "text-embedding-3-small", dimension: int = 1536):
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        dimension: int = 1536,
+        local_model: Optional[str] = None
+    ):
         """
         Initialize embedding engine.
-        
+
         Args:
             model: OpenAI model name
             dimension: Embedding dimension (1536 for text-embedding-3-small)
+            local_model: Optional sentence-transformers model name (e.g. "all-MiniLM-L6-v2");
+                         used instead of OpenAI, and sets the dimension
         """
         self.model = model
         self.dimension = dimension
         self._openai_available = False
-        self._check_openai()
-    
+        self._local_model = None
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        if local_model:
+            self._load_local_model(local_model)
+        else:
+            self._check_openai()
+
     def _check_openai(self):
         """Check if OpenAI is available."""
         try:
             import openai
-            import os
             if os.getenv("OPENAI_API_KEY"):
                 self._openai_available = True
         except ImportError:
             pass
-    
-    @lru_cache(maxsize=50000)
+
+    def _load_local_model(self, model_name: str):
+        """Load a local sentence-transformers model (falls back to OpenAI if unavailable)."""
+        try:
+            from sentence_transformers import SentenceTransformer
+            self._local_model = SentenceTransformer(model_name)
+            self.dimension = int(self._local_model.get_sentence_embedding_dimension())
+        except Exception as e:
+            logger.warning(f"sentence-transformers model {model_name} unavailable ({e}), using OpenAI/fallback embeddings")
+            self._check_openai()
+
     def embed(self, text: str) -> Optional[np.ndarray]:
         """
         Generate embedding for text.
-        
+
         Args:
             text: Text to embed
-        
+
         Returns:
             Embedding vector or None
         """
-        if not text or not isinstance(text, str) or text.strip() == "":
-            return np.zeros(self.dimension)
-        
-        # Try OpenAI first
-        if self._openai_available:
-            try:
-                import openai
-                import os
-                
-                client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                response = client.embeddings.create(
-                    model=self.model,
-                    input=text
-                )
-                return np.array(response.data[0].embedding)
-            except Exception as e:
-                logger.debug(f"OpenAI embedding error: {str(e)}")
-        
-        # Fallback: generate stable pseudo-random vector based on text hash
-        # This ensures same text always gets same vector (deterministic)
-        import hashlib
-        text_hash = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        np.random.seed(text_hash % (2**32))
-        embedding = np.random.normal(0, 0.001, size=(self.dimension,))
-        np.random.seed()  # Reset seed
-        
-        return embedding
-    
+        return self.embed_batch([text])[0]
+
     def embed_batch(self, texts: List[str]) -> List[Optional[np.ndarray]]:
         """
         Generate embeddings for multiple texts.
-        
+
+        Distinct uncached texts are embedded together: one model.encode call
+        (local model) or one request per OPENAI_BATCH_SIZE texts (OpenAI).
+
         Args:
             texts: List of texts to embed
-        
+
         Returns:
             List of embedding vectors
         """
-        return [self.embed(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        with self._cache_lock:
+            for position, text in enumerate(texts):
+                if not text or not isinstance(text, str) or text.strip() == "":
+                    results[position] = np.zeros(self.dimension)
+                elif text in self._cache:
+                    self._cache.move_to_end(text)
+                    results[position] = self._cache[text]
+                else:
+                    pending.setdefault(text, []).append(position)
 
+        if pending:
+            unique_texts = list(pending.keys())
+            embeddings = self._embed_uncached(unique_texts)
+            with self._cache_lock:
+                for text, embedding in zip(unique_texts, embeddings):
+                    self._cache[text] = embedding
+                    for position in pending[text]:
+                        results[position] = embedding
+                while len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return results
+
+    def _embed_uncached(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed non-empty texts with the best available backend."""
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        if self._local_model is not None:
+            try:
+                encoded = self._local_model.encode(texts, batch_size=LOCAL_BATCH_SIZE, show_progress_bar=False)
+                embeddings = [np.asarray(row) for row in encoded]
+            except Exception as e:
+                logger.debug(f"Local embedding error: {str(e)}")
+        elif self._openai_available:
+            embeddings = self._embed_openai(texts)
+
+        # Fallback for anything the model could not embed
+        return [
+            embedding if embedding is not None else self._fallback_embedding(text)
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+    def _embed_openai(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed texts with OpenAI, OPENAI_BATCH_SIZE inputs per request."""
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        try:
+            import openai
+            client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        except Exception as e:
+            logger.debug(f"OpenAI embedding error: {str(e)}")
+            return embeddings
+
+        for start in range(0, len(texts), OPENAI_BATCH_SIZE):
+            batch = texts[start:start + OPENAI_BATCH_SIZE]
+            try:
+                response = client.embeddings.create(model=self.model, input=batch)
+                for item in response.data:
+                    embeddings[start + item.index] = np.array(item.embedding)
+            except Exception as e:
+                logger.debug(f"OpenAI embedding error: {str(e)}")
+        return embeddings
+
+    def _fallback_embedding(self, text: str) -> np.ndarray:
+        """
+        Stable pseudo-random vector based on text hash.
+        This ensures same text always gets same vector (deterministic).
+        """
+        text_hash = int(hashlib.md5(text.encode()).hexdigest(), 16)
+        return np.random.RandomState(text_hash % (2**32)).normal(0, 0.001, size=(self.dimension,))
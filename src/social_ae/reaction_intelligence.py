@@ -89,21 +89,6 @@ class ReactionIntelligenceCore:
                 # Normalize reaction
                 normalized = self.normalizer.normalize(reaction, drug)
                 
-                # Generate embedding if requested
-                embedding = None
-                if generate_embeddings:
-                    embedding = self.embedding_engine.embed(reaction)
-                    if embedding is not None:
-                        all_embeddings.append(embedding)
-                        # Add to vector store
-                        self.similarity_engine.add_to_store(
-                            reaction_raw=reaction,
-                            reaction_norm=normalized["pt"],
-                            embedding=embedding,
-                            drug=drug,
-                            source="social"
-                        )
-                
                 # Create row
                 row = {
                     "post_id": post_id,
@@ -119,12 +104,30 @@ class ReactionIntelligenceCore:
                     "confidence": result.get("confidence", 0.0),
                     "text": text[:500],  # Truncate
                     "source": "social",
-                    "has_embedding": embedding is not None
+                    "has_embedding": False
                 }
                 
                 all_rows.append(row)
                 all_reactions.append(reaction)
         
+        # Generate embeddings for all reactions in one batch if requested
+        if generate_embeddings and all_reactions:
+            embeddings = self.embedding_engine.embed_batch(all_reactions)
+            embedded = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+            for i in embedded:
+                all_rows[i]["has_embedding"] = True
+            all_embeddings = [embeddings[i] for i in embedded]
+            
+            # Add to vector store
+            self.similarity_engine.add_many_to_store(
+                reactions_raw=[all_reactions[i] for i in embedded],
+                reactions_norm=[all_rows[i]["reaction"] for i in embedded],
+                embeddings=all_embeddings,
+                drugs=[drug] * len(embedded),
+                source="social"
+            )
+            self.similarity_engine.save_store()
+        
         df = pd.DataFrame(all_rows)
         
         # Add clustering if requested
@@ -153,14 +156,15 @@ class ReactionIntelligenceCore:
         if df.empty or "reaction" not in df.columns:
             return {"pairs": {}, "triplets": {}, "network_data": []}
         
-        # Group by post_id to get reaction lists
-        if "post_id" in df.columns:
-            reaction_groups = df.groupby("post_id")["reaction"].apply(list).tolist()
-        else:
-            # Fallback: group by timestamp
-            reaction_groups = df.groupby("timestamp")["reaction"].apply(list).tolist()
-        
-        return self.cooccur_engine.analyze_cooccurrence(reaction_groups, drug)
+        # One case per post_id (fallback: per timestamp), one reaction per row
+        case_column = "post_id" if "post_id" in df.columns else "timestamp"
+        return self.cooccur_engine.analyze_dataframe(
+            df,
+            reaction_column="reaction",
+            case_column=case_column,
+            separator=None,
+            drug=drug
+        )
     
     def discover_emerging(
         self,
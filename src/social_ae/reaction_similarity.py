@@ -3,12 +3,21 @@ Reaction Similarity Search
 Semantic similarity search using embeddings and vector store.
 """
 
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REACTION_STORE_DIR = "data/cache/reaction_vectors"
+_EMBEDDINGS_FILE = "embeddings.npy"
+_ROWS_FILE = "rows.json"
+
 # Try to import Supabase
 try:
     from supabase import create_client
@@ -19,20 +28,250 @@ except ImportError:
     logger.warning("Supabase not available, similarity search will use in-memory only")
 
 
+class ReactionVectorStore:
+    """
+    In-memory reaction vector store.
+
+    Embeddings live in one contiguous, L2-normalized float32 matrix (grown
+    by doubling) with parallel metadata lists; rows are grouped by drug in
+    an offset index (CSR) rebuilt lazily after appends. Saved as .npy +
+    JSON and reopened memory-mapped, so restarts need no re-embedding.
+    """
+
+    def __init__(self):
+        self.dim: Optional[int] = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self.reaction_raw: List[str] = []
+        self.reaction_norm: List[str] = []
+        self.drugs: List[str] = []
+        self.sources: List[str] = []
+        self._drug_codes: List[int] = []
+        self._drug_ids: Dict[str, int] = {}
+        self._drug_order: Optional[np.ndarray] = None
+        self._drug_offsets: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n, dim) float32 view of the stored, L2-normalized embeddings."""
+        return self._matrix[:self._size]
+
+    def add(
+        self,
+        reactions_raw: List[str],
+        reactions_norm: List[str],
+        embeddings: Any,
+        drugs: Optional[List[Optional[str]]] = None,
+        sources: Optional[List[str]] = None
+    ) -> int:
+        """
+        Append reactions with their embeddings.
+
+        Args:
+            reactions_raw: Raw reaction texts
+            reactions_norm: Normalized PTs
+            embeddings: Embedding vectors, one per reaction (same dimension)
+            drugs: Drug names
+            sources: Source names
+
+        Returns:
+            Number of reactions added
+        """
+        if not reactions_raw:
+            return 0
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape[0] != len(reactions_raw):
+            raise ValueError("embeddings must have one row per reaction")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            if vectors.shape[1] != self.dim:
+                logger.warning(f"Skipping {len(vectors)} embeddings of dimension {vectors.shape[1]} (store dimension {self.dim})")
+                return 0
+
+            count = len(vectors)
+            self._reserve(self._size + count)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self._matrix[self._size:self._size + count] = vectors / np.where(norms > 0, norms, 1.0)
+            self._size += count
+
+            drugs = drugs or [None] * count
+            self.reaction_raw.extend(reactions_raw)
+            self.reaction_norm.extend(reactions_norm)
+            self.drugs.extend(drug or "" for drug in drugs)
+            self.sources.extend(sources or ["social"] * count)
+            self._drug_codes.extend(
+                self._drug_ids.setdefault((drug or "").lower(), len(self._drug_ids)) for drug in drugs
+            )
+            self._drug_order = None
+        return count
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the matrix (a writable copy if memory-mapped) to hold rows."""
+        capacity = self._matrix.shape[0]
+        if rows <= capacity and self._matrix.flags.writeable:
+            return
+        grown = np.zeros((max(rows, 2 * capacity, 64), self.dim), dtype=np.float32)
+        if self._size:
+            grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+
+    def _rows_for_drug(self, drug: str) -> np.ndarray:
+        """Row ids of a drug (case-insensitive) from the drug offset index."""
+        code = self._drug_ids.get(drug.lower())
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        if self._drug_order is None:
+            codes = np.asarray(self._drug_codes, dtype=np.int64)
+            self._drug_order = np.argsort(codes, kind="stable")
+            self._drug_offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(self._drug_ids)))))
+        return self._drug_order[self._drug_offsets[code]:self._drug_offsets[code + 1]]
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        k: int = 5,
+        drug: Optional[str] = None,
+        min_similarity: float = 0.7
+    ) -> List[Dict]:
+        """
+        Top-k reactions by cosine similarity (one matrix-vector product).
+
+        Args:
+            embedding: Query embedding vector
+            k: Number of results
+            drug: Optional drug filter (case-insensitive)
+            min_similarity: Minimum similarity threshold
+
+        Returns:
+            List of similar reactions with similarity scores, best first
+        """
+        with self._lock:
+            if not self._size or k <= 0:
+                return []
+            query = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            if query.shape[0] != self.dim:
+                return []
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            rows = self._rows_for_drug(drug) if drug else None
+            vectors = self.matrix if rows is None else self.matrix[rows]
+            if not len(vectors):
+                return []
+            scores = vectors @ query
+            passing = np.flatnonzero(scores >= min_similarity)
+            if len(passing) > k:
+                passing = passing[np.argpartition(-scores[passing], k - 1)[:k]]
+            # Best first; earlier rows first on ties
+            passing = passing[np.lexsort((passing, -scores[passing]))]
+
+            results = []
+            for position in passing.tolist():
+                row = position if rows is None else int(rows[position])
+                results.append({
+                    "reaction_raw": self.reaction_raw[row],
+                    "reaction_norm": self.reaction_norm[row],
+                    "drug": self.drugs[row],
+                    "similarity": float(scores[position])
+                })
+            return results
+
+    def save(self, directory: Path) -> bool:
+        """
+        Persist the store (atomic replace, best effort).
+
+        Args:
+            directory: Target directory
+
+        Returns:
+            True if the files were written
+        """
+        directory = Path(directory)
+        with self._lock:
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                fd, tmp_embeddings = tempfile.mkstemp(dir=directory, suffix=".npy")
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, np.ascontiguousarray(self.matrix))
+                fd, tmp_rows = tempfile.mkstemp(dir=directory, suffix=".json")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "dim": self.dim,
+                        "reaction_raw": self.reaction_raw,
+                        "reaction_norm": self.reaction_norm,
+                        "drug": self.drugs,
+                        "source": self.sources,
+                    }, f)
+                os.replace(tmp_embeddings, directory / _EMBEDDINGS_FILE)
+                os.replace(tmp_rows, directory / _ROWS_FILE)
+                return True
+            except OSError as e:
+                logger.warning(f"Could not persist reaction vector store: {e}")
+                return False
+
+    @classmethod
+    def load(cls, directory: Path) -> "ReactionVectorStore":
+        """
+        Open a saved store (embeddings memory-mapped read-only until the next add).
+
+        Args:
+            directory: Directory written by save()
+
+        Returns:
+            ReactionVectorStore (empty if nothing usable was saved)
+        """
+        store = cls()
+        directory = Path(directory)
+        try:
+            with open(directory / _ROWS_FILE, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+            matrix = np.load(directory / _EMBEDDINGS_FILE, mmap_mode="r")
+        except FileNotFoundError:
+            return store
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable reaction vector store {directory}: {e}")
+            return store
+
+        if matrix.ndim != 2 or len(matrix) != len(rows["reaction_raw"]):
+            logger.warning("Reaction vector store files are inconsistent - starting empty")
+            return store
+        store.dim = rows["dim"]
+        store._matrix = matrix
+        store._size = len(matrix)
+        store.reaction_raw = rows["reaction_raw"]
+        store.reaction_norm = rows["reaction_norm"]
+        store.drugs = rows["drug"]
+        store.sources = rows["source"]
+        store._drug_codes = [store._drug_ids.setdefault(drug.lower(), len(store._drug_ids)) for drug in store.drugs]
+        return store
+
+
 class ReactionSimilarityEngine:
     """
     Semantic similarity search for reactions using embeddings.
     """
     
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, store_dir: Optional[str] = None):
         """
         Initialize similarity engine.
         
         Args:
             supabase_client: Optional Supabase client (for vector store)
+            store_dir: Directory of the persisted in-memory store (default:
+                       REACTION_STORE_DIR env var or data/cache/reaction_vectors)
         """
         self.supabase = supabase_client
-        self._in_memory_store: List[Dict] = []  # Fallback in-memory store
+        self.store_dir = Path(store_dir or os.getenv("REACTION_STORE_DIR", DEFAULT_REACTION_STORE_DIR))
+        self._in_memory_store = ReactionVectorStore.load(self.store_dir)  # Fallback in-memory store
     
     def find_similar_reactions(
         self,
@@ -96,43 +335,7 @@ class ReactionSimilarityEngine:
         min_similarity: float
     ) -> List[Dict]:
         """Search using in-memory store (fallback)."""
-        if not self._in_memory_store:
-            return []
-        
-        similarities = []
-        for item in self._in_memory_store:
-            # Filter by drug if specified
-            if drug and item.get("drug", "").lower() != drug.lower():
-                continue
-            
-            # Calculate cosine similarity
-            item_embedding = np.array(item.get("embedding", []))
-            if len(item_embedding) != len(embedding):
-                continue
-            
-            similarity = self._cosine_similarity(embedding, item_embedding)
-            if similarity >= min_similarity:
-                similarities.append({
-                    "reaction_raw": item.get("reaction_raw", ""),
-                    "reaction_norm": item.get("reaction_norm", ""),
-                    "drug": item.get("drug", ""),
-                    "similarity": similarity
-                })
-        
-        # Sort by similarity and return top k
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
-        return similarities[:k]
-    
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return float(dot_product / (norm1 * norm2))
+        return self._in_memory_store.search(embedding, k, drug, min_similarity)
     
     def add_to_store(
         self,
@@ -152,32 +355,57 @@ class ReactionSimilarityEngine:
             drug: Drug name
             source: Source name
         """
+        self.add_many_to_store([reaction_raw], [reaction_norm], [embedding], [drug], source=source)
+    
+    def add_many_to_store(
+        self,
+        reactions_raw: List[str],
+        reactions_norm: List[str],
+        embeddings: List[np.ndarray],
+        drugs: Optional[List[Optional[str]]] = None,
+        source: str = "social"
+    ):
+        """
+        Add a batch of reactions to the vector store (one insert / one append).
+        
+        Args:
+            reactions_raw: Raw reaction texts
+            reactions_norm: Normalized PTs
+            embeddings: Embedding vectors
+            drugs: Drug names
+            source: Source name
+        """
+        if not reactions_raw:
+            return
+        drugs = drugs or [None] * len(reactions_raw)
         if self.supabase and SUPABASE_AVAILABLE:
             try:
-                self.supabase.table("reaction_vectors").insert({
-                    "reaction_raw": reaction_raw,
-                    "reaction_norm": reaction_norm,
-                    "drug": drug or "",
-                    "embedding": embedding.tolist(),
-                    "source": source
-                }).execute()
+                self.supabase.table("reaction_vectors").insert([
+                    {
+                        "reaction_raw": reaction_raw,
+                        "reaction_norm": reaction_norm,
+                        "drug": drug or "",
+                        "embedding": np.asarray(embedding).tolist(),
+                        "source": source
+                    }
+                    for reaction_raw, reaction_norm, embedding, drug in zip(reactions_raw, reactions_norm, embeddings, drugs)
+                ]).execute()
+                return
             except Exception as e:
                 logger.warning(f"Error adding to Supabase: {str(e)}")
                 # Fallback to in-memory
-                self._in_memory_store.append({
-                    "reaction_raw": reaction_raw,
-                    "reaction_norm": reaction_norm,
-                    "drug": drug or "",
-                    "embedding": embedding.tolist(),
-                    "source": source
-                })
-        else:
-            # Use in-memory store
-            self._in_memory_store.append({
-                "reaction_raw": reaction_raw,
-                "reaction_norm": reaction_norm,
-                "drug": drug or "",
-                "embedding": embedding.tolist(),
-                "source": source
-            })
-
+        
+        self._in_memory_store.add(
+            reactions_raw, reactions_norm, embeddings, drugs, [source] * len(reactions_raw)
+        )
+    
+    def save_store(self) -> bool:
+        """
+        Persist the in-memory store so it survives restarts without re-embedding.
+        
+        Returns:
+            True if the store was written
+        """
+        if not len(self._in_memory_store):
+            return False
+        return self._in_memory_store.save(self.store_dir)
@@ -14,7 +14,8 @@ from .social_fetcher import fetch_daily_social_posts
 from .social_cleaner import clean_and_normalize_posts
 from .social_mapper import extract_reactions_from_posts
 from .social_anonymizer import anonymize_posts
-from .social_ae_storage import store_posts, init_database, get_statistics
+from .social_ae_storage import store_posts, init_database, get_statistics, filter_unstored_posts
+from .social_cursors import get_cursor_store
 from src.storage.public_data_storage import store_from_dataframe
 
 # Configure logging
@@ -45,7 +46,8 @@ def run_daily_pull(
     platforms: Optional[List[str]] = None,
     days_back: int = 1,
     limit_per_term: int = 50,
-    anonymize: bool = True
+    anonymize: bool = True,
+    incremental: bool = True
 ) -> Dict:
     """
     Run a daily pull of social media posts.
@@ -56,6 +58,7 @@ def run_daily_pull(
         days_back: Days back to search
         limit_per_term: Max posts per drug term
         anonymize: Whether to anonymize posts
+        incremental: Fetch only posts newer than each (platform, term) cursor
     
     Returns:
         Dictionary with pull results and statistics
@@ -73,11 +76,13 @@ def run_daily_pull(
     try:
         # Step 1: Fetch posts
         logger.info("Fetching posts from social media...")
+        cursors = get_cursor_store("scheduler") if incremental else None
         raw_posts = fetch_daily_social_posts(
             drug_terms_str,
             platforms=platforms,
             limit_per_term=limit_per_term,
             days_back=days_back,
+            cursors=cursors,
         )
         
         if not raw_posts:
@@ -90,12 +95,31 @@ def run_daily_pull(
         
         logger.info(f"Fetched {len(raw_posts)} raw posts")
         
+        # Skip posts stored by earlier pulls before any processing
+        new_posts = filter_unstored_posts(raw_posts)
+        logger.info(f"{len(raw_posts) - len(new_posts)} posts already stored")
+        if not new_posts:
+            _advance_cursors(cursors, raw_posts)
+            return {
+                "success": True,
+                "posts_fetched": len(raw_posts),
+                "posts_cleaned": 0,
+                "posts_with_reactions": 0,
+                "posts_stored": 0,
+                "posts_duplicate": len(raw_posts),
+                "posts_errors": 0,
+                "drug_terms": drug_terms,
+                "platforms": platforms,
+                "timestamp": datetime.now().isoformat()
+            }
+        
         # Step 2: Clean and normalize
         logger.info("Cleaning and normalizing posts...")
-        cleaned_df = clean_and_normalize_posts(raw_posts)
+        cleaned_df = clean_and_normalize_posts(new_posts)
         
         if cleaned_df.empty:
             logger.warning("All posts filtered out during cleaning")
+            _advance_cursors(cursors, raw_posts)
             return {
                 "success": False,
                 "error": "All posts filtered out",
@@ -126,6 +150,7 @@ def run_daily_pull(
         storage_result = store_posts(posts_list, drug_terms_str, platforms)
         
         logger.info(f"Storage complete: {storage_result['stored']} new, {storage_result['duplicates']} duplicates")
+        _advance_cursors(cursors, raw_posts)
         
         # Step 6: Also store in public_ae_data table (public data platform)
         logger.info("Storing in public_ae_data table...")
@@ -175,6 +200,13 @@ def run_daily_pull(
         }
 
 
+def _advance_cursors(cursors, posts: List[Dict]) -> None:
+    """Move the fetch cursors past posts that have been processed."""
+    if cursors is not None:
+        cursors.advance(posts)
+        cursors.save()
+
+
 def run_scheduled_pull():
     """
     Entry point for scheduled/cron jobs.
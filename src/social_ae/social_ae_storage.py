@@ -193,6 +193,50 @@ def store_posts(posts: List[Dict], drug_terms: str, platforms: List[str]) -> Dic
     }
 
 
+def filter_unstored_posts(posts: List[Dict], chunk_size: int = 500) -> List[Dict]:
+    """
+    Drop posts already stored, matched by (platform, post_id).
+    
+    Meant to run before cleaning and reaction extraction so re-fetched posts
+    are not processed again.
+    
+    Args:
+        posts: Raw post dictionaries
+        chunk_size: Post ids per lookup query
+    
+    Returns:
+        Posts not yet in social_posts (input order kept)
+    """
+    if not posts:
+        return []
+    
+    init_database()
+    by_platform: Dict[str, set] = {}
+    for post in posts:
+        by_platform.setdefault(post.get("platform", post.get("source", "unknown")), set()).add(str(post.get("post_id", "")))
+    
+    stored = set()
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        for platform, post_ids in by_platform.items():
+            post_ids = list(post_ids)
+            for start in range(0, len(post_ids), chunk_size):
+                chunk = post_ids[start:start + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT post_id FROM social_posts WHERE platform = ? AND post_id IN ({placeholders})",
+                    [platform, *chunk]
+                ).fetchall()
+                stored.update((platform, row[0]) for row in rows)
+    finally:
+        conn.close()
+    
+    return [
+        post for post in posts
+        if (post.get("platform", post.get("source", "unknown")), str(post.get("post_id", ""))) not in stored
+    ]
+
+
 def get_posts(
     drug_match: Optional[str] = None,
     reaction: Optional[str] = None,
@@ -0,0 +1,136 @@
+"""
+Incremental fetch cursors for Social AE pulls.
+
+Each (platform, drug term) keeps a high-water mark: the newest created_utc
+seen, the ids of the posts at that second (so a post sharing the boundary
+second is not fetched twice) and the newest post id (X's since_id). Marks
+are persisted as JSON and only advanced by the caller once a pull has been
+stored, so a failed run is simply fetched again.
+
+Marks are kept per sink: the scheduler (local social_posts/public_ae_data)
+and the API job queue (Supabase social_ae) each advance their own file, so a
+pull into one sink never hides posts from the other.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Cursor file per sink
+CURSOR_FILES = {
+    "scheduler": Path("data/social_ae/fetch_cursors_scheduler.json"),
+    "api": Path("data/social_ae/fetch_cursors_api.json"),
+}
+
+_stores: Dict[str, "SocialCursorStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class SocialCursorStore:
+    """
+    Persisted per-(platform, term) high-water marks.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: JSON file holding the marks
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._marks: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self._marks = json.load(f)
+
+    @staticmethod
+    def _key(platform: str, term: str) -> str:
+        return f"{platform}:{(term or '').strip().lower()}"
+
+    def get(self, platform: str, term: str) -> Optional[Dict[str, Any]]:
+        """Mark for (platform, term): {"created_utc", "post_id", "boundary_ids"} or None."""
+        with self._lock:
+            mark = self._marks.get(self._key(platform, term))
+            return dict(mark) if mark else None
+
+    def since(self, platform: str, term: str) -> Optional[int]:
+        """Newest created_utc fetched for (platform, term)."""
+        mark = self.get(platform, term)
+        return mark["created_utc"] if mark else None
+
+    def is_new(self, post: Dict[str, Any]) -> bool:
+        """True if the post is past its (platform, term) mark."""
+        with self._lock:
+            mark = self._marks.get(self._key(post.get("source"), post.get("drug_match")))
+        if not mark:
+            return True
+        created = post.get("created_utc")
+        if created is None or int(created) == mark["created_utc"]:
+            return str(post.get("post_id")) not in mark["boundary_ids"]
+        return int(created) > mark["created_utc"]
+
+    def advance(self, posts: Iterable[Dict[str, Any]]) -> None:
+        """Move marks forward to the newest of the given (stored) posts."""
+        newest: Dict[str, Dict[str, Any]] = {}
+        for post in posts:
+            created = post.get("created_utc")
+            post_id = post.get("post_id")
+            if created is None or post_id is None:
+                continue
+            created = int(created)
+            key = self._key(post.get("source"), post.get("drug_match"))
+            mark = newest.get(key)
+            if mark is None or created > mark["created_utc"]:
+                newest[key] = {"created_utc": created, "post_id": str(post_id), "boundary_ids": [str(post_id)]}
+            elif created == mark["created_utc"]:
+                mark["boundary_ids"].append(str(post_id))
+                mark["post_id"] = max(mark["post_id"], str(post_id), key=_id_order)
+
+        with self._lock:
+            for key, candidate in newest.items():
+                current = self._marks.get(key)
+                if current is None or candidate["created_utc"] > current["created_utc"]:
+                    candidate["boundary_ids"] = sorted(set(candidate["boundary_ids"]))
+                    self._marks[key] = candidate
+                elif candidate["created_utc"] == current["created_utc"]:
+                    current["boundary_ids"] = sorted(set(current["boundary_ids"]) | set(candidate["boundary_ids"]))
+                    current["post_id"] = max(current["post_id"], candidate["post_id"], key=_id_order)
+
+    def save(self) -> None:
+        """Write the marks (atomic replace)."""
+        with self._lock:
+            payload = json.dumps(self._marks, indent=2, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def get_cursor_store(sink: str) -> SocialCursorStore:
+    """
+    Cursor store shared by all pulls into a sink.
+
+    Args:
+        sink: "scheduler" or "api" (see CURSOR_FILES)
+    """
+    if sink not in CURSOR_FILES:
+        raise ValueError(f"Unknown cursor sink: {sink}")
+    with _stores_lock:
+        store = _stores.get(sink)
+        if store is None:
+            store = _stores[sink] = SocialCursorStore(CURSOR_FILES[sink])
+        return store
+
+
+def _id_order(post_id: str):
+    """Numeric ids (X) compare as numbers, others as text."""
+    return (0, int(post_id), "") if post_id.isdigit() else (1, 0, post_id)
@@ -1,15 +1,99 @@
 """
 Social media fetcher for adverse event detection.
 Handles API pulls from Reddit, X (Twitter), YouTube, and other platforms.
+
+Terms (and, in fetch_daily_social_posts, platforms) are fetched
+concurrently. Requests go through the shared pooled session and a rate
+limiter per platform (PLATFORM_RATE_LIMITS) instead of sleeping. Passing a
+SocialCursorStore makes a pull incremental: each (platform, term) only
+returns posts newer than its high-water mark, paging back from the newest
+post until the mark is reached so nothing between the two is skipped.
 """
 
-import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import requests
 import streamlit as st
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from src.data_sources.http_pool import get_rate_limiter, get_session
 from src.utils.config_loader import load_config
+from .social_cursors import SocialCursorStore
+
+logger = logging.getLogger(__name__)
+
+# Requests per second per platform (shared by all terms of a pull)
+PLATFORM_RATE_LIMITS = {
+    "reddit": 2.0,
+    "x": 1.0,
+    "youtube": 5.0,
+}
+MAX_FETCH_WORKERS = 8
+# Pages fetched per (platform, term) when catching up to a cursor mark
+MAX_CURSOR_PAGES = 20
+
+REDDIT_SEARCH_URL = "https://api.pushshift.io/reddit/search/comment/"
+X_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
+YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+YOUTUBE_COMMENTS_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
+
+
+def _platform_get(platform: str, url: str, **kwargs) -> requests.Response:
+    """GET through the shared session within the platform's rate budget."""
+    get_rate_limiter(f"social_{platform}", PLATFORM_RATE_LIMITS[platform]).acquire()
+    return get_session().get(url, **kwargs)
+
+
+def _fetch_terms(
+    tasks: List[Tuple[str, str, Callable[[], List[Dict]]]],
+    cursors: Optional[SocialCursorStore] = None
+) -> List[Dict]:
+    """
+    Run (platform, term, fetch) tasks concurrently.
+
+    A failing task is logged and contributes no posts. With cursors, posts at
+    or before their (platform, term) mark are dropped.
+
+    Returns:
+        Posts in task order
+    """
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tasks)), thread_name_prefix="social-fetch") as pool:
+        return [post for posts in pool.map(lambda task: _run_task(task, cursors), tasks) for post in posts]
+
+
+def _iter_fetch_terms(
+    tasks: List[Tuple[str, str, Callable[[], List[Dict]]]],
+    cursors: Optional[SocialCursorStore] = None
+) -> Iterator[List[Dict]]:
+    """Like _fetch_terms, but yields each task's posts as soon as it completes."""
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tasks)), thread_name_prefix="social-fetch") as pool:
+        pending = {pool.submit(_run_task, task, cursors) for task in tasks}
+        try:
+            for future in as_completed(pending):
+                pending.discard(future)
+                posts = future.result()
+                if posts:
+                    yield posts
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _run_task(task: Tuple[str, str, Callable[[], List[Dict]]], cursors: Optional[SocialCursorStore]) -> List[Dict]:
+    platform, term, fetch = task
+    try:
+        posts = fetch()
+    except Exception as e:
+        logger.warning(f"{platform} fetch failed for '{term}': {str(e)[:100]}")
+        return []
+    if cursors is not None:
+        posts = [post for post in posts if cursors.is_new(post)]
+    return posts
 
 
 @retry(
@@ -33,10 +117,16 @@ def _fetch_reddit_api_request(url: str, params: dict, timeout: int = 10) -> requ
     Raises:
         requests.exceptions.RequestException: If request fails after retries
     """
-    return requests.get(url, params=params, timeout=timeout)
+    return _platform_get("reddit", url, params=params, timeout=timeout)
 
 
-def fetch_reddit_posts(drug_terms: List[str], limit_per_term: int = 50, days_back: int = 7) -> List[Dict]:
+def fetch_reddit_posts(
+    drug_terms: List[str],
+    limit_per_term: int = 50,
+    days_back: int = 7,
+    cursors: Optional[SocialCursorStore] = None,
+    now: Optional[datetime] = None
+) -> List[Dict]:
     """
     Fetch Reddit posts/comments mentioning drug terms.
     
@@ -47,63 +137,88 @@ def fetch_reddit_posts(drug_terms: List[str], limit_per_term: int = 50, days_bac
         drug_terms: List of drug names/keywords to search
         limit_per_term: Maximum posts per drug term
         days_back: How many days back to search
+        cursors: Optional high-water marks (fetch only posts newer than them)
+        now: Reference time for days_back (default: current time)
     
     Returns:
         List of post dictionaries with source, text, timestamp, etc.
     """
-    posts = []
-    
+    return _fetch_terms(_reddit_tasks(drug_terms, limit_per_term, days_back, cursors, now), cursors)
+
+
+def _reddit_tasks(drug_terms, limit_per_term, days_back, cursors, now):
     # Calculate time range
-    after_timestamp = int((datetime.now() - timedelta(days=days_back)).timestamp())
+    after_timestamp = int(((now or datetime.now()) - timedelta(days=days_back)).timestamp())
     
+    tasks = []
     for term in drug_terms:
         term = term.strip().lower()
         if not term:
             continue
+        since = cursors.since("reddit", term) if cursors is not None else None
+        # One second back: posts sharing the mark's second are dropped by id
+        after = max(after_timestamp, since - 1) if since is not None else after_timestamp
+        tasks.append((
+            "reddit", term,
+            lambda term=term, after=after: _reddit_term_posts(term, limit_per_term, after, to_mark=cursors is not None)
+        ))
+    return tasks
+
+
+def _reddit_term_posts(term: str, limit_per_term: int, after_timestamp: int, to_mark: bool = False) -> List[Dict]:
+    """
+    Pushshift comments for one term created after after_timestamp, newest first.
+
+    Without to_mark only the newest limit_per_term are fetched; with it
+    (incremental pulls), older pages follow (before=) until after_timestamp
+    is reached.
+    """
+    posts = []
+    seen = set()
+    # Try Pushshift API (free, no auth required)
+    params = {
+        "q": term,
+        "size": limit_per_term,
+        "after": after_timestamp,
+        "sort": "created_utc",
+        "sort_type": "desc",
+    }
+    
+    for _ in range(MAX_CURSOR_PAGES if to_mark else 1):
+        # Use retry-enabled request function
+        response = _fetch_reddit_api_request(REDDIT_SEARCH_URL, params, timeout=10)
+        if response.status_code != 200:
+            if posts:
+                # A missing older page would leave a gap below the newest post: fail the term
+                response.raise_for_status()
+            break
         
-        try:
-            # Try Pushshift API (free, no auth required)
-            url = "https://api.pushshift.io/reddit/search/comment/"
-            params = {
-                "q": term,
-                "size": limit_per_term,
-                "after": after_timestamp,
-                "sort": "created_utc",
-                "sort_type": "desc",
-            }
-            
-            # Use retry-enabled request function
-            response = _fetch_reddit_api_request(url, params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("data", []):
-                    body = item.get("body", "")
-                    if body and len(body) > 20:  # Filter very short comments
-                        posts.append({
-                            "source": "reddit",
-                            "platform": "reddit",
-                            "text": body,
-                            "created_utc": item.get("created_utc"),
-                            "post_id": item.get("id"),
-                            "subreddit": item.get("subreddit", "unknown"),
-                            "author": item.get("author", "[deleted]"),
-                            "drug_match": term,
-                            "url": f"https://reddit.com{item.get('permalink', '')}",
-                            "score": item.get("score", 0),
-                        })
-            
-            # Rate limiting - be respectful
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            # If API fails, continue to next term
-            st.warning(f"⚠️ Reddit API error for '{term}': {str(e)[:100]}")
-            continue
-        except Exception as e:
-            st.warning(f"⚠️ Error fetching Reddit data for '{term}': {str(e)[:100]}")
-            continue
-    
+        items = [item for item in response.json().get("data", []) if item.get("id") not in seen]
+        for item in items:
+            seen.add(item.get("id"))
+            body = item.get("body", "")
+            if body and len(body) > 20:  # Filter very short comments
+                posts.append({
+                    "source": "reddit",
+                    "platform": "reddit",
+                    "text": body,
+                    "created_utc": item.get("created_utc"),
+                    "post_id": item.get("id"),
+                    "subreddit": item.get("subreddit", "unknown"),
+                    "author": item.get("author", "[deleted]"),
+                    "drug_match": term,
+                    "url": f"https://reddit.com{item.get('permalink', '')}",
+                    "score": item.get("score", 0),
+                })
+        
+        times = [int(item["created_utc"]) for item in items if item.get("created_utc") is not None]
+        if len(items) < limit_per_term or not times:
+            break
+        # before= is exclusive: repeat the oldest second, its posts already seen are skipped by id
+        params["before"] = min(times) + 1
+    else:
+        if to_mark:
+            logger.warning(f"Reddit '{term}': {MAX_CURSOR_PAGES} pages fetched before reaching the cursor, older posts skipped")
     return posts
 
 
@@ -129,10 +244,14 @@ def _fetch_x_api_request(url: str, headers: dict, params: dict, timeout: int = 1
     Raises:
         requests.exceptions.RequestException: If request fails after retries
     """
-    return requests.get(url, headers=headers, params=params, timeout=timeout)
+    return _platform_get("x", url, headers=headers, params=params, timeout=timeout)
 
 
-def fetch_x_posts(drug_terms: List[str], limit_per_term: int = 50) -> List[Dict]:
+def fetch_x_posts(
+    drug_terms: List[str],
+    limit_per_term: int = 50,
+    cursors: Optional[SocialCursorStore] = None
+) -> List[Dict]:
     """
     Fetch X (Twitter) posts mentioning drug terms.
     
@@ -142,12 +261,15 @@ def fetch_x_posts(drug_terms: List[str], limit_per_term: int = 50) -> List[Dict]
     Args:
         drug_terms: List of drug names/keywords to search
         limit_per_term: Maximum posts per drug term
+        cursors: Optional high-water marks (fetch only posts newer than them)
     
     Returns:
         List of post dictionaries
     """
-    posts = []
-    
+    return _fetch_terms(_x_tasks(drug_terms, limit_per_term, cursors), cursors)
+
+
+def _x_tasks(drug_terms, limit_per_term, cursors):
     # Placeholder: X API requires Bearer token authentication
     # To use: Set X_API_BEARER_TOKEN in environment or session state
     api_token = st.session_state.get("x_api_bearer_token") or st.secrets.get("X_API_BEARER_TOKEN", None)
@@ -155,54 +277,82 @@ def fetch_x_posts(drug_terms: List[str], limit_per_term: int = 50) -> List[Dict]
     if not api_token:
         # Return mock data structure for demonstration
         st.info("ℹ️ X API requires authentication. Add X_API_BEARER_TOKEN to use real data.")
-        return posts
+        return []
     
+    tasks = []
     for term in drug_terms:
         term = term.strip()
         if not term:
             continue
+        mark = cursors.get("x", term) if cursors is not None else None
+        since_id = mark["post_id"] if mark else None
+        tasks.append((
+            "x", term,
+            lambda term=term, since_id=since_id: _x_term_posts(
+                term, limit_per_term, api_token, since_id, to_mark=cursors is not None
+            )
+        ))
+    return tasks
+
+
+def _x_term_posts(
+    term: str,
+    limit_per_term: int,
+    api_token: str,
+    since_id: Optional[str] = None,
+    to_mark: bool = False
+) -> List[Dict]:
+    """
+    Recent posts for one term (newer than since_id if given), newest first.
+
+    Without to_mark only the newest page is fetched; with it (incremental
+    pulls), next_token pages follow until since_id (or the end of the
+    search window) is reached.
+    """
+    posts = []
+    headers = {
+        "Authorization": f"Bearer {api_token}",
+    }
+    params = {
+        "query": f"{term} -is:retweet lang:en",
+        "max_results": min(limit_per_term, 100),
+        "tweet.fields": "created_at,author_id,public_metrics",
+    }
+    if since_id:
+        params["since_id"] = since_id
+    
+    for _ in range(MAX_CURSOR_PAGES if to_mark else 1):
+        # Use retry-enabled request function
+        response = _fetch_x_api_request(X_SEARCH_URL, headers, params, timeout=10)
+        if response.status_code != 200:
+            if posts:
+                # A missing older page would leave a gap below the newest post: fail the term
+                response.raise_for_status()
+            break
         
-        try:
-            # X API v2 endpoint
-            url = "https://api.twitter.com/2/tweets/search/recent"
-            headers = {
-                "Authorization": f"Bearer {api_token}",
-            }
-            params = {
-                "query": f"{term} -is:retweet lang:en",
-                "max_results": min(limit_per_term, 100),
-                "tweet.fields": "created_at,author_id,public_metrics",
-            }
-            
-            # Use retry-enabled request function
-            response = _fetch_x_api_request(url, headers, params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("data", []):
-                    text = item.get("text", "")
-                    if text and len(text) > 10:
-                        posts.append({
-                            "source": "x",
-                            "platform": "twitter",
-                            "text": text,
-                            "created_utc": None,  # X uses created_at ISO format
-                            "post_id": item.get("id"),
-                            "author": item.get("author_id", "unknown"),
-                            "drug_match": term,
-                            "url": f"https://twitter.com/i/web/status/{item.get('id')}",
-                            "metrics": item.get("public_metrics", {}),
-                        })
-            
-            time.sleep(1)  # Rate limiting
-            
-        except requests.exceptions.RequestException as e:
-            st.warning(f"⚠️ X API error for '{term}': {str(e)[:100]}")
-            continue
-        except Exception as e:
-            st.warning(f"⚠️ Error fetching X data for '{term}': {str(e)[:100]}")
-            continue
-    
+        data = response.json()
+        for item in data.get("data", []):
+            text = item.get("text", "")
+            if text and len(text) > 10:
+                posts.append({
+                    "source": "x",
+                    "platform": "twitter",
+                    "text": text,
+                    "created_utc": _iso_to_utc(item.get("created_at")),
+                    "post_id": item.get("id"),
+                    "author": item.get("author_id", "unknown"),
+                    "drug_match": term,
+                    "url": f"https://twitter.com/i/web/status/{item.get('id')}",
+                    "metrics": item.get("public_metrics", {}),
+                })
+        
+        next_token = data.get("meta", {}).get("next_token")
+        if not next_token:
+            break
+        params["next_token"] = next_token
+    else:
+        if to_mark:
+            logger.warning(f"X '{term}': {MAX_CURSOR_PAGES} pages fetched before reaching the cursor, older posts skipped")
     return posts
 
 
@@ -227,10 +377,16 @@ def _fetch_youtube_api_request(url: str, params: dict, timeout: int = 10) -> req
     Raises:
         requests.exceptions.RequestException: If request fails after retries
     """
-    return requests.get(url, params=params, timeout=timeout)
+    return _platform_get("youtube", url, params=params, timeout=timeout)
 
 
-def fetch_youtube_comments(drug_terms: List[str], limit_per_term: int = 50, days_back: int = 30) -> List[Dict]:
+def fetch_youtube_comments(
+    drug_terms: List[str],
+    limit_per_term: int = 50,
+    days_back: int = 30,
+    cursors: Optional[SocialCursorStore] = None,
+    now: Optional[datetime] = None
+) -> List[Dict]:
     """
     Fetch YouTube comments from videos mentioning drug terms.
     
@@ -243,12 +399,16 @@ def fetch_youtube_comments(drug_terms: List[str], limit_per_term: int = 50, days
         drug_terms: List of drug names/keywords to search
         limit_per_term: Maximum comments per drug term
         days_back: How many days back to search (YouTube API limitation)
+        cursors: Optional high-water marks (keep only comments newer than them)
+        now: Reference time for days_back (default: current time)
     
     Returns:
         List of comment dictionaries with source, text, timestamp, etc.
     """
-    posts = []
-    
+    return _fetch_terms(_youtube_tasks(drug_terms, limit_per_term, days_back, now), cursors)
+
+
+def _youtube_tasks(drug_terms, limit_per_term, days_back, now):
     # Get API key from config or environment
     config = load_config()
     api_key = (
@@ -259,155 +419,177 @@ def fetch_youtube_comments(drug_terms: List[str], limit_per_term: int = 50, days
     
     if not api_key:
         st.info("ℹ️ YouTube API requires authentication. Add YOUTUBE_API_KEY to use YouTube data.")
-        return posts
+        return []
     
     # Calculate publishedAfter date (YouTube API uses ISO 8601)
-    published_after = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Video publish dates bound the search; new comments on older videos
+    # are filtered by the cursors instead
+    published_after = ((now or datetime.now()) - timedelta(days=days_back)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    return [
+        ("youtube", term, lambda term=term: _youtube_term_comments(term, limit_per_term, published_after, api_key))
+        for term in (t.strip() for t in drug_terms)
+        if term
+    ]
+
+
+def _youtube_term_comments(term: str, limit_per_term: int, published_after: str, api_key: str) -> List[Dict]:
+    """Comments on videos about one term."""
+    posts = []
+    # Step 1: Search for videos about the drug
+    search_params = {
+        "part": "snippet",
+        "q": f"{term} review experience side effects",
+        "type": "video",
+        "maxResults": min(limit_per_term // 5, 20),  # Get fewer videos, more comments per video
+        "order": "relevance",
+        "publishedAfter": published_after,
+        "key": api_key,
+    }
+    
+    search_response = _fetch_youtube_api_request(YOUTUBE_SEARCH_URL, search_params, timeout=10)
+    
+    if search_response.status_code != 200:
+        error_data = search_response.json() if search_response.text else {}
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        logger.warning(f"YouTube search API error for '{term}': {error_msg}")
+        return posts
     
-    for term in drug_terms:
-        term = term.strip()
-        if not term:
-            continue
-        
+    search_data = search_response.json()
+    video_ids = [item["id"]["videoId"] for item in search_data.get("items", [])]
+    
+    # Step 2: Get comments from each video
+    for video_id in video_ids[:10]:  # Limit to 10 videos per drug term
         try:
-            # Step 1: Search for videos about the drug
-            search_url = "https://www.googleapis.com/youtube/v3/search"
-            search_params = {
+            comments_params = {
                 "part": "snippet",
-                "q": f"{term} review experience side effects",
-                "type": "video",
-                "maxResults": min(limit_per_term // 5, 20),  # Get fewer videos, more comments per video
+                "videoId": video_id,
+                "maxResults": 50,  # Max comments per video
                 "order": "relevance",
-                "publishedAfter": published_after,
+                "textFormat": "plainText",
                 "key": api_key,
             }
             
-            search_response = _fetch_youtube_api_request(search_url, search_params, timeout=10)
-            
-            if search_response.status_code != 200:
-                error_data = search_response.json() if search_response.text else {}
-                error_msg = error_data.get("error", {}).get("message", "Unknown error")
-                st.warning(f"⚠️ YouTube search API error for '{term}': {error_msg}")
-                continue
-            
-            search_data = search_response.json()
-            video_ids = [item["id"]["videoId"] for item in search_data.get("items", [])]
+            comments_response = _fetch_youtube_api_request(YOUTUBE_COMMENTS_URL, comments_params, timeout=10)
             
-            if not video_ids:
-                continue
-            
-            # Step 2: Get comments from each video
-            for video_id in video_ids[:10]:  # Limit to 10 videos per drug term
-                try:
-                    comments_url = "https://www.googleapis.com/youtube/v3/commentThreads"
-                    comments_params = {
-                        "part": "snippet",
-                        "videoId": video_id,
-                        "maxResults": 50,  # Max comments per video
-                        "order": "relevance",
-                        "textFormat": "plainText",
-                        "key": api_key,
-                    }
-                    
-                    comments_response = _fetch_youtube_api_request(comments_url, comments_params, timeout=10)
-                    
-                    if comments_response.status_code == 200:
-                        comments_data = comments_response.json()
-                        for item in comments_data.get("items", []):
-                            snippet = item.get("snippet", {})
-                            top_level = snippet.get("topLevelComment", {}).get("snippet", {})
-                            text = top_level.get("textDisplay", "")
-                            
-                            if text and len(text) > 20:  # Filter very short comments
-                                published_at = top_level.get("publishedAt", "")
-                                # Convert ISO 8601 to Unix timestamp
-                                try:
-                                    dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                                    created_utc = int(dt.timestamp())
-                                except:
-                                    created_utc = None
-                                
-                                posts.append({
-                                    "source": "youtube",
-                                    "platform": "youtube",
-                                    "text": text,
-                                    "created_utc": created_utc,
-                                    "post_id": top_level.get("id"),
-                                    "author": top_level.get("authorDisplayName", "unknown"),
-                                    "drug_match": term,
-                                    "url": f"https://www.youtube.com/watch?v={video_id}&lc={top_level.get('id')}",
-                                    "video_id": video_id,
-                                    "video_title": search_data.get("items", [{}])[0].get("snippet", {}).get("title", ""),
-                                    "like_count": top_level.get("likeCount", 0),
-                                })
+            if comments_response.status_code == 200:
+                comments_data = comments_response.json()
+                for item in comments_data.get("items", []):
+                    snippet = item.get("snippet", {})
+                    top_level = snippet.get("topLevelComment", {}).get("snippet", {})
+                    text = top_level.get("textDisplay", "")
                     
-                    # Rate limiting - YouTube quota: 1 search = 100 units, 1 commentThread = 1 unit
-                    time.sleep(0.2)
-                    
-                except requests.exceptions.RequestException as e:
-                    # Continue to next video if one fails
-                    continue
-                except Exception as e:
-                    continue
-            
-            # Rate limiting between drug terms
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            st.warning(f"⚠️ YouTube API error for '{term}': {str(e)[:100]}")
-            continue
-        except Exception as e:
-            st.warning(f"⚠️ Error fetching YouTube data for '{term}': {str(e)[:100]}")
+                    if text and len(text) > 20:  # Filter very short comments
+                        posts.append({
+                            "source": "youtube",
+                            "platform": "youtube",
+                            "text": text,
+                            # Convert ISO 8601 to Unix timestamp
+                            "created_utc": _iso_to_utc(top_level.get("publishedAt")),
+                            "post_id": top_level.get("id"),
+                            "author": top_level.get("authorDisplayName", "unknown"),
+                            "drug_match": term,
+                            "url": f"https://www.youtube.com/watch?v={video_id}&lc={top_level.get('id')}",
+                            "video_id": video_id,
+                            "video_title": search_data.get("items", [{}])[0].get("snippet", {}).get("title", ""),
+                            "like_count": top_level.get("likeCount", 0),
+                        })
+        except Exception:
+            # Continue to next video if one fails
             continue
     
     return posts
 
 
+def _iso_to_utc(value: Optional[str]) -> Optional[int]:
+    """Unix timestamp of an ISO 8601 time (None if missing or malformed)."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    except ValueError:
+        return None
+
+
 def fetch_daily_social_posts(
     drug_terms: str,
     platforms: List[str] = None,
     limit_per_term: int = 50,
     days_back: int = 7,
+    cursors: Optional[SocialCursorStore] = None,
+    now: Optional[datetime] = None,
 ) -> List[Dict]:
     """
     Main entry point: Fetch social media posts for given drug terms.
     
+    All (platform, term) requests run concurrently, each platform within
+    its rate budget. With cursors, only posts newer than each (platform,
+    term) mark are returned; the caller advances and saves the cursors once
+    the posts are stored.
+    
     Args:
         drug_terms: Comma-separated drug names/keywords
         platforms: List of platforms to search (["reddit", "x"] or None for all)
         limit_per_term: Max posts per drug term per platform
         days_back: Days back to search
+        cursors: Optional high-water marks for incremental pulls
+        now: Reference time for days_back (default: current time)
     
     Returns:
         Combined list of posts from all platforms
     """
+    all_posts = _fetch_terms(_daily_tasks(drug_terms, platforms, limit_per_term, days_back, cursors, now), cursors)
+    
+    # Sort by timestamp (newest first)
+    all_posts.sort(
+        key=lambda x: x.get("created_utc") or 0,
+        reverse=True
+    )
+    
+    return all_posts
+
+
+def iter_social_posts(
+    drug_terms: str,
+    platforms: List[str] = None,
+    limit_per_term: int = 50,
+    days_back: int = 7,
+    cursors: Optional[SocialCursorStore] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[List[Dict]]:
+    """
+    Streaming variant of fetch_daily_social_posts.
+    
+    Yields the posts of each (platform, term) as soon as that request
+    finishes, so processing can start before the slowest term is fetched.
+    Same arguments as fetch_daily_social_posts.
+    
+    Yields:
+        Non-empty lists of posts
+    """
+    yield from _iter_fetch_terms(_daily_tasks(drug_terms, platforms, limit_per_term, days_back, cursors, now), cursors)
+
+
+def _daily_tasks(drug_terms, platforms, limit_per_term, days_back, cursors, now):
     if platforms is None:
         platforms = ["reddit"]  # Default to Reddit (no auth required)
     
     terms = [t.strip() for t in drug_terms.split(",") if t.strip()]
     
+    tasks = []
     if not terms:
-        return []
-    
-    all_posts = []
+        return tasks
     
     if "reddit" in platforms:
-        reddit_posts = fetch_reddit_posts(terms, limit_per_term, days_back)
-        all_posts.extend(reddit_posts)
+        tasks.extend(_reddit_tasks(terms, limit_per_term, days_back, cursors, now))
     
     if "x" in platforms or "twitter" in platforms:
-        x_posts = fetch_x_posts(terms, limit_per_term)
-        all_posts.extend(x_posts)
+        tasks.extend(_x_tasks(terms, limit_per_term, cursors))
     
     if "youtube" in platforms:
-        youtube_posts = fetch_youtube_comments(terms, limit_per_term, days_back)
-        all_posts.extend(youtube_posts)
+        tasks.extend(_youtube_tasks(terms, limit_per_term, days_back, now))
     
-    # Sort by timestamp (newest first)
-    all_posts.sort(
-        key=lambda x: x.get("created_utc") or 0,
-        reverse=True
-    )
-    
-    return all_posts
-
+    return tasks
@@ -4,7 +4,8 @@ Maps informal language to standardized adverse event terms.
 """
 
 import re
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
 
@@ -360,6 +361,286 @@ def extract_emoji_reactions(text: str) -> List[str]:
     return unique_mapped
 
 
+# Negation window checked before a matched term (either pattern negates it)
+NEGATION_WINDOW_CHARS = 100
+_NEGATION_RE = re.compile(
+    r'\b(no|not|never|didn\'t|doesn\'t|won\'t|isn\'t|wasn\'t|weren\'t)\s+\w*\s*$'
+    r'|\b(without|lack of|absence of)\s+',
+    re.IGNORECASE
+)
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+# (they would slip past the literal pattern prefixes)
+_CASE_FOLD_CHARS = frozenset("\u0130\u0131\u017f\u212a")
+
+# Post-level context patterns
+_DRUG_CONTEXT_RE = re.compile(
+    r'\b(took|taking|on|using|started|stopped)\s+\w+'
+    r'|\b(drug|medication|medicine|prescription)\b'
+)
+_OVERALL_NEGATION_RE = re.compile(
+    r'\b(no|not|never|didn\'t|doesn\'t|won\'t|isn\'t)\s+(side\s+effects?|adverse|reactions?)'
+)
+
+
+class ReactionMatcher:
+    """
+    Precompiled matcher for SLANG_MAP and PATTERN_MAP.
+    
+    Slang keys and the literal prefix of each pattern are compiled into one
+    Aho-Corasick automaton (term_index.ContainmentAutomaton), so a single
+    pass over the post finds the first occurrence of every slang key and the
+    candidate start positions of every pattern; patterns are then only tried
+    at those positions. Results are identical to testing each key with `in`
+    and each pattern with re.search, in map order.
+    """
+    
+    def __init__(self, slang_map: Dict[str, str], pattern_map: List[Tuple[str, str]]):
+        """
+        Build the automaton and pattern regexes.
+        
+        Args:
+            slang_map: Slang term -> reaction (iteration order is priority order)
+            pattern_map: List of (regex, reaction) in priority order
+        """
+        self.slang_terms = list(slang_map.keys())
+        self.slang_reactions = list(slang_map.values())
+        self.pattern_sources = [pattern for pattern, _ in pattern_map]
+        self.pattern_reactions = [reaction for _, reaction in pattern_map]
+        self._patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.pattern_sources]
+        
+        # Automaton terms: slang keys, then distinct pattern prefixes
+        self._pattern_anchors = [_literal_prefix(pattern) for pattern in self.pattern_sources]
+        anchors = sorted({anchor for anchor in self._pattern_anchors if anchor})
+        self._anchor_ids = {anchor: len(self.slang_terms) + i for i, anchor in enumerate(anchors)}
+        # Imported here: src.normalization imports this module at package import
+        from src.normalization.term_index import ContainmentAutomaton
+        self._automaton = ContainmentAutomaton(self.slang_terms + anchors)
+        
+        # Exact fallback for texts where IGNORECASE lets non-ASCII characters
+        # match a prefix: zero-width alternation tried at every position,
+        # reporting the first pattern matching there by group name
+        self._pattern_scan = re.compile(
+            "(?=" + "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self.pattern_sources)) + ")",
+            re.IGNORECASE
+        ) if self.pattern_sources else None
+    
+    def _scan(self, text_lower: str) -> Tuple[Dict[int, int], Dict[int, List[int]]]:
+        """
+        Run the automaton over a lowercased text.
+        
+        Returns:
+            Tuple of (slang index -> first start position,
+                      anchor term id -> all start positions)
+        """
+        term_lengths = self._automaton.term_lengths
+        slang_count = len(self.slang_terms)
+        first: Dict[int, int] = {}
+        anchors: Dict[int, List[int]] = {}
+        for end, term_ids in self._automaton.iter_matches(text_lower):
+            for index in term_ids:
+                if index >= slang_count:
+                    anchors.setdefault(index, []).append(end - term_lengths[index])
+                elif index not in first:
+                    first[index] = end - term_lengths[index]
+        return first, anchors
+    
+    def find_slang(self, text_lower: str) -> Dict[int, int]:
+        """
+        Find the slang keys occurring in a lowercased text.
+        
+        Args:
+            text_lower: Lowercased post text
+            
+        Returns:
+            Dictionary mapping slang index to its first start position
+            (same position as text_lower.find(term))
+        """
+        return self._scan(text_lower)[0]
+    
+    def find_patterns(self, text_lower: str, anchor_hits: Optional[Dict[int, List[int]]] = None) -> List[int]:
+        """
+        Find the PATTERN_MAP entries that match a lowercased text.
+        
+        Args:
+            text_lower: Lowercased post text
+            anchor_hits: Prefix positions from _scan (computed if None)
+            
+        Returns:
+            Sorted list of matching pattern indices
+        """
+        if not self._patterns:
+            return []
+        if not _CASE_FOLD_CHARS.isdisjoint(text_lower):
+            return self._find_patterns_by_scan(text_lower)
+        if anchor_hits is None:
+            anchor_hits = self._scan(text_lower)[1]
+        
+        found = []
+        for index, pattern in enumerate(self._patterns):
+            anchor = self._pattern_anchors[index]
+            if not anchor:
+                if pattern.search(text_lower):
+                    found.append(index)
+            elif any(pattern.match(text_lower, position) for position in anchor_hits.get(self._anchor_ids[anchor], ())):
+                found.append(index)
+        return found
+    
+    def _find_patterns_by_scan(self, text_lower: str) -> List[int]:
+        """Find matching patterns with the combined regex (no prefix filter)."""
+        found = set()
+        for match in self._pattern_scan.finditer(text_lower):
+            index = int(match.lastgroup[1:])
+            found.add(index)
+            # Later patterns starting at the same position are shadowed by the
+            # alternation, so check them directly
+            for other in range(index + 1, len(self._patterns)):
+                if other not in found and self._patterns[other].match(text_lower, match.start()):
+                    found.add(other)
+        return sorted(found)
+    
+    def extract(self, text: str, return_confidence: bool = False) -> Union[List[Tuple[str, float]], List[str]]:
+        """
+        Extract multiple adverse events from a single post.
+        
+        See extract_multiple_reactions.
+        """
+        all_reactions = self._score(text)
+        
+        # Convert to list format
+        if return_confidence:
+            return [(reaction, conf) for reaction, conf in sorted(all_reactions.items(), key=lambda x: x[1], reverse=True)]
+        else:
+            return list(all_reactions.keys())
+    
+    def _score(self, text: str) -> Dict[str, float]:
+        """Reactions of a post with their confidence, in detection order."""
+        if not text or not isinstance(text, str):
+            return {}
+        
+        text_lower = text.lower()
+        all_reactions = {}  # Dict to store unique reactions with their max confidence
+        negated = {}  # Term start position -> negation (one window check per position)
+        
+        def is_negated(position: int) -> bool:
+            if position not in negated:
+                negated[position] = _is_negated_at(text_lower, position)
+            return negated[position]
+        
+        # 1. Extract emoji-based reactions (all mapped emojis are non-ASCII)
+        if not text.isascii():
+            for reaction in extract_emoji_reactions(text):
+                if reaction not in all_reactions:
+                    all_reactions[reaction] = 0.85  # Emoji = high confidence
+        
+        # 2. Extract slang-based reactions (in SLANG_MAP order)
+        slang_positions, anchor_hits = self._scan(text_lower)
+        for index in sorted(slang_positions):
+            if is_negated(slang_positions[index]):
+                continue  # Skip negated reactions
+            mapped_reaction = self.slang_reactions[index]
+            if all_reactions.get(mapped_reaction, 0.0) < 0.9:
+                all_reactions[mapped_reaction] = 0.9  # Exact slang match = high confidence
+        
+        # 3. Extract pattern-based reactions (negation is looked up by the pattern text, as before)
+        for index in self.find_patterns(text_lower, anchor_hits):
+            position = text_lower.find(self.pattern_sources[index])
+            if position != -1 and is_negated(position):
+                continue
+            mapped_reaction = self.pattern_reactions[index]
+            if all_reactions.get(mapped_reaction, 0.0) < 0.7:
+                all_reactions[mapped_reaction] = 0.7  # Pattern match = medium confidence
+        
+        # 4. Boost confidence if drug context present
+        if all_reactions and _DRUG_CONTEXT_RE.search(text_lower):
+            for reaction in all_reactions:
+                all_reactions[reaction] = min(1.0, all_reactions[reaction] + 0.1)
+        
+        # 5. Reduce confidence if overall negation detected
+        if all_reactions and _OVERALL_NEGATION_RE.search(text_lower):
+            for reaction in all_reactions:
+                all_reactions[reaction] = max(0.2, all_reactions[reaction] - 0.3)
+        
+        return all_reactions
+    
+    def extract_batch(self, texts: Iterable[Any], return_confidence: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Extract reactions for a column of posts.
+        
+        Duplicate texts (reposts, retweets) are matched once.
+        
+        Args:
+            texts: Iterable of post texts (e.g. df["text"])
+            return_confidence: If True, reactions are ordered by confidence
+                               as in extract_multiple_reactions(..., True)
+                               
+        Returns:
+            Dictionary of columnar arrays:
+            - offsets: int64 array (n + 1); post i owns entries offsets[i]:offsets[i + 1]
+            - reaction: object array of reaction terms
+            - confidence: float64 array aligned with reaction
+            - max_confidence: float64 array (n), 0.0 for posts without reactions
+        """
+        results: Dict[Any, List[Tuple[str, float]]] = {}
+        offsets = [0]
+        reactions: List[str] = []
+        confidences: List[float] = []
+        max_confidences: List[float] = []
+        
+        for text in texts:
+            result = results.get(text) if isinstance(text, str) else None
+            if result is None:
+                scores = self._score(text)
+                if return_confidence:
+                    result = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+                else:
+                    result = list(scores.items())
+                if isinstance(text, str):
+                    results[text] = result
+            
+            for reaction, conf in result:
+                reactions.append(reaction)
+                confidences.append(conf)
+            max_confidences.append(max((conf for _, conf in result), default=0.0))
+            offsets.append(len(reactions))
+        
+        return {
+            "offsets": np.asarray(offsets, dtype=np.int64),
+            "reaction": np.asarray(reactions, dtype=object),
+            "confidence": np.asarray(confidences, dtype=np.float64),
+            "max_confidence": np.asarray(max_confidences, dtype=np.float64),
+        }
+
+
+_MATCHER: Optional[ReactionMatcher] = None
+
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    Lowercase literal text every match of a pattern starts with ('' if none).
+    
+    Args:
+        pattern: Regex such as r"\\bpuked?\\b" (prefix "puke")
+        
+    Returns:
+        Literal prefix following a leading word boundary
+    """
+    body = pattern[2:] if pattern.startswith("\\b") else pattern
+    match = re.match(r"[A-Za-z0-9 ]+", body)
+    prefix = match.group(0) if match else ""
+    if prefix and body[len(prefix):len(prefix) + 1] in ("?", "*", "{"):
+        prefix = prefix[:-1]  # Last character is optional
+    return prefix.lower()
+
+
+def get_reaction_matcher() -> ReactionMatcher:
+    """Get the shared matcher for SLANG_MAP / PATTERN_MAP (built on first use)."""
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = ReactionMatcher(SLANG_MAP, PATTERN_MAP)
+    return _MATCHER
+
+
 def extract_multiple_reactions(text: str, return_confidence: bool = False) -> Union[List[Tuple[str, float]], List[str]]:
     """
     Extract multiple adverse events from a single post.
@@ -375,64 +656,26 @@ def extract_multiple_reactions(text: str, return_confidence: bool = False) -> Un
     Args:
         text: Social media post text
         return_confidence: If True, returns list of (reaction, confidence) tuples
-    
+        
     Returns:
         List of standardized reaction terms, or list of (reaction, confidence) tuples
     """
-    if not text or not isinstance(text, str):
-        return [] if not return_confidence else []
-    
-    text_lower = text.lower()
-    all_reactions = {}  # Dict to store unique reactions with their max confidence
-    
-    # 1. Extract emoji-based reactions
-    emoji_reactions = extract_emoji_reactions(text)
-    for reaction in emoji_reactions:
-        if reaction not in all_reactions:
-            all_reactions[reaction] = 0.85  # Emoji = high confidence
-    
-    # 2. Extract slang-based reactions (check all matches, not just first)
-    for slang, mapped_reaction in SLANG_MAP.items():
-        if slang in text_lower:
-            # Check if this is negated
-            if _is_negated(text_lower, slang):
-                continue  # Skip negated reactions
-            if mapped_reaction not in all_reactions:
-                all_reactions[mapped_reaction] = 0.9  # Exact slang match = high confidence
-            elif all_reactions[mapped_reaction] < 0.9:
-                all_reactions[mapped_reaction] = 0.9
+    return get_reaction_matcher().extract(text, return_confidence=return_confidence)
+
+
+def extract_reactions_batch(texts: Iterable[Any], return_confidence: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Extract multiple adverse events for a column of posts.
     
-    # 3. Extract pattern-based reactions
-    for pattern, mapped_reaction in PATTERN_MAP:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            if _is_negated(text_lower, pattern):
-                continue
-            if mapped_reaction not in all_reactions:
-                all_reactions[mapped_reaction] = 0.7  # Pattern match = medium confidence
-            elif all_reactions[mapped_reaction] < 0.7:
-                all_reactions[mapped_reaction] = 0.7
-    
-    # 4. Boost confidence if drug context present
-    drug_indicators = [
-        r'\b(took|taking|on|using|started|stopped)\s+\w+',
-        r'\b(drug|medication|medicine|prescription)\b',
-    ]
-    has_drug_context = any(re.search(indicator, text_lower) for indicator in drug_indicators)
-    if has_drug_context:
-        for reaction in all_reactions:
-            all_reactions[reaction] = min(1.0, all_reactions[reaction] + 0.1)
-    
-    # 5. Reduce confidence if overall negation detected
-    overall_negation = re.search(r'\b(no|not|never|didn\'t|doesn\'t|won\'t|isn\'t)\s+(side\s+effects?|adverse|reactions?)', text_lower)
-    if overall_negation:
-        for reaction in all_reactions:
-            all_reactions[reaction] = max(0.2, all_reactions[reaction] - 0.3)
-    
-    # Convert to list format
-    if return_confidence:
-        return [(reaction, conf) for reaction, conf in sorted(all_reactions.items(), key=lambda x: x[1], reverse=True)]
-    else:
-        return list(all_reactions.keys())
+    Args:
+        texts: Iterable of post texts (e.g. df["text"])
+        return_confidence: If True, reactions are ordered by confidence
+        
+    Returns:
+        Dictionary of columnar arrays (offsets, reaction, confidence, max_confidence);
+        see ReactionMatcher.extract_batch
+    """
+    return get_reaction_matcher().extract_batch(texts, return_confidence=return_confidence)
 
 
 def _is_negated(text: str, term: str) -> bool:
@@ -442,27 +685,22 @@ def _is_negated(text: str, term: str) -> bool:
     Args:
         text: Lowercase text
         term: Term to check for negation
-    
+        
     Returns:
         True if term appears to be negated
     """
     # Find position of term
-    term_pos = text.find(term)
+    return _is_negated_at(text, text.find(term))
+
+
+def _is_negated_at(text: str, term_pos: int) -> bool:
+    """Check for negation words in the window before a term position (-1 = not found)."""
     if term_pos == -1:
         return False
     
     # Check for negation words before the term (within 10 words)
-    before_text = text[max(0, term_pos - 100):term_pos]
-    negation_patterns = [
-        r'\b(no|not|never|didn\'t|doesn\'t|won\'t|isn\'t|wasn\'t|weren\'t)\s+\w*\s*$',
-        r'\b(without|lack of|absence of)\s+',
-    ]
-    
-    for pattern in negation_patterns:
-        if re.search(pattern, before_text, re.IGNORECASE):
-            return True
-    
-    return False
+    before_text = text[max(0, term_pos - NEGATION_WINDOW_CHARS):term_pos]
+    return _NEGATION_RE.search(before_text) is not None
 
 
 def map_slang_to_reaction(text: str, return_confidence: bool = False) -> Union[Tuple[Optional[str], float], Optional[str]]:
@@ -472,7 +710,7 @@ def map_slang_to_reaction(text: str, return_confidence: bool = False) -> Union[T
     Args:
         text: Social media post text
         return_confidence: If True, returns (reaction, confidence_score) tuple
-    
+        
     Returns:
         Standardized reaction term or (reaction, confidence) tuple
         Confidence score: 0.0-1.0 (1.0 = high confidence, 0.6 = medium, 0.3 = low)
@@ -490,22 +728,21 @@ def map_slang_to_reaction(text: str, return_confidence: bool = False) -> Union[T
         reaction = emoji_reactions[0]  # Take first emoji reaction
         confidence = 0.85  # Emoji detection = high confidence
     
-    # Then check exact slang matches (highest confidence)
+    # Then check exact slang matches (highest confidence, first key in SLANG_MAP order)
+    matcher = get_reaction_matcher()
     if not reaction:
-        for slang, mapped_reaction in SLANG_MAP.items():
-            if slang in text_lower:
-                # Exact match = high confidence
-                reaction = mapped_reaction
-                confidence = 0.9
-                break
+        slang_positions = matcher.find_slang(text_lower)
+        if slang_positions:
+            # Exact match = high confidence
+            reaction = matcher.slang_reactions[min(slang_positions)]
+            confidence = 0.9
     
     # Then check pattern matches (medium confidence)
     if not reaction:
-        for pattern, mapped_reaction in PATTERN_MAP:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                reaction = mapped_reaction
-                confidence = 0.7  # Pattern match = medium confidence
-                break
+        pattern_hits = matcher.find_patterns(text_lower)
+        if pattern_hits:
+            reaction = matcher.pattern_reactions[pattern_hits[0]]
+            confidence = 0.7  # Pattern match = medium confidence
     
     # If emoji reactions found but no text reaction, use emoji reaction
     if not reaction and emoji_reactions:
@@ -546,7 +783,7 @@ def extract_reactions_from_posts(df: pd.DataFrame, include_confidence: bool = Tr
         df: DataFrame with cleaned posts (from social_cleaner)
         include_confidence: If True, adds confidence_score column
         multi_ae: If True, extracts multiple reactions per post (default: True)
-    
+        
     Returns:
         DataFrame with added 'reaction' (or 'reactions' if multi_ae=True) and optionally 'confidence_score' columns
     """
@@ -555,30 +792,21 @@ def extract_reactions_from_posts(df: pd.DataFrame, include_confidence: bool = Tr
     
     if multi_ae:
         # Multi-AE extraction mode
-        reactions_list = []
-        confidence_scores = []
-        max_confidence_scores = []
+        batch = extract_reactions_batch(
+            (str(text) for text in df["text"]), return_confidence=include_confidence
+        )
+        offsets = batch["offsets"].tolist()
+        reactions_flat = batch["reaction"].tolist()
+        confidences_flat = batch["confidence"].tolist()
         
-        for text in df["text"]:
-            result = extract_multiple_reactions(str(text), return_confidence=include_confidence)
-            
-            if include_confidence and result:
-                # result is list of (reaction, confidence) tuples
-                reactions_with_conf = result
-                reactions = [r[0] for r in reactions_with_conf]
-                confidences = [r[1] for r in reactions_with_conf]
-                reactions_list.append(reactions)
-                confidence_scores.append(confidences)
-                max_confidence_scores.append(max(confidences) if confidences else 0.0)
-            elif result:
-                # result is list of reaction strings
-                reactions_list.append(result)
-                confidence_scores.append([])
-                max_confidence_scores.append(0.0)
-            else:
-                reactions_list.append([])
-                confidence_scores.append([])
-                max_confidence_scores.append(0.0)
+        reactions_list = [reactions_flat[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+        confidence_scores = [
+            confidences_flat[start:end] if include_confidence else []
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        max_confidence_scores = (
+            batch["max_confidence"].tolist() if include_confidence else [0.0] * len(reactions_list)
+        )
         
         # Store as JSON-serializable format (list of strings)
         df["reactions"] = reactions_list
@@ -629,7 +857,7 @@ def get_reaction_summary(df: pd.DataFrame, multi_ae: bool = True) -> Dict[str, i
     Args:
         df: DataFrame with reactions mapped
         multi_ae: If True, uses 'reactions' column (list), else uses 'reaction' column
-    
+        
     Returns:
         Dictionary mapping reaction terms to counts
     """
@@ -665,7 +893,7 @@ def normalize_to_meddra(reaction: str) -> Optional[str]:
     
     Args:
         reaction: Standardized reaction term
-    
+        
     Returns:
         MedDRA PT or original term if not found
     """
@@ -694,5 +922,13 @@ def normalize_to_meddra(reaction: str) -> Optional[str]:
         "insomnia": "Insomnia",
     }
     
-    return meddra_mapping.get(reaction.lower(), reaction)
+    if reaction.lower() in meddra_mapping:
+        return meddra_mapping[reaction.lower()]
+    
+    # Fall back to the shared MedDRA-like term index (exact or contained synonym)
+    try:
+        from src.normalization.term_index import get_term_index
+    except ImportError:
+        return reaction
+    return get_term_index().lookup_pt(reaction) or reaction
 
@@ -0,0 +1,352 @@
+"""
+Background job queue for Social AE pulls.
+
+A pull is submitted as a job and runs on a small worker pool. Inside a job
+the stages form a streaming batch pipeline: posts arrive from the
+concurrent fetch as each (platform, term) completes, and are cut into
+batches that go through clean -> extract reactions -> anonymize -> store
+while the remaining terms are still being fetched. Each job records its
+progress and per-stage timings. A trigger for a watchlist that already has
+a queued or running job returns that job instead of starting another.
+
+The fetch cursors of a (platform, term) advance as soon as all of its posts
+are stored, so a job failing midway does not re-store finished terms on the
+next trigger. Posts are claimed by (platform, post_id) before they are
+stored, so concurrent jobs with overlapping watchlists store each post once.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .social_anonymizer import anonymize_posts
+from .social_cleaner import clean_and_normalize_posts
+from .social_cursors import SocialCursorStore, get_cursor_store
+from .social_fetcher import iter_social_posts
+from .social_mapper import extract_reactions_from_posts
+from .social_storage import store_social_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_BATCH_SIZE = 200
+MAX_FINISHED_JOBS = 200
+# (platform, post_id) claims remembered across jobs
+MAX_CLAIMED_POSTS = 100_000
+
+STAGES = ("fetch", "clean", "extract", "anonymize", "store")
+ACTIVE_STATUSES = ("queued", "running")
+
+
+@dataclass
+class StageMetrics:
+    """Time spent in a stage and the items it produced."""
+    seconds: float = 0.0
+    items: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": round(self.seconds, 3),
+            "items": self.items,
+            "items_per_sec": round(self.items / self.seconds, 2) if self.seconds > 0 else None,
+        }
+
+
+@dataclass
+class PullJob:
+    """State of one social pull."""
+    job_id: str
+    watchlist_key: str
+    drug_terms: List[str]
+    platforms: List[str]
+    limit_per_term: int
+    days_back: int
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    batches: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: {
+        "posts_fetched": 0,
+        "posts_cleaned": 0,
+        "posts_with_reactions": 0,
+        "posts_stored": 0,
+        "posts_errors": 0,
+    })
+    stages: Dict[str, StageMetrics] = field(default_factory=lambda: {stage: StageMetrics() for stage in STAGES})
+    error: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, stage: str, seconds: float, items: int) -> None:
+        with self._lock:
+            metrics = self.stages[stage]
+            metrics.seconds += seconds
+            metrics.items += items
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                self.counts[name] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "drug_terms": list(self.drug_terms),
+                "platforms": list(self.platforms),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "batches": self.batches,
+                **self.counts,
+                # Alias kept for callers of the former synchronous endpoint
+                "inserted": self.counts["posts_stored"],
+                "stages": {stage: metrics.to_dict() for stage, metrics in self.stages.items()},
+                "error": self.error,
+            }
+
+
+class SocialPullJobQueue:
+    """
+    Runs social pulls as background jobs.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cursors: Optional[SocialCursorStore] = None
+    ):
+        """
+        Args:
+            max_workers: Jobs running at the same time
+            batch_size: Posts per pipeline batch
+            cursors: Fetch cursors (default: the shared API sink store)
+        """
+        self.batch_size = max(1, int(batch_size))
+        self.cursors = cursors
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="social-pull")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, PullJob]" = OrderedDict()
+        self._active: Dict[str, str] = {}
+        self._claimed: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+    def submit(
+        self,
+        drug_terms: List[str],
+        platforms: List[str],
+        limit_per_term: int = 50,
+        days_back: int = 1
+    ) -> Tuple[PullJob, bool]:
+        """
+        Queue a pull, or return the queued/running job for the same watchlist.
+
+        Returns:
+            Tuple of (job, created) where created is False for a de-duplicated trigger
+        """
+        terms = [term.strip() for term in drug_terms if term and term.strip()]
+        key = watchlist_key(terms, platforms)
+        with self._lock:
+            active_id = self._active.get(key)
+            if active_id is not None:
+                return self._jobs[active_id], False
+
+            job = PullJob(
+                job_id=uuid.uuid4().hex,
+                watchlist_key=key,
+                drug_terms=terms,
+                platforms=list(platforms),
+                limit_per_term=limit_per_term,
+                days_back=days_back,
+            )
+            self._jobs[job.job_id] = job
+            self._active[key] = job.job_id
+            self._evict_finished()
+        self._pool.submit(self._run, job)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[PullJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[PullJob]:
+        """Known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Job counts by status and stage throughput over succeeded jobs."""
+        jobs = self.jobs()
+        by_status: Dict[str, int] = {}
+        totals = {stage: StageMetrics() for stage in STAGES}
+        for job in jobs:
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+            if job.status == "succeeded":
+                for stage, metrics in job.stages.items():
+                    totals[stage].seconds += metrics.seconds
+                    totals[stage].items += metrics.items
+        return {
+            "jobs": by_status,
+            "stages": {stage: metrics.to_dict() for stage, metrics in totals.items()},
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _evict_finished(self) -> None:
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status not in ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    # ---------------------------
+    # Pipeline
+    # ---------------------------
+    def _run(self, job: PullJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        cursors = self.cursors or get_cursor_store("api")
+        # (platform, term) -> its fetched posts, and how many are not stored yet
+        arrived: Dict[Tuple[str, str], List[Dict]] = {}
+        unstored: Dict[Tuple[str, str], int] = {}
+        try:
+            for batch in self._batches(job, cursors, arrived):
+                posts = self._claim(batch)
+                try:
+                    self._process_batch(job, posts)
+                except BaseException:
+                    self._release(posts)
+                    raise
+                # A term's cursor moves once all of its posts are stored
+                stored_terms = []
+                for post in batch:
+                    key = _term_key(post)
+                    unstored[key] = unstored.get(key, len(arrived[key])) - 1
+                    if unstored[key] == 0:
+                        stored_terms.append(key)
+                if stored_terms:
+                    for key in stored_terms:
+                        cursors.advance(arrived.pop(key))
+                    cursors.save()
+            job.status = "succeeded"
+        except Exception as e:
+            logger.error(f"Social pull job {job.job_id} failed: {str(e)}", exc_info=True)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            with self._lock:
+                if self._active.get(job.watchlist_key) == job.job_id:
+                    del self._active[job.watchlist_key]
+
+    def _claim(self, posts: List[Dict]) -> List[Dict]:
+        """Posts not yet claimed by any job, claimed now (posts without an id always pass)."""
+        fresh = []
+        with self._lock:
+            for post in posts:
+                if post.get("post_id") is None:
+                    fresh.append(post)
+                    continue
+                key = (post.get("source"), str(post["post_id"]))
+                if key in self._claimed:
+                    continue
+                self._claimed[key] = None
+                fresh.append(post)
+            while len(self._claimed) > MAX_CLAIMED_POSTS:
+                self._claimed.popitem(last=False)
+        return fresh
+
+    def _release(self, posts: List[Dict]) -> None:
+        """Drop the claims of posts that could not be stored."""
+        with self._lock:
+            for post in posts:
+                if post.get("post_id") is not None:
+                    self._claimed.pop((post.get("source"), str(post["post_id"])), None)
+
+    def _batches(
+        self,
+        job: PullJob,
+        cursors: SocialCursorStore,
+        arrived: Dict[Tuple[str, str], List[Dict]]
+    ) -> Iterator[List[Dict]]:
+        """Fetched posts cut into batch_size batches as they arrive (recorded per term in arrived)."""
+        pending: List[Dict] = []
+        started = time.monotonic()
+        for posts in iter_social_posts(
+            ", ".join(job.drug_terms),
+            platforms=job.platforms,
+            limit_per_term=job.limit_per_term,
+            days_back=job.days_back,
+            cursors=cursors,
+        ):
+            job.add(posts_fetched=len(posts))
+            for post in posts:
+                arrived.setdefault(_term_key(post), []).append(post)
+            pending.extend(posts)
+            while len(pending) >= self.batch_size:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                yield batch
+        # Fetch stage: wall time until the last term arrived (overlaps the other stages)
+        job.record("fetch", time.monotonic() - started, job.counts["posts_fetched"])
+        if pending:
+            yield pending
+
+    def _process_batch(self, job: PullJob, posts: List[Dict]) -> None:
+        start = time.monotonic()
+        cleaned_df = clean_and_normalize_posts(posts, use_ml=False)  # ML optional for speed
+        job.record("clean", time.monotonic() - start, len(cleaned_df))
+        job.add(posts_cleaned=len(cleaned_df))
+        if cleaned_df.empty:
+            job.batches += 1
+            return
+
+        start = time.monotonic()
+        df_with_reactions = extract_reactions_from_posts(cleaned_df, include_confidence=True)
+        job.record("extract", time.monotonic() - start, len(df_with_reactions))
+        if "has_reaction" in df_with_reactions.columns:
+            job.add(posts_with_reactions=int(df_with_reactions["has_reaction"].sum()))
+
+        start = time.monotonic()
+        df_final = pd.DataFrame(anonymize_posts(df_with_reactions.to_dict("records")))
+        job.record("anonymize", time.monotonic() - start, len(df_final))
+
+        start = time.monotonic()
+        storage_result = store_social_records(df_final)
+        job.record("store", time.monotonic() - start, storage_result["inserted"])
+        job.add(posts_stored=storage_result["inserted"], posts_errors=storage_result["errors"])
+        job.batches += 1
+
+
+def _term_key(post: Dict) -> Tuple[str, str]:
+    """(platform, term) a fetched post belongs to."""
+    return post.get("source"), post.get("drug_match")
+
+
+def watchlist_key(drug_terms: List[str], platforms: List[str]) -> str:
+    """Identity of a watchlist pull (order- and case-insensitive)."""
+    terms = ",".join(sorted({term.strip().lower() for term in drug_terms if term and term.strip()}))
+    names = ",".join(sorted({platform.strip().lower() for platform in platforms}))
+    return hashlib.sha1(f"{terms}|{names}".encode()).hexdigest()
+
+
+_queue: Optional[SocialPullJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_pull_queue() -> SocialPullJobQueue:
+    """Process-wide social pull job queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = SocialPullJobQueue()
+        return _queue
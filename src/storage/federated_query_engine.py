@@ -283,9 +283,32 @@ class FederatedQueryEngine:
                 logger.error(f"Error in semantic search: {str(e)}")
                 return pd.DataFrame()
         else:
-            # SQLite doesn't support vector search natively
-            # Fallback to keyword search
-            return self.query(query_text=query_text, drug=drug, limit=k)
+            # SQLite has no vector search - use the local ANN index next to the database
+            try:
+                index = self.storage.vector_index()
+            except Exception as e:
+                logger.error(f"Error opening vector index: {str(e)}")
+                index = None
+            if index is None or len(index) == 0:
+                # No stored embeddings - fallback to keyword search
+                return self.query(query_text=query_text, drug=drug, limit=k)
+            
+            hits = index.search(embedding, k=k, drug=self._normalize_drug(drug) if drug else None)
+            if not hits:
+                return pd.DataFrame()
+            
+            ae_ids = [ae_id for ae_id, _ in hits]
+            placeholders = ", ".join(["?"] * len(ae_ids))
+            df = self._execute_sqlite_query(
+                f"SELECT * FROM ae_events WHERE ae_id IN ({placeholders})", ae_ids
+            )
+            if df.empty:
+                return df
+            
+            similarity = dict(hits)
+            df = df.drop(columns=["embedding_vector"], errors="ignore")
+            df["similarity"] = df["ae_id"].map(similarity)
+            return df.sort_values("similarity", ascending=False).reset_index(drop=True)
     
     def get_drug_reaction_summary(
         self,
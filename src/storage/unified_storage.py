@@ -6,13 +6,33 @@ Combines PostgreSQL (structured), Vector Store (embeddings), and Document Store
 import pandas as pd
 import sqlite3
 import json
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import uuid
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterable, Callable, Tuple
 from pathlib import Path
 from datetime import datetime
 import logging
 
+import numpy as np
+
+from .vector_index import LocalVectorIndex, get_vector_index
+
 logger = logging.getLogger(__name__)
 
+# Events per governance pass / SQLite transaction / Supabase request
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_SUPABASE_CHUNK_SIZE = 500
+
+_JSON_FIELDS = ("seriousness_flags", "metadata")
+_DATE_FIELDS = ("event_date", "report_date", "fetched_at", "created_at", "updated_at")
+
+# One WAL-mode connection (plus write lock) per SQLite file, shared by all engines
+_connections: Dict[str, Tuple[sqlite3.Connection, threading.Lock]] = {}
+_connections_lock = threading.Lock()
+_novelty_engine = None
+
 # Try to import Supabase for cloud storage
 try:
     from supabase import create_client
@@ -51,6 +71,96 @@ class UnifiedStorageEngine:
             self._ensure_db_directory()
             self._create_tables_if_needed()
     
+    def _connection(self) -> Tuple[sqlite3.Connection, threading.Lock]:
+        """Pooled connection for db_path (WAL journal, NORMAL sync) and its write lock."""
+        key = str(Path(self.db_path).resolve())
+        with _connections_lock:
+            entry = _connections.get(key)
+            if entry is None:
+                conn = sqlite3.connect(key, check_same_thread=False, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                entry = (conn, threading.Lock())
+                _connections[key] = entry
+            return entry
+    
+    def _ae_columns(self) -> List[str]:
+        """Column names of the ae_events table."""
+        if getattr(self, "_ae_event_columns", None) is None:
+            conn, lock = self._connection()
+            with lock:
+                rows = conn.execute("PRAGMA table_info(ae_events)").fetchall()
+            self._ae_event_columns = [row[1] for row in rows]
+        return self._ae_event_columns
+    
+    def vector_index(self, sync: bool = True) -> LocalVectorIndex:
+        """
+        Local ANN index over ae_events embeddings (SQLite backend).
+        
+        The index lives next to the database (<db stem>_vectors/) and is shared
+        by all engines for the same file. With sync=True it is rebuilt from
+        ae_events once per process if its size disagrees with the table.
+        
+        Args:
+            sync: Check the index against ae_events before returning it
+        
+        Returns:
+            LocalVectorIndex
+        """
+        db_path = Path(self.db_path)
+        index = get_vector_index(db_path.parent / f"{db_path.stem}_vectors")
+        if sync and not index.synced:
+            with index._lock:
+                if not index.synced:
+                    self._sync_vector_index(index)
+                    index.synced = True
+        return index
+    
+    def _sync_vector_index(self, index: LocalVectorIndex, chunk_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """Rebuild the vector index from ae_events if the row counts differ."""
+        conn, lock = self._connection()
+        # Writers index their rows after releasing the connection lock, so
+        # holding it here keeps the table stable without deadlocking them
+        with lock:
+            expected = conn.execute(
+                "SELECT COUNT(*) FROM ae_events WHERE embedding_vector IS NOT NULL"
+            ).fetchone()[0]
+            if expected == len(index):
+                return
+            
+            logger.info(f"Rebuilding vector index from {expected} stored embeddings")
+            index.reset()
+            cursor = conn.execute(
+                "SELECT ae_id, drug_normalized, embedding_vector FROM ae_events WHERE embedding_vector IS NOT NULL"
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                ae_ids, drugs, vectors = [], [], []
+                for ae_id, drug, embedding_json in rows:
+                    try:
+                        vectors.append(json.loads(embedding_json))
+                    except (TypeError, ValueError):
+                        continue
+                    ae_ids.append(ae_id)
+                    drugs.append(drug)
+                self._add_vectors(index, ae_ids, drugs, vectors)
+    
+    @staticmethod
+    def _add_vectors(index: LocalVectorIndex, ae_ids: List[str], drugs: List[Optional[str]], vectors: List) -> None:
+        """Add vectors to the index, grouped by dimension (malformed vectors are skipped)."""
+        by_dim: Dict[int, List[int]] = {}
+        for i, vector in enumerate(vectors):
+            if isinstance(vector, (list, tuple, np.ndarray)) and len(vector) > 0:
+                by_dim.setdefault(len(vector), []).append(i)
+        for positions in by_dim.values():
+            index.add(
+                [ae_ids[i] for i in positions],
+                [drugs[i] for i in positions],
+                np.asarray([vectors[i] for i in positions], dtype=np.float32)
+            )
+    
     def _ensure_db_directory(self):
         """Ensure database directory exists."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -172,65 +282,129 @@ class UnifiedStorageEngine:
         Returns:
             AE ID
         """
-        import uuid
+        embeddings = [embedding] if embedding is not None else None
+        return self.store_ae_events_batch([event], embeddings)[0]
+    
+    def store_ae_events_batch(
+        self,
+        events: Iterable[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        supabase_chunk_size: int = DEFAULT_SUPABASE_CHUNK_SIZE,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ) -> List[str]:
+        """
+        Store multiple AE events in batch.
         
-        ae_id = event.get("ae_id") or str(uuid.uuid4())
-        event["ae_id"] = ae_id
+        Events are consumed batch_size at a time, so a generator is never
+        materialized and the producer is held back while a batch is written.
+        Each batch is scored by evidence governance in one pass, then written
+        in a single SQLite transaction (executemany on the pooled WAL
+        connection) or as bulk Supabase upserts of supabase_chunk_size rows.
+        On both backends an event whose ae_id is already stored replaces it.
+        Failed Supabase requests are retried with exponential backoff.
         
-        # Track storage stage (governance integration)
+        Args:
+            events: AE event dictionaries (list or any iterable)
+            embeddings: Optional list of embedding vectors (aligned with events)
+            batch_size: Events per governance pass / transaction
+            supabase_chunk_size: Rows per Supabase upsert request
+            max_retries: Retries per Supabase request
+            retry_backoff: Initial retry delay in seconds (doubled per retry)
+            progress_callback: Optional callback(events_stored_so_far)
+        
+        Returns:
+            List of AE IDs
+        """
+        ae_ids: List[str] = []
+        iterator = iter(events)
+        
+        while True:
+            batch = list(islice(iterator, max(1, batch_size)))
+            if not batch:
+                break
+            
+            offset = len(ae_ids)
+            batch_embeddings = [
+                embeddings[i] if embeddings is not None and i < len(embeddings) else None
+                for i in range(offset, offset + len(batch))
+            ]
+            
+            for event in batch:
+                event["ae_id"] = event.get("ae_id") or str(uuid.uuid4())
+            
+            # Track storage stage (governance integration)
+            self._apply_governance(batch)
+            
+            if self.use_supabase:
+                self._insert_supabase_rows(batch, batch_embeddings, supabase_chunk_size, max_retries, retry_backoff)
+            else:
+                self._insert_sqlite_rows(batch, batch_embeddings)
+            
+            ae_ids.extend(event["ae_id"] for event in batch)
+            if progress_callback:
+                progress_callback(len(ae_ids))
+        
+        return ae_ids
+    
+    def _apply_governance(self, events: List[Dict[str, Any]]) -> None:
+        """Add governance tracking and provenance/quality/evidence-strength scores to events in place."""
+        global _novelty_engine
         try:
-            from src.evidence_governance.integration import track_storage
             from src.evidence_governance.config import EVIDENCE_GOVERNANCE_ENABLED
+            if not EVIDENCE_GOVERNANCE_ENABLED:
+                return
+            
+            from src.evidence_governance.integration import track_storage_batch
             from src.evidence_governance.lineage import get_lineage_tracker
             from src.evidence_governance.provenance import get_provenance_engine
             from src.evidence_governance.quality import get_quality_engine
             from src.evidence_governance.fusion import get_fusion_engine
             
-            if EVIDENCE_GOVERNANCE_ENABLED:
-                source = event.get("source", "unknown")
-                event = track_storage(event, source)
-                
-                # Calculate governance scores
-                record_id = event.get("ae_id") or event.get("record_id")
-                lineage = get_lineage_tracker()
-                lineage_chain = lineage.get_lineage(record_id) if record_id else []
-                
-                # Provenance scoring
-                provenance_engine = get_provenance_engine()
-                prov_score = provenance_engine.score(event, lineage_chain)
-                event["provenance"] = prov_score
-                
-                # Quality scoring
-                quality_engine = get_quality_engine()
-                qual_score = quality_engine.score(event, lineage_chain)
-                event["data_quality"] = qual_score
-                
-                # Fusion (Evidence Strength Score)
-                fusion_engine = get_fusion_engine()
-                # Try to get novelty engine if available
-                novelty_engine = None
+            if _novelty_engine is None:
                 try:
                     from src.ai.novelty_detection import NoveltyDetectionEngine
-                    novelty_engine = NoveltyDetectionEngine()
+                    _novelty_engine = NoveltyDetectionEngine()
                 except ImportError:
                     pass
-                
-                ess = fusion_engine.fuse(prov_score, qual_score, event, novelty_engine)
-                event["evidence_strength"] = ess
+            
+            track_storage_batch(events)
+            
+            # Lineage chains for the whole batch in one pass
+            record_ids = [event.get("ae_id") or event.get("record_id") for event in events]
+            lineages = get_lineage_tracker().get_lineages([rid for rid in record_ids if rid])
+            
+            provenance_engine = get_provenance_engine()
+            quality_engine = get_quality_engine()
+            fusion_engine = get_fusion_engine()
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).debug(f"Governance scoring error: {e}")
-            pass  # Governance optional
+            logger.debug(f"Governance scoring error: {e}")
+            return  # Governance optional
         
-        # Prepare event for storage
-        if self.use_supabase:
-            return self._store_to_supabase(event, embedding)
-        else:
-            return self._store_to_sqlite(event, embedding)
+        for event, record_id in zip(events, record_ids):
+            try:
+                lineage_chain = lineages.get(record_id, []) if record_id else []
+                prov_score = provenance_engine.score(event, lineage_chain)
+                event["provenance"] = prov_score
+                qual_score = quality_engine.score(event, lineage_chain)
+                event["data_quality"] = qual_score
+                event["evidence_strength"] = fusion_engine.fuse(prov_score, qual_score, event, _novelty_engine)
+            except Exception as e:
+                logger.debug(f"Governance scoring error: {e}")
     
-    def _store_to_supabase(self, event: Dict[str, Any], embedding: Optional[List[float]]) -> str:
-        """Store to Supabase."""
-        try:
+    def _insert_supabase_rows(
+        self,
+        events: List[Dict[str, Any]],
+        embeddings: List[Optional[List[float]]],
+        chunk_size: int,
+        max_retries: int,
+        retry_backoff: float
+    ) -> None:
+        """Bulk upsert to Supabase in chunks (keyed by ae_id), retrying each chunk with backoff."""
+        rows = []
+        for event, embedding in zip(events, embeddings):
             # Convert embedding to list if numpy array
             if embedding is not None:
                 if hasattr(embedding, 'tolist'):
@@ -238,91 +412,130 @@ class UnifiedStorageEngine:
                 event["embedding_vector"] = embedding
             
             # Convert JSONB fields
-            if "seriousness_flags" in event and isinstance(event["seriousness_flags"], dict):
-                event["seriousness_flags"] = json.dumps(event["seriousness_flags"])
-            
-            if "metadata" in event and isinstance(event["metadata"], dict):
-                event["metadata"] = json.dumps(event["metadata"])
-            
-            # Store
-            result = self.supabase.table("ae_events").insert(event).execute()
-            return event["ae_id"]
-        except Exception as e:
-            logger.error(f"Error storing to Supabase: {str(e)}")
-            raise
+            for field in _JSON_FIELDS:
+                if field in event and isinstance(event[field], dict):
+                    event[field] = json.dumps(event[field])
+            rows.append(event)
+        
+        for start in range(0, len(rows), max(1, chunk_size)):
+            chunk = rows[start:start + chunk_size]
+            delay = retry_backoff
+            for attempt in range(max_retries + 1):
+                try:
+                    # Upsert on the key: a re-stored event (same ae_id) replaces its row, as on SQLite
+                    self.supabase.table("ae_events").upsert(chunk, on_conflict="ae_id").execute()
+                    break
+                except Exception as e:
+                    if attempt >= max_retries:
+                        logger.error(f"Error storing to Supabase: {str(e)}")
+                        raise
+                    logger.warning(f"Supabase insert failed ({str(e)}), retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    delay *= 2
     
-    def _store_to_sqlite(self, event: Dict[str, Any], embedding: Optional[List[float]]) -> str:
-        """Store to SQLite."""
+    def _insert_sqlite_rows(
+        self,
+        events: List[Dict[str, Any]],
+        embeddings: List[Optional[List[float]]]
+    ) -> None:
+        """Insert events in one transaction, one executemany per distinct column set."""
+        columns = self._ae_columns()
+        known = set(columns)
+        
+        statements: Dict[Tuple[str, ...], List[List[Any]]] = {}
+        for event, embedding in zip(events, embeddings):
+            row = self._sqlite_row(event, embedding, known)
+            statements.setdefault(tuple(row.keys()), []).append(list(row.values()))
+        
+        conn, lock = self._connection()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Convert embedding to JSON string
-            if embedding is not None:
-                if hasattr(embedding, 'tolist'):
-                    embedding = embedding.tolist()
-                event["embedding_vector"] = json.dumps(embedding)
-            
-            # Convert JSONB fields to JSON strings
-            if "seriousness_flags" in event:
-                if isinstance(event["seriousness_flags"], dict):
-                    event["seriousness_flags"] = json.dumps(event["seriousness_flags"])
-                elif event["seriousness_flags"] is None:
-                    event["seriousness_flags"] = "{}"
-            
-            if "metadata" in event:
-                if isinstance(event["metadata"], dict):
-                    event["metadata"] = json.dumps(event["metadata"])
-                elif event["metadata"] is None:
-                    event["metadata"] = "{}"
-            
-            # Convert dates to strings
-            for date_field in ["event_date", "report_date", "fetched_at", "created_at", "updated_at"]:
-                if date_field in event and event[date_field]:
-                    if isinstance(event[date_field], datetime):
-                        event[date_field] = event[date_field].isoformat()
-            
-            # Insert
-            columns = ", ".join(event.keys())
-            placeholders = ", ".join(["?" for _ in event])
-            values = list(event.values())
-            
-            cursor.execute(
-                f"INSERT OR REPLACE INTO ae_events ({columns}) VALUES ({placeholders})",
-                values
-            )
-            
-            conn.commit()
-            conn.close()
-            
-            return event["ae_id"]
+            with lock, conn:
+                for row_columns, values in statements.items():
+                    placeholders = ", ".join(["?"] * len(row_columns))
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO ae_events ({', '.join(row_columns)}) VALUES ({placeholders})",
+                        values
+                    )
         except Exception as e:
             logger.error(f"Error storing to SQLite: {str(e)}")
             raise
+        
+        self._index_vectors(events, embeddings)
     
-    def store_ae_events_batch(
+    def _index_vectors(
         self,
         events: List[Dict[str, Any]],
-        embeddings: Optional[List[List[float]]] = None
-    ) -> List[str]:
-        """
-        Store multiple AE events in batch.
+        embeddings: List[Optional[List[float]]]
+    ) -> None:
+        """Mirror committed embeddings into the local vector index (replaced rows without one are removed)."""
+        ae_ids, drugs, vectors, removed = [], [], [], []
+        for event, embedding in zip(events, embeddings):
+            if embedding is None:
+                embedding = event.get("embedding_vector")
+            if embedding is None:
+                removed.append(event["ae_id"])
+                continue
+            ae_ids.append(event["ae_id"])
+            drugs.append(event.get("drug_normalized") or event.get("drug_name"))
+            vectors.append(embedding)
         
-        Args:
-            events: List of AE event dictionaries
-            embeddings: Optional list of embedding vectors
+        index = self.vector_index(sync=False)
+        try:
+            if removed:
+                index.remove(removed)
+            self._add_vectors(index, ae_ids, drugs, vectors)
+        except Exception as e:
+            # The index is rebuilt from ae_events on next use; never fail the write
+            logger.warning(f"Vector index update failed: {str(e)}")
+            index.synced = False
+    
+    @staticmethod
+    def _sqlite_row(
+        event: Dict[str, Any],
+        embedding: Optional[List[float]],
+        known_columns: set
+    ) -> Dict[str, Any]:
+        """
+        Map an event to ae_events columns.
         
-        Returns:
-            List of AE IDs
+        Fields that are not table columns (e.g. governance scores) are kept in
+        the metadata JSON; dicts/lists become JSON strings and datetimes ISO strings.
         """
-        ae_ids = []
+        row = {key: value for key, value in event.items() if key in known_columns}
+        extras = {key: value for key, value in event.items() if key not in known_columns}
         
-        for i, event in enumerate(events):
-            embedding = embeddings[i] if embeddings and i < len(embeddings) else None
-            ae_id = self.store_ae_event(event, embedding)
-            ae_ids.append(ae_id)
+        # Convert embedding to JSON string
+        if embedding is not None:
+            if hasattr(embedding, 'tolist'):
+                embedding = embedding.tolist()
+            row["embedding_vector"] = embedding
         
-        return ae_ids
+        if extras:
+            metadata = row.get("metadata")
+            if isinstance(metadata, str):
+                try:
+                    metadata = json.loads(metadata)
+                except ValueError:
+                    metadata = {"raw_metadata": metadata}
+            metadata = dict(metadata) if isinstance(metadata, dict) else {}
+            metadata.update(extras)
+            row["metadata"] = metadata
+        
+        # JSONB fields default to empty objects
+        for field in _JSON_FIELDS:
+            if field in row and row[field] is None:
+                row[field] = "{}"
+        
+        for key, value in row.items():
+            if isinstance(value, (dict, list, tuple)):
+                row[key] = json.dumps(value, default=str)
+            elif isinstance(value, datetime) and key in _DATE_FIELDS:
+                row[key] = value.isoformat()
+            elif hasattr(value, 'item'):
+                # numpy scalars
+                row[key] = value.item()
+        
+        return row
     
     def store_drug(self, drug: Dict[str, Any]) -> str:
         """Store or update a drug entry."""
@@ -0,0 +1,360 @@
+"""
+Local Vector Index (Phase 3A.5)
+Approximate nearest-neighbour search over AE event embeddings for the SQLite backend.
+
+Vectors are L2-normalized and appended to a memory-mapped float32 matrix
+(vectors.f32) next to the database, with one "ae_id, drug, live" line per row
+in rows.tsv. Once the index holds IVF_MIN_ROWS rows an inverted-file (IVF)
+layer is trained with k-means; queries then score only the nprobe closest
+lists. Smaller indexes, and drug-filtered queries whose drug has few rows,
+are searched exactly.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IVF_MIN_ROWS = 50_000
+MAX_LISTS = 1024
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 8
+SAMPLES_PER_LIST = 32
+
+_VECTORS_FILE = "vectors.f32"
+_ROWS_FILE = "rows.tsv"
+_LISTS_FILE = "lists.i32"
+_CENTROIDS_FILE = "centroids.npy"
+_META_FILE = "meta.json"
+
+_indexes: Dict[str, "LocalVectorIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(index_dir: Path) -> "LocalVectorIndex":
+    """Shared LocalVectorIndex for a directory (one instance per process)."""
+    key = str(Path(index_dir).resolve())
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = LocalVectorIndex(Path(index_dir))
+        return _indexes[key]
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _clean_drug(drug) -> str:
+    if drug is None:
+        return ""
+    return " ".join(str(drug).split()).lower()
+
+
+class LocalVectorIndex:
+    """
+    Append-only cosine-similarity index with an optional IVF layer.
+
+    Rows are never rewritten: replacing an ae_id appends a new row and the
+    latest row for an ae_id wins; removals append a tombstone row.
+    """
+
+    def __init__(self, index_dir: Path, nprobe: int = DEFAULT_NPROBE):
+        """
+        Initialize (or open) an index.
+
+        Args:
+            index_dir: Directory holding the index files
+            nprobe: Number of IVF lists scanned per query
+        """
+        self.index_dir = Path(index_dir)
+        self.nprobe = nprobe
+        # Set by the owning storage engine once checked against ae_events
+        self.synced = False
+        self._lock = threading.RLock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Load row metadata and IVF state; trims a partially written tail."""
+        self.dim: Optional[int] = None
+        self.ae_ids: List[str] = []
+        self.drugs: List[str] = []
+        self._live = np.zeros(0, dtype=bool)
+        self._row_of: Dict[str, int] = {}
+        self._drug_codes = np.zeros(0, dtype=np.int32)
+        self._drug_index: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._trained_rows = 0
+        self._matrix: Optional[np.memmap] = None
+
+        meta = self._read_meta()
+        if not meta:
+            return
+        self.dim = meta.get("dim")
+        self._trained_rows = meta.get("trained_rows", 0)
+
+        rows_path = self.index_dir / _ROWS_FILE
+        lines = rows_path.read_text(encoding="utf-8").splitlines() if rows_path.exists() else []
+        vectors_path = self.index_dir / _VECTORS_FILE
+        n_vectors = vectors_path.stat().st_size // (4 * self.dim) if self.dim and vectors_path.exists() else 0
+        n_rows = min(len(lines), n_vectors)
+
+        centroids_path = self.index_dir / _CENTROIDS_FILE
+        lists_path = self.index_dir / _LISTS_FILE
+        if centroids_path.exists() and lists_path.exists():
+            self._centroids = np.load(centroids_path)
+            self._lists = np.fromfile(lists_path, dtype=np.int32)
+            n_rows = min(n_rows, len(self._lists))
+            self._lists = self._lists[:n_rows]
+
+        live = np.zeros(n_rows, dtype=bool)
+        drug_codes = np.zeros(n_rows, dtype=np.int32)
+        for row, line in enumerate(lines[:n_rows]):
+            ae_id, drug, flag = (line.split("\t") + ["", "1"])[:3]
+            self.ae_ids.append(ae_id)
+            self.drugs.append(drug)
+            drug_codes[row] = self._drug_index.setdefault(drug, len(self._drug_index))
+            previous = self._row_of.get(ae_id)
+            if previous is not None:
+                live[previous] = False
+            if flag == "1":
+                live[row] = True
+                self._row_of[ae_id] = row
+            else:
+                self._row_of.pop(ae_id, None)
+        self._live = live
+        self._drug_codes = drug_codes
+
+        if n_rows < len(lines) or n_rows < n_vectors:
+            self._truncate(n_rows)
+
+    def _truncate(self, n_rows: int) -> None:
+        """Drop rows beyond n_rows from all files (recovery after an interrupted append)."""
+        rows_path = self.index_dir / _ROWS_FILE
+        lines = rows_path.read_text(encoding="utf-8").splitlines()[:n_rows]
+        rows_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+        with open(self.index_dir / _VECTORS_FILE, "r+b") as f:
+            f.truncate(n_rows * 4 * self.dim)
+        if self._centroids is not None:
+            self._lists[:n_rows].tofile(self.index_dir / _LISTS_FILE)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.index_dir / _META_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_dir / _META_FILE, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "trained_rows": self._trained_rows}, f)
+
+    def _vectors(self) -> np.ndarray:
+        """Memory-mapped (n_rows, dim) float32 matrix."""
+        n_rows = len(self.ae_ids)
+        if self._matrix is None or self._matrix.shape[0] != n_rows:
+            if n_rows == 0 or not self.dim:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self.index_dir / _VECTORS_FILE, dtype=np.float32, mode="r", shape=(n_rows, self.dim)
+            )
+        return self._matrix
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, ae_id: str) -> bool:
+        return ae_id in self._row_of
+
+    def add(self, ae_ids: List[str], drugs: List[Optional[str]], vectors) -> int:
+        """
+        Add or replace vectors.
+
+        Args:
+            ae_ids: AE IDs
+            drugs: Normalized drug names (used for drug_filter)
+            vectors: Embeddings, one per ae_id (same dimension)
+
+        Returns:
+            Number of vectors added
+        """
+        if not ae_ids:
+            return 0
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ae_ids):
+            raise ValueError("vectors must be a 2-D array with one row per ae_id")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self._write_meta()
+            if matrix.shape[1] != self.dim:
+                logger.warning(f"Skipping {len(ae_ids)} embeddings of dimension {matrix.shape[1]} (index dimension {self.dim})")
+                return 0
+            self._append(ae_ids, [_clean_drug(drug) for drug in drugs], _normalize_rows(matrix), live=True)
+            self._maybe_train()
+        return len(ae_ids)
+
+    def remove(self, ae_ids: List[str]) -> int:
+        """Remove AE IDs from the index (appends tombstones). Returns number removed."""
+        with self._lock:
+            present = [ae_id for ae_id in ae_ids if ae_id in self._row_of]
+            if present and self.dim:
+                zeros = np.zeros((len(present), self.dim), dtype=np.float32)
+                self._append(present, [""] * len(present), zeros, live=False)
+            return len(present)
+
+    def _append(self, ae_ids: List[str], drugs: List[str], vectors: np.ndarray, live: bool) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        start = len(self.ae_ids)
+
+        lists = None
+        if self._centroids is not None:
+            lists = np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+        with open(self.index_dir / _VECTORS_FILE, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        if lists is not None:
+            with open(self.index_dir / _LISTS_FILE, "ab") as f:
+                f.write(lists.tobytes())
+        flag = "1" if live else "0"
+        with open(self.index_dir / _ROWS_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(f"{ae_id}\t{drug}\t{flag}\n" for ae_id, drug in zip(ae_ids, drugs)))
+
+        codes = np.array([self._drug_index.setdefault(drug, len(self._drug_index)) for drug in drugs], dtype=np.int32)
+        new_live = np.full(len(ae_ids), live, dtype=bool)
+        for offset, ae_id in enumerate(ae_ids):
+            previous = self._row_of.get(ae_id)
+            if previous is not None:
+                if previous >= start:
+                    new_live[previous - start] = False
+                else:
+                    self._live[previous] = False
+            if live:
+                self._row_of[ae_id] = start + offset
+            else:
+                self._row_of.pop(ae_id, None)
+
+        self.ae_ids.extend(ae_ids)
+        self.drugs.extend(drugs)
+        self._live = np.concatenate([self._live, new_live])
+        self._drug_codes = np.concatenate([self._drug_codes, codes])
+        if lists is not None:
+            self._lists = np.concatenate([self._lists, lists])
+
+    def _maybe_train(self) -> None:
+        """(Re)train the IVF layer when the index first reaches IVF_MIN_ROWS rows and whenever it doubles."""
+        n_rows = len(self.ae_ids)
+        if n_rows < IVF_MIN_ROWS or (self._trained_rows and n_rows < 2 * self._trained_rows):
+            return
+
+        vectors = self._vectors()
+        live_rows = np.flatnonzero(self._live)
+        n_lists = int(min(MAX_LISTS, max(1, np.sqrt(len(live_rows)))))
+        rng = np.random.default_rng(0)
+        sample = rng.choice(live_rows, size=min(len(live_rows), n_lists * SAMPLES_PER_LIST), replace=False)
+        sample_vectors = np.asarray(vectors[np.sort(sample)])
+
+        # Spherical k-means on the sample
+        centroids = sample_vectors[rng.choice(len(sample_vectors), size=n_lists, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample_vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample_vectors)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize_rows(sums).astype(np.float32)
+
+        # Assign all rows in blocks
+        lists = np.empty(n_rows, dtype=np.int32)
+        for start in range(0, n_rows, 65536):
+            block = np.asarray(vectors[start:start + 65536])
+            lists[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        np.save(self.index_dir / _CENTROIDS_FILE, centroids)
+        lists.tofile(self.index_dir / _LISTS_FILE)
+        self._centroids = centroids
+        self._lists = lists
+        self._trained_rows = n_rows
+        self._write_meta()
+        logger.info(f"Trained IVF vector index: {n_lists} lists over {n_rows} rows")
+
+    def reset(self) -> None:
+        """Delete all index files."""
+        with self._lock:
+            for name in (_VECTORS_FILE, _ROWS_FILE, _LISTS_FILE, _CENTROIDS_FILE, _META_FILE):
+                (self.index_dir / name).unlink(missing_ok=True)
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query_vector,
+        k: int = 10,
+        drug: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k most similar AE events.
+
+        Args:
+            query_vector: Query embedding
+            k: Number of results
+            drug: Optional drug filter (applied before scoring)
+
+        Returns:
+            List of (ae_id, cosine similarity), best first
+        """
+        with self._lock:
+            if not self._row_of or self.dim is None:
+                return []
+            query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+            if query.shape[0] != self.dim:
+                logger.warning(f"Query dimension {query.shape[0]} does not match index dimension {self.dim}")
+                return []
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+
+            vectors = self._vectors()
+            candidates = self._live.copy()
+            if drug:
+                code = self._drug_index.get(_clean_drug(drug))
+                if code is None:
+                    return []
+                candidates &= self._drug_codes == code
+
+            rows = np.flatnonzero(candidates)
+            if self._centroids is not None and len(rows) > IVF_MIN_ROWS:
+                probe = np.zeros(len(self._centroids), dtype=bool)
+                probe[np.argsort(-(self._centroids @ query))[:self.nprobe]] = True
+                probed = rows[probe[self._lists[rows]]]
+                if len(probed) >= k:
+                    rows = probed
+            if len(rows) == 0:
+                return []
+
+            scores = np.asarray(vectors[rows]) @ query
+            top = min(k, len(rows))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best])]
+            return [(self.ae_ids[rows[i]], float(scores[i])) for i in best]
@@ -54,6 +54,7 @@ from src.literature_integration import enrich_signal_with_literature
 from src.longitudinal_spike import detect_spikes, detect_statistical_spikes, analyze_trend_changepoint
 from src.new_signal_detection import calculate_unexpectedness_score, detect_new_signals
 from src.class_effect_detection import detect_class_effects, analyze_drug_class_signal
+from src.disproportionality_engine import get_disproportionality_table
 from src.exposure_normalization import normalize_by_exposure, calculate_incidence_rate
 from src.quantum_explainability import (
     explain_quantum_ranking,
@@ -1511,8 +1512,18 @@ def _render_signals_tab(filters: Dict, summary: Dict, filtered_df: pd.DataFrame,
     if combinations:
         combos = combinations[:20]
 
-        # Attach PRR/ROR for each combo
+        # Attach PRR/ROR for each combo from the dataset's all-pairs table (built at load time)
+        background = get_disproportionality_table(normalized_df)
         for combo in combos:
+            key = (normalize_text(combo["drug"]), normalize_text(combo["reaction"]))
+            if key in background.index and pd.notna(background.at[key, "prr"]):
+                row = background.loc[key]
+                combo.update({
+                    col: (int(row[col]) if col in ("a", "b", "c", "d") else row[col])
+                    for col in ("a", "b", "c", "d", "prr", "prr_ci_lower", "prr_ci_upper",
+                                "ror", "ror_ci_lower", "ror_ci_upper", "chi2", "p_value")
+                })
+                continue
             prr_ror = signal_stats.calculate_prr_ror(
                 combo["drug"], combo["reaction"], normalized_df
             )
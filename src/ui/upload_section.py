@@ -12,6 +12,10 @@ from src import pv_schema
 from src import signal_stats
 from src import mapping_templates
 from src.app_helpers import cached_detect_and_normalize, load_all_files
+from src.query_dataset import prepare_query_dataset
+from src.dataset_vocabulary import prepare_dataset_vocabulary
+from src.ai.trend_cube import prepare_trend_cube
+from src.disproportionality_engine import prepare_disproportionality_table
 from src.app_processing_mode import (
     ProcessingMode,
     recommend_mode_based_on_file_size,
@@ -1056,6 +1060,14 @@ def render_upload_section():
                 st.session_state.normalized_data = normalized
                 st.session_state.data = normalized  # Also set data for compatibility
                 
+                # Index filter columns and query terms once so queries don't re-normalize the dataset
+                prepare_query_dataset(normalized)
+                prepare_dataset_vocabulary(normalized)
+                # Count drug/reaction/month trends once for the trend alert detectors
+                prepare_trend_cube(normalized)
+                # PRR/ROR for every drug-event pair, looked up by the signals tab
+                prepare_disproportionality_table(normalized)
+                
                 # Store data in database if user is authenticated
                 try:
                     from src.auth.auth import is_authenticated, get_current_user
@@ -1381,6 +1393,12 @@ def render_upload_section():
                                             with col3:
                                                 st.metric("Duplicates", f"{dedup_result['duplicate_cases']:,}")
                                             
+                                            if dedup_result.get('pairs_compared'):
+                                                st.caption(
+                                                    f"Compared {dedup_result['pairs_compared']:,} candidate pairs "
+                                                    f"({dedup_result['pairs_pruned']:,} pairs pruned by blocking)"
+                                                )
+                                            
                                             if dedup_result['cross_source_duplicates'] > 0:
                                                 st.info(f"🔗 Found {dedup_result['cross_source_duplicates']} duplicate groups spanning multiple sources")
                                             
@@ -1439,6 +1457,9 @@ def render_upload_section():
                                 "Type": meta.get("file_type", ""),
                                 "Rows": meta.get("rows"),
                                 "Approx. skipped lines": meta.get("approx_skipped_lines"),
+                                "Parse (s)": meta.get("parse_seconds"),
+                                "Rows/s": meta.get("rows_per_sec"),
+                                "MB/s": meta.get("mb_per_sec"),
                             }
                         )
                     if summary_rows:
@@ -1081,6 +1081,17 @@ def map_to_meddra_pt(term: str) -> str:
     if not term_str:
         return ""
     
+    # Exact and longest-contained synonym lookups go through the shared
+    # term index (Aho-Corasick automaton + LRU cache)
+    try:
+        from src.normalization.term_index import get_term_index
+    except ImportError:
+        return _scan_meddra_like(term_str)
+    return get_term_index().map_to_pt(term_str)
+
+
+def _scan_meddra_like(term_str: str) -> str:
+    """Linear-scan fallback for map_to_meddra_pt when the term index is unavailable."""
     # Normalize for lookup (lowercase)
     term_lower = normalize_text(term_str)
     
@@ -7,6 +7,8 @@ import pandas as pd
 from datetime import datetime
 from src import signal_stats
 from src import quantum_ranking
+from src.disproportionality_engine import compute_disproportionality_table
+from src.utils import normalize_text
 
 
 def show_watchlist_tab():
@@ -70,13 +72,16 @@ def show_watchlist_tab():
         with st.spinner(
             f"🔍 Scanning {len(normalized_df):,} cases for {len(drugs)} drug(s)..."
         ):
+            # One pass over the dataset yields every drug–event pair with PRR/ROR/IC/EBGM
+            table = compute_disproportionality_table(normalized_df, min_cases=5)
             candidates = []
             for drug in drugs:
-                temp_filter = {"drug": drug}
-                filtered = signal_stats.apply_filters(normalized_df, temp_filter)
-                if not filtered.empty:
+                drug_rows = table[
+                    table["drug"].str.contains(normalize_text(drug), regex=False)
+                ]
+                if not drug_rows.empty:
                     combos = signal_stats.get_drug_event_combinations(
-                        filtered, min_cases=5
+                        normalized_df, min_cases=5, disproportionality_table=drug_rows
                     )
                     for c in combos:
                         c["source_drug"] = drug
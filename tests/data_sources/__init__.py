@@ -0,0 +1,3 @@
+"""
+Data Source Tests - Ingestion tests against a local stub HTTP server
+"""
@@ -0,0 +1,140 @@
+"""
+Concurrent Fetch Tests - DataSourceManagerV2 fan-out against a local stub HTTP server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.data_sources import DataSourceManagerV2, SourceClientBase
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers /events?delay=<secs>&source=<name> after sleeping `delay` seconds."""
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        time.sleep(float(params.get("delay", ["0"])[0]))
+        source = params.get("source", [""])[0]
+        body = json.dumps([{"drug": "testdrug", "reaction": "nausea", "text": f"report from {source}"}]).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up at its deadline
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class _StubClient(SourceClientBase):
+    def __init__(self, name, config, base_url, delay, requests=1):
+        super().__init__(name, config)
+        self.base_url = base_url
+        self.delay = delay
+        self.requests = requests
+
+    def fetch(self, query):
+        entries = []
+        for _ in range(self.requests):
+            response = self.http_get(f"{self.base_url}/events", params={"delay": self.delay, "source": self.name})
+            response.raise_for_status()
+            entries.extend(response.json())
+        return entries
+
+
+def _manager(stub_url, sources):
+    """Manager over stub clients: sources maps name -> (delay, extra config)."""
+    manager = DataSourceManagerV2(config_path=Path("missing_config.yaml"), env_path=Path("missing.env"))
+    manager.clients = {}
+    for name, (delay, extra) in sources.items():
+        config = {"enabled": True, **extra}
+        manager.config["sources"][name] = config
+        manager.clients[name] = _StubClient(name, config, stub_url, delay)
+    return manager
+
+
+def test_fetch_all_runs_sources_concurrently(stub_url):
+    manager = _manager(stub_url, {
+        "slow": (0.6, {"priority": 9}),
+        "medium": (0.4, {"priority": 5}),
+        "fast": (0.2, {"priority": 7}),
+    })
+
+    start = time.monotonic()
+    results = manager.fetch_all({"drug_name": "testdrug"})
+    elapsed = time.monotonic() - start
+
+    # Wall time tracks the slowest source, not the sum (1.2s)
+    assert elapsed < 1.0
+    assert [entry["source"] for entry in results] == ["slow", "fast", "medium"]
+
+
+def test_iter_fetch_all_streams_in_completion_order(stub_url):
+    manager = _manager(stub_url, {
+        "slow": (0.5, {"priority": 9}),
+        "fast": (0.05, {"priority": 1}),
+    })
+
+    arrivals = [(name, time.monotonic()) for name, _ in manager.iter_fetch_all({"drug_name": "testdrug"})]
+
+    assert [name for name, _ in arrivals] == ["fast", "slow"]
+    assert arrivals[1][1] - arrivals[0][1] > 0.2
+
+
+def test_source_past_deadline_is_dropped(stub_url):
+    manager = _manager(stub_url, {
+        "stuck": (2.0, {"priority": 9, "deadline_secs": 0.3}),
+        "fast": (0.05, {"priority": 1}),
+    })
+
+    start = time.monotonic()
+    results = manager.fetch_all({"drug_name": "testdrug"})
+
+    assert time.monotonic() - start < 1.0
+    assert [entry["source"] for entry in results] == ["fast"]
+
+
+def test_rate_limiter_spaces_requests(stub_url):
+    client = _StubClient("rate_limited_stub", {"enabled": True, "rate_limit_per_sec": 10}, stub_url, 0.0, requests=4)
+
+    start = time.monotonic()
+    entries = client.fetch({"drug_name": "testdrug"})
+
+    # One request right away, then one every 0.1s
+    assert len(entries) == 4
+    assert time.monotonic() - start >= 0.28
+
+
+def test_deadline_starts_when_a_queued_source_runs(stub_url, monkeypatch):
+    monkeypatch.setattr("src.data_sources.data_source_manager_v2.MAX_FETCH_WORKERS", 1)
+    manager = _manager(stub_url, {
+        "stuck": (2.0, {"priority": 9, "deadline_secs": 0.3}),
+        "queued": (0.05, {"priority": 1, "deadline_secs": 0.5}),
+    })
+
+    start = time.monotonic()
+    results = manager.fetch_all({"drug_name": "testdrug"})
+
+    # The stuck request times out at its deadline and frees the only worker;
+    # the queued source's deadline only starts then
+    assert time.monotonic() - start < 1.0
+    assert [entry["source"] for entry in results] == ["queued"]
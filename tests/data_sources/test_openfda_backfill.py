@@ -0,0 +1,187 @@
+"""
+OpenFDA Backfill Tests - windowed paging, storage streaming and resume against a stub openFDA server
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.data_sources import OpenFDABackfill
+from src.data_sources.sources.openfda import OpenFDAClient
+from src.storage.unified_storage import UnifiedStorageEngine
+
+START = date(2020, 1, 1)
+DAYS = 20
+
+
+def _reports():
+    """Reports per receive date: day i has (i % 4) * 4 reports, two reactions each."""
+    reports = []
+    for i in range(DAYS):
+        day = START + timedelta(days=i)
+        for n in range((i % 4) * 4):
+            reports.append({
+                "safetyreportid": f"{day:%Y%m%d}{n:03d}",
+                "receivedate": f"{day:%Y%m%d}",
+                "serious": "1" if n % 2 else "2",
+                "patient": {"reaction": [{"reactionmeddrapt": "NAUSEA"}, {"reactionmeddrapt": "HEADACHE"}]},
+            })
+    return reports
+
+
+REPORTS = _reports()
+
+
+class _OpenFDAStub(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        type(self).requests.append(params)
+        first, last = re.search(r"receivedate:\[(\d{8})\+TO\+(\d{8})\]", params["search"]).groups()
+        matches = [report for report in REPORTS if first <= report["receivedate"] <= last]
+        skip, limit = int(params.get("skip", 0)), int(params["limit"])
+        if not matches:
+            self._reply(404, {"error": {"code": "NOT_FOUND"}})
+        else:
+            self._reply(200, {"meta": {"results": {"total": len(matches)}}, "results": matches[skip:skip + limit]})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OpenFDAStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/drug/event.json"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub_url):
+    client = OpenFDAClient("openfda_backfill_stub", {"enabled": True, "rate_limit_per_sec": 1000})
+    client.api_key = None
+    client.BASE_URL_EVENT = stub_url
+    # Small limits force window splitting and multi-page windows
+    client.MAX_PAGE_SIZE = 5
+    client.MAX_SKIP = 15
+    _OpenFDAStub.requests = []
+    return client
+
+
+def _stored_rows(storage):
+    with sqlite3.connect(storage.db_path) as conn:
+        return conn.execute("SELECT source_id, reaction_normalized, serious FROM ae_events").fetchall()
+
+
+def test_backfill_stores_every_report_reaction(tmp_path, client):
+    storage = UnifiedStorageEngine(db_path=tmp_path / "ae.db")
+    backfill = OpenFDABackfill(client, storage, checkpoint_dir=tmp_path / "ckpt", window_days=7, batch_size=7)
+
+    progress = backfill.run("testdrug", START, START + timedelta(days=DAYS - 1))
+
+    rows = _stored_rows(storage)
+    assert progress.reports_fetched == len(REPORTS)
+    assert len(rows) == progress.events_stored == 2 * len(REPORTS)
+    assert {source_id for source_id, _, _ in rows} == {report["safetyreportid"] for report in REPORTS}
+    assert {reaction for _, reaction, _ in rows} == {"nausea", "headache"}
+    # Every request stayed within the (shrunk) skip and page limits
+    assert all(int(r["skip"]) <= client.MAX_SKIP and int(r["limit"]) <= client.MAX_PAGE_SIZE for r in _OpenFDAStub.requests)
+
+
+def test_backfill_resumes_after_interruption(tmp_path, client):
+    storage = UnifiedStorageEngine(db_path=tmp_path / "ae.db")
+
+    class FailingStorage:
+        calls = 0
+
+        def store_ae_events_batch(self, events, batch_size):
+            type(self).calls += 1
+            if type(self).calls == 2:
+                raise RuntimeError("storage went away")
+            return storage.store_ae_events_batch(events, batch_size=batch_size)
+
+    end = START + timedelta(days=DAYS - 1)
+    interrupted = OpenFDABackfill(client, FailingStorage(), checkpoint_dir=tmp_path / "ckpt", window_days=7)
+    with pytest.raises(RuntimeError):
+        interrupted.run("testdrug", START, end)
+
+    checkpoint = json.loads(interrupted.checkpoint_path("testdrug").read_text())
+    assert checkpoint["completed_windows"] == ["20200101-20200107"]
+
+    progress = OpenFDABackfill(client, storage, checkpoint_dir=tmp_path / "ckpt", window_days=7).run("testdrug", START, end)
+
+    assert progress.windows_skipped == 1
+    assert progress.windows_completed == 2
+    assert len(_stored_rows(storage)) == 2 * len(REPORTS)
+
+    # A finished backfill makes no further requests
+    _OpenFDAStub.requests = []
+    rerun = OpenFDABackfill(client, storage, checkpoint_dir=tmp_path / "ckpt", window_days=7).run("testdrug", START, end)
+    assert rerun.windows_skipped == 3 and not _OpenFDAStub.requests
+
+
+class _SupabaseStub:
+    """ae_events table keyed by ae_id; insert rejects a duplicate key like Postgres."""
+
+    def __init__(self):
+        self.rows = {}
+        self._pending = None
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        if any(row["ae_id"] in self.rows for row in rows):
+            raise RuntimeError("duplicate key value violates unique constraint")
+        return self.upsert(rows, on_conflict="ae_id")
+
+    def upsert(self, rows, on_conflict):
+        self._pending = [(row[on_conflict], row) for row in rows]
+        return self
+
+    def execute(self):
+        self.rows.update(self._pending)
+
+
+def test_resume_on_supabase_replaces_rows(tmp_path, client):
+    storage = UnifiedStorageEngine(db_path=tmp_path / "ae.db")
+    storage.supabase, storage.use_supabase = _SupabaseStub(), True
+    end = START + timedelta(days=DAYS - 1)
+    backfill = OpenFDABackfill(client, storage, checkpoint_dir=tmp_path / "ckpt", window_days=7)
+
+    backfill.run("testdrug", START, end)
+    # Forget the checkpoint: every window is fetched and stored again
+    backfill.checkpoint_path("testdrug").unlink()
+    backfill.run("testdrug", START, end)
+
+    assert len(storage.supabase.rows) == 2 * len(REPORTS)
+    # ae_events.ae_id is a UUID column and serious a BOOLEAN on Supabase
+    assert all(str(uuid.UUID(ae_id)) == ae_id for ae_id in storage.supabase.rows)
+    assert all(isinstance(row["serious"], bool) for row in storage.supabase.rows.values())
+
+    # A report without safetyreportid still gets a stable id from its content
+    report = {key: value for key, value in REPORTS[-1].items() if key != "safetyreportid"}
+    first, second = (
+        [event["ae_id"] for event in backfill._storage_events(iter([report]), "testdrug", None)]
+        for _ in range(2)
+    )
+    assert first == second and all(first)
@@ -0,0 +1,3 @@
+"""
+Local FAERS Tests - browser-side FAERS loaders
+"""
@@ -0,0 +1,23 @@
+"""
+FAERS Loader Base Tests - streamed CSV parsing
+"""
+
+from src.local_faers.faers_loader_base import FaersLoaderBase
+from src.local_faers.reac_loader import ReacLoader
+
+
+def test_blank_lines_are_skipped():
+    data = b"primaryid,caseid,pt\n\n1,10,Headache\n\n2,20,Nausea\n\n"
+
+    table = ReacLoader().load_csv(data, validate=True)
+
+    assert len(table) == 2
+    assert [row["pt"] for row in table.iter_rows()] == ["Headache", "Nausea"]
+
+
+def test_chunks_hold_only_records():
+    data = b"primaryid,caseid,pt\n" + b"".join(b"%d,%d,X\n\n" % (i, i) for i in range(5))
+
+    table = FaersLoaderBase("REAC").load_stream(data, validate=False, chunk_rows=2)
+
+    assert [row["primaryid"] for row in table.iter_rows()] == ["0", "1", "2", "3", "4"]
@@ -41,6 +41,66 @@ def test_kg_router():
     assert explanation["path_found"] is True
 
 
+def test_kg_snapshot_paths():
+    """Test compiled snapshot path queries and invalidation."""
+    import networkx as nx
+    
+    kg = KnowledgeGraph()
+    kg.add_drug("semaglutide")
+    kg.add_target("glp1r")
+    kg.add_pathway("gastric_emptying")
+    kg.add_reaction("nausea")
+    kg.link_drug_target("semaglutide", "glp1r")
+    kg.link_target_pathway("glp1r", "gastric_emptying")
+    kg.link_pathway_reaction("gastric_emptying", "nausea")
+    kg.link_drug_pathway("semaglutide", "gastric_emptying")
+    
+    expected = list(nx.all_simple_paths(kg.g, "semaglutide", "nausea", cutoff=5))
+    assert kg.all_paths("semaglutide", "nausea") == expected
+    assert kg.all_paths("semaglutide", "nausea", max_length=2) == [["semaglutide", "gastric_emptying", "nausea"]]
+    assert kg.all_paths("nausea", "semaglutide") == []
+    assert kg.all_paths("semaglutide", "unknown") == []
+    
+    snapshot = kg.snapshot()
+    assert kg.snapshot() is snapshot
+    assert kg.get_statistics()["pathways"] == 1
+    
+    kg.link_drug_reaction("semaglutide", "nausea")
+    assert kg.snapshot() is not snapshot
+    assert ["semaglutide", "nausea"] in kg.all_paths("semaglutide", "nausea")
+
+
+def test_linking_engine_incremental(tmp_path):
+    """Test batched, watermarked FAERS ingestion and binary persistence."""
+    from src.knowledge_graph import LinkingEngine
+    
+    faers = pd.DataFrame({
+        "primaryid": [1, 2, 3, 4],
+        "drug": ["semaglutide", "semaglutide", "metformin", "semaglutide"],
+        "reaction": ["nausea", "nausea", "nausea", "vomiting"],
+        "seriousness": [1, 0, 0, 1],
+    })
+    
+    kg = KnowledgeGraph()
+    engine = LinkingEngine(kg)
+    assert engine.ingest_faers(faers.iloc[:3]) == 3
+    edge = kg.get_edge_attributes("semaglutide", "nausea")
+    assert edge["count"] == 2
+    assert edge["weight"] == pytest.approx(1.7)
+    
+    # Re-ingesting the grown dataset only folds in the new case
+    assert engine.ingest_faers(faers) == 1
+    assert kg.get_edge_attributes("semaglutide", "nausea")["count"] == 2
+    assert kg.g.has_edge("semaglutide", "vomiting")
+    
+    path = tmp_path / "kg.npz"
+    kg.save(str(path))
+    loaded = KnowledgeGraph.load(str(path))
+    assert loaded.get_edge_attributes("semaglutide", "nausea") == edge
+    assert loaded.get_node_attributes("metformin")["type"] == "drug"
+    assert LinkingEngine(loaded).ingest_faers(faers) == 0
+
+
 def test_supervisor_reasoning():
     """Test Mechanism Supervisor reasoning."""
     try:
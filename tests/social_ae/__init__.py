@@ -0,0 +1,3 @@
+"""
+Social AE Tests - Social fetch runs replayed from recorded HTTP fixtures
+"""
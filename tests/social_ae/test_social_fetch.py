@@ -0,0 +1,99 @@
+"""
+Social Fetch Tests - concurrent, incremental Reddit pulls replayed from recorded HTTP fixtures
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.data_sources.http_pool import http_fixtures
+from src.social_ae import social_ae_storage, social_cursors
+from src.social_ae.social_cursors import SocialCursorStore, get_cursor_store
+from src.social_ae.social_fetcher import REDDIT_SEARCH_URL, fetch_daily_social_posts
+
+FIXTURES = Path(__file__).parent / "fixtures" / "reddit_daily_pull.json"
+# Pulls are replayed at a fixed time so the requested window matches the recording
+NOW = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+
+def _pull(cursors=None):
+    with http_fixtures(FIXTURES):
+        return fetch_daily_social_posts("ozempic, wegovy", platforms=["reddit"], days_back=1, cursors=cursors, now=NOW)
+
+
+def test_replayed_pull_is_reproducible():
+    first = _pull()
+    second = _pull()
+
+    assert [post["post_id"] for post in first] == ["a3", "a2", "b1", "a1"]
+    assert first == second
+    assert {post["drug_match"] for post in first} == {"ozempic", "wegovy"}
+
+
+def test_cursors_fetch_only_new_posts(tmp_path):
+    cursors = SocialCursorStore(tmp_path / "cursors.json")
+    first = _pull(cursors)
+    cursors.advance(first)
+    cursors.save()
+
+    # Marks survive a restart; the next pull asks for (and keeps) only newer posts
+    reloaded = SocialCursorStore(tmp_path / "cursors.json")
+    assert reloaded.get("reddit", "ozempic") == {"created_utc": 1735710000, "post_id": "a3", "boundary_ids": ["a2", "a3"]}
+    second = _pull(reloaded)
+
+    assert [post["post_id"] for post in second] == ["a4"]
+
+
+def _reddit_page(ids, before=None):
+    """Recorded Pushshift page (limit 2, after the mark at 1735700000) of comments created at their id."""
+    params = [["after", "1735699999"], ["q", "ozempic"], ["size", "2"], ["sort", "created_utc"], ["sort_type", "desc"]]
+    if before is not None:
+        params.insert(1, ["before", str(before)])
+    items = [{"id": str(i), "created_utc": i, "body": f"Post {i}: the nausea has been rough lately"} for i in ids]
+    return {"method": "GET", "url": REDDIT_SEARCH_URL, "params": params, "status": 200,
+            "headers": {"Content-Type": "application/json"}, "body": json.dumps({"data": items})}
+
+
+def test_incremental_pull_pages_back_to_the_mark(tmp_path):
+    cursors = SocialCursorStore(tmp_path / "cursors.json")
+    cursors.advance([{"source": "reddit", "drug_match": "ozempic", "created_utc": 1735700000, "post_id": "1735700000"}])
+    fixtures = tmp_path / "pages.json"
+    fixtures.write_text(json.dumps([
+        _reddit_page([1735700005, 1735700004]),
+        _reddit_page([1735700003, 1735700002], before=1735700005),
+        _reddit_page([1735700001], before=1735700003),
+    ]))
+
+    with http_fixtures(fixtures):
+        posts = fetch_daily_social_posts("ozempic", platforms=["reddit"], limit_per_term=2, days_back=1, cursors=cursors, now=NOW)
+
+    # Every post between the mark and the newest one, not just the newest page
+    assert sorted(post["created_utc"] for post in posts) == [1735700001, 1735700002, 1735700003, 1735700004, 1735700005]
+
+
+def test_each_sink_keeps_its_own_cursors(tmp_path, monkeypatch):
+    monkeypatch.setattr(social_cursors, "CURSOR_FILES", {
+        "scheduler": tmp_path / "scheduler.json",
+        "api": tmp_path / "api.json",
+    })
+    monkeypatch.setattr(social_cursors, "_stores", {})
+    scheduler = get_cursor_store("scheduler")
+    scheduler.advance(_pull(scheduler))
+    scheduler.save()
+
+    # A scheduler pull does not hide those posts from the API sink
+    api = get_cursor_store("api")
+    assert api is not scheduler
+    assert api.since("reddit", "ozempic") is None
+    assert len(_pull(api)) == len(_pull(SocialCursorStore(tmp_path / "fresh.json")))
+
+
+def test_stored_posts_are_dropped_by_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(social_ae_storage, "DB_DIR", tmp_path)
+    monkeypatch.setattr(social_ae_storage, "DB_FILE", tmp_path / "social_posts.db")
+    posts = _pull()
+    social_ae_storage.store_posts(posts[:2], "ozempic, wegovy", ["reddit"])
+
+    remaining = social_ae_storage.filter_unstored_posts(posts)
+
+    assert [post["post_id"] for post in remaining] == [post["post_id"] for post in posts[2:]]
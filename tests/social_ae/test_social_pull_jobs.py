@@ -0,0 +1,131 @@
+"""
+Social Pull Job Tests - background queue, streaming batches and trigger de-duplication
+"""
+
+import time
+
+import pandas as pd
+import pytest
+
+from src.social_ae import social_pull_jobs
+from src.social_ae.social_cursors import SocialCursorStore
+from src.social_ae.social_pull_jobs import SocialPullJobQueue
+
+
+def _posts(term, count, start=1735700000):
+    return [
+        {"source": "reddit", "platform": "reddit", "drug_match": term, "post_id": f"{term}{i}",
+         "created_utc": start + i, "text": f"{term} gave me a headache"}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Stub fetch (one term every 0.2s) and stages; records when each stage saw a batch."""
+    events = []
+
+    def fake_iter_social_posts(drug_terms, platforms, limit_per_term, days_back, cursors):
+        for term in [t.strip() for t in drug_terms.split(",")]:
+            time.sleep(0.2)
+            if term == "broken":
+                raise RuntimeError("fetch exploded")
+            events.append(("fetched", term, time.monotonic()))
+            yield _posts(term, 3)
+
+    def fake_store(df):
+        events.append(("stored", len(df), time.monotonic()))
+        return {"inserted": len(df), "errors": 0}
+
+    monkeypatch.setattr(social_pull_jobs, "iter_social_posts", fake_iter_social_posts)
+    monkeypatch.setattr(social_pull_jobs, "clean_and_normalize_posts", lambda posts, use_ml: pd.DataFrame(posts))
+    monkeypatch.setattr(
+        social_pull_jobs, "extract_reactions_from_posts",
+        lambda df, include_confidence: df.assign(has_reaction=True)
+    )
+    monkeypatch.setattr(social_pull_jobs, "anonymize_posts", lambda posts: posts)
+    monkeypatch.setattr(social_pull_jobs, "store_social_records", fake_store)
+    return events
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_submit_returns_at_once_and_streams_batches(tmp_path, pipeline):
+    queue = SocialPullJobQueue(batch_size=4, cursors=SocialCursorStore(tmp_path / "cursors.json"))
+
+    start = time.monotonic()
+    job, created = queue.submit(["ozempic", "wegovy", "mounjaro"], ["reddit"])
+    assert created and time.monotonic() - start < 0.1
+
+    result = _wait(job).to_dict()
+    assert result["status"] == "succeeded"
+    assert result["posts_fetched"] == result["posts_stored"] == result["posts_with_reactions"] == 9
+    assert result["batches"] == 3
+    assert result["stages"]["store"]["items"] == 9
+    assert result["stages"]["fetch"]["items_per_sec"] > 0
+
+    # The first batch was stored before the last term had been fetched
+    first_store = next(at for kind, _, at in pipeline if kind == "stored")
+    last_fetch = max(at for kind, _, at in pipeline if kind == "fetched")
+    assert first_store < last_fetch
+
+    # Cursors advance once each term has been stored
+    assert queue.cursors.since("reddit", "mounjaro") == 1735700002
+    assert queue.metrics()["jobs"] == {"succeeded": 1}
+
+
+def test_concurrent_triggers_for_a_watchlist_share_one_job(tmp_path, pipeline):
+    queue = SocialPullJobQueue(cursors=SocialCursorStore(tmp_path / "cursors.json"))
+
+    job, created = queue.submit(["ozempic", "wegovy"], ["reddit"])
+    same, created_again = queue.submit([" Wegovy", "OZEMPIC"], ["reddit"])
+    other, created_other = queue.submit(["ozempic"], ["reddit"])
+
+    assert created and not created_again and same is job
+    assert created_other and other is not job
+
+    _wait(job)
+    _wait(other)
+    rerun, created_rerun = queue.submit(["ozempic", "wegovy"], ["reddit"])
+    assert created_rerun and rerun is not job
+    _wait(rerun)
+
+
+def test_failed_job_reports_error_and_keeps_cursors(tmp_path, pipeline):
+    queue = SocialPullJobQueue(cursors=SocialCursorStore(tmp_path / "cursors.json"))
+
+    job, _ = queue.submit(["ozempic", "broken"], ["reddit"])
+    result = _wait(job).to_dict()
+
+    assert result["status"] == "failed"
+    assert "fetch exploded" in result["error"]
+    assert queue.cursors.since("reddit", "ozempic") is None
+
+
+def test_stored_terms_keep_their_cursors_when_a_job_fails(tmp_path, pipeline):
+    queue = SocialPullJobQueue(batch_size=3, cursors=SocialCursorStore(tmp_path / "cursors.json"))
+
+    job, _ = queue.submit(["ozempic", "broken"], ["reddit"])
+    assert _wait(job).status == "failed"
+
+    # ozempic was stored before the failure, so the next trigger does not store it again
+    assert queue.cursors.since("reddit", "ozempic") == 1735700002
+    assert SocialCursorStore(tmp_path / "cursors.json").since("reddit", "ozempic") == 1735700002
+
+
+def test_overlapping_jobs_store_each_post_once(tmp_path, pipeline):
+    queue = SocialPullJobQueue(batch_size=3, cursors=SocialCursorStore(tmp_path / "cursors.json"))
+
+    first, _ = queue.submit(["ozempic", "wegovy"], ["reddit"])
+    second, _ = queue.submit(["ozempic"], ["reddit"])
+    _wait(first)
+    _wait(second)
+
+    assert first.status == second.status == "succeeded"
+    assert first.counts["posts_stored"] + second.counts["posts_stored"] == 6
+    assert sum(count for kind, count, _ in pipeline if kind == "stored") == 6
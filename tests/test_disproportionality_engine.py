@@ -0,0 +1,34 @@
+"""
+Disproportionality Engine Tests - the shared all-pairs table of a dataset
+"""
+
+import pandas as pd
+
+from src.disproportionality_engine import compute_disproportionality_table, get_disproportionality_table
+
+
+def _frame():
+    return pd.DataFrame({
+        "drug_name": ["Aspirin", "aspirin; Ibuprofen", "Ibuprofen", "Ozempic", "Ozempic"],
+        "reaction": ["Nausea", "Headache; nausea", "Headache", "Nausea", "Vomiting"],
+    })
+
+
+def test_table_is_built_once_per_dataset():
+    df = _frame()
+
+    table = get_disproportionality_table(df)
+
+    assert get_disproportionality_table(df) is table
+    pd.testing.assert_frame_equal(table.reset_index(), compute_disproportionality_table(df))
+
+
+def test_table_is_rebuilt_when_counted_columns_change():
+    df = _frame()
+    table = get_disproportionality_table(df)
+
+    df["reaction"] = ["Rash"] * len(df)
+
+    rebuilt = get_disproportionality_table(df)
+    assert rebuilt is not table
+    assert set(rebuilt.index.get_level_values("reaction")) == {"rash"}
@@ -0,0 +1,67 @@
+"""
+FAERS Cache Tests - a cache hit returns the same table as a fresh load, with the same dtypes
+"""
+
+import pandas as pd
+import pytest
+
+from src import faers_cache, faers_loader
+
+pytestmark = pytest.mark.skipif(not faers_cache.is_cache_available(), reason="pyarrow not installed")
+
+QUARTER = {
+    "DEMO24Q1.txt": "primaryid$caseid$age$sex$fda_dt\n1$10$45$F$20240101\n2$20$$M$20240102\n3$30$60$$20240103\n",
+    "DRUG24Q1.txt": "primaryid$caseid$drug_seq$role_cod$drugname\n1$10$1$PS$ASPIRIN\n2$20$1$PS$IBUPROFEN\n",
+    "REAC24Q1.txt": "primaryid$caseid$pt\n1$10$Headache\n3$30$Nausea\n",
+}
+
+
+@pytest.fixture
+def quarter(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAERS_CACHE_DIR", str(tmp_path / "cache"))
+    folder = tmp_path / "faers"
+    folder.mkdir()
+    for name, text in QUARTER.items():
+        (folder / name).write_text(text)
+    return folder
+
+
+def test_cache_hit_matches_fresh_load(quarter):
+    fresh = faers_loader.load_faers_folder(str(quarter), max_workers=1, use_cache=False)
+    faers_loader.load_faers_folder(str(quarter), max_workers=1, use_cache=True)
+    cached = faers_loader.load_faers_folder(str(quarter), max_workers=1, use_cache=True)
+
+    assert len(faers_cache.list_cache_entries()) == 1
+    pd.testing.assert_frame_equal(cached, fresh)
+    # Missing text is NaN on both paths, never None (which .astype(str) turns into 'None')
+    for col in fresh.select_dtypes(include="object").columns:
+        assert cached[col].astype(str).tolist() == fresh[col].astype(str).tolist()
+        assert "None" not in cached[col].astype(str).tolist()
+
+
+def test_digest_index_drops_missing_and_changed_files(quarter):
+    demo, drug = quarter / "DEMO24Q1.txt", quarter / "DRUG24Q1.txt"
+    faers_cache.file_digest(demo)
+    faers_cache.file_digest(drug)
+    drug.unlink()
+    demo.write_text(QUARTER["DEMO24Q1.txt"] + "4$40$30$F$20240104\n")
+    faers_cache.file_digest(demo)
+
+    index = faers_cache._read_json(faers_cache.get_cache_dir() / faers_cache._DIGEST_INDEX)
+    assert len(index) == 1
+    assert next(iter(index)).startswith(str(demo.resolve()))
+
+
+def test_counts_keep_integer_dtype_when_other_tables_have_extra_cases(tmp_path):
+    folder = tmp_path / "faers"
+    folder.mkdir()
+    (folder / "DEMO24Q1.txt").write_text("primaryid$caseid$age$sex\n1$10$45$F\n2$20$50$M\n")
+    (folder / "DRUG24Q1.txt").write_text("primaryid$caseid$drug_seq$role_cod$drugname\n1$10$1$PS$ASPIRIN\n2$20$1$PS$IBUPROFEN\n")
+    # Case 9 is not in DEMO (nor in DRUG)
+    (folder / "REAC24Q1.txt").write_text("primaryid$caseid$pt\n1$10$Headache\n9$90$Nausea\n")
+
+    df = faers_loader.load_faers_folder(str(folder), max_workers=1, use_cache=False)
+
+    # Every DEMO case has drugs, so drug_count stays int64 as with one merge per table
+    assert df["drug_count"].dtype == "int64"
+    assert df["drug_count"].tolist() == [1, 1]
@@ -0,0 +1,74 @@
+"""
+Query Dataset Tests - indexed filtering matches the former apply_filters path
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.query_dataset import QueryDataset
+from src.utils import normalize_text
+
+
+def _reference_select(df, filters):
+    """Text filters as the former signal_stats.apply_filters evaluated them (row mask)."""
+    mask = np.ones(len(df), dtype=bool)
+
+    def normalized(col):
+        return df[col].astype(str).str.strip().str.lower().replace("nan", "")
+
+    def contains(series, values):
+        terms = values if isinstance(values, list) else [values]
+        tokens = [re.escape(normalize_text(term)) for term in terms if term]
+        return series.str.contains("|".join(tokens), na=False).to_numpy()
+
+    if "drug" in filters:
+        mask &= contains(normalized("drug_name"), filters["drug"])
+    if "reaction" in filters:
+        mask &= contains(normalized("reaction"), filters["reaction"])
+    if "exclude_reaction" in filters:
+        mask &= ~contains(normalized("reaction"), filters["exclude_reaction"])
+    if "sex" in filters:
+        mask &= (normalized("sex") == normalize_text(filters["sex"])).to_numpy()
+    if "country" in filters:
+        mask &= contains(normalized("country"), filters["country"])
+    if filters.get("seriousness"):
+        mask &= normalized("seriousness").isin({"1", "yes", "y", "true", "serious"}).to_numpy()
+    return mask
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    missing = [None, np.nan, pd.NA]
+    drugs = ["Aspirin", "IBUPROFEN; aspirin", " Ozempic ", "none", "Nan-Drug", *missing]
+    reactions = ["Nausea", "Headache; NAUSEA", "Injection site pain", "nan", "None", *missing]
+    n = 2000
+    return pd.DataFrame({
+        "drug_name": rng.choice(np.array(drugs, dtype=object), n),
+        "reaction": rng.choice(np.array(reactions, dtype=object), n),
+        "sex": rng.choice(np.array(["F", "m", " M ", *missing], dtype=object), n),
+        "country": rng.choice(np.array(["US", "United Kingdom", "none", *missing], dtype=object), n),
+        "seriousness": rng.choice(np.array(["1", "Yes", "0", "serious", *missing], dtype=object), n),
+    })
+
+
+@pytest.mark.parametrize("filters", [
+    {"reaction": "n"},
+    {"reaction": "none"},
+    {"reaction": "na"},
+    {"drug": "aspirin"},
+    {"drug": "non"},
+    {"drug": ["ozempic", "none"]},
+    {"exclude_reaction": "n"},
+    {"sex": "m"},
+    {"country": "n"},
+    {"seriousness": True},
+    {"drug": "a", "reaction": "headache", "exclude_reaction": "pain", "country": "u"},
+])
+def test_select_matches_former_filter_path(frame, filters):
+    selected = QueryDataset(frame).select(filters)
+
+    assert np.array_equal(selected, _reference_select(frame, filters))